@@ -1,5 +1,5 @@
 # instal package
 pip install -r requirements.txt
 
-# run backend server
-uvicorn app:app --host 0.0.0.0 --port 8000
\ No newline at end of file
+# run backend server (workers: conf server.workers or WEB_CONCURRENCY, graceful reload: kill -HUP <master pid>)
+gunicorn app:app -c gunicorn.conf.py
\ No newline at end of file
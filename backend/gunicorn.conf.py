@@ -0,0 +1,40 @@
+"""Gunicorn config (multi-worker production server)
+
+Usage:
+    gunicorn app:app -c gunicorn.conf.py
+
+    - workers: conf server.workers (or WEB_CONCURRENCY), worker process count. -w on command line overrides it.
+    - worker_class: uvicorn worker with uvloop event loop and httptools http parser (lib/worker.py)
+    - each worker imports the app after fork and creates its own engine, caches, search indexes on first use.
+      DB pool of a worker is conf server.db_connection_budget / workers (lib.server.worker_pool_size),
+      or conf db_pool pool_size, max_overflow (lib.pool.pool_options). GET /internal/pool shows pool stats of a worker,
+      GET /internal/cache shows cache stats of a worker.
+      The sync engine (migration, scripts) holds at most one connection outside the budget.
+      Password hashing processes of a worker are cpu count / workers (conf password_hash.max_workers overrides it).
+    - kill -HUP <master pid>: graceful reload. new workers are started with new code and conf,
+      old workers finish requests in progress within graceful_timeout.
+    - kill -TERM <master pid>: graceful shutdown, kill -TTIN/-TTOU <master pid>: one more/less worker
+"""
+import os
+import sys
+
+backend_path = os.path.abspath(os.path.dirname(__file__))
+src_path = os.path.abspath(os.path.join(backend_path, 'src'))
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from lib import SERVER
+from lib.server import worker_count
+
+
+bind = SERVER.get("bind", "0.0.0.0:8000")
+workers = worker_count()
+worker_class = "lib.worker.UvicornWorker"
+graceful_timeout = SERVER.get("graceful_timeout", 30)
+timeout = SERVER.get("timeout", 60)
+keepalive = 5
+
+
+def post_fork(server, worker):
+    # pool size of the worker is computed from the current worker count (-w, TTIN/TTOU)
+    os.environ["WEB_CONCURRENCY"] = str(server.cfg.workers)
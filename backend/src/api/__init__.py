@@ -1,26 +1,42 @@
-import os
-import sys
-from fastapi import FastAPI, Request
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, Depends
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from lib.db_connect import AsyncMySQLManager, AsyncSession, get_session, dispose_engine
+from lib.password import shutdown_executor
+from lib.search_index import get_search_index, get_fuzzy_index
+from lib.cache import get_item_cache, close_item_cache
+from lib.expiry import get_expiry_scheduler, start_expiry_scheduler, stop_expiry_scheduler
 
-api_path = os.path.abspath(os.path.join(__file__, os.path.pardir))
-src_path = os.path.abspath(os.path.join(api_path, os.path.pardir))
-lib_path = os.path.abspath(os.path.join(src_path, 'lib'))
-if api_path not in sys.path:
-    sys.path.append(api_path)
-if lib_path not in sys.path:
-    sys.path.append(lib_path)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """App startup/shutdown.
+    Engines, caches, search indexes, validators are created lazily on first use in each worker,
+    so importing and creating the app reads no conf and opens no connection.
+    """
+    # item expiry event scheduler (enabled by conf in one process)
+    await start_expiry_scheduler()
+    try:
+        yield
+    finally:
+        await stop_expiry_scheduler()
+        # close process-wide connection pool, hashing pool, item cache
+        await dispose_engine()
+        shutdown_executor()
+        await close_item_cache()
 
 
 def create_app():
-    app = FastAPI()
+    app = FastAPI(lifespan=lifespan)
     
     # router
-    from auth import auth_router
-    from item import item_router
+    from .auth import auth_router
+    from .item import item_router
+    from .internal import internal_router
     app.include_router(auth_router)
     app.include_router(item_router)
+    app.include_router(internal_router)
 
     # error handler
     @app.exception_handler(CustomHttpException)
@@ -48,6 +64,12 @@ def create_app():
     return app
 
 
+async def get_mysql_manager(session: AsyncSession = Depends(get_session)) -> AsyncMySQLManager:
+    """FastAPI dependency. Make AsyncMySQLManager with a new session for each request."""
+    return AsyncMySQLManager(session, get_search_index(), get_item_cache(), get_fuzzy_index(),
+                             get_expiry_scheduler())
+
+
 class CustomHttpException(Exception):
     def __init__(self, code: int, error: Exception, message: str = "") -> None:
         self.code = code
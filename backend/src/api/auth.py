@@ -1,30 +1,28 @@
 import jwt
 from datetime import datetime, timedelta
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 from pydantic import BaseModel
-from api import CustomHttpException
-from lib import TOKEN_KEY
+from api import CustomHttpException, get_mysql_manager
+from lib import get_key
 from lib.util import make_respose
-from lib.db_connect import MySQLManager, MySQLManagerError
-from lib.encrypt import EncryptManager, EncryptManagerError
-from lib.validator import ApiValidator, BadRequestError, UnAuthorizationError
+from lib.db_connect import AsyncMySQLManager, MySQLManagerError, DuplicateKeyError
+from lib.encrypt import EncryptManagerError
+from lib.password import get_password_hasher, PasswordHasherError
+from lib.validator import get_api_validator, BadRequestError, UnAuthorizationError
 
 class User(BaseModel):
     phone_number: str
     password: str
 
-ApiValidator = ApiValidator()
-EncryptManager = EncryptManager()
-MySQLManager = MySQLManager()
 auth_router = APIRouter(prefix="/auth")
 
 
 @auth_router.post("/signup")
-async def signup_user(user: User):
+async def signup_user(user: User, MySQLManager: AsyncMySQLManager = Depends(get_mysql_manager)):
     """POST /auth/signup
     ## Sign up user api
     It receives phone_number, password as body values.
-    The password is encrypted with a dek.
+    The password is hashed with scrypt.
     Phone_number and password are stored in user_auth table.
     
     ## Body:
@@ -44,24 +42,27 @@ async def signup_user(user: User):
     """
     try:
         # check user input signup validate
-        ApiValidator.check_user_signup(user.phone_number)
+        get_api_validator().check_user_signup(user.phone_number)
 
-        # encrypt password
-        encrypt_password = EncryptManager.encrypt_password(user.password)
+        # hash password
+        hash_password = await get_password_hasher().hash_password(user.password)
         
-        # Insert user auth in DB
-        result = MySQLManager.insert_user_auth(user.phone_number, encrypt_password)
+        # Insert user auth in DB (phone_number is unique key)
+        try:
+            result = await MySQLManager.insert_user_auth(user.phone_number, hash_password)
+        except DuplicateKeyError:
+            raise BadRequestError("This phone number already exists. Please log in with your existing account.")
         return make_respose({"phone_number": result})
     except BadRequestError as e:
         raise CustomHttpException(400, error=e)
-    except (MySQLManagerError, EncryptManagerError) as e:
+    except (MySQLManagerError, EncryptManagerError, PasswordHasherError) as e:
         raise CustomHttpException(500, error=e, message="Try again in a few minutes.")
     except Exception as e:
         raise CustomHttpException(500, error=e, message="Unknown error. Contact service manager.")
 
 
 @auth_router.post("/login")
-async def login_user(user: User):
+async def login_user(user: User, MySQLManager: AsyncMySQLManager = Depends(get_mysql_manager)):
     """POST /auth/login
     ## Log in user api
     It receives phone_number, password as body values.
@@ -86,19 +87,19 @@ async def login_user(user: User):
     """
     try:
         # check user input login validate
-        ApiValidator.check_user_login(user.phone_number, user.password)
+        await get_api_validator().check_user_login(user.phone_number, user.password, MySQLManager)
         
         # make JWT token
         token = jwt.encode({
                 "phone_number": user.phone_number,
                 "exp": datetime.utcnow() + timedelta(hours=2)
-            }, TOKEN_KEY, algorithm="HS256")
+            }, get_key("jwt_key"), algorithm="HS256")
         return make_respose({"user": user.phone_number,"token": token})
     except BadRequestError as e:
         raise CustomHttpException(400, error=e)
     except UnAuthorizationError as e:
         raise CustomHttpException(401, error=e)
-    except (MySQLManagerError, EncryptManagerError) as e:
+    except (MySQLManagerError, EncryptManagerError, PasswordHasherError) as e:
         raise CustomHttpException(500, error=e, message="Try again in a few minutes.")
     except Exception as e:
         raise CustomHttpException(500, error=e, message="Unknown error. Contact service manager.")
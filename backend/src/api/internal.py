@@ -0,0 +1,115 @@
+from fastapi import APIRouter, Header
+from fastapi.responses import ORJSONResponse
+from api import CustomHttpException
+from lib.util import make_respose
+from lib.db_connect import get_pool_stats, get_cache_stats
+from lib.validator import get_api_validator, UnAuthorizationError, ForbiddenError
+
+internal_router = APIRouter(prefix="/internal")
+
+
+@internal_router.get("/pool", response_class=ORJSONResponse)
+async def get_pool(x_internal_token: str = Header(None)):
+    """GET /internal/pool
+    ## DB connection pool stats api
+    It receives X-Internal-Token as Header value. (403 if conf server.internal_token is not set)
+    Connection pool state and stats of the worker that handled the request are returned.
+    Stats are counted per worker process (pid) from the worker start.
+    async: engine of api requests, sync: engine of migration (null if not created in the worker)
+
+    ## Headers:
+        X-Internal-Token: conf server.internal_token
+
+    ## Response:
+        {
+            "meta": {
+                "code": 200,
+                "message": "ok"
+                },
+            "data": {
+                "pid": worker_pid,
+                "async": {
+                    "size": pool_size,
+                    "max_overflow": max_overflow,
+                    "checked_out": connections_in_use,
+                    "idle": connections_in_pool,
+                    "overflow": connections_opened_over_pool_size,
+                    "waiting": requests_waiting_for_connection,
+                    "connects": opened_connections,
+                    "checkouts": checkouts,
+                    "invalidated": dead_or_stale_connections,
+                    "timeouts": pool_timeout_errors,
+                    "wait_avg_ms": avg_time_to_get_connection,
+                    "wait_max_ms": max_time_to_get_connection,
+                    "hold_avg_ms": avg_time_connection_in_use,
+                    "hold_max_ms": max_time_connection_in_use
+                },
+                "sync": Same as async or null
+            }
+        }
+    """
+    try:
+        # check internal api token
+        get_api_validator().check_internal_token(x_internal_token)
+
+        return ORJSONResponse(make_respose(get_pool_stats()))
+    except UnAuthorizationError as e:
+        raise CustomHttpException(401, error=e)
+    except ForbiddenError as e:
+        raise CustomHttpException(403, error=e)
+    except Exception as e:
+        raise CustomHttpException(
+            500, error=e, message="Unknown error. Contact service manager.")
+
+
+@internal_router.get("/cache", response_class=ORJSONResponse)
+async def get_cache(x_internal_token: str = Header(None)):
+    """GET /internal/cache
+    ## Cache stats api
+    It receives X-Internal-Token as Header value. (403 if conf server.internal_token is not set)
+    Size and hit/miss stats of caches and search indexes of the worker that handled the request are returned.
+    Stats are counted per worker process (pid) from the worker start. (null if the cache is disabled)
+
+    ## Headers:
+        X-Internal-Token: conf server.internal_token
+
+    ## Response:
+        {
+            "meta": {
+                "code": 200,
+                "message": "ok"
+                },
+            "data": {
+                "pid": worker_pid,
+                "item": {
+                    "backend": "MemoryBackend" or "RedisBackend",
+                    "size": cached_items (null for redis),
+                    "hits": hits, "misses": misses, "errors": cache_server_errors, "hit_rate": hit_rate
+                } or null,
+                "token": {"size": cached_tokens, "hits": hits, "misses": misses, "hit_rate": hit_rate},
+                "search_count": Same as token (keyword search total count),
+                "infix_search": Same as token (infix search total, ranked seqs),
+                "barcode": Same as token (scanned barcode item),
+                "search_index": {
+                    "users": loaded_users, "bytes": estimated_memory, "hits": hits, "misses": misses,
+                    "evictions": evicted_users, "discards": loads_not_stored
+                } or null,
+                "fuzzy_index": Same as search_index or null
+            }
+        }
+    """
+    try:
+        # check internal api token
+        validator = get_api_validator()
+        validator.check_internal_token(x_internal_token)
+
+        stats = get_cache_stats()
+        stats["token"] = validator.TokenCache.stats()
+        return ORJSONResponse(make_respose(stats))
+    except UnAuthorizationError as e:
+        raise CustomHttpException(401, error=e)
+    except ForbiddenError as e:
+        raise CustomHttpException(403, error=e)
+    except Exception as e:
+        raise CustomHttpException(
+            500, error=e, message="Unknown error. Contact service manager.")
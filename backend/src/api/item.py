@@ -1,14 +1,17 @@
-from fastapi import APIRouter, Header
-from pydantic import BaseModel
-from typing import Optional
-from api import CustomHttpException
-from lib.util import make_respose
-from lib.db_connect import MySQLManager, MySQLManagerError
-from lib.validator import ApiValidator, BadRequestError, UnAuthorizationError
+import orjson
+from fastapi import APIRouter, Header, Depends, Request, Response
+from fastapi.responses import StreamingResponse, ORJSONResponse
+from pydantic import BaseModel, ValidationError
+from typing import Optional, List
+from datetime import date, timedelta
+from api import CustomHttpException, get_mysql_manager
+from lib.bulk import parse_bulk_rows, export_rows, EXPORT_MEDIA_TYPES, BulkParseError
+from lib.util import make_respose, encode_cursor, decode_cursor, make_etag, make_content_etag, etag_matches, \
+    split_search_terms
+from lib.db_connect import AsyncMySQLManager, MySQLManagerError, NotFoundError
+from lib.validator import get_api_validator, BadRequestError, UnAuthorizationError
 
 item_router = APIRouter(prefix="/item")
-ApiValidator = ApiValidator()
-MySQLManager = MySQLManager()
 
 
 class CreateItem(BaseModel):
@@ -32,8 +35,61 @@ class UpdateItem(BaseModel):
     expiration_date: Optional[str] = None
     size: Optional[str] = None
 
+
+class ItemFilter(BaseModel):
+    category: Optional[str] = None
+    size: Optional[str] = None
+    expiration_before: Optional[str] = None
+    seqs: Optional[List[int]] = None
+
+
+class PriceAdjust(BaseModel):
+    field: str
+    amount: Optional[int] = None
+    percent: Optional[float] = None
+
+
+class BulkUpdateItem(BaseModel):
+    filter: ItemFilter
+    change: UpdateItem = UpdateItem()
+    adjust: Optional[PriceAdjust] = None
+    dry_run: bool = False
+
+
+class BulkDeleteItem(BaseModel):
+    filter: ItemFilter
+    dry_run: bool = False
+
+
+class BarcodeLookup(BaseModel):
+    barcodes: List[str]
+
+
+def _validate_bulk_row(params: dict) -> dict:
+    """Validate bulk row with the same rules as insert item api."""
+    item = CreateItem.model_validate(params)
+    get_api_validator().check_user_valid_input(item.expiration_date, item.size)
+    return item.model_dump()
+
+
+async def _insert_item_chunk(MySQLManager: AsyncMySQLManager, user: str, chunk: list,
+                             chunk_rows: list, errors: list) -> int:
+    """Insert one chunk. If the chunk fails, report its rows as errors and go on."""
+    try:
+        return await MySQLManager.insert_item_bulk(user, chunk)
+    except MySQLManagerError as e:
+        errors.extend({"row": row, "error": str(e)} for row in chunk_rows)
+        return 0
+
+
+def _item_etag(version: int, user: str, request: Request) -> str:
+    """Make ETag of item read api from user item version. (read before the item query)"""
+    return make_etag(version, f"{user}:{request.url.path}?{request.url.query}")
+
+
 @item_router.post("/")
-async def insert_item(item: CreateItem, user: str = Header(None), authorization: str = Header(None)):
+async def insert_item(item: CreateItem, user: str = Header(None), authorization: str = Header(None),
+                      MySQLManager: AsyncMySQLManager = Depends(get_mysql_manager)):
     """POST /item
     ## Insert item api
     It receives user(phone_number) and Authorization as Header values.
@@ -69,13 +125,13 @@ async def insert_item(item: CreateItem, user: str = Header(None), authorization:
     """
     try:
         # check user login
-        ApiValidator.check_current_user(user, authorization)
+        get_api_validator().check_current_user(user, authorization)
 
         # check user valid input(expriation_date, size)
-        ApiValidator.check_user_valid_input(item.expiration_date, item.size)
+        get_api_validator().check_user_valid_input(item.expiration_date, item.size)
 
         # Insert user item in DB
-        result = MySQLManager.insert_item_info(user, item.dict())
+        result = await MySQLManager.insert_item_info(user, item.model_dump())
         return make_respose({"phone_number": result, "name": item.name})
     except BadRequestError as e:
         raise CustomHttpException(400, error=e)
@@ -89,8 +145,524 @@ async def insert_item(item: CreateItem, user: str = Header(None), authorization:
             500, error=e, message="Unknown error. Contact service manager.")
 
 
+@item_router.post("/bulk")
+async def insert_item_bulk(request: Request, user: str = Header(None), authorization: str = Header(None),
+                           chunk_size: int = 1000,
+                           MySQLManager: AsyncMySQLManager = Depends(get_mysql_manager)):
+    """POST /item/bulk?chunk_size={chunk_size}
+    ## Bulk insert item api
+    It receives user(phone_number) and Authorization as Header values.
+    It receives items as body value. The body format is chosen by Content-Type.
+        application/json: JSON array of items
+        text/csv: CSV with header line (category,selling_price,...,size)
+        application/x-ndjson: one JSON item per line
+    CSV and NDJSON are read as a stream. Each row is checked like POST /item.
+    Valid rows are inserted chunk_size rows (default 1000, max 10000) per statement and commit.
+    Invalid rows are reported in errors and do not fail the whole upload.
+
+    ## Headers:
+        user: user_phone_number
+        authorization: login jwt token
+
+    ## Response:
+        {
+            "meta": {
+                "code": 200,
+                "message": "ok"
+                },
+            "data": {
+                "phone_number": phone_number,
+                "inserted": inserted_count,
+                "failed": failed_count,
+                "errors": [{"row": row_index(from 0, without CSV header), "error": error_message}, ...]
+            }
+        }
+    """
+    try:
+        # check user login
+        get_api_validator().check_current_user(user, authorization)
+
+        # check user valid input(chunk_size)
+        get_api_validator().check_bulk_input(chunk_size)
+
+        inserted, errors = 0, []
+        chunk, chunk_rows = [], []
+        row = -1
+        async for params, error in parse_bulk_rows(request.headers.get("content-type"), request.stream()):
+            row += 1
+            if error is None:
+                try:
+                    chunk.append(_validate_bulk_row(params))
+                    chunk_rows.append(row)
+                except ValidationError as e:
+                    error = ", ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())
+                except BadRequestError as e:
+                    error = str(e)
+            if error is not None:
+                errors.append({"row": row, "error": error})
+
+            # Insert user items in DB per chunk
+            if len(chunk) >= chunk_size:
+                inserted += await _insert_item_chunk(MySQLManager, user, chunk, chunk_rows, errors)
+                chunk, chunk_rows = [], []
+        if chunk:
+            inserted += await _insert_item_chunk(MySQLManager, user, chunk, chunk_rows, errors)
+        errors.sort(key=lambda e: e["row"])
+        return make_respose({"phone_number": user, "inserted": inserted, "failed": len(errors), "errors": errors})
+    except BulkParseError as e:
+        raise CustomHttpException(400, error=e)
+    except BadRequestError as e:
+        raise CustomHttpException(400, error=e)
+    except UnAuthorizationError as e:
+        raise CustomHttpException(401, error=e)
+    except MySQLManagerError as e:
+        raise CustomHttpException(
+            500, error=e, message="Try again in a few minutes.")
+    except Exception as e:
+        raise CustomHttpException(
+            500, error=e, message="Unknown error. Contact service manager.")
+
+
+@item_router.post("/bulk-update")
+async def update_item_bulk(item: BulkUpdateItem, user: str = Header(None), authorization: str = Header(None),
+                           MySQLManager: AsyncMySQLManager = Depends(get_mysql_manager)):
+    """POST /item/bulk-update
+    ## Bulk update item api
+    It receives user(phone_number) and Authorization as Header values.
+    It receives a filter and the change of matched items as body values.
+    All matched items are changed with one UPDATE statement.
+
+    ## Headers:
+        user: user_phone_number
+        authorization: login jwt token
+
+    ## Body:
+        filter (required, at least one):
+            category (str): item category
+            size (str): item size
+            expiration_before (str): items expiring before this date **required format: 20XX-XX-XX**
+            seqs (list): item seq list
+        change (optional): values to set (Same as POST /item/{seq} body)
+        adjust (optional):
+            field (str): selling_price or cost_price
+            amount (int) or percent (float): change price by amount or percent (rounded, min 0)
+        dry_run (bool): only count matched items without update
+
+    ## Response:
+        {
+            "meta": {
+                "code": 200,
+                "message": "ok"
+                },
+            "data": {
+                "phone_number": phone_number,
+                "dry_run": dry_run,
+                "affected": matched_item_count
+            }
+        }
+    """
+    try:
+        # check user login
+        get_api_validator().check_current_user(user, authorization)
+
+        # check user valid input(filter, change)
+        filters = item.filter.model_dump()
+        params = item.change.model_dump(exclude_none=True)
+        adjust = item.adjust.model_dump() if item.adjust else None
+        get_api_validator().check_bulk_filter(filters)
+        get_api_validator().check_bulk_change(params, adjust)
+
+        # Update user items in DB
+        result = await MySQLManager.update_item_bulk(user, filters, params, adjust, item.dry_run)
+        return make_respose({"phone_number": user, "dry_run": item.dry_run, "affected": result})
+    except BadRequestError as e:
+        raise CustomHttpException(400, error=e)
+    except UnAuthorizationError as e:
+        raise CustomHttpException(401, error=e)
+    except MySQLManagerError as e:
+        raise CustomHttpException(
+            500, error=e, message="Try again in a few minutes.")
+    except Exception as e:
+        raise CustomHttpException(
+            500, error=e, message="Unknown error. Contact service manager.")
+
+
+@item_router.post("/bulk-delete")
+async def delete_item_bulk(item: BulkDeleteItem, user: str = Header(None), authorization: str = Header(None),
+                           MySQLManager: AsyncMySQLManager = Depends(get_mysql_manager)):
+    """POST /item/bulk-delete
+    ## Bulk delete item api
+    It receives user(phone_number) and Authorization as Header values.
+    It receives a filter of items to delete as body value.
+    All matched items are deleted with one DELETE statement.
+
+    ## Headers:
+        user: user_phone_number
+        authorization: login jwt token
+
+    ## Body:
+        filter (required, at least one): Same as POST /item/bulk-update
+        dry_run (bool): only count matched items without delete
+
+    ## Response:
+        {
+            "meta": {
+                "code": 200,
+                "message": "ok"
+                },
+            "data": {
+                "phone_number": phone_number,
+                "dry_run": dry_run,
+                "affected": deleted_item_count
+            }
+        }
+    """
+    try:
+        # check user login
+        get_api_validator().check_current_user(user, authorization)
+
+        # check user valid input(filter)
+        filters = item.filter.model_dump()
+        get_api_validator().check_bulk_filter(filters)
+
+        # Delete user items in DB
+        result = await MySQLManager.delete_item_bulk(user, filters, item.dry_run)
+        return make_respose({"phone_number": user, "dry_run": item.dry_run, "affected": result})
+    except BadRequestError as e:
+        raise CustomHttpException(400, error=e)
+    except UnAuthorizationError as e:
+        raise CustomHttpException(401, error=e)
+    except MySQLManagerError as e:
+        raise CustomHttpException(
+            500, error=e, message="Try again in a few minutes.")
+    except Exception as e:
+        raise CustomHttpException(
+            500, error=e, message="Unknown error. Contact service manager.")
+
+
+@item_router.get("/export")
+async def export_item(user: str = Header(None), authorization: str = Header(None), format: str = "csv",
+                      MySQLManager: AsyncMySQLManager = Depends(get_mysql_manager)):
+    """GET /item/export?format={csv|ndjson}
+    ## Export item api
+    It receives user(phone_number) and Authorization as Header values.
+    Every item of the user is streamed as CSV(with header line) or NDJSON ordered by seq.
+    Items are read from the DB with a server-side cursor, so memory use does not grow with the item count.
+    The CSV can be uploaded again with POST /item/bulk.
+
+    ## Headers:
+        user: user_phone_number
+        authorization: login jwt token
+
+    ## Response:
+        csv:
+            seq,phone_number,category,selling_price,cost_price,name,description,barcode,expiration_date,size
+            1,010-0000-0000,coffee,5000,3500,아메리카노,...
+        ndjson:
+            {"seq": seq, "phone_number": phone_number, ...}
+            ...
+    """
+    try:
+        # check user login
+        get_api_validator().check_current_user(user, authorization)
+
+        # check user valid input(format)
+        get_api_validator().check_export_input(format)
+
+        # Stream user items in DB
+        # (the request session is closed after the response is sent)
+        return StreamingResponse(
+            export_rows(format, MySQLManager.stream_all_item(user)),
+            media_type=EXPORT_MEDIA_TYPES[format],
+            headers={"Content-Disposition": f'attachment; filename="items.{format}"'})
+    except BadRequestError as e:
+        raise CustomHttpException(400, error=e)
+    except UnAuthorizationError as e:
+        raise CustomHttpException(401, error=e)
+    except Exception as e:
+        raise CustomHttpException(
+            500, error=e, message="Unknown error. Contact service manager.")
+
+
+@item_router.get("/search", response_class=ORJSONResponse)
+async def search_item(request: Request, q: str = None, user: str = Header(None), authorization: str = Header(None),
+                      if_none_match: str = Header(None), page_number: int = 0, page_size: int = 10,
+                      MySQLManager: AsyncMySQLManager = Depends(get_mysql_manager)):
+    """GET /item/search?q={query}&page_number={page_number}&page_size={page_size}
+    ## Infix search item api
+    It receives user(phone_number) and Authorization as Header values.
+    Items containing every whitespace separated term of q in name, name initial or description are returned.
+    (ex. "라떼" finds "바닐라 라떼", "바닐라 ㄹㄸ" finds "바닐라 라떼")
+    Items are ordered by relevance (name > initial > description), then seq.
+    meta.total is the matched item count and meta.has_more tells whether the next page exists.
+    The response has an ETag header like GET /item/{seq}. (304 Not Modified if If-None-Match matches)
+
+    ## Headers:
+        user: user_phone_number
+        authorization: login jwt token
+        if-none-match (optional): ETag of previous response
+
+    ## Response:
+        {
+            "meta": {
+                "code": 200,
+                "message": "ok",
+                "total": matched_item_count,
+                "has_more": true or false(last page)
+                },
+            "data": [item info (Same as GET /item), ...]
+        }
+    """
+    try:
+        # check user login
+        get_api_validator().check_current_user(user, authorization)
+
+        # check user valid search input(q, page_size)
+        terms = split_search_terms(q)
+        get_api_validator().check_infix_input(terms, page_size)
+        page_number = max(page_number, 0)
+
+        # Not modified since previous response (skip search query)
+        counter = await MySQLManager.get_item_counter(user)
+        etag = _item_etag(counter["version"], user, request)
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+
+        result, total = await MySQLManager.get_infix_search_item(user, terms, page_number, page_size,
+                                                                 counter["version"])
+        meta = {"total": total, "has_more": (page_number + 1) * page_size < total}
+        return ORJSONResponse(make_respose(result, meta=meta), headers={"ETag": etag})
+    except BadRequestError as e:
+        raise CustomHttpException(400, error=e)
+    except UnAuthorizationError as e:
+        raise CustomHttpException(401, error=e)
+    except MySQLManagerError as e:
+        raise CustomHttpException(
+            500, error=e, message="Try again in a few minutes.")
+    except Exception as e:
+        raise CustomHttpException(
+            500, error=e, message="Unknown error. Contact service manager.")
+
+
+@item_router.get("/barcode/{barcode}", response_class=ORJSONResponse)
+async def get_barcode_item(barcode: str, request: Request, user: str = Header(None), authorization: str = Header(None),
+                           if_none_match: str = Header(None),
+                           MySQLManager: AsyncMySQLManager = Depends(get_mysql_manager)):
+    """GET /item/barcode/{barcode}
+    ## GET barcode item api
+    It receives user(phone_number) and Authorization as Header values.
+    Item information is queried through the scanned barcode. (one index lookup, cached per item version)
+    If several items share the barcode, the first registered item is returned.
+    The response has an ETag header like GET /item/{seq}. (304 Not Modified if If-None-Match matches)
+
+    ## Headers:
+        user: user_phone_number
+        authorization: login jwt token
+        if-none-match (optional): ETag of previous response
+
+    ## Response:
+        {
+            "meta": {
+                "code": 200,
+                "message": "ok"
+                },
+            "data": item info (Same as GET /item/{seq})
+        }
+    """
+    try:
+        # check user login
+        get_api_validator().check_current_user(user, authorization)
+
+        # check user valid barcode input
+        get_api_validator().check_barcode_input([barcode])
+
+        # Not modified since previous response (skip item query)
+        version = await MySQLManager.get_item_version(user)
+        etag = _item_etag(version, user, request)
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+
+        # Get user barcode item in DB
+        result = await MySQLManager.get_item_by_barcode(user, barcode, version)
+        return ORJSONResponse(make_respose(result), headers={"ETag": etag})
+    except BadRequestError as e:
+        raise CustomHttpException(400, error=e)
+    except UnAuthorizationError as e:
+        raise CustomHttpException(401, error=e)
+    except NotFoundError as e:
+        raise CustomHttpException(404, error=e)
+    except MySQLManagerError as e:
+        raise CustomHttpException(
+            500, error=e, message="Try again in a few minutes.")
+    except Exception as e:
+        raise CustomHttpException(
+            500, error=e, message="Unknown error. Contact service manager.")
+
+
+@item_router.post("/barcode", response_class=ORJSONResponse)
+async def get_barcode_items(item: BarcodeLookup, user: str = Header(None), authorization: str = Header(None),
+                            MySQLManager: AsyncMySQLManager = Depends(get_mysql_manager)):
+    """POST /item/barcode
+    ## Batch barcode item api
+    It receives user(phone_number) and Authorization as Header values.
+    And it receives scanned barcodes as body values. Every barcode is resolved with one query.
+    Barcodes without item are returned as null.
+
+    ## Headers:
+        user: user_phone_number
+        authorization: login jwt token
+
+    ## Body:
+        **required params**
+        barcodes (list): scanned barcodes **1 ~ 100 barcodes**
+
+    ## Response:
+        {
+            "meta": {
+                "code": 200,
+                "message": "ok"
+                },
+            "data": {
+                barcode: item info (Same as GET /item/{seq}) or null,
+                ...
+            }
+        }
+    """
+    try:
+        # check user login
+        get_api_validator().check_current_user(user, authorization)
+
+        # check user valid barcodes input
+        get_api_validator().check_barcode_input(item.barcodes)
+
+        # Get user barcode items in DB
+        version = await MySQLManager.get_item_version(user)
+        result = await MySQLManager.get_items_by_barcodes(user, item.barcodes, version)
+        return ORJSONResponse(make_respose(result))
+    except BadRequestError as e:
+        raise CustomHttpException(400, error=e)
+    except UnAuthorizationError as e:
+        raise CustomHttpException(401, error=e)
+    except MySQLManagerError as e:
+        raise CustomHttpException(
+            500, error=e, message="Try again in a few minutes.")
+    except Exception as e:
+        raise CustomHttpException(
+            500, error=e, message="Unknown error. Contact service manager.")
+
+
+@item_router.get("/expiring", response_class=ORJSONResponse)
+async def get_expiring_item(within_days: int = 3, page_number: int = 0, page_size: int = 10,
+                            user: str = Header(None), authorization: str = Header(None),
+                            MySQLManager: AsyncMySQLManager = Depends(get_mysql_manager)):
+    """GET /item/expiring?within_days={within_days}&page_number={page_number}&page_size={page_size}
+    ## Expiring item api
+    It receives user(phone_number) and Authorization as Header values.
+    Items whose expiration_date is from today to within_days later are returned
+    ordered by expiration_date, then seq. (within_days=0: expiring today)
+    meta.total is the matched item count and meta.has_more tells whether the next page exists.
+
+    ## Headers:
+        user: user_phone_number
+        authorization: login jwt token
+
+    ## Response:
+        {
+            "meta": {
+                "code": 200,
+                "message": "ok",
+                "total": matched_item_count,
+                "has_more": true or false(last page)
+                },
+            "data": [item info (Same as GET /item), ...]
+        }
+    """
+    try:
+        # check user login
+        get_api_validator().check_current_user(user, authorization)
+
+        # check user valid input(within_days, page_size)
+        get_api_validator().check_expiring_input(within_days, page_size)
+        page_number = max(page_number, 0)
+
+        # Get user expiring items in DB
+        today = date.today()
+        result, total = await MySQLManager.get_expiring_item(
+            user, today.isoformat(), (today + timedelta(days=within_days)).isoformat(), page_number, page_size)
+        meta = {"total": total, "has_more": (page_number + 1) * page_size < total}
+        return ORJSONResponse(make_respose(result, meta=meta))
+    except BadRequestError as e:
+        raise CustomHttpException(400, error=e)
+    except UnAuthorizationError as e:
+        raise CustomHttpException(401, error=e)
+    except MySQLManagerError as e:
+        raise CustomHttpException(
+            500, error=e, message="Try again in a few minutes.")
+    except Exception as e:
+        raise CustomHttpException(
+            500, error=e, message="Unknown error. Contact service manager.")
+
+
+@item_router.get("/stats", response_class=ORJSONResponse)
+async def get_item_stats(request: Request, user: str = Header(None), authorization: str = Header(None),
+                         if_none_match: str = Header(None),
+                         MySQLManager: AsyncMySQLManager = Depends(get_mysql_manager)):
+    """GET /item/stats
+    ## Item statistics api
+    It receives user(phone_number) and Authorization as Header values.
+    Item count, average selling_price/cost_price and margin per category are returned.
+    They are read from per-category aggregates changed by every item write. (no item scan)
+    The response has an ETag header like GET /item/{seq}. (304 Not Modified if If-None-Match matches)
+
+    ## Headers:
+        user: user_phone_number
+        authorization: login jwt token
+        if-none-match (optional): ETag of previous response
+
+    ## Response:
+        {
+            "meta": {
+                "code": 200,
+                "message": "ok"
+                },
+            "data": {
+                "categories": [{
+                    "category": category,
+                    "item_count": item count,
+                    "avg_selling_price": average selling_price,
+                    "avg_cost_price": average cost_price,
+                    "margin": average selling_price - cost_price,
+                    "margin_rate": margin / selling_price (%)
+                }, ...],
+                "total": stat of every item (Same as category stat without category)
+            }
+        }
+    """
+    try:
+        # check user login
+        get_api_validator().check_current_user(user, authorization)
+
+        # Not modified since previous response (skip stat query)
+        etag = _item_etag(await MySQLManager.get_item_version(user), user, request)
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+
+        # Get user item stats in DB
+        result = await MySQLManager.get_item_stats(user)
+        return ORJSONResponse(make_respose(result), headers={"ETag": etag})
+    except UnAuthorizationError as e:
+        raise CustomHttpException(401, error=e)
+    except MySQLManagerError as e:
+        raise CustomHttpException(
+            500, error=e, message="Try again in a few minutes.")
+    except Exception as e:
+        raise CustomHttpException(
+            500, error=e, message="Unknown error. Contact service manager.")
+
+
 @item_router.delete("/{seq}")
-async def delete_item(seq: int, user: str = Header(None), authorization: str = Header(None)):
+async def delete_item(seq: int, user: str = Header(None), authorization: str = Header(None),
+                      MySQLManager: AsyncMySQLManager = Depends(get_mysql_manager)):
     """Delete /item/{seq}
     ## Delete item api
     It receives user(phone_number) and Authorization as Header values.
@@ -111,15 +683,17 @@ async def delete_item(seq: int, user: str = Header(None), authorization: str = H
     """
     try:
         # check user login
-        ApiValidator.check_current_user(user, authorization)
+        get_api_validator().check_current_user(user, authorization)
 
         # Delete user item in DB
-        result = MySQLManager.delete_item_info(user, seq)
+        result = await MySQLManager.delete_item_info(user, seq)
         return make_respose(result)
     except BadRequestError as e:
         raise CustomHttpException(400, error=e)
     except UnAuthorizationError as e:
         raise CustomHttpException(401, error=e)
+    except NotFoundError as e:
+        raise CustomHttpException(404, error=e)
     except MySQLManagerError as e:
         raise CustomHttpException(
             500, error=e, message="Try again in a few minutes.")
@@ -128,16 +702,22 @@ async def delete_item(seq: int, user: str = Header(None), authorization: str = H
             500, error=e, message="Unknown error. Contact service manager.")
 
 
-@item_router.get("/{seq}")
-async def get_item(seq: int, user: str = Header(None), authorization: str = Header(None)):
+@item_router.get("/{seq}", response_class=ORJSONResponse)
+async def get_item(seq: int, user: str = Header(None), authorization: str = Header(None),
+                   if_none_match: str = Header(None),
+                   MySQLManager: AsyncMySQLManager = Depends(get_mysql_manager)):
     """GET /item/{seq}
     ## GET item api
     It receives user(phone_number) and Authorization as Header values.
     Item information is queried through the seq number assigned to the item.
+    The response has an ETag header made from the item. It changes whenever the item is changed.
+    If If-None-Match matches the ETag, 304 Not Modified is returned without body.
+    (item cache hit is answered without DB query)
     
     ## Headers:
         user: user_phone_number
         authorization: login jwt token
+        if-none-match (optional): ETag of previous response
     
     ## Response:
         {
@@ -146,6 +726,7 @@ async def get_item(seq: int, user: str = Header(None), authorization: str = Head
                 "message": "ok"
                 },
             "data": {
+                "seq": seq,
                 "phone_number": phone_number,
                 "category": category,
                 "selling_price": selling_price,
@@ -160,15 +741,22 @@ async def get_item(seq: int, user: str = Header(None), authorization: str = Head
     """
     try:
         # check user login
-        ApiValidator.check_current_user(user, authorization)
+        get_api_validator().check_current_user(user, authorization)
 
-        # Get user item in DB
-        result = MySQLManager.get_item_info(user, seq)
-        return make_respose(result)
+        # Get user item (item cache first)
+        result = await MySQLManager.get_item_info(user, seq)
+
+        # Not modified since previous response
+        etag = make_content_etag(orjson.dumps(result))
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        return ORJSONResponse(make_respose(result), headers={"ETag": etag})
     except BadRequestError as e:
         raise CustomHttpException(400, error=e)
     except UnAuthorizationError as e:
         raise CustomHttpException(401, error=e)
+    except NotFoundError as e:
+        raise CustomHttpException(404, error=e)
     except MySQLManagerError as e:
         raise CustomHttpException(
             500, error=e, message="Try again in a few minutes.")
@@ -178,7 +766,8 @@ async def get_item(seq: int, user: str = Header(None), authorization: str = Head
 
 
 @item_router.post("/{seq}")
-async def update_item(seq: int, item: UpdateItem, user: str = Header(None), authorization: str = Header(None)):
+async def update_item(seq: int, item: UpdateItem, user: str = Header(None), authorization: str = Header(None),
+                      MySQLManager: AsyncMySQLManager = Depends(get_mysql_manager)):
     """POST /item/{seq}
     ## Update item api
     It receives user(phone_number) and Authorization as Header values.
@@ -214,18 +803,20 @@ async def update_item(seq: int, item: UpdateItem, user: str = Header(None), auth
     """
     try:
         # check user login
-        ApiValidator.check_current_user(user, authorization)
+        get_api_validator().check_current_user(user, authorization)
         
         # check user valid input(expriation_date, size)
-        ApiValidator.check_user_valid_input(item.expiration_date, item.size)
+        get_api_validator().check_user_valid_input(item.expiration_date, item.size)
         
         # Update user item in DB
-        result = MySQLManager.update_item_info(user, seq, item.dict())
+        result = await MySQLManager.update_item_info(user, seq, item.model_dump())
         return make_respose({"phone_number": user, "change_value": result})
     except BadRequestError as e:
         raise CustomHttpException(400, error=e)
     except UnAuthorizationError as e:
         raise CustomHttpException(401, error=e)
+    except NotFoundError as e:
+        raise CustomHttpException(404, error=e)
     except MySQLManagerError as e:
         raise CustomHttpException(
             500, error=e, message="Try again in a few minutes.")
@@ -234,25 +825,43 @@ async def update_item(seq: int, item: UpdateItem, user: str = Header(None), auth
             500, error=e, message="Unknown error. Contact service manager.")
         
 
-@item_router.get("/")
-async def get_all_item(user: str = Header(None), authorization: str = Header(None), page_number: int = 0, keyword: str = None):
+@item_router.get("/", response_class=ORJSONResponse)
+async def get_all_item(request: Request, user: str = Header(None), authorization: str = Header(None),
+                       if_none_match: str = Header(None), page_number: int = 0, keyword: str = None,
+                       cursor: str = None, page_size: int = 10, fuzzy: bool = False,
+                       MySQLManager: AsyncMySQLManager = Depends(get_mysql_manager)):
     """GET /item?page_number={page_number}&keyword={keyword}
+       GET /item?cursor={next_cursor}&page_size={page_size}&keyword={keyword}
+       GET /item?keyword={keyword}&fuzzy=1&page_number={page_number}
     ## GET all item api & Get search item api
     It receives user(phone_number) and Authorization as Header values.
-    There is a page_number parameter that can be viewed 10 per page.
+    There is a cursor parameter(next_cursor of previous page) that can be viewed page_size per page.
+    Every page costs the same with cursor. The first page is requested without cursor.
+    There is a page_number parameter that can be viewed page_size per page. (for older clients)
+    There is a page_size parameter (default 10, max 100).
     There is a keyword parameter to search for a specific keyword.
+    With fuzzy=1, items whose name (or a word of the name) is within a few jamo typos of keyword are
+    returned ordered by typo count, then seq. (ex. "아매리카노" finds "아메리카노", page_number only)
+    meta.total is the item count of the user (or matched by keyword) and meta.has_more tells whether
+    the next page exists, so the last page does not need to be requested again.
+    The response has an ETag header like GET /item/{seq}. (304 Not Modified if If-None-Match matches)
     
     ## Headers:
         user: user_phone_number
         authorization: login jwt token
+        if-none-match (optional): ETag of previous response
 
     ## Response:
         {
             "meta": {
                 "code": 200,
-                "message": "ok"
+                "message": "ok",
+                "next_cursor": next_cursor or null(last page),
+                "total": total_item_count,
+                "has_more": true or false(last page)
                 },
             "data": [{
+                "seq": seq,
                 "phone_number": phone_number,
                 "category": category,
                 "selling_price": selling_price,
@@ -268,14 +877,40 @@ async def get_all_item(user: str = Header(None), authorization: str = Header(Non
     """
     try:
         # check user login
-        ApiValidator.check_current_user(user, authorization)
+        get_api_validator().check_current_user(user, authorization)
+
+        # check user valid page input(page_size, cursor)
+        get_api_validator().check_page_input(page_size, cursor)
+        if fuzzy:
+            get_api_validator().check_fuzzy_input(keyword, cursor)
+        last_seq = decode_cursor(cursor) if cursor else None
+
+        # Not modified since previous response (skip item query)
+        counter = await MySQLManager.get_item_counter(user)
+        etag = _item_etag(counter["version"], user, request)
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
         
-        # If there is no keyword, search all items
+        if fuzzy:
+            # ordered by edit distance, no cursor
+            result, total = await MySQLManager.get_fuzzy_search_item(user, keyword, page_number, page_size)
+            meta = {"next_cursor": None, "total": total, "has_more": (page_number + 1) * page_size < total}
+            return ORJSONResponse(make_respose(result, meta=meta), headers={"ETag": etag})
+
+        # If there is no keyword, search all items (total: maintained item count, no COUNT query)
         if not keyword:
-            result = MySQLManager.get_all_item(user, page_number)
+            result = await MySQLManager.get_all_item(user, page_number, last_seq, page_size, lookahead=True)
+            total = counter["item_count"]
         else:
-            result = MySQLManager.get_search_item(user, keyword, page_number)
-        return make_respose(result)
+            result = await MySQLManager.get_search_item(user, keyword, page_number, last_seq, page_size,
+                                                        lookahead=True)
+            total = await MySQLManager.count_search_item(user, keyword, counter["version"])
+        has_more = len(result) > page_size
+        result = result[:page_size]
+        next_cursor = encode_cursor(result[-1]["seq"]) if has_more else None
+        meta = {"next_cursor": next_cursor, "total": total, "has_more": has_more}
+        # rows are plain dict, skip jsonable_encoder
+        return ORJSONResponse(make_respose(result, meta=meta), headers={"ETag": etag})
     except BadRequestError as e:
         raise CustomHttpException(400, error=e)
     except UnAuthorizationError as e:
@@ -285,5 +920,4 @@ async def get_all_item(user: str = Header(None), authorization: str = Header(Non
             500, error=e, message="Try again in a few minutes.")
     except Exception as e:
         raise CustomHttpException(
-            500, error=e, message="Unknown error. Contact service manager.")
-        
+            500, error=e, message="Unknown error. Contact service manager.")
\ No newline at end of file
@@ -1,25 +1,98 @@
 import os
-import sys
 import json
+from collections.abc import MutableMapping
 
 lib_path = os.path.abspath(os.path.join(__file__, os.path.pardir))
 src_path = os.path.abspath(os.path.join(lib_path, os.path.pardir))
 backend_path = os.path.abspath(os.path.join(src_path, os.path.pardir))
 conf_path = os.path.abspath(os.path.join(backend_path, 'conf'))
-conf_file = os.path.abspath(os.path.join(conf_path, 'conf.json'))
+# CONF_FILE environment variable overrides conf/conf.json
+conf_file = os.environ.get("CONF_FILE") or os.path.abspath(os.path.join(conf_path, 'conf.json'))
 
-if lib_path not in sys.path:
-    sys.path.append(lib_path)
-if conf_path not in sys.path:
-    sys.path.append(conf_path)
-    
 # 리얼 서버 : "REAL", 스테이징 서버 : "STAGE", 개발 서버 : "DEV"
 ENV = "DEV"
 
-with open(conf_file, "rt") as f:
-    conf = json.load(f)
+_conf = None
+# required keys of conf, read on first access (from lib import TOKEN_KEY)
+_KEYS = {"TOKEN_KEY": "jwt_key", "ENCRYTION_KEY": "encryption_key"}
 
-MYSQL_CONNECTION = conf["mysql_connection"][ENV]
-ENCRYTION_KEY = conf["encryption_key"][ENV]
-TOKEN_KEY = conf["jwt_key"][ENV]
 
+def get_conf() -> dict:
+    """Get conf. conf.json is read once on first use (not on import) and shared by every module."""
+    global _conf
+    if _conf is None:
+        with open(conf_file, "rt") as f:
+            _conf = json.load(f)
+    return _conf
+
+
+def get_key(name: str) -> str:
+    """Get required key of ENV from conf. (jwt_key, encryption_key)"""
+    return get_conf()[name][ENV]
+
+
+def __getattr__(name: str):
+    if name in _KEYS:
+        return get_key(_KEYS[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class ConfSection(MutableMapping):
+    """ENV section of conf. conf.json is read on first access, so importing a module needs no conf."""
+    def __init__(self, name: str, required: bool = False) -> None:
+        self.name = name
+        self.required = required
+        self._data = None
+
+    @property
+    def data(self) -> dict:
+        if self._data is None:
+            conf = get_conf()
+            if self.required:
+                self._data = conf[self.name][ENV]
+            else:
+                self._data = conf.setdefault(self.name, {}).setdefault(ENV, {})
+        return self._data
+
+    def __getitem__(self, key):
+        return self.data[key]
+
+    def __setitem__(self, key, value) -> None:
+        self.data[key] = value
+
+    def __delitem__(self, key) -> None:
+        del self.data[key]
+
+    def __iter__(self):
+        return iter(self.data)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def copy(self) -> dict:
+        return dict(self.data)
+
+    def __repr__(self) -> str:
+        return f"ConfSection({self.name!r})"
+
+
+MYSQL_CONNECTION = ConfSection("mysql_connection", required=True)
+# optional: {"pool_size", "max_overflow": async engine (default server.db_connection_budget / workers, or 10, 10),
+#            "pool_recycle": seconds (default 500), "pool_timeout": seconds (default 30), "pool_pre_ping": default true}
+DB_POOL = ConfSection("db_pool")
+# optional: {"cost": scrypt cost factor(log2 N), "max_workers": hashing process count per worker (default: cpu count / workers)}
+PASSWORD_HASH = ConfSection("password_hash")
+# optional: {"enabled": in-process item search index, "max_bytes": memory cap, "ttl": reload seconds}
+SEARCH_INDEX = ConfSection("search_index")
+# optional: {"enabled": in-process item fuzzy search index (default true), "max_bytes": memory cap, "ttl": reload seconds}
+FUZZY_INDEX = ConfSection("fuzzy_index")
+# optional: {"enabled": item detail cache (default true), "backend": "memory" or "redis", "maxsize": memory entries,
+#            "ttl": seconds, "redis": {"host", "port", "db", "password"}}
+ITEM_CACHE = ConfSection("item_cache")
+# optional: {"enabled": item expiry event scheduler (default false, enable in one process only),
+#            "webhook_url": expiry event webhook, "horizon_days": days scheduled in memory, "reload_interval": seconds}
+EXPIRY_SCHEDULER = ConfSection("expiry_scheduler")
+# optional: {"workers": worker process count (default 1, env WEB_CONCURRENCY), "bind": "0.0.0.0:8000",
+#            "db_connection_budget": MySQL connections of every worker, "graceful_timeout": seconds, "timeout": seconds,
+#            "internal_token": X-Internal-Token of /internal api (default: /internal api disabled)}
+SERVER = ConfSection("server")
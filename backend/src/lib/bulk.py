@@ -0,0 +1,133 @@
+"""Bulk import/export library
+
+Functions:
+    - parse_bulk_rows: 요청 body를 아이템 등록 params 단위로 읽는 async generator 입니다.
+                       Content-Type에 따라 JSON array, CSV(첫 줄 header), NDJSON을 지원합니다.
+                       CSV, NDJSON은 body 전체를 메모리에 올리지 않고 받은 chunk 단위로 읽습니다.
+                       행 단위 오류는 전체 업로드를 중단하지 않고 (None, error) 로 반환합니다.
+    - export_rows: DB에서 chunk 단위로 읽은 아이템을 CSV, NDJSON 문자열로 변환하는 async generator 입니다.
+                   CSV는 parse_bulk_rows로 다시 등록할 수 있는 형식(첫 줄 header)입니다.
+
+Raises:
+    BulkParseError: body 전체를 읽을 수 없는 경우 (ex. JSON array가 아닌 경우)
+"""
+import io
+import csv
+import json
+import codecs
+from typing import AsyncIterator, Tuple
+
+CSV_TYPES = ("text/csv",)
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+EXPORT_MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+
+
+async def _iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[list]:
+    """Decode byte chunks and yield complete lines of each chunk."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        lines = buffer.split("\n")
+        buffer = lines.pop()
+        if lines:
+            yield lines
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield [buffer]
+
+
+async def _iter_csv_rows(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[dict, str]]:
+    header = None
+    pending = None
+    async for lines in _iter_lines(chunks):
+        records = []
+        for line in lines:
+            pending = line if pending is None else pending + "\n" + line
+            # 따옴표 안의 줄바꿈은 다음 줄과 합쳐 한 행으로 읽습니다.
+            if pending.count('"') % 2 == 0:
+                records.append(pending)
+                pending = None
+        for values in csv.reader(records):
+            if not values:
+                continue
+            if header is None:
+                header = [name.strip() for name in values]
+            elif len(values) != len(header):
+                yield None, f"Expected {len(header)} columns, got {len(values)}."
+            else:
+                yield dict(zip(header, values)), None
+    if pending is not None:
+        yield None, "Unterminated quoted field."
+
+
+async def _iter_ndjson_rows(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[dict, str]]:
+    async for lines in _iter_lines(chunks):
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                yield None, "Invalid JSON line."
+                continue
+            yield (row, None) if isinstance(row, dict) else (None, "Row must be a JSON object.")
+
+
+async def _iter_json_rows(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[dict, str]]:
+    body = b"".join([chunk async for chunk in chunks])
+    try:
+        rows = json.loads(body)
+    except ValueError:
+        raise BulkParseError("Invalid JSON body.")
+    if not isinstance(rows, list):
+        raise BulkParseError("The body must be a JSON array.")
+    for row in rows:
+        yield (row, None) if isinstance(row, dict) else (None, "Row must be a JSON object.")
+
+
+def parse_bulk_rows(content_type: str, chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[dict, str]]:
+    """Parse bulk request body to item params.
+    Args:
+        content_type: request Content-Type (text/csv, application/x-ndjson, application/json)
+        chunks: request body stream
+
+    Return:
+        async iterator of (params, None) or (None, row error message)
+
+    Raise:
+        BulkParseError: The body must be a JSON array.
+    """
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type in CSV_TYPES:
+        return _iter_csv_rows(chunks)
+    if media_type in NDJSON_TYPES:
+        return _iter_ndjson_rows(chunks)
+    return _iter_json_rows(chunks)
+
+
+async def export_rows(format: str, chunks: AsyncIterator[list]) -> AsyncIterator[str]:
+    """Convert item chunks to CSV or NDJSON text.
+    Args:
+        format: csv or ndjson
+        chunks: async iterator of [item dict, ...]
+
+    Return:
+        async iterator of text (one per chunk)
+    """
+    header = False
+    async for rows in chunks:
+        if format == "ndjson":
+            yield "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+            continue
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        if not header and rows:
+            writer.writerow(rows[0].keys())
+            header = True
+        writer.writerows(row.values() for row in rows)
+        yield buffer.getvalue()
+
+
+class BulkParseError(Exception):
+    """Bulk request body parse Error"""
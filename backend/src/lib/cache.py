@@ -0,0 +1,312 @@
+"""Cache library
+
+TTLCache:
+    - 프로세스 메모리에 값을 저장하는 크기 제한 LRU + TTL 캐시입니다.
+    - maxsize를 넘으면 가장 오래 사용하지 않은 값부터 제거합니다.
+    - 값마다 만료 시각(epoch seconds)을 가지며 만료된 값은 조회 시 제거합니다.
+    Functions:
+        - get: 캐시 값을 조회합니다. (hit/miss 카운트)
+        - set: 캐시 값을 저장합니다.
+        - delete: 캐시 값을 삭제합니다.
+        - clear: 모든 캐시 값을 삭제합니다.
+        - stats: hit/miss 카운트와 hit rate를 조회합니다.
+
+MemoryBackend, RedisBackend:
+    - ItemCache가 사용하는 비동기 캐시 backend 입니다. 값은 bytes로 저장합니다.
+    - MemoryBackend: 프로세스 메모리(TTLCache)에 저장합니다. (기본값, worker 간 공유되지 않음)
+    - RedisBackend: Redis protocol(RESP)로 외부 캐시 서버에 저장합니다. (worker 간 공유)
+    Functions:
+        - get_many: 여러 key의 값을 한 번에 조회합니다. (MGET)
+        - set: 값을 ttl(초)과 함께 저장합니다.
+        - delete: 값을 삭제합니다.
+        - close: 연결을 닫습니다.
+
+ItemCache:
+    - (phone_number, seq) 단위로 아이템 상세 정보를 저장하는 read-through 캐시입니다. (TTL, MemoryBackend는 LRU)
+    - 캐시 hit은 MySQL을 조회하지 않고 캐시 backend 왕복 1번(MGET)으로 응답합니다.
+    - 아이템 등록/수정/삭제는 commit 후 그 아이템의 marker를, 일괄 등록/수정/삭제는 유저의 marker를 새 값으로 바꿉니다.
+      값은 조회 전에 읽은 marker와 함께 저장하고 marker가 다르면 사용하지 않으므로,
+      쓰기와 동시에 DB에서 읽어 저장한 이전 값도 반환하지 않습니다.
+    - marker도 캐시 backend에 저장하므로 RedisBackend는 모든 worker의 캐시가 함께 무효화되고,
+      worker별 MemoryBackend는 다른 worker의 변경이 ttl이 지나야 반영됩니다.
+    - 캐시 서버 오류는 API 오류로 전달하지 않고 DB에서 조회합니다. (errors 카운트)
+    Functions:
+        - get_or_load: 캐시 값을 조회하고 없으면 loader로 DB에서 조회해 저장합니다.
+        - invalidate: 유저 아이템(seq)의 캐시 값을 무효화합니다.
+        - invalidate_user: 유저의 모든 아이템 캐시 값을 무효화합니다. (일괄 쓰기)
+        - stats: hit/miss/error 카운트와 hit rate를 조회합니다.
+
+get_item_cache:
+    - conf의 item_cache 설정으로 프로세스당 하나의 ItemCache를 만듭니다. (비활성화 시 None)
+
+Raises:
+    RedisError: Redis 서버 오류 응답, 연결 오류
+"""
+import os
+import time
+import asyncio
+import orjson
+from collections import OrderedDict
+from typing import Awaitable, Callable
+from . import ITEM_CACHE
+
+_item_cache = None
+
+
+class TTLCache:
+    def __init__(self, maxsize: int, ttl: float = None) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def get(self, key, default=None):
+        """Get cache value. Return default if key does not exist or expired."""
+        entry = self._data.get(key)
+        if entry is not None:
+            value, expire_at = entry
+            if expire_at is None or expire_at > time.time():
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._data[key]
+        self.misses += 1
+        return default
+
+    def set(self, key, value, ttl: float = None, expire_at: float = None) -> None:
+        """Set cache value.
+        Args:
+            ttl: seconds to keep value (default: cache ttl)
+            expire_at: epoch seconds to expire value (override ttl)
+        """
+        if self.maxsize <= 0:
+            return
+        if expire_at is None:
+            ttl = ttl if ttl is not None else self.ttl
+            expire_at = time.time() + ttl if ttl is not None else None
+        self._data[key] = (value, expire_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0
+        }
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class MemoryBackend:
+    def __init__(self, maxsize: int = 10000) -> None:
+        self.cache = TTLCache(maxsize)
+
+    async def get_many(self, keys: list) -> list:
+        return [self.cache.get(key) for key in keys]
+
+    async def set(self, key: str, value: bytes, ttl: float = None) -> None:
+        self.cache.set(key, value, ttl=ttl)
+
+    async def delete(self, key: str) -> None:
+        self.cache.delete(key)
+
+    async def close(self) -> None:
+        self.cache.clear()
+
+
+class RedisBackend:
+    def __init__(self, host: str = "127.0.0.1", port: int = 6379, db: int = 0,
+                 password: str = None, timeout: float = 1.0) -> None:
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.timeout = timeout
+        self._reader = None
+        self._writer = None
+        self._lock = None
+
+    async def get_many(self, keys: list) -> list:
+        return await self.execute("MGET", *keys)
+
+    async def set(self, key: str, value: bytes, ttl: float = None) -> None:
+        args = ["SET", key, value]
+        if ttl:
+            args += ["PX", int(ttl * 1000)]
+        await self.execute(*args)
+
+    async def delete(self, key: str) -> None:
+        await self.execute("DEL", key)
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+    async def execute(self, *args):
+        """Send one command and read the reply. Reconnect on next command after connection error."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            try:
+                return await asyncio.wait_for(self._execute(args), self.timeout)
+            except RedisError:
+                raise
+            except Exception as e:
+                await self.close()
+                raise RedisError(f"Redis connection error: {e!r}")
+
+    async def _execute(self, args):
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+            if self.password:
+                self._send(("AUTH", self.password))
+                await self._read_reply()
+            if self.db:
+                self._send(("SELECT", self.db))
+                await self._read_reply()
+        self._send(args)
+        return await self._read_reply()
+
+    def _send(self, args) -> None:
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            if not isinstance(arg, bytes):
+                arg = str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        self._writer.write(b"".join(parts))
+
+    async def _read_reply(self):
+        line = await self._reader.readline()
+        if not line:
+            raise ConnectionError("Connection closed by server.")
+        kind, body = line[:1], line[1:-2]
+        if kind == b"+":
+            return body.decode()
+        if kind == b"-":
+            raise RedisError(body.decode())
+        if kind == b":":
+            return int(body)
+        if kind == b"$":
+            length = int(body)
+            if length < 0:
+                return None
+            return (await self._reader.readexactly(length + 2))[:-2]
+        if kind == b"*":
+            length = int(body)
+            if length < 0:
+                return None
+            return [await self._read_reply() for _ in range(length)]
+        raise RedisError(f"Unknown reply: {line!r}")
+
+
+class ItemCache:
+    def __init__(self, backend, ttl: float = 60) -> None:
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    async def get_or_load(self, phone_number: str, seq: int, loader: Callable[[], Awaitable[dict]]) -> dict:
+        """Get item info from cache. If not cached, load from DB and cache it.
+        Args:
+            loader: async function to get item info from DB (errors are not cached)
+        """
+        keys = [f"item_user:{phone_number}", f"item_seq:{phone_number}:{seq}", f"item:{phone_number}:{seq}"]
+        try:
+            user_marker, seq_marker, entry = await self.backend.get_many(keys)
+        except Exception:
+            self.errors += 1
+            return await loader()
+        # markers read before loader: a write committed during the load changes them
+        markers = [_decode(user_marker), _decode(seq_marker)]
+        if entry is not None:
+            cached = orjson.loads(entry)
+            if cached[:2] == markers:
+                self.hits += 1
+                return cached[2]
+        self.misses += 1
+        value = await loader()
+        try:
+            await self.backend.set(keys[2], orjson.dumps(markers + [value]), self.ttl)
+        except Exception:
+            self.errors += 1
+        return value
+
+    async def invalidate(self, phone_number: str, seqs: list) -> None:
+        """Invalidate cached items of user. (after commit of item insert/update/delete)"""
+        for seq in seqs:
+            await self._set_marker(f"item_seq:{phone_number}:{seq}")
+
+    async def invalidate_user(self, phone_number: str) -> None:
+        """Invalidate every cached item of user. (after commit of bulk write)"""
+        await self._set_marker(f"item_user:{phone_number}")
+
+    async def _set_marker(self, key: str) -> None:
+        # new random marker (not a counter), kept longer than entries stored before it
+        try:
+            await self.backend.set(key, os.urandom(8).hex().encode(), self.ttl * 2 if self.ttl else None)
+        except Exception:
+            self.errors += 1
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            # entries in this worker (memory backend, bounded by maxsize with LRU)
+            "size": len(self.backend.cache) if isinstance(self.backend, MemoryBackend) else None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_rate": self.hits / total if total else 0.0
+        }
+
+
+def _decode(marker):
+    return marker.decode() if isinstance(marker, bytes) else marker
+
+
+def get_item_cache():
+    """Get process-wide ItemCache. Return None if item cache is disabled."""
+    global _item_cache
+    if _item_cache is None and ITEM_CACHE.get("enabled", True):
+        if ITEM_CACHE.get("backend", "memory") == "redis":
+            backend = RedisBackend(**ITEM_CACHE.get("redis", {}))
+        else:
+            backend = MemoryBackend(maxsize=ITEM_CACHE.get("maxsize", 10000))
+        _item_cache = ItemCache(backend, ttl=ITEM_CACHE.get("ttl", 60))
+    return _item_cache
+
+
+async def close_item_cache() -> None:
+    """Close process-wide ItemCache backend. (app shutdown)"""
+    global _item_cache
+    if _item_cache is not None:
+        await _item_cache.backend.close()
+    _item_cache = None
+
+
+def _reset_item_cache_after_fork() -> None:
+    # redis connection and memory entries of the parent are not shared
+    global _item_cache
+    _item_cache = None
+
+
+os.register_at_fork(after_in_child=_reset_item_cache_after_fork)
+
+
+class RedisError(Exception):
+    """Redis server or connection Error"""
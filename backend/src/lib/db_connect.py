@@ -7,41 +7,662 @@ MySQLManager:
         - delete_user_auth: 유저의 계정 정보를 삭제합니다.
         - get_user_auth: 유저의 계정 정보를 조회합니다.
         - get_user_all_auth_number: DB에 저장된 모든 계정의 전화번호를 조회합니다.
+        - update_user_password: 유저의 비밀번호를 변경합니다.
         - insert_item_info: 유저가 등록한 아이템 정보를 저장합니다.
         - delete_item_info: 유저가 등록한 아이템 정보를 삭제합니다.
         - get_item_info: 유저가 등록한 특정 아이템 정보를 조회합니다.
         - get_all_item: 유저가 등록한 모든 아이템 정보를 조회합니다.
         - get_search_item: 유저가 검색한 모든 아이템 정보를 조회합니다.
+        - get_item_version: 유저 아이템 버전을 조회합니다. (아이템 등록/수정/삭제 시 같은 transaction에서 1 증가)
+    - 아이템 등록/수정/삭제 시 같은 transaction에서 user_item_stat(카테고리 통계)에 변경분을 더합니다.
+      (수정/삭제는 이전 값을 따로 읽지 않고 INSERT ... SELECT upsert 한 번으로 더합니다. 카테고리 변경은 2번)
+
+AsyncMySQLManager:
+    - API 핸들러에서 사용하는 비동기 MySQL DB Manager 입니다.
+    - MySQLManager와 같은 함수를 제공하며 모든 함수는 await 해서 사용합니다.
+    - SQLAlchemy async engine(aiomysql) 위에서 동작하므로 쿼리 대기 중에 이벤트 루프를 막지 않습니다.
+    - 요청마다 get_session으로 연 session을 받아 사용합니다.
+    - 테스트에서는 sqlite+aiosqlite session을 넘겨 MySQL 없이 사용할 수 있습니다.
+    - search_index를 넘기면 get_search_item은 SQL LIKE 대신 프로세스 메모리의 trie로 검색하고,
+      아이템 등록/수정/삭제 시 trie를 함께 수정합니다.
+    - fuzzy_index를 넘기면 get_fuzzy_search_item으로 이름 오타 검색을 할 수 있고, search_index와 같이 함께 수정합니다.
+    - 아이템 등록/수정/삭제 시 같은 transaction에서 user_item_ngram(부분 검색 인덱스)을 함께 수정합니다.
+    - 아이템 등록/수정/삭제(일괄 포함) 시 같은 transaction에서 user_item_stat(카테고리 통계)에 변경분을 더합니다.
+    - item_cache를 넘기면 get_item_info는 (phone_number, seq) 단위로 캐시에서 먼저 조회합니다. (read-through, hit은 SQL 없음)
+      아이템 등록/수정/삭제는 commit 후 그 아이템을, 일괄 등록/수정/삭제는 유저의 모든 아이템을 캐시에서 무효화합니다.
+    - expiry_scheduler를 넘기면 아이템 등록/유통기한 수정 시 만료 이벤트를 바로 예약합니다.
+      (삭제된 아이템은 이벤트를 보내기 전에 확인해서 제외)
+    Functions:
+        - insert_item_bulk: 여러 아이템 정보를 한 번의 INSERT, 한 번의 commit으로 저장합니다.
+        - update_item_bulk: 조건(filters)에 맞는 아이템 정보를 한 번의 UPDATE로 변경합니다. (dry_run: 개수만 조회)
+        - delete_item_bulk: 조건(filters)에 맞는 아이템 정보를 한 번의 DELETE로 삭제합니다. (dry_run: 개수만 조회)
+        - stream_all_item: 유저의 모든 아이템 정보를 server-side cursor로 chunk 단위로 읽습니다. (export용)
+        - get_item_names: 검색 인덱스 로드를 위해 유저의 모든 아이템 이름/초성을 조회합니다.
+        - get_item_counter: 유저 아이템 버전과 아이템 수를 한 번에 조회합니다. (아이템 등록/삭제 시 같은 transaction에서 변경)
+        - count_search_item: 검색 아이템 수를 조회합니다. (아이템 버전별로 SEARCH_COUNT_TTL초 캐시)
+        - get_fuzzy_search_item: 자모 단위 symmetric delete 인덱스(fuzzy_index)로 이름 오타 검색 결과를 편집 거리 순으로 조회합니다.
+        - get_infix_search_item: user_item_ngram(bigram inverted index)으로 이름/초성/설명 부분 검색 결과를 관련도 순으로 조회합니다.
+        - get_item_by_barcode: (phone_number, barcode) 인덱스로 바코드 아이템을 조회합니다. (아이템 버전별로 BARCODE_TTL초 캐시)
+        - get_items_by_barcodes: 여러 바코드의 아이템을 한 번의 쿼리로 조회합니다. (캐시되지 않은 바코드만 조회)
+        - get_expiring_item: (phone_number, expiration_date) 인덱스로 기간 안에 유통기한이 끝나는 아이템을 조회합니다.
+        - get_expiry_items: 기간 안에 유통기한이 끝나는 아이템의 seq, 이름, 유통기한을 조회합니다. (expiry scheduler)
+        - get_expiry_items_by_seq: 아이템의 seq, 이름, 유통기한을 조회합니다. (만료 이벤트 전송 전 확인)
+        - get_item_stats: user_item_stat에서 카테고리별 아이템 수, 평균 판매가/원가, 마진을 조회합니다. (카테고리 수만큼 읽음)
+        - rebuild_item_stats: user_item에서 유저의 user_item_stat을 다시 계산합니다.
+
+get_session:
+    - 프로세스당 하나의 engine, sessionmaker에서 요청마다 새 session을 열고 닫는 FastAPI dependency 입니다.
+    - engine은 worker마다 처음 사용할 때 만들고, pool 옵션은 pool.pool_options(conf db_pool)로 정합니다.
+      (sync engine은 connection 1개)
+    - 오래되어 끊긴 connection은 pool_pre_ping으로 꺼낼 때 확인해서 새로 연결합니다.
+
+get_pool_stats:
+    - 이 worker의 engine connection pool 상태와 PoolStats 통계를 조회합니다. (GET /internal/pool)
+    - fork 된 프로세스는 부모의 engine(연결)을 쓰지 않고 새로 만듭니다.
+
+get_cache_stats:
+    - 이 worker의 아이템 캐시, 검색 결과 캐시, 검색 인덱스 크기와 hit/miss 통계를 조회합니다. (GET /internal/cache)
 
 Raises:
     MySQLManagerError: MySQLManager에서 발생한 오류
+    DuplicateKeyError: unique key(phone_number) 중복 오류
+    NotFoundError: 수정/삭제/조회할 데이터가 없는 경우 (rowcount 0)
 
 """
+import os
 from datetime import datetime
-from sqlalchemy import create_engine, select, or_, and_
+from sqlalchemy import create_engine, select, insert, update, delete, func, case, cast, Integer, or_, and_, \
+    literal, union_all
 from sqlalchemy.orm import Session
+from typing import AsyncIterator
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from . import MYSQL_CONNECTION
-from model import User, Item
-from util import extract_korean_initial
+from .model import User, Item, ItemVersion, ItemNgram, ItemStat
+from .util import extract_korean_initial, extract_korean_initial_many, extract_ngrams, normalize_search_text
+from .search_index import SearchIndex, FuzzySearchIndex, get_search_index, get_fuzzy_index
+from .cache import ItemCache, TTLCache, get_item_cache
+from .pool import PoolStats, StatsQueuePool, StatsAsyncQueuePool, pool_options
 
+# columns that update_item_info can change
+ITEM_UPDATE_COLUMNS = ("category", "selling_price", "cost_price", "name", "description",
+                       "barcode", "expiration_date", "size")
 
-class MySQLManager:
+# keyword search total count is cached per (phone_number, keyword, item version)
+SEARCH_COUNT_TTL = 30
+_search_count_cache = TTLCache(maxsize=10000, ttl=SEARCH_COUNT_TTL)
+# infix search total (or ranked seqs of terms longer than 2 characters) is cached per
+# (phone_number, terms, item version)
+_infix_search_cache = TTLCache(maxsize=1000, ttl=SEARCH_COUNT_TTL)
+# scanned barcode item is cached per (phone_number, barcode, item version)
+BARCODE_TTL = 60
+_barcode_cache = TTLCache(maxsize=10000, ttl=BARCODE_TTL)
+
+# item columns counted in user_item_stat
+ITEM_STAT_COLUMNS = ("category", "selling_price", "cost_price")
+
+# user_item_ngram field of item column, relevance weight of field
+NGRAM_FIELDS = {"name": "n", "search_initial": "i", "description": "d"}
+NGRAM_COLUMNS = {field: column for column, field in NGRAM_FIELDS.items()}
+NGRAM_WEIGHTS = {"n": 3, "i": 2, "d": 1}
+
+# process-wide engine & sessionmaker (created lazily on first use)
+_engine = None
+_async_engine = None
+_async_session = None
+
+
+def make_mysql_url(driver: str = "pymysql") -> str:
+    """Make MySQL connection url from conf.
+    Args:
+        driver: sqlalchemy mysql driver name. pymysql(sync) or aiomysql(async)
     """
-    MySQL DB manager
+    user = MYSQL_CONNECTION['user']
+    passwd = MYSQL_CONNECTION['password']
+    host = MYSQL_CONNECTION['host']
+    port = MYSQL_CONNECTION['port']
+    db = MYSQL_CONNECTION['db']
+    charset = MYSQL_CONNECTION['charset']
+    return f"mysql+{driver}://{user}:{passwd}@{host}:{port}/{db}?charset={charset}"
+
+
+def get_engine() -> Engine:
+    """Get process-wide sync engine."""
+    global _engine
+    if _engine is None:
+        _engine = create_engine(make_mysql_url("pymysql"), echo=False, poolclass=StatsQueuePool,
+                                **pool_options(sync=True))
+        PoolStats().watch(_engine)
+    return _engine
+
+
+def get_async_engine() -> AsyncEngine:
+    """Get process-wide async engine."""
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_engine(make_mysql_url("aiomysql"), echo=False, poolclass=StatsAsyncQueuePool,
+                                            **pool_options())
+        PoolStats().watch(_async_engine.sync_engine)
+    return _async_engine
+
+
+def get_pool_stats() -> dict:
+    """Get connection pool stats of process-wide engines in this worker. (None if the engine is not created)"""
+    return {
+        "pid": os.getpid(),
+        "async": _pool_snapshot(_async_engine.sync_engine if _async_engine is not None else None),
+        "sync": _pool_snapshot(_engine)
+    }
+
+
+def get_cache_stats() -> dict:
+    """Get size and hit/miss stats of process-wide caches and search indexes in this worker. (None if disabled)"""
+    item_cache, search_index, fuzzy_index = get_item_cache(), get_search_index(), get_fuzzy_index()
+    return {
+        "pid": os.getpid(),
+        "item": item_cache.stats() if item_cache is not None else None,
+        "search_count": _search_count_cache.stats(),
+        "infix_search": _infix_search_cache.stats(),
+        "barcode": _barcode_cache.stats(),
+        "search_index": search_index.stats() if search_index is not None else None,
+        "fuzzy_index": fuzzy_index.stats() if fuzzy_index is not None else None
+    }
+
+
+def _pool_snapshot(engine: Engine):
+    stats = getattr(engine.pool, "stats", None) if engine is not None else None
+    return stats.snapshot(engine.pool) if stats is not None else None
+
+
+def get_async_sessionmaker() -> async_sessionmaker:
+    """Get process-wide async sessionmaker bound to async engine."""
+    global _async_session
+    if _async_session is None:
+        _async_session = async_sessionmaker(get_async_engine(), expire_on_commit=False)
+    return _async_session
+
+
+async def get_session() -> AsyncIterator[AsyncSession]:
+    """Open a new session for each request and close it after response.
+    Used as FastAPI dependency.
+    """
+    async with get_async_sessionmaker()() as session:
+        yield session
+
+
+async def dispose_engine() -> None:
+    """Dispose process-wide engines and connection pools."""
+    global _engine, _async_engine, _async_session
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    if _engine is not None:
+        _engine.dispose()
+    _engine = _async_engine = _async_session = None
+
+
+def _reset_engine_after_fork() -> None:
+    # pooled connections of the parent are not closed (still used by the parent) nor shared
+    global _engine, _async_engine, _async_session
+    if _async_engine is not None:
+        _async_engine.sync_engine.dispose(close=False)
+    if _engine is not None:
+        _engine.dispose(close=False)
+    _engine = _async_engine = _async_session = None
+    for cache in (_search_count_cache, _infix_search_cache, _barcode_cache):
+        cache.clear()
+
+
+os.register_at_fork(after_in_child=_reset_engine_after_fork)
+
+
+def _item_row(phone_number: str, params: dict, search_initial: str = None) -> dict:
+    """Make user_item row from insert params."""
+    return {
+        "phone_number": phone_number,
+        "category": params["category"],
+        "selling_price": int(params["selling_price"]),
+        "cost_price": int(params["cost_price"]),
+        "name": params["name"],
+        "description": params["description"],
+        "barcode": params["barcode"],
+        "expiration_date": params["expiration_date"],
+        "size": params["size"],
+        "search_initial": search_initial if search_initial is not None else extract_korean_initial(params["name"])
+    }
+
+
+def _update_item_values(params: dict) -> tuple:
+    """Make UPDATE values from update params. Only whitelisted columns are changed.
+    Return:
+        (values, [change_params_key, ...])
+    """
+    values, result = {}, []
+    for key, value in params.items():
+        if key not in ITEM_UPDATE_COLUMNS or not value:
+            continue
+        values[key] = value if type(value) is str else int(value)
+        result.append(key)
+        # Automatically change search_initial when renaming
+        if key == "name":
+            values["search_initial"] = extract_korean_initial(value)
+            result.append("search_initial")
+    return values, result
+
+
+def _new_item(phone_number: str, params: dict) -> Item:
+    """Make Item object from insert params."""
+    return Item(**_item_row(phone_number, params))
+
+
+# statements issued by MySQLManager (also checked by migration explain)
+def _delete_user_sql(phone_number: str):
+    return delete(User).where(User.phone_number == phone_number)
+
+
+def _user_auth_sql(phone_number: str):
+    # single lookup on unique phone_number index
+    return select(User.phone_number, User.password).filter(User.phone_number == phone_number)
+
+
+def _update_password_sql(phone_number: str, password: str):
+    return update(User).where(User.phone_number == phone_number).values(password=password)
+
+
+# columns of item read apis. rows are returned as Core rows (no ORM object, no identity map)
+_ITEM_COLUMNS = (Item.seq, Item.phone_number, Item.category, Item.selling_price, Item.cost_price, Item.name,
+                 Item.description, Item.barcode, Item.expiration_date, Item.size)
+
+
+def _rows_to_dict(rows) -> list:
+    """Convert item rows to api response format."""
+    return [row._asdict() for row in rows]
+
+
+def _update_item_sql(phone_number: str, seq: int, values: dict):
+    return update(Item).where(Item.phone_number == phone_number, Item.seq == seq).values(
+        **values).execution_options(synchronize_session=False)
+
+
+def _delete_item_sql(phone_number: str, seq: int):
+    return delete(Item).where(Item.phone_number == phone_number, Item.seq == seq).execution_options(
+        synchronize_session=False)
+
+
+def _item_info_sql(phone_number: str, seq: int):
+    return select(*_ITEM_COLUMNS).filter(Item.phone_number == phone_number, Item.seq == seq)
+
+
+def _items_by_seq_sql(phone_number: str, seqs: list):
+    return select(*_ITEM_COLUMNS).filter(Item.phone_number == phone_number, Item.seq.in_(seqs)).order_by(Item.seq)
+
+
+def _barcode_item_sql(phone_number: str, barcodes: list):
+    # items sharing a barcode (registered before the barcode index) are resolved to the first seq
+    return select(*_ITEM_COLUMNS).filter(Item.phone_number == phone_number, Item.barcode.in_(barcodes)).order_by(
+        Item.seq)
+
+
+def _expiring_item_filter(phone_number: str, start: str, end: str) -> tuple:
+    # range of (phone_number, expiration_date) index, start and end are included
+    return Item.phone_number == phone_number, Item.expiration_date >= start, Item.expiration_date <= end
+
+
+def _expiring_item_sql(phone_number: str, start: str, end: str, page_number: int = 0, page_size: int = 10):
+    return select(*_ITEM_COLUMNS).filter(*_expiring_item_filter(phone_number, start, end)).order_by(
+        Item.expiration_date, Item.seq).offset(page_number * page_size).limit(page_size)
+
+
+def _count_expiring_item_sql(phone_number: str, start: str, end: str):
+    return select(func.count()).select_from(Item).filter(*_expiring_item_filter(phone_number, start, end))
+
+
+def _expiry_item_sql(start: str, end: str, phone_number: str = None):
+    # items of every user (expiration_date index) or a user
+    sql = select(Item.seq, Item.phone_number, Item.name, Item.expiration_date)
+    if phone_number is not None:
+        return sql.filter(*_expiring_item_filter(phone_number, start, end))
+    return sql.filter(Item.expiration_date >= start, Item.expiration_date <= end)
+
+
+def _expiry_item_by_seq_sql(phone_number: str, seqs: list):
+    return select(Item.seq, Item.phone_number, Item.name, Item.expiration_date).filter(
+        Item.phone_number == phone_number, Item.seq.in_(seqs))
+
+
+def _export_item_sql(phone_number: str):
+    # read with server-side cursor
+    return select(*_ITEM_COLUMNS).filter(Item.phone_number == phone_number).order_by(Item.seq)
+
+
+def _item_names_sql(phone_number: str):
+    return select(Item.seq, Item.name, Item.search_initial).filter(Item.phone_number == phone_number)
+
+
+def _item_filter(phone_number: str, filters: dict) -> list:
+    # every condition is scoped to the caller's phone_number
+    conditions = [Item.phone_number == phone_number]
+    if filters.get("category") is not None:
+        conditions.append(Item.category == filters["category"])
+    if filters.get("size") is not None:
+        conditions.append(Item.size == filters["size"])
+    if filters.get("expiration_before") is not None:
+        conditions.append(Item.expiration_date < filters["expiration_before"])
+    if filters.get("seqs") is not None:
+        conditions.append(Item.seq.in_(filters["seqs"]))
+    return conditions
+
+
+def _adjust_price(column, amount: int = None, percent: float = None):
+    # price + amount or round(price * (100 + percent) / 100), never below 0
+    if percent is not None:
+        value = cast(func.round(column * ((100 + percent) / 100)), Integer)
+    else:
+        value = column + amount
+    return case((value < 0, 0), else_=value)
+
+
+def _count_item_sql(phone_number: str, filters: dict):
+    return select(func.count()).select_from(Item).filter(*_item_filter(phone_number, filters))
+
+
+def _update_item_bulk_sql(phone_number: str, filters: dict, values: dict):
+    return update(Item).where(*_item_filter(phone_number, filters)).values(
+        **values).execution_options(synchronize_session=False)
+
+
+def _delete_item_bulk_sql(phone_number: str, filters: dict):
+    return delete(Item).where(*_item_filter(phone_number, filters)).execution_options(
+        synchronize_session=False)
+
+
+def _paginate(sql, page_number: int, cursor: int, page_size: int, lookahead: bool = False):
+    # keyset pagination (seq > cursor) costs the same on every page.
+    # page_number(offset) is kept for older clients.
+    # lookahead reads one more row to know whether the next page exists.
+    if cursor is not None:
+        sql = sql.filter(Item.seq > cursor)
+    else:
+        sql = sql.offset(page_number * page_size)
+    return sql.order_by(Item.seq).limit(page_size + 1 if lookahead else page_size)
+
+
+def _all_item_sql(phone_number: str, page_number: int = 0, cursor: int = None, page_size: int = 10,
+                  lookahead: bool = False):
+    sql = select(*_ITEM_COLUMNS).filter(Item.phone_number == phone_number)
+    return _paginate(sql, page_number, cursor, page_size, lookahead)
+
+
+def _search_filter(phone_number: str, keyword: str):
+    return and_(Item.phone_number == phone_number, or_(
+        Item.name.like(keyword + '%'), Item.search_initial.like(keyword + '%')))
+
+
+def _search_item_sql(phone_number: str, keyword: str, page_number: int = 0, cursor: int = None, page_size: int = 10,
+                     lookahead: bool = False):
+    sql = select(*_ITEM_COLUMNS).filter(_search_filter(phone_number, keyword))
+    return _paginate(sql, page_number, cursor, page_size, lookahead)
+
+
+def _count_search_item_sql(phone_number: str, keyword: str):
+    return select(func.count()).select_from(Item).filter(_search_filter(phone_number, keyword))
+
+
+def _item_ngram_rows(phone_number: str, seq: int, name: str = None, description: str = None,
+                     search_initial: str = None) -> list:
+    """Make user_item_ngram rows of changed item name(with search_initial), description."""
+    texts = {"n": name, "d": description}
+    # initial of non korean name is the same as name
+    if name is not None and normalize_search_text(search_initial) != normalize_search_text(name):
+        texts["i"] = search_initial
+    return [{"phone_number": phone_number, "gram": gram, "seq": seq, "field": field}
+            for field, text in texts.items() if text for gram in extract_ngrams(text)]
+
+
+def _changed_ngram_fields(values: dict) -> list:
+    fields = []
+    if "name" in values:
+        fields += [NGRAM_FIELDS["name"], NGRAM_FIELDS["search_initial"]]
+    if "description" in values:
+        fields.append(NGRAM_FIELDS["description"])
+    return fields
+
+
+def _insert_ngram_sql(dialect_name: str):
+    # the same row indexed twice (bulk insert next to a concurrent write) is ignored
+    if dialect_name == "mysql":
+        return mysql_insert(ItemNgram.__table__).prefix_with("IGNORE")
+    return sqlite_insert(ItemNgram.__table__).on_conflict_do_nothing()
+
+
+def _delete_ngram_sql(phone_number: str, seqs, fields: list = None):
+    # seqs: [seq, ...] or select of seq
+    sql = delete(ItemNgram).where(ItemNgram.phone_number == phone_number, ItemNgram.seq.in_(seqs))
+    if fields:
+        sql = sql.where(ItemNgram.field.in_(fields))
+    return sql.execution_options(synchronize_session=False)
+
+
+def _max_item_seq_sql(phone_number: str):
+    return select(func.max(Item.seq)).filter(Item.phone_number == phone_number)
+
+
+def _item_text_sql(phone_number: str, seqs: list = None, after_seq: int = None):
+    sql = select(Item.seq, Item.name, Item.description, Item.search_initial).filter(Item.phone_number == phone_number)
+    if seqs is not None:
+        sql = sql.filter(Item.seq.in_(seqs))
+    if after_seq is not None:
+        sql = sql.filter(Item.seq > after_seq)
+    return sql
+
+
+def _filter_seq_sql(phone_number: str, filters: dict):
+    return select(Item.seq).filter(*_item_filter(phone_number, filters))
+
+
+def _ngram_candidate_sql(phone_number: str, term: str):
+    # (seq, field) of which field has every gram of term
+    if len(term) == 1:
+        # last character is indexed with space (ex. "떼 "), every position starts a gram.
+        # grams starting with term by code point range (LIKE prefix is not an index range on sqlite).
+        # >= : "떼 " = "떼" on MySQL PAD SPACE collation
+        return select(ItemNgram.seq, ItemNgram.field).filter(
+            ItemNgram.phone_number == phone_number, ItemNgram.gram >= term,
+            ItemNgram.gram < chr(ord(term) + 1)).distinct()
+    grams = {term[i:i + 2] for i in range(len(term) - 1)}
+    if len(grams) == 1:
+        # (phone_number, gram, seq, field) is primary key, no duplicate
+        return select(ItemNgram.seq, ItemNgram.field).filter(
+            ItemNgram.phone_number == phone_number, ItemNgram.gram == term)
+    return select(ItemNgram.seq, ItemNgram.field).filter(
+        ItemNgram.phone_number == phone_number, ItemNgram.gram.in_(grams)).group_by(
+        ItemNgram.seq, ItemNgram.field).having(func.count(ItemNgram.gram.distinct()) == len(grams))
+
+
+def _infix_rank_sql(phone_number: str, terms: list):
+    # (seq, score) of items matched by every term ordered by score desc, seq.
+    # only for terms of 1~2 characters (one gram, no false positive)
+    matched = union_all(*[
+        select(candidate.c.seq, candidate.c.field, literal(i).label("term"))
+        for i, candidate in enumerate(_ngram_candidate_sql(phone_number, term).subquery() for term in terms)
+    ]).subquery() if len(terms) > 1 else _ngram_candidate_sql(phone_number, terms[0]).subquery()
+    score = func.sum(case(NGRAM_WEIGHTS, value=matched.c.field)).label("score")
+    sql = select(matched.c.seq, score).group_by(matched.c.seq)
+    if len(terms) > 1:
+        sql = sql.having(func.count(matched.c.term.distinct()) == len(terms))
+    return sql.order_by(score.desc(), matched.c.seq)
+
+
+def _count_infix_rank_sql(phone_number: str, terms: list):
+    return select(func.count()).select_from(_infix_rank_sql(phone_number, terms).order_by(None).subquery())
+
+
+def _chunks(values: list, size: int = 1000):
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+
+def _rank_infix_match(terms: list, candidates: list, texts: dict = None) -> list:
+    """Rank items matched by every term.
+    Args:
+        terms: normalized search terms
+        candidates: [{seq: {field, ...}}, ...] per term (from _ngram_candidate_sql)
+        texts: {seq: item text row (_item_text_sql)} to check terms longer than 2 characters
+               (their grams may appear apart from each other)
+
+    Return:
+        [seq, ...] ordered by relevance(sum of matched field weights) desc, seq asc
+    """
+    seqs = set(candidates[0]).intersection(*candidates[1:]) if candidates else set()
+    scores = {}
+    for seq in seqs:
+        score = 0
+        for term, fields in zip(terms, (candidate[seq] for candidate in candidates)):
+            if texts is not None and len(term) > 2:
+                # only candidate fields are normalized
+                fields = {field for field in fields if term in _item_text(texts[seq], field)}
+            if not fields:
+                break
+            score += sum(NGRAM_WEIGHTS[field] for field in fields)
+        else:
+            scores[seq] = score
+    return sorted(scores, key=lambda seq: (-scores[seq], seq))
+
+
+def _item_text(row, field: str) -> str:
+    return normalize_search_text(getattr(row, NGRAM_COLUMNS[field]))
+
+
+def _item_version_sql(phone_number: str):
+    return select(ItemVersion.version, ItemVersion.item_count).filter(ItemVersion.phone_number == phone_number)
+
+
+def _bump_item_version_sql(dialect_name: str, phone_number: str, count: int = 0):
+    # one upsert in the same transaction as the item write (version 1 on first write).
+    # item_count is changed by count(inserted or -deleted rows) atomically, so concurrent writes are not lost.
+    if dialect_name == "mysql":
+        sql = mysql_insert(ItemVersion).values(phone_number=phone_number, version=1, item_count=count)
+        return sql.on_duplicate_key_update(version=ItemVersion.version + 1,
+                                           item_count=ItemVersion.item_count + count)
+    sql = sqlite_insert(ItemVersion).values(phone_number=phone_number, version=1, item_count=count)
+    return sql.on_conflict_do_update(index_elements=[ItemVersion.phone_number],
+                                     set_={"version": ItemVersion.version + 1,
+                                           "item_count": ItemVersion.item_count + count})
+
+
+def _merge_item_stat(deltas: dict, rows, sign: int = 1) -> dict:
+    """Add (category, item_count, selling_price_sum, cost_price_sum) rows to deltas.
+    Args:
+        deltas: {category: [item_count, selling_price_sum, cost_price_sum]}
+        rows: item stat rows (_item_stat_group_sql or one item as (category, 1, selling_price, cost_price))
+        sign: 1 (added items) or -1 (removed items)
     """
+    for category, item_count, selling_price_sum, cost_price_sum in rows:
+        delta = deltas.setdefault(category, [0, 0, 0])
+        delta[0] += sign * item_count
+        delta[1] += sign * int(selling_price_sum or 0)
+        delta[2] += sign * int(cost_price_sum or 0)
+    return deltas
 
-    def __init__(self) -> None:
-        user = MYSQL_CONNECTION['user']
-        passwd = MYSQL_CONNECTION['password']
-        host = MYSQL_CONNECTION['host']
-        port = MYSQL_CONNECTION['port']
-        db = MYSQL_CONNECTION['db']
-        charset = MYSQL_CONNECTION['charset']
-        engine = create_engine(
-            f"mysql+pymysql://{user}:{passwd}@{host}:{port}/{db}?charset={charset}",
-            echo=False, pool_size=10, pool_recycle=500, max_overflow=10)
 
-        self.session = Session(engine)
+def _item_stat_delta_sql(dialect_name: str, phone_number: str, deltas: dict):
+    # one upsert of every changed category in the same transaction as the item write.
+    # columns are changed by delta atomically, so concurrent writes are not lost.
+    # None if nothing is changed (ex. price update to the same value)
+    rows = [{"phone_number": phone_number, "category": category, "item_count": delta[0],
+             "selling_price_sum": delta[1], "cost_price_sum": delta[2]}
+            for category, delta in deltas.items() if any(delta)]
+    if not rows:
+        return None
+    if dialect_name == "mysql":
+        sql = mysql_insert(ItemStat).values(rows)
+        return sql.on_duplicate_key_update(
+            item_count=ItemStat.item_count + sql.inserted.item_count,
+            selling_price_sum=ItemStat.selling_price_sum + sql.inserted.selling_price_sum,
+            cost_price_sum=ItemStat.cost_price_sum + sql.inserted.cost_price_sum)
+    sql = sqlite_insert(ItemStat).values(rows)
+    return sql.on_conflict_do_update(index_elements=[ItemStat.phone_number, ItemStat.category], set_={
+        "item_count": ItemStat.item_count + sql.excluded.item_count,
+        "selling_price_sum": ItemStat.selling_price_sum + sql.excluded.selling_price_sum,
+        "cost_price_sum": ItemStat.cost_price_sum + sql.excluded.cost_price_sum})
+
+
+def _item_stat_change_sql(dialect_name: str, phone_number: str, seq: int, sign: int, values: dict = None):
+    # stat delta of one item read from the item row by the upsert itself (INSERT ... SELECT ... FOR UPDATE),
+    # so update/delete need no separate read. the item row is locked until commit like the write after it.
+    # values None: sign -1 (before delete or category change), sign 1 (after category change)
+    # values: price difference of an update keeping category (before update)
+    if values is None:
+        columns = [literal(sign), Item.selling_price * sign, Item.cost_price * sign]
+    else:
+        columns = [literal(0)] + [literal(values[key]) - getattr(Item, key) if key in values else literal(0)
+                                  for key in ("selling_price", "cost_price")]
+    rows = select(Item.phone_number, Item.category, *columns).filter(
+        Item.phone_number == phone_number, Item.seq == seq).with_for_update()
+    names = ["phone_number", "category", "item_count", "selling_price_sum", "cost_price_sum"]
+    if dialect_name == "mysql":
+        sql = mysql_insert(ItemStat).from_select(names, rows)
+        return sql.on_duplicate_key_update(
+            item_count=ItemStat.item_count + sql.inserted.item_count,
+            selling_price_sum=ItemStat.selling_price_sum + sql.inserted.selling_price_sum,
+            cost_price_sum=ItemStat.cost_price_sum + sql.inserted.cost_price_sum)
+    sql = sqlite_insert(ItemStat).from_select(names, rows)
+    return sql.on_conflict_do_update(index_elements=[ItemStat.phone_number, ItemStat.category], set_={
+        "item_count": ItemStat.item_count + sql.excluded.item_count,
+        "selling_price_sum": ItemStat.selling_price_sum + sql.excluded.selling_price_sum,
+        "cost_price_sum": ItemStat.cost_price_sum + sql.excluded.cost_price_sum})
+
+
+def _item_stat_group_sql(phone_number: str, seqs: list):
+    # category aggregate of items before/after bulk update, before bulk delete (rows locked by caller)
+    return select(Item.category, func.count(), func.sum(Item.selling_price), func.sum(Item.cost_price)).filter(
+        Item.phone_number == phone_number, Item.seq.in_(seqs)).group_by(Item.category)
+
+
+def _item_stat_sql(phone_number: str):
+    # categories emptied by update/delete are kept with item_count 0 until rebuild
+    return select(ItemStat.category, ItemStat.item_count, ItemStat.selling_price_sum,
+                  ItemStat.cost_price_sum).filter(
+        ItemStat.phone_number == phone_number, ItemStat.item_count > 0).order_by(ItemStat.category)
+
+
+def _delete_item_stat_sql(phone_number: str = None):
+    sql = delete(ItemStat)
+    if phone_number is not None:
+        sql = sql.where(ItemStat.phone_number == phone_number)
+    return sql.execution_options(synchronize_session=False)
+
+
+def _rebuild_item_stat_sql(phone_number: str = None):
+    # category aggregate of every item of every user (or a user)
+    sql = select(Item.phone_number, Item.category, func.count(), func.sum(Item.selling_price),
+                 func.sum(Item.cost_price)).group_by(Item.phone_number, Item.category)
+    if phone_number is not None:
+        sql = sql.filter(Item.phone_number == phone_number)
+    return insert(ItemStat).from_select(
+        ["phone_number", "category", "item_count", "selling_price_sum", "cost_price_sum"], sql)
+
+
+def _item_stat_summary(item_count: int, selling_price_sum: int, cost_price_sum: int) -> dict:
+    """Make item stat response. (margin: average selling_price - cost_price, margin_rate: margin / selling_price %)"""
+    if not item_count:
+        return {"item_count": 0, "avg_selling_price": 0.0, "avg_cost_price": 0.0, "margin": 0.0, "margin_rate": 0.0}
+    return {
+        "item_count": item_count,
+        "avg_selling_price": round(selling_price_sum / item_count, 2),
+        "avg_cost_price": round(cost_price_sum / item_count, 2),
+        "margin": round((selling_price_sum - cost_price_sum) / item_count, 2),
+        "margin_rate": round((selling_price_sum - cost_price_sum) / selling_price_sum * 100, 2)
+        if selling_price_sum else 0.0
+    }
+
+
+class MySQLManager:
+    """
+    MySQL DB manager
+    """
 
     def insert_user_auth(self, phone_number: str, password: bytes) -> str:
         """Insert user auth info to user_auth table.
@@ -53,10 +674,11 @@ class MySQLManager:
             phone_number
 
         Raise:
+            This phone number already exists.
             Failed to insert user auth on DB.
         """
         try:
-            with self.session as session:
+            with Session(get_engine()) as session:
                 content = User(
                     phone_number=phone_number,
                     password=password,
@@ -65,6 +687,8 @@ class MySQLManager:
                 session.add(content)
                 session.commit()
             return phone_number
+        except IntegrityError:
+            raise DuplicateKeyError("This phone number already exists.")
         except Exception:
             raise MySQLManagerError("Failed to insert user auth on DB.")
 
@@ -78,17 +702,17 @@ class MySQLManager:
 
         Raise:
             Failed to delete user auth on DB.
+            This user does not exist.
         """
         try:
-            with self.session as session:
-                sql = select(User).filter(User.phone_number == phone_number)
-                user_auth = session.execute(sql).scalar_one()
-                if user_auth:
-                    session.delete(user_auth)
+            with Session(get_engine()) as session:
+                rowcount = session.execute(_delete_user_sql(phone_number)).rowcount
                 session.commit()
-            return "success"
         except Exception:
             raise MySQLManagerError("Failed to delete user auth on DB.")
+        if not rowcount:
+            raise NotFoundError("This user does not exist.")
+        return "success"
 
     def get_user_auth(self, phone_number: str) -> dict:
         """Get user auth info from user_auth table.
@@ -97,18 +721,15 @@ class MySQLManager:
 
         Return:
             {"phone_number": phone_number, "password": password}
+            None if phone_number does not exist.
 
         Raise:
             Failed to get user auth on DB.
         """
         try:
-            with self.session as session:
-                sql = select(User).filter(User.phone_number == phone_number)
-                obj = session.execute(sql).scalar_one()
-                return {
-                    "phone_number": obj.phone_number,
-                    "password": obj.password
-                }
+            with Session(get_engine()) as session:
+                row = session.execute(_user_auth_sql(phone_number)).first()
+                return row._asdict() if row else None
         except Exception:
             raise MySQLManagerError("Failed to get user auth on DB.")
 
@@ -122,7 +743,7 @@ class MySQLManager:
         """
         try:
             all_user_auth_number = list()
-            with self.session as session:
+            with Session(get_engine()) as session:
                 sql = select(User)
                 for obj in session.execute(sql):
                     all_user_auth_number.append(obj.User.phone_number)
@@ -131,6 +752,26 @@ class MySQLManager:
             raise MySQLManagerError(
                 "Failed to get all user auth phone_number on DB.")
 
+    def update_user_password(self, phone_number: str, password: str) -> str:
+        """Update user password on user_auth table.
+        Args:
+            phone_number: user phone_number
+            password: user hash password
+
+        Return:
+            phone_number
+
+        Raise:
+            Failed to update user password on DB.
+        """
+        try:
+            with Session(get_engine()) as session:
+                session.execute(_update_password_sql(phone_number, password))
+                session.commit()
+            return phone_number
+        except Exception:
+            raise MySQLManagerError("Failed to update user password on DB.")
+
     def insert_item_info(self, phone_number: str, params: dict) -> str:
         """Insert item info from user_item table.
         Args:
@@ -153,20 +794,15 @@ class MySQLManager:
             Failed to insert item info on DB.
         """
         try:
-            with self.session as session:
-                content = Item(
-                    phone_number=phone_number,
-                    category=params["category"],
-                    selling_price=int(params["selling_price"]),
-                    cost_price=int(params["cost_price"]),
-                    name=params["name"],
-                    description=params["description"],
-                    barcode=params["barcode"],
-                    expiration_date=params["expiration_date"],
-                    size=params["size"],
-                    search_initial=extract_korean_initial(params["name"])
-                )
-                session.add(content)
+            with Session(get_engine()) as session:
+                item = _new_item(phone_number, params)
+                session.add(item)
+                session.flush()
+                self._insert_ngrams(session, _item_ngram_rows(
+                    phone_number, item.seq, item.name, item.description, item.search_initial))
+                self._bump_item_version(session, phone_number, 1)
+                self._update_item_stat(session, phone_number, _merge_item_stat(
+                    {}, [(item.category, 1, item.selling_price, item.cost_price)]))
                 session.commit()
             return phone_number
         except Exception:
@@ -183,18 +819,22 @@ class MySQLManager:
 
         Raise:
             Failed to delete item info on DB.
+            This item does not exist.
         """
         try:
-            with self.session as session:
-                sql = select(Item).filter(Item.phone_number ==
-                                          phone_number, Item.seq == seq)
-                item_info = session.execute(sql).scalar_one()
-                if item_info:
-                    session.delete(item_info)
+            with Session(get_engine()) as session:
+                # no-op if the item does not exist
+                self._change_item_stat(session, phone_number, seq, -1)
+                rowcount = session.execute(_delete_item_sql(phone_number, seq)).rowcount
+                if rowcount:
+                    session.execute(_delete_ngram_sql(phone_number, [seq]))
+                    self._bump_item_version(session, phone_number, -rowcount)
                 session.commit()
-            return "success"
         except Exception:
             raise MySQLManagerError("Failed to delete item info on DB.")
+        if not rowcount:
+            raise NotFoundError("This item does not exist.")
+        return "success"
 
     def update_item_info(self, phone_number: str, seq: int, params: dict) -> list:
         """Update item info from user_item table.
@@ -219,29 +859,78 @@ class MySQLManager:
 
         Raise:
             Failed to update item info on DB.
+            This item does not exist.
         """
         try:
-            with self.session as session:
-                sql = select(Item).filter(Item.phone_number == phone_number,
-                                          Item.seq == seq)
-                item_obj = session.execute(sql).scalar_one()
-                result = []
-                for key, value in params.items():
-                    if not value:
-                        continue
-                    if type(value) is str:
-                        exec(f"item_obj.{key} = '{value}'")
-                    else:
-                        exec(f"item_obj.{key} = int({value})")
-                    result.append(key)
-                    # Automatically change search_initial when renaming
-                    if key == "name":
-                        item_obj.search_initial = extract_korean_initial(value)
-                        result.append("search_initial")
-                session.commit()
-            return result
+            values, result = _update_item_values(params)
+            with Session(get_engine()) as session:
+                if values:
+                    if "category" in values:
+                        self._change_item_stat(session, phone_number, seq, -1)
+                    elif set(values) & set(ITEM_STAT_COLUMNS):
+                        self._change_item_stat(session, phone_number, seq, 0, values)
+                    rowcount = session.execute(_update_item_sql(phone_number, seq, values)).rowcount
+                    if rowcount:
+                        self._update_ngrams(session, phone_number, [seq], values)
+                        self._bump_item_version(session, phone_number)
+                        if "category" in values:
+                            self._change_item_stat(session, phone_number, seq, 1)
+                    session.commit()
+                else:
+                    rowcount = len(session.execute(_item_info_sql(phone_number, seq)).all())
         except Exception:
             raise MySQLManagerError("Failed to update item info on DB")
+        if not rowcount:
+            raise NotFoundError("This item does not exist.")
+        return result
+
+    @staticmethod
+    def _bump_item_version(session: Session, phone_number: str, count: int = 0) -> None:
+        session.execute(_bump_item_version_sql(session.get_bind().dialect.name, phone_number, count))
+
+    @staticmethod
+    def _update_item_stat(session: Session, phone_number: str, deltas: dict) -> None:
+        sql = _item_stat_delta_sql(session.get_bind().dialect.name, phone_number, deltas)
+        if sql is not None:
+            session.execute(sql)
+
+    @staticmethod
+    def _change_item_stat(session: Session, phone_number: str, seq: int, sign: int, values: dict = None) -> None:
+        session.execute(_item_stat_change_sql(session.get_bind().dialect.name, phone_number, seq, sign, values))
+
+    @staticmethod
+    def _insert_ngrams(session: Session, rows: list) -> None:
+        for chunk in _chunks(rows, 10000):
+            session.execute(_insert_ngram_sql(session.get_bind().dialect.name), chunk)
+
+    def _update_ngrams(self, session: Session, phone_number: str, seqs: list, values: dict) -> None:
+        """Replace grams of changed name, description."""
+        fields = _changed_ngram_fields(values)
+        if not fields:
+            return
+        for chunk in _chunks(seqs):
+            session.execute(_delete_ngram_sql(phone_number, chunk, fields))
+        rows = _item_ngram_rows(phone_number, 0, values.get("name"), values.get("description"),
+                                values.get("search_initial"))
+        self._insert_ngrams(session, [dict(row, seq=seq) for seq in seqs for row in rows])
+
+    def get_item_version(self, phone_number: str) -> int:
+        """Get user item version. It is increased on every item insert, update and delete.
+        Args:
+            phone_number: user phone_number
+
+        Return:
+            version (0 if user has never changed items)
+
+        Raise:
+            Failed to get item version on DB.
+        """
+        try:
+            with Session(get_engine()) as session:
+                row = session.execute(_item_version_sql(phone_number)).first()
+                return row.version if row else 0
+        except Exception:
+            raise MySQLManagerError("Failed to get item version on DB.")
 
     def get_item_info(self, phone_number: str, seq: int) -> dict:
         """Get item info from user_item table.
@@ -252,6 +941,7 @@ class MySQLManager:
 
         Return:
             {
+                "seq": obj.seq,
                 "phone_number": obj.phone_number,
                 "category": obj.category,
                 "selling_price": obj.selling_price,
@@ -265,34 +955,33 @@ class MySQLManager:
 
         Raise:
             Failed to get item info on DB.
+            This item does not exist.
         """
         try:
-            with self.session as session:
-                sql = select(Item).filter(Item.phone_number == phone_number,
-                                          Item.seq == seq)
-                obj = session.execute(sql).scalar_one()
-                return {
-                    "phone_number": obj.phone_number,
-                    "category": obj.category,
-                    "selling_price": obj.selling_price,
-                    "cost_price": obj.cost_price,
-                    "name": obj.name,
-                    "description": obj.description,
-                    "barcode": obj.barcode,
-                    "expiration_date": obj.expiration_date,
-                    "size": obj.size
-                }
+            with Session(get_engine()) as session:
+                sql = _item_info_sql(phone_number, seq)
+                row = session.execute(sql).first()
         except Exception:
             raise MySQLManagerError("Failed to get item info on DB.")
+        if row is None:
+            raise NotFoundError("This item does not exist.")
+        return row._asdict()
 
-    def get_all_item(self, phone_number: str, page_number: int) -> list:
+    def get_all_item(self, phone_number: str, page_number: int = 0,
+                     cursor: int = None, page_size: int = 10) -> list:
         """Get all item info from user_item table.
         Args:
             **required**
             phone_number: user phone_number
 
+            **optional**
+            page_number: page number (offset pagination)
+            cursor: last seen item seq (keyset pagination, used instead of page_number)
+            page_size: item count per page
+
         Return:
             [{
+                "seq": obj.seq,
                 "phone_number": obj.phone_number,
                 "category": obj.category,
                 "selling_price": obj.selling_price,
@@ -308,35 +997,28 @@ class MySQLManager:
             Failed to get all item info on DB.
         """
         try:
-            all_item = list()
-            with self.session as session:
-                sql = select(Item).filter(Item.phone_number ==
-                                          phone_number).limit(10).offset(page_number * 10)
-                for obj in session.execute(sql):
-                    all_item.append({
-                        "phone_number": obj.Item.phone_number,
-                        "category": obj.Item.category,
-                        "selling_price": obj.Item.selling_price,
-                        "cost_price": obj.Item.cost_price,
-                        "name": obj.Item.name,
-                        "description": obj.Item.description,
-                        "barcode": obj.Item.barcode,
-                        "expiration_date": obj.Item.expiration_date,
-                        "size": obj.Item.size
-                    })
-            return all_item
+            with Session(get_engine()) as session:
+                sql = _all_item_sql(phone_number, page_number, cursor, page_size)
+                return _rows_to_dict(session.execute(sql))
         except Exception:
             raise MySQLManagerError("Failed to get all item info on DB.")
 
-    def get_search_item(self, phone_number: str, keyword: str, page_number: int) -> list:
+    def get_search_item(self, phone_number: str, keyword: str, page_number: int = 0,
+                        cursor: int = None, page_size: int = 10) -> list:
         """Get all item info from user_item table.
         Args:
             **required**
             phone_number: user phone_number
             keyword: user input keyword for searching
 
+            **optional**
+            page_number: page number (offset pagination)
+            cursor: last seen item seq (keyset pagination, used instead of page_number)
+            page_size: item count per page
+
         Return:
             [{
+                "seq": obj.seq,
                 "phone_number": obj.phone_number,
                 "category": obj.category,
                 "selling_price": obj.selling_price,
@@ -352,26 +1034,834 @@ class MySQLManager:
             Failed to get search item info on DB.
         """
         try:
-            search_item = list()
-            with self.session as session:
-                sql = select(Item).filter(and_(Item.phone_number == phone_number, or_(
-                    Item.name.like(keyword + '%'), Item.search_initial.like(keyword + '%')))).limit(10).offset(page_number * 10)
-                for obj in session.execute(sql):
-                    search_item.append({
-                        "phone_number": obj.Item.phone_number,
-                        "category": obj.Item.category,
-                        "selling_price": obj.Item.selling_price,
-                        "cost_price": obj.Item.cost_price,
-                        "name": obj.Item.name,
-                        "description": obj.Item.description,
-                        "barcode": obj.Item.barcode,
-                        "expiration_date": obj.Item.expiration_date,
-                        "size": obj.Item.size
-                    })
-            return search_item
+            with Session(get_engine()) as session:
+                sql = _search_item_sql(phone_number, keyword, page_number, cursor, page_size)
+                return _rows_to_dict(session.execute(sql))
+        except Exception:
+            raise MySQLManagerError("Failed to get search item info on DB.")
+
+
+class AsyncMySQLManager:
+    """
+    Async MySQL DB manager
+    """
+
+    def __init__(self, session: AsyncSession, search_index: SearchIndex = None,
+                 item_cache: ItemCache = None, fuzzy_index: FuzzySearchIndex = None,
+                 expiry_scheduler=None) -> None:
+        self.session = session
+        self.search_index = search_index
+        self.item_cache = item_cache
+        self.fuzzy_index = fuzzy_index
+        # expiry.ExpiryScheduler (expiry imports this module)
+        self.expiry_scheduler = expiry_scheduler
+        # in-process indexes changed by item writes
+        self.indexes = [index for index in (search_index, fuzzy_index) if index is not None]
+
+    async def insert_user_auth(self, phone_number: str, password: bytes) -> str:
+        """Insert user auth info to user_auth table.
+        Args:
+            phone_number: user phone_number
+            password: user decryption password
+
+        Return:
+            phone_number
+
+        Raise:
+            This phone number already exists.
+            Failed to insert user auth on DB.
+        """
+        try:
+            content = User(
+                phone_number=phone_number,
+                password=password,
+                timestamp=datetime.utcnow()
+            )
+            self.session.add(content)
+            await self.session.commit()
+            return phone_number
+        except IntegrityError:
+            raise DuplicateKeyError("This phone number already exists.")
+        except Exception:
+            raise MySQLManagerError("Failed to insert user auth on DB.")
+
+    async def delete_user_auth(self, phone_number: str) -> str:
+        """Delete user auth info from user_auth table.
+        Args:
+            phone_number: user phone_number
+
+        Return:
+            phone_number
+
+        Raise:
+            Failed to delete user auth on DB.
+            This user does not exist.
+        """
+        try:
+            rowcount = (await self.session.execute(_delete_user_sql(phone_number))).rowcount
+            await self.session.commit()
+        except Exception:
+            raise MySQLManagerError("Failed to delete user auth on DB.")
+        if not rowcount:
+            raise NotFoundError("This user does not exist.")
+        return "success"
+
+    async def get_user_auth(self, phone_number: str) -> dict:
+        """Get user auth info from user_auth table.
+        Args:
+            phone_number: user phone_number
+
+        Return:
+            {"phone_number": phone_number, "password": password}
+            None if phone_number does not exist.
+
+        Raise:
+            Failed to get user auth on DB.
+        """
+        try:
+            row = (await self.session.execute(_user_auth_sql(phone_number))).first()
+            return row._asdict() if row else None
+        except Exception:
+            raise MySQLManagerError("Failed to get user auth on DB.")
+
+    async def get_user_all_auth_number(self) -> list:
+        """Get all user auth info from user_auth table.
+        Return:
+            [phone_number, ...]
+
+        Raise:
+            Failed to get all user auth phone_number on DB.
+        """
+        try:
+            sql = select(User.phone_number)
+            return list((await self.session.execute(sql)).scalars())
+        except Exception:
+            raise MySQLManagerError(
+                "Failed to get all user auth phone_number on DB.")
+
+    async def update_user_password(self, phone_number: str, password: str) -> str:
+        """Update user password on user_auth table.
+        Args:
+            phone_number: user phone_number
+            password: user hash password
+
+        Return:
+            phone_number
+
+        Raise:
+            Failed to update user password on DB.
+        """
+        try:
+            await self.session.execute(_update_password_sql(phone_number, password))
+            await self.session.commit()
+            return phone_number
+        except Exception:
+            raise MySQLManagerError("Failed to update user password on DB.")
+
+    async def insert_item_info(self, phone_number: str, params: dict) -> str:
+        """Insert item info from user_item table.
+        Args: Same as MySQLManager.insert_item_info
+
+        Return:
+            phone_number
+
+        Raise:
+            Failed to insert item info on DB.
+        """
+        try:
+            item = _new_item(phone_number, params)
+            self.session.add(item)
+            await self.session.flush()
+            await self._insert_ngrams(_item_ngram_rows(
+                phone_number, item.seq, item.name, item.description, item.search_initial))
+            await self._bump_item_version(phone_number, 1)
+            await self._update_item_stat(phone_number, _merge_item_stat(
+                {}, [(item.category, 1, item.selling_price, item.cost_price)]))
+            await self.session.commit()
+            await self._invalidate_items(phone_number, [item.seq])
+            for index in self.indexes:
+                index.add(phone_number, item.seq, item.name, item.search_initial)
+            if self.expiry_scheduler is not None:
+                self.expiry_scheduler.schedule(phone_number, item.seq, item.expiration_date)
+            return phone_number
+        except Exception:
+            raise MySQLManagerError("Failed to insert item info on DB.")
+
+    async def insert_item_bulk(self, phone_number: str, items: list) -> int:
+        """Insert many item info to user_item table with one statement and one commit.
+        Args:
+            phone_number: user phone_number
+            items: [params, ...] (params: Same as MySQLManager.insert_item_info)
+
+        Return:
+            inserted item count
+
+        Raise:
+            Failed to insert item bulk on DB. (the chunk is rolled back)
+        """
+        try:
+            initials = extract_korean_initial_many(params["name"] for params in items)
+            rows = [_item_row(phone_number, params, initial) for params, initial in zip(items, initials)]
+            last_seq = (await self.session.execute(_max_item_seq_sql(phone_number))).scalar() or 0
+            await self.session.execute(insert(Item), rows)
+            # seq of inserted rows is unknown (no RETURNING on MySQL), read rows after last seq
+            inserted = await self.session.execute(_item_text_sql(phone_number, after_seq=last_seq))
+            await self._insert_ngrams([ngram for row in inserted for ngram in _item_ngram_rows(
+                phone_number, row.seq, row.name, row.description, row.search_initial)])
+            await self._bump_item_version(phone_number, len(rows))
+            await self._update_item_stat(phone_number, _merge_item_stat(
+                {}, [(row["category"], 1, row["selling_price"], row["cost_price"]) for row in rows]))
+            await self.session.commit()
+            await self._invalidate_items(phone_number)
+            # seq of inserted rows is unknown, reload index on next search
+            for index in self.indexes:
+                index.invalidate(phone_number)
+            if self.expiry_scheduler is not None:
+                self.expiry_scheduler.refresh(phone_number)
+            return len(rows)
+        except Exception:
+            try:
+                await self.session.rollback()
+            except Exception:
+                pass
+            raise MySQLManagerError("Failed to insert item bulk on DB.")
+
+    async def update_item_bulk(self, phone_number: str, filters: dict, params: dict = None,
+                               adjust: dict = None, dry_run: bool = False) -> int:
+        """Update item info matched by filters with one UPDATE statement.
+        Args:
+            **required**
+            phone_number: user phone_number
+            filters:
+                category (str): item category
+                size (str): item size
+                expiration_before (str): items expiring before this date (20XX-XX-XX)
+                seqs (list): item seq list
+
+            **optional**
+            params: values to set (Same as MySQLManager.update_item_info params)
+            adjust:
+                field (str): selling_price or cost_price
+                amount (int): add amount to price
+                percent (float): change price by percent (rounded)
+            dry_run: count matched items without update
+
+        Return:
+            matched item count
+
+        Raise:
+            Failed to update item bulk on DB.
+        """
+        try:
+            if dry_run:
+                return (await self.session.execute(_count_item_sql(phone_number, filters))).scalar_one()
+            values = dict(params or {})
+            if "name" in values:
+                values["search_initial"] = extract_korean_initial(values["name"])
+            if adjust:
+                column = getattr(Item, adjust["field"])
+                values[adjust["field"]] = _adjust_price(column, adjust.get("amount"), adjust.get("percent"))
+            stat_changed = bool(set(values) & set(ITEM_STAT_COLUMNS))
+            if _changed_ngram_fields(values) or stat_changed:
+                # lock matched rows, the filter may not match after update (ex. category change)
+                seqs = (await self.session.execute(
+                    _filter_seq_sql(phone_number, filters).with_for_update())).scalars().all()
+            if stat_changed:
+                deltas = _merge_item_stat({}, await self._item_stat_rows(phone_number, seqs), -1)
+            result = await self.session.execute(_update_item_bulk_sql(phone_number, filters, values))
+            if result.rowcount:
+                if _changed_ngram_fields(values):
+                    await self._update_ngrams(phone_number, seqs, values)
+                await self._bump_item_version(phone_number)
+                if stat_changed:
+                    await self._update_item_stat(phone_number, _merge_item_stat(
+                        deltas, await self._item_stat_rows(phone_number, seqs)))
+            await self.session.commit()
+            if result.rowcount:
+                await self._invalidate_items(phone_number)
+            if "name" in values:
+                for index in self.indexes:
+                    index.invalidate(phone_number)
+            if self.expiry_scheduler is not None and "expiration_date" in values:
+                self.expiry_scheduler.refresh(phone_number)
+            return result.rowcount
+        except Exception:
+            raise MySQLManagerError("Failed to update item bulk on DB.")
+
+    async def delete_item_bulk(self, phone_number: str, filters: dict, dry_run: bool = False) -> int:
+        """Delete item info matched by filters with one DELETE statement.
+        Args:
+            phone_number: user phone_number
+            filters: Same as update_item_bulk
+            dry_run: count matched items without delete
+
+        Return:
+            deleted(matched) item count
+
+        Raise:
+            Failed to delete item bulk on DB.
+        """
+        try:
+            if dry_run:
+                return (await self.session.execute(_count_item_sql(phone_number, filters))).scalar_one()
+            seqs = (await self.session.execute(
+                _filter_seq_sql(phone_number, filters).with_for_update())).scalars().all()
+            deltas = _merge_item_stat({}, await self._item_stat_rows(phone_number, seqs), -1)
+            result = await self.session.execute(_delete_item_bulk_sql(phone_number, filters))
+            if result.rowcount:
+                for chunk in _chunks(seqs):
+                    await self.session.execute(_delete_ngram_sql(phone_number, chunk))
+                await self._bump_item_version(phone_number, -result.rowcount)
+                await self._update_item_stat(phone_number, deltas)
+            await self.session.commit()
+            if result.rowcount:
+                await self._invalidate_items(phone_number)
+            for index in self.indexes:
+                index.invalidate(phone_number)
+            return result.rowcount
+        except Exception:
+            raise MySQLManagerError("Failed to delete item bulk on DB.")
+
+    async def delete_item_info(self, phone_number: str, seq: int) -> str:
+        """Delete item info from user_item table.
+        Args:
+            phone_number: user phone_number
+            seq: item seq
+
+        Return:
+            success
+
+        Raise:
+            Failed to delete item info on DB.
+            This item does not exist.
+        """
+        try:
+            # no-op if the item does not exist
+            await self._change_item_stat(phone_number, seq, -1)
+            rowcount = (await self.session.execute(_delete_item_sql(phone_number, seq))).rowcount
+            if rowcount:
+                await self.session.execute(_delete_ngram_sql(phone_number, [seq]))
+                await self._bump_item_version(phone_number, -rowcount)
+            await self.session.commit()
+        except Exception:
+            raise MySQLManagerError("Failed to delete item info on DB.")
+        if not rowcount:
+            raise NotFoundError("This item does not exist.")
+        await self._invalidate_items(phone_number, [seq])
+        for index in self.indexes:
+            index.remove(phone_number, seq)
+        return "success"
+
+    async def update_item_info(self, phone_number: str, seq: int, params: dict) -> list:
+        """Update item info from user_item table.
+        Args: Same as MySQLManager.update_item_info
+
+        Return:
+            [change_params_key, ...]
+
+        Raise:
+            Failed to update item info on DB.
+            This item does not exist.
+        """
+        try:
+            values, result = _update_item_values(params)
+            if values:
+                if "category" in values:
+                    await self._change_item_stat(phone_number, seq, -1)
+                elif set(values) & set(ITEM_STAT_COLUMNS):
+                    await self._change_item_stat(phone_number, seq, 0, values)
+                rowcount = (await self.session.execute(_update_item_sql(phone_number, seq, values))).rowcount
+                if rowcount:
+                    await self._update_ngrams(phone_number, [seq], values)
+                    await self._bump_item_version(phone_number)
+                    if "category" in values:
+                        await self._change_item_stat(phone_number, seq, 1)
+                await self.session.commit()
+            else:
+                rowcount = len((await self.session.execute(_item_info_sql(phone_number, seq))).all())
+        except Exception:
+            raise MySQLManagerError("Failed to update item info on DB")
+        if not rowcount:
+            raise NotFoundError("This item does not exist.")
+        if values:
+            await self._invalidate_items(phone_number, [seq])
+        if "name" in values:
+            for index in self.indexes:
+                index.add(phone_number, seq, values["name"], values["search_initial"])
+        if self.expiry_scheduler is not None and "expiration_date" in values:
+            self.expiry_scheduler.schedule(phone_number, seq, values["expiration_date"])
+        return result
+
+    async def _invalidate_items(self, phone_number: str, seqs: list = None) -> None:
+        # after commit: readers which loaded the row before the commit do not store it as current
+        if self.item_cache is not None:
+            if seqs is None:
+                await self.item_cache.invalidate_user(phone_number)
+            else:
+                await self.item_cache.invalidate(phone_number, seqs)
+
+    async def _bump_item_version(self, phone_number: str, count: int = 0) -> None:
+        await self.session.execute(
+            _bump_item_version_sql(self.session.get_bind().dialect.name, phone_number, count))
+
+    async def _update_item_stat(self, phone_number: str, deltas: dict) -> None:
+        sql = _item_stat_delta_sql(self.session.get_bind().dialect.name, phone_number, deltas)
+        if sql is not None:
+            await self.session.execute(sql)
+
+    async def _change_item_stat(self, phone_number: str, seq: int, sign: int, values: dict = None) -> None:
+        await self.session.execute(
+            _item_stat_change_sql(self.session.get_bind().dialect.name, phone_number, seq, sign, values))
+
+    async def _item_stat_rows(self, phone_number: str, seqs: list) -> list:
+        rows = []
+        for chunk in _chunks(seqs):
+            rows += (await self.session.execute(_item_stat_group_sql(phone_number, chunk))).all()
+        return rows
+
+    async def _insert_ngrams(self, rows: list) -> None:
+        for chunk in _chunks(rows, 10000):
+            await self.session.execute(_insert_ngram_sql(self.session.get_bind().dialect.name), chunk)
+
+    async def _update_ngrams(self, phone_number: str, seqs: list, values: dict) -> None:
+        """Replace grams of changed name, description. (Same as MySQLManager._update_ngrams)"""
+        fields = _changed_ngram_fields(values)
+        if not fields:
+            return
+        for chunk in _chunks(seqs):
+            await self.session.execute(_delete_ngram_sql(phone_number, chunk, fields))
+        rows = _item_ngram_rows(phone_number, 0, values.get("name"), values.get("description"),
+                                values.get("search_initial"))
+        await self._insert_ngrams([dict(row, seq=seq) for seq in seqs for row in rows])
+
+    async def get_item_version(self, phone_number: str) -> int:
+        """Get user item version. (Same as MySQLManager.get_item_version)
+        Checked before item read apis run the item query. (ETag, 304 Not Modified)
+
+        Raise:
+            Failed to get item version on DB.
+        """
+        return (await self.get_item_counter(phone_number))["version"]
+
+    async def get_item_counter(self, phone_number: str) -> dict:
+        """Get user item version and item count with one primary key lookup.
+        Args:
+            phone_number: user phone_number
+
+        Return:
+            {"version": version, "item_count": item_count} (0 if user has never changed items)
+
+        Raise:
+            Failed to get item version on DB.
+        """
+        try:
+            row = (await self.session.execute(_item_version_sql(phone_number))).first()
+            return row._asdict() if row else {"version": 0, "item_count": 0}
+        except Exception:
+            raise MySQLManagerError("Failed to get item version on DB.")
+
+    async def count_search_item(self, phone_number: str, keyword: str, version: int) -> int:
+        """Count items matched by keyword. Cached for SEARCH_COUNT_TTL seconds per item version.
+        Args:
+            phone_number: user phone_number
+            keyword: user input keyword for searching
+            version: user item version (get_item_counter). any item write changes the cache key.
+
+        Return:
+            matched item count
+
+        Raise:
+            Failed to count search item on DB.
+        """
+        key = (phone_number, keyword, version)
+        count = _search_count_cache.get(key)
+        if count is not None:
+            return count
+        try:
+            if self.search_index is not None:
+                count = await self.search_index.count(phone_number, keyword, self.get_item_names)
+            else:
+                count = (await self.session.execute(_count_search_item_sql(phone_number, keyword))).scalar_one()
+        except Exception:
+            raise MySQLManagerError("Failed to count search item on DB.")
+        _search_count_cache.set(key, count)
+        return count
+
+    async def get_item_info(self, phone_number: str, seq: int) -> dict:
+        """Get item info from user_item table. (item_cache first if given, no SQL on cache hit)
+        Args:
+            phone_number: user phone_number
+            seq: item seq
+
+        Return: Same as MySQLManager.get_item_info
+
+        Raise:
+            Failed to get item info on DB.
+            This item does not exist.
+        """
+        if self.item_cache is not None:
+            return await self.item_cache.get_or_load(
+                phone_number, seq, lambda: self._load_item_info(phone_number, seq))
+        return await self._load_item_info(phone_number, seq)
+
+    async def _load_item_info(self, phone_number: str, seq: int) -> dict:
+        try:
+            sql = _item_info_sql(phone_number, seq)
+            row = (await self.session.execute(sql)).first()
+        except Exception:
+            raise MySQLManagerError("Failed to get item info on DB.")
+        if row is None:
+            raise NotFoundError("This item does not exist.")
+        return row._asdict()
+
+    async def get_item_by_barcode(self, phone_number: str, barcode: str, version: int) -> dict:
+        """Get item info by barcode. Cached for BARCODE_TTL seconds per item version.
+        Args:
+            phone_number: user phone_number
+            barcode: scanned item barcode
+            version: user item version (get_item_counter). any item write changes the cache key.
+
+        Return: Same as MySQLManager.get_item_info
+
+        Raise:
+            Failed to get item info on DB.
+            This barcode item does not exist.
+        """
+        item = (await self.get_items_by_barcodes(phone_number, [barcode], version))[barcode]
+        if item is None:
+            raise NotFoundError("This barcode item does not exist.")
+        return item
+
+    async def get_items_by_barcodes(self, phone_number: str, barcodes: list, version: int) -> dict:
+        """Get item info of many barcodes with one query. Cached barcodes are not queried.
+        Args:
+            phone_number: user phone_number
+            barcodes: [barcode, ...]
+            version: user item version (get_item_counter)
+
+        Return:
+            {barcode: item info (Same as MySQLManager.get_item_info) or None if not exist, ...}
+
+        Raise:
+            Failed to get item info on DB.
+        """
+        result = {barcode: _barcode_cache.get((phone_number, barcode, version)) for barcode in barcodes}
+        missing = [barcode for barcode, item in result.items() if item is None]
+        if missing:
+            try:
+                rows = _rows_to_dict(await self.session.execute(_barcode_item_sql(phone_number, missing)))
+            except Exception:
+                raise MySQLManagerError("Failed to get item info on DB.")
+            # first seq of the same barcode is kept (rows are ordered by seq)
+            for row in reversed(rows):
+                if row["barcode"] in result:
+                    result[row["barcode"]] = row
+            for barcode in missing:
+                if result[barcode] is not None:
+                    _barcode_cache.set((phone_number, barcode, version), result[barcode])
+        return result
+
+    async def get_expiring_item(self, phone_number: str, start: str, end: str, page_number: int = 0,
+                                page_size: int = 10) -> tuple:
+        """Get items whose expiration_date is between start and end (included), ordered by expiration_date, seq.
+        Args:
+            **required**
+            phone_number: user phone_number
+            start, end: YYYY-MM-DD date
+
+            **optional**
+            page_number: page number
+            page_size: item count per page
+
+        Return:
+            ([item info (Same as get_item_info), ...], matched item count)
+
+        Raise:
+            Failed to get expiring item info on DB.
+        """
+        try:
+            rows = await self.session.execute(_expiring_item_sql(phone_number, start, end, page_number, page_size))
+            total = (await self.session.execute(_count_expiring_item_sql(phone_number, start, end))).scalar_one()
+            return _rows_to_dict(rows), total
+        except Exception:
+            raise MySQLManagerError("Failed to get expiring item info on DB.")
+
+    async def get_expiry_items(self, start: str, end: str, phone_number: str = None) -> list:
+        """Get items of every user (or a user) whose expiration_date is between start and end. (expiry scheduler)
+        Return:
+            [{"seq": seq, "phone_number": phone_number, "name": name, "expiration_date": expiration_date}, ...]
+
+        Raise:
+            Failed to get expiry item info on DB.
+        """
+        try:
+            return _rows_to_dict(await self.session.execute(_expiry_item_sql(start, end, phone_number)))
+        except Exception:
+            raise MySQLManagerError("Failed to get expiry item info on DB.")
+
+    async def get_expiry_items_by_seq(self, phone_number: str, seqs: list) -> list:
+        """Get seq, name and expiration_date of user items. (checked before expiry event is sent)
+        Return: Same as get_expiry_items (deleted items are not included)
+
+        Raise:
+            Failed to get expiry item info on DB.
+        """
+        try:
+            return _rows_to_dict(await self.session.execute(_expiry_item_by_seq_sql(phone_number, seqs)))
+        except Exception:
+            raise MySQLManagerError("Failed to get expiry item info on DB.")
+
+    async def get_item_stats(self, phone_number: str) -> dict:
+        """Get item count, average prices and margin per category from user_item_stat. (no user_item scan)
+        Args:
+            phone_number: user phone_number
+
+        Return:
+            {
+                "categories": [{
+                    "category": category,
+                    "item_count": item count,
+                    "avg_selling_price": average selling_price,
+                    "avg_cost_price": average cost_price,
+                    "margin": average selling_price - cost_price,
+                    "margin_rate": margin / selling_price (%)
+                }, ...] (ordered by category),
+                "total": Same as category stat of every item (without category)
+            }
+
+        Raise:
+            Failed to get item stats on DB.
+        """
+        try:
+            rows = (await self.session.execute(_item_stat_sql(phone_number))).all()
+        except Exception:
+            raise MySQLManagerError("Failed to get item stats on DB.")
+        categories = [dict(category=row.category, **_item_stat_summary(
+            row.item_count, row.selling_price_sum, row.cost_price_sum)) for row in rows]
+        total = [sum(row[i] for row in rows) for i in range(1, 4)]
+        return {"categories": categories, "total": _item_stat_summary(*total)}
+
+    async def rebuild_item_stats(self, phone_number: str) -> None:
+        """Recompute user_item_stat of user from user_item. (Same as python -m migration rebuild-stats)
+
+        Raise:
+            Failed to rebuild item stats on DB.
+        """
+        try:
+            await self.session.execute(_delete_item_stat_sql(phone_number))
+            await self.session.execute(_rebuild_item_stat_sql(phone_number))
+            await self.session.commit()
+        except Exception:
+            raise MySQLManagerError("Failed to rebuild item stats on DB.")
+
+    async def get_all_item(self, phone_number: str, page_number: int = 0,
+                           cursor: int = None, page_size: int = 10, lookahead: bool = False) -> list:
+        """Get all item info from user_item table.
+        Args:
+            **required**
+            phone_number: user phone_number
+
+            **optional**
+            page_number: page number (offset pagination)
+            cursor: last seen item seq (keyset pagination, used instead of page_number)
+            page_size: item count per page
+            lookahead: return up to page_size + 1 items (more than page_size: next page exists)
+
+        Return: Same as MySQLManager.get_all_item
+
+        Raise:
+            Failed to get all item info on DB.
+        """
+        try:
+            sql = _all_item_sql(phone_number, page_number, cursor, page_size, lookahead)
+            return _rows_to_dict(await self.session.execute(sql))
+        except Exception:
+            raise MySQLManagerError("Failed to get all item info on DB.")
+
+    async def get_search_item(self, phone_number: str, keyword: str, page_number: int = 0,
+                              cursor: int = None, page_size: int = 10, lookahead: bool = False) -> list:
+        """Get all item info from user_item table.
+        Args:
+            **required**
+            phone_number: user phone_number
+            keyword: user input keyword for searching
+
+            **optional**
+            page_number: page number (offset pagination)
+            cursor: last seen item seq (keyset pagination, used instead of page_number)
+            page_size: item count per page
+            lookahead: Same as get_all_item
+
+        Return: Same as MySQLManager.get_search_item
+
+        Raise:
+            Failed to get search item info on DB.
+        """
+        try:
+            if self.search_index is not None:
+                seqs = await self.search_index.search(
+                    phone_number, keyword, self.get_item_names, page_number, cursor, page_size, lookahead)
+                if not seqs:
+                    return []
+                sql = _items_by_seq_sql(phone_number, seqs)
+            else:
+                sql = _search_item_sql(phone_number, keyword, page_number, cursor, page_size, lookahead)
+            return _rows_to_dict(await self.session.execute(sql))
         except Exception:
             raise MySQLManagerError("Failed to get search item info on DB.")
 
+    async def get_fuzzy_search_item(self, phone_number: str, keyword: str, page_number: int = 0,
+                                    page_size: int = 10) -> tuple:
+        """Search items whose name (or a word of name) is within jamo edit distance of keyword with fuzzy_index.
+        (ex. "아매리카노" -> "아메리카노") Items are ordered by edit distance, then seq.
+        Args:
+            **required**
+            phone_number: user phone_number
+            keyword: user input keyword for searching
+
+            **optional**
+            page_number: page number
+            page_size: item count per page
+
+        Return:
+            ([item info (Same as get_item_info), ...], total matched item count)
+
+        Raise:
+            Failed to get fuzzy search item info on DB.
+        """
+        if self.fuzzy_index is None:
+            raise MySQLManagerError("Fuzzy search index is disabled.")
+        try:
+            seqs = await self.fuzzy_index.search(
+                phone_number, keyword, self.get_item_names, page_number, page_size=page_size)
+            total = await self.fuzzy_index.count(phone_number, keyword, self.get_item_names)
+            rows = {}
+            if seqs:
+                rows = {row["seq"]: row for row in _rows_to_dict(
+                    await self.session.execute(_items_by_seq_sql(phone_number, seqs)))}
+            return [rows[seq] for seq in seqs if seq in rows], total
+        except Exception:
+            raise MySQLManagerError("Failed to get fuzzy search item info on DB.")
+
+    async def get_infix_search_item(self, phone_number: str, terms: list, page_number: int = 0,
+                                    page_size: int = 10, version: int = None) -> tuple:
+        """Search items containing every term in name, initial or description with user_item_ngram.
+        Items are ordered by relevance (name 3, initial 2, description 1 per matched term), then seq.
+        Args:
+            **required**
+            phone_number: user phone_number
+            terms: normalized search terms (util.split_search_terms)
+
+            **optional**
+            page_number: page number
+            page_size: item count per page
+            version: user item version. total (ranked seqs of terms longer than 2 characters) is cached
+                     per version (any item write changes it)
+
+        Return:
+            ([item info (Same as get_item_info), ...], total matched item count)
+
+        Raise:
+            Failed to get infix search item info on DB.
+        """
+        try:
+            key = (phone_number, tuple(terms), version)
+            cached = _infix_search_cache.get(key) if version is not None else None
+            if all(len(term) <= 2 for term in terms):
+                # rank in DB and read the page only (cached: total)
+                total = cached
+                if total is None:
+                    total = (await self.session.execute(_count_infix_rank_sql(phone_number, terms))).scalar_one()
+                sql = _infix_rank_sql(phone_number, terms).limit(page_size).offset(page_number * page_size)
+                page = (await self.session.execute(sql)).scalars().all() if total else []
+                result = total
+            else:
+                # grams of longer terms may appear apart from each other, check item texts (cached: ranked seqs)
+                ranked = cached
+                if ranked is None:
+                    ranked = await self._rank_infix_search(phone_number, terms)
+                total, page = len(ranked), ranked[page_number * page_size:(page_number + 1) * page_size]
+                result = ranked
+            if version is not None and cached is None:
+                _infix_search_cache.set(key, result)
+            rows = {}
+            if page:
+                rows = {row["seq"]: row for row in _rows_to_dict(
+                    await self.session.execute(_items_by_seq_sql(phone_number, page)))}
+            return [rows[seq] for seq in page if seq in rows], total
+        except Exception:
+            raise MySQLManagerError("Failed to get infix search item info on DB.")
+
+    async def _rank_infix_search(self, phone_number: str, terms: list) -> list:
+        candidates = []
+        for term in terms:
+            matched = {}
+            for seq, field in await self.session.execute(_ngram_candidate_sql(phone_number, term)):
+                matched.setdefault(seq, set()).add(field)
+            candidates.append(matched)
+            if not matched:
+                return []
+        texts = None
+        if any(len(term) > 2 for term in terms):
+            seqs = sorted(set(candidates[0]).intersection(*candidates[1:]))
+            texts = {}
+            for chunk in _chunks(seqs):
+                rows = await self.session.execute(_item_text_sql(phone_number, chunk))
+                texts.update((row.seq, row) for row in rows)
+            # rows deleted after the grams were read
+            candidates = [{seq: fields for seq, fields in candidate.items() if seq in texts}
+                          for candidate in candidates]
+        return _rank_infix_match(terms, candidates, texts)
+
+    async def stream_all_item(self, phone_number: str, chunk_size: int = 1000) -> AsyncIterator[list]:
+        """Stream all item info of user with server-side cursor (yield_per).
+        Only chunk_size rows are kept in memory at once regardless of the item count.
+        Args:
+            phone_number: user phone_number
+            chunk_size: item count per chunk
+
+        Return:
+            async iterator of [item info (Same as get_item_info), ...]
+
+        Raise:
+            Failed to stream all item info on DB.
+        """
+        try:
+            sql = _export_item_sql(phone_number).execution_options(yield_per=chunk_size)
+            result = await self.session.stream(sql)
+            try:
+                async for partition in result.partitions():
+                    yield _rows_to_dict(partition)
+            finally:
+                await result.close()
+        except Exception:
+            raise MySQLManagerError("Failed to stream all item info on DB.")
+
+    async def get_item_names(self, phone_number: str) -> list:
+        """Get all item name, search_initial of user for search index.
+        Args:
+            phone_number: user phone_number
+
+        Return:
+            [(seq, name, search_initial), ...]
+
+        Raise:
+            Failed to get item names on DB.
+        """
+        try:
+            sql = _item_names_sql(phone_number)
+            return [tuple(row) for row in await self.session.execute(sql)]
+        except Exception:
+            raise MySQLManagerError("Failed to get item names on DB.")
+
 
 class MySQLManagerError(Exception):
     """All DBManager Error"""
+
+
+class DuplicateKeyError(MySQLManagerError):
+    """Unique key duplicate Error"""
+
+
+class NotFoundError(MySQLManagerError):
+    """Row not found Error"""
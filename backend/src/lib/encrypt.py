@@ -13,12 +13,12 @@ Raises:
 import base64
 from Crypto.Cipher import AES
 from Crypto.Util.Padding import pad, unpad
-from . import ENCRYTION_KEY
+from . import get_key
 
 
 class EncryptManager:
     def __init__(self) -> None:
-        self.dek = bytes(ENCRYTION_KEY, "utf-8")
+        self.dek = bytes(get_key("encryption_key"), "utf-8")
         self.Block_size = 16
     
     def encrypt_password(self, origin_pw: str) -> bytes:
@@ -0,0 +1,308 @@
+"""Expiry scheduler library
+
+ExpiryScheduler:
+    - 아이템 유통기한이 끝나는 시각(expiration_date 다음 날 0시)에 만료 이벤트를 보내는 프로세스 내 scheduler 입니다.
+    - 만료 시각 min-heap에서 가장 빠른 만료 시각까지 sleep 하므로 테이블을 polling 하지 않습니다.
+    - 시작할 때와 reload_interval(초)마다 horizon_days 안에 만료되는 아이템만 expiration_date 인덱스로 읽고,
+      같은 프로세스의 아이템 등록/유통기한 수정은 바로 heap에 추가합니다. (다른 worker의 변경은 다음 reload에 반영)
+    - 이벤트를 보내기 전에 아이템을 다시 조회해서 삭제되었거나 유통기한이 바뀐 아이템은 보내지 않습니다.
+    - 여러 worker에서 실행하면 이벤트가 중복되므로 한 프로세스에서만 활성화합니다.
+    - 프로세스가 멈춰 있던 동안 지난 만료 시각의 이벤트는 보내지 않습니다. (GET /item/expiring 으로 조회)
+    Functions:
+        - start: scheduler task를 시작합니다. 아이템은 task에서 로드하므로 DB 오류가 app 시작을 막지 않습니다.
+          (로드 실패 시 60초 뒤 다시 시도)
+        - stop: scheduler task를 멈춥니다.
+        - schedule: 아이템 만료 이벤트를 예약합니다. (horizon_days 이후 만료는 다음 reload에서 예약)
+        - refresh: 유저의 만료 예정 아이템을 다시 읽어 예약합니다. (일괄 등록/수정)
+        - reload: 모든 유저의 만료 예정 아이템을 다시 읽어 예약합니다.
+        - run_pending: 만료 시각이 지난 이벤트를 확인하고 handler로 보냅니다.
+        - stats: 예약된 이벤트 수와 보낸 이벤트 수, 오류 수를 조회합니다.
+
+log_handler, WebhookHandler:
+    - 만료 이벤트 handler 입니다. 이벤트 목록을 받는 async 함수입니다.
+    - log_handler: 이벤트를 logging으로 남깁니다.
+    - WebhookHandler: 이벤트 목록을 webhook url로 POST 합니다. ({"events": [event, ...]})
+
+get_expiry_scheduler:
+    - 이 프로세스에서 실행 중인 ExpiryScheduler를 조회합니다. (비활성화 또는 다른 worker에서 실행 중이면 None)
+
+start_expiry_scheduler, stop_expiry_scheduler:
+    - app startup/shutdown 때 ExpiryScheduler를 시작하고 멈춥니다.
+    - conf의 expiry_scheduler 설정으로 만들며(기본 비활성화), 여러 worker 중 lock_file의 lock을 얻은 한 worker에서만 실행합니다.
+      (lock은 프로세스가 끝나면 풀리고, 다시 시작된 worker가 lock을 얻어 실행)
+"""
+import os
+import time
+import fcntl
+import heapq
+import asyncio
+import logging
+import tempfile
+from datetime import date, datetime, timedelta
+from typing import Callable
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from . import EXPIRY_SCHEDULER
+from .db_connect import AsyncMySQLManager, get_async_sessionmaker
+
+logger = logging.getLogger(__name__)
+
+_expiry_scheduler = None
+# lock file held by the worker running the scheduler
+_lock_file = None
+
+
+def expire_time(expiration_date: str) -> float:
+    """Epoch seconds when item expires. (local midnight after expiration_date)"""
+    day = date.fromisoformat(expiration_date) + timedelta(days=1)
+    return datetime.combine(day, datetime.min.time()).timestamp()
+
+
+async def log_handler(events: list) -> None:
+    for event in events:
+        logger.info("item expired: phone_number=%s seq=%s name=%s expiration_date=%s",
+                    event["phone_number"], event["seq"], event["name"], event["expiration_date"])
+
+
+class WebhookHandler:
+    def __init__(self, url: str, timeout: float = 5.0) -> None:
+        self.url = url
+        self.timeout = timeout
+
+    async def __call__(self, events: list) -> None:
+        # imported on first webhook, not on app startup (webhook is optional)
+        import httpx
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            resp = await client.post(self.url, json={"events": events})
+            resp.raise_for_status()
+
+
+class ExpiryScheduler:
+    def __init__(self, sessionmaker: async_sessionmaker, handlers: list, horizon_days: int = 2,
+                 reload_interval: float = 3600, clock: Callable[[], float] = time.time) -> None:
+        """
+        Args:
+            sessionmaker: async sessionmaker to load and check items
+            handlers: [async function receives [event, ...], ...]
+            horizon_days: items expiring within horizon_days are kept in heap (longer than reload_interval)
+            reload_interval: seconds to reload items of every user (changes of other workers)
+            clock: function returns epoch seconds (test)
+        """
+        self.sessionmaker = sessionmaker
+        self.handlers = handlers
+        self.horizon_days = horizon_days
+        self.reload_interval = reload_interval
+        self.clock = clock
+        self.sent = 0
+        self.dropped = 0
+        self.errors = 0
+        # heap of (expire time, phone_number, seq), latest scheduled expiration_date of (phone_number, seq)
+        self._heap = []
+        self._scheduled = {}
+        self._next_reload = 0
+        # events scheduled while reload is loading items (kept after the reload)
+        self._reloading = None
+        # created in start (event loop of the app)
+        self._wakeup = None
+        self._task = None
+        self._refreshing = set()
+
+    def schedule(self, phone_number: str, seq: int, expiration_date: str) -> None:
+        """Schedule item expiry event. Replace the event scheduled before. (item update)"""
+        at = expire_time(expiration_date)
+        if not self.clock() <= at <= self._horizon():
+            return
+        self._scheduled[(phone_number, seq)] = expiration_date
+        heapq.heappush(self._heap, (at, phone_number, seq))
+        if self._reloading is not None:
+            self._reloading[(phone_number, seq)] = expiration_date
+        # wake up if the new event is earlier than the sleeping one
+        if self._wakeup is not None and self._heap[0][1:] == (phone_number, seq):
+            self._wakeup.set()
+
+    def refresh(self, phone_number: str) -> None:
+        """Reload user items in background. (bulk insert/update, seq of changed items is unknown)"""
+        if self._task is None or phone_number in self._refreshing:
+            return
+        self._refreshing.add(phone_number)
+        asyncio.get_running_loop().create_task(self._refresh(phone_number))
+
+    async def reload(self) -> None:
+        """Reload items of every user expiring within horizon_days."""
+        self._reloading = {}
+        try:
+            items = await self._load()
+        finally:
+            scheduled, self._reloading = self._reloading, None
+        self._heap, self._scheduled = [], {}
+        for item in items:
+            self.schedule(item["phone_number"], item["seq"], item["expiration_date"])
+        # item insert/update of this process committed after the load started
+        for (phone_number, seq), expiration_date in scheduled.items():
+            self.schedule(phone_number, seq, expiration_date)
+        self._next_reload = self.clock() + self.reload_interval
+
+    async def run_pending(self) -> int:
+        """Send events of items expired until now.
+        Return:
+            sent event count
+        """
+        due = {}
+        while self._heap and self._heap[0][0] <= self.clock():
+            at, phone_number, seq = heapq.heappop(self._heap)
+            expiration_date = self._scheduled.get((phone_number, seq))
+            # replaced by later schedule of the same item
+            if expiration_date is None or expire_time(expiration_date) != at:
+                continue
+            del self._scheduled[(phone_number, seq)]
+            due.setdefault(phone_number, {})[seq] = expiration_date
+        if not due:
+            return 0
+        events = await self._check(due)
+        if not events:
+            return 0
+        for handler in self.handlers:
+            try:
+                await handler(events)
+            except Exception as e:
+                self.errors += 1
+                logger.warning("expiry handler error: %r", e)
+        self.sent += len(events)
+        return len(events)
+
+    async def start(self) -> None:
+        """Start scheduler task. Items are loaded by the task. (retried after 60 seconds on error)"""
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._next_reload = 0
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "scheduled": len(self._scheduled),
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "next": self._heap[0][0] if self._heap else None
+        }
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                if self.clock() >= self._next_reload:
+                    await self.reload()
+                await self.run_pending()
+            except Exception as e:
+                self.errors += 1
+                logger.warning("expiry scheduler error: %r", e)
+                # retry in 60 seconds (failed reload is due now, so it is not kept by min)
+                now = self.clock()
+                self._next_reload = now + 60 if self._next_reload <= now else min(self._next_reload, now + 60)
+            # sleep until the earliest event or reload (no polling of the table)
+            wakeup_at = min(self._heap[0][0], self._next_reload) if self._heap else self._next_reload
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), max(0.0, wakeup_at - self.clock()))
+            except asyncio.TimeoutError:
+                pass
+
+    async def _refresh(self, phone_number: str) -> None:
+        try:
+            for item in await self._load(phone_number):
+                if self._scheduled.get((phone_number, item["seq"])) != item["expiration_date"]:
+                    self.schedule(phone_number, item["seq"], item["expiration_date"])
+        except Exception as e:
+            self.errors += 1
+            logger.warning("expiry scheduler refresh error: %r", e)
+        finally:
+            self._refreshing.discard(phone_number)
+
+    async def _load(self, phone_number: str = None) -> list:
+        # items expiring from today (expire time: tomorrow midnight) to the horizon
+        today = date.fromtimestamp(self.clock())
+        end = today + timedelta(days=self.horizon_days)
+        async with self.sessionmaker() as session:
+            return await AsyncMySQLManager(session).get_expiry_items(today.isoformat(), end.isoformat(), phone_number)
+
+    async def _check(self, due: dict) -> list:
+        # drop events of items deleted or changed by any worker since scheduled
+        events = []
+        async with self.sessionmaker() as session:
+            MySQLManager = AsyncMySQLManager(session)
+            for phone_number, items in due.items():
+                for row in await MySQLManager.get_expiry_items_by_seq(phone_number, list(items)):
+                    if row["expiration_date"] == items[row["seq"]]:
+                        events.append(row)
+        self.dropped += sum(map(len, due.values())) - len(events)
+        return events
+
+    def _horizon(self) -> float:
+        return self.clock() + self.horizon_days * 86400
+
+
+def get_expiry_scheduler():
+    """Get ExpiryScheduler running in this process. Return None if it is disabled or runs in another worker."""
+    return _expiry_scheduler
+
+
+async def start_expiry_scheduler() -> None:
+    """Start process-wide ExpiryScheduler in one worker. (app startup)"""
+    global _expiry_scheduler
+    if _expiry_scheduler is not None or not EXPIRY_SCHEDULER.get("enabled") or not _acquire_lock():
+        return
+    handlers = [log_handler]
+    if EXPIRY_SCHEDULER.get("webhook_url"):
+        handlers.append(WebhookHandler(EXPIRY_SCHEDULER["webhook_url"], EXPIRY_SCHEDULER.get("timeout", 5.0)))
+    _expiry_scheduler = ExpiryScheduler(
+        get_async_sessionmaker(), handlers,
+        horizon_days=EXPIRY_SCHEDULER.get("horizon_days", 2),
+        reload_interval=EXPIRY_SCHEDULER.get("reload_interval", 3600))
+    await _expiry_scheduler.start()
+
+
+async def stop_expiry_scheduler() -> None:
+    """Stop process-wide ExpiryScheduler. (app shutdown)"""
+    global _expiry_scheduler
+    if _expiry_scheduler is not None:
+        await _expiry_scheduler.stop()
+    _expiry_scheduler = None
+    _release_lock()
+
+
+def _acquire_lock() -> bool:
+    # non-blocking, other workers skip the scheduler
+    global _lock_file
+    path = EXPIRY_SCHEDULER.get("lock_file") or os.path.join(tempfile.gettempdir(), "cafe_expiry_scheduler.lock")
+    lock_file = open(path, "a")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return False
+    _lock_file = lock_file
+    return True
+
+
+def _release_lock() -> None:
+    global _lock_file
+    if _lock_file is not None:
+        _lock_file.close()
+    _lock_file = None
+
+
+def _reset_after_fork() -> None:
+    # the scheduler task belongs to the parent. closing the inherited lock file keeps the lock of the parent
+    global _expiry_scheduler
+    _expiry_scheduler = None
+    _release_lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
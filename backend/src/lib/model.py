@@ -3,7 +3,7 @@
 User:
     - user_auth 테이블 DB 객체 model입니다.
     - seq: 번호
-    - phone_number: user phone_number
+    - phone_number: user phone_number (unique)
     - password: user password
     - timestamp: insert timestamp
 
@@ -16,21 +16,73 @@ Item:
     - cost_price: item cost_price
     - name: item name
     - description: item description
-    - expiration_date: item expiration_date
+    - expiration_date: item expiration_date (DATE, API에서는 YYYY-MM-DD 문자열)
     - size: item size
     - search_initial: item search_initial
+    - idx_user_item_phone_seq: 유저별 아이템 조회, cursor 페이지네이션
+    - idx_user_item_phone_name, idx_user_item_phone_initial: 유저별 이름/초성 prefix 검색 (LIKE 'x%')
+    - idx_user_item_phone_barcode: 유저별 바코드 조회 (같은 바코드 아이템이 있을 수 있어 unique 아님)
+    - idx_user_item_phone_expiration: 유저별 유통기한 임박 아이템 조회
+    - idx_user_item_expiration: 모든 유저의 만료 예정 아이템 조회 (expiry scheduler)
+
+ItemVersion:
+    - user_item_version 테이블 DB 객체 model입니다.
+    - phone_number: user phone_number (primary key)
+    - version: 유저 아이템이 변경될 때마다 1씩 증가하는 버전 (아이템 조회 API ETag)
+    - item_count: 유저 아이템 수 (아이템 등록/삭제 시 같은 transaction에서 변경, 아이템 목록 API total)
+
+ItemNgram:
+    - user_item_ngram 테이블 DB 객체 model입니다. (아이템 부분 검색 inverted index)
+    - phone_number: user phone_number
+    - gram: 정규화된 아이템 이름/초성/설명의 bigram (util.extract_ngrams)
+    - seq: item seq
+    - field: gram이 나온 필드 (n: name, i: search_initial, d: description)
+    - primary key (phone_number, gram, seq, field): 유저별 gram 조회
+    - idx_user_item_ngram_phone_seq: 아이템 수정/삭제 시 gram 삭제
+
+ItemStat:
+    - user_item_stat 테이블 DB 객체 model입니다. (유저별 카테고리 통계)
+    - phone_number: user phone_number
+    - category: item category
+    - item_count: 카테고리 아이템 수
+    - selling_price_sum, cost_price_sum: 카테고리 아이템 판매가/원가 합계
+    - primary key (phone_number, category): 유저별 카테고리 통계 조회
+    - 아이템 등록/수정/삭제 시 같은 transaction에서 변경분(delta)만큼 더합니다.
     
 """
+from datetime import date
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
-from sqlalchemy import VARCHAR
+from sqlalchemy import VARCHAR, BigInteger, Date, Index
+from sqlalchemy.types import TypeDecorator
 
 
 class Base(DeclarativeBase):
     pass
 
 
+class IsoDate(TypeDecorator):
+    """DATE column read and written as YYYY-MM-DD string. (API, cache and export keep the string format)"""
+    impl = Date
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if isinstance(value, str):
+            return date.fromisoformat(value)
+        return value
+
+    def process_literal_param(self, value, dialect):
+        # EXPLAIN of statements compiled with literal_binds (rendered by Date)
+        return self.process_bind_param(value, dialect)
+
+    def process_result_value(self, value, dialect):
+        return value.isoformat() if value is not None else None
+
+
 class User(Base):
     __tablename__ = "user_auth"
+    __table_args__ = (
+        Index("idx_user_auth", "phone_number", unique=True),
+    )
     
     seq: Mapped[int] = mapped_column(
         primary_key=True, autoincrement=True, nullable=False)
@@ -44,6 +96,15 @@ class User(Base):
 
 class Item(Base):
     __tablename__ = "user_item"
+    # every query filters phone_number first
+    __table_args__ = (
+        Index("idx_user_item_phone_seq", "phone_number", "seq"),
+        Index("idx_user_item_phone_name", "phone_number", "name"),
+        Index("idx_user_item_phone_initial", "phone_number", "search_initial"),
+        Index("idx_user_item_phone_barcode", "phone_number", "barcode"),
+        Index("idx_user_item_phone_expiration", "phone_number", "expiration_date"),
+        Index("idx_user_item_expiration", "expiration_date"),
+    )
     
     seq: Mapped[int] = mapped_column(
         primary_key=True, autoincrement=True, nullable=False)
@@ -54,9 +115,50 @@ class Item(Base):
     name: Mapped[str] = mapped_column(VARCHAR(200), nullable=False)
     description: Mapped[str] = mapped_column(VARCHAR(1000), nullable=True)
     barcode:  Mapped[str] = mapped_column(VARCHAR(200), nullable=False)
-    expiration_date: Mapped[str] = mapped_column(VARCHAR(200), nullable=False)
+    expiration_date: Mapped[str] = mapped_column(IsoDate, nullable=False)
     size: Mapped[str] = mapped_column(VARCHAR(100), nullable=False) # small/ large
     search_initial: Mapped[str] = mapped_column(VARCHAR(200), nullable=False)
     
     def __repr__(self) -> str:
         return f"Item(name={self.name})"
+
+
+class ItemVersion(Base):
+    __tablename__ = "user_item_version"
+
+    phone_number: Mapped[str] = mapped_column(VARCHAR(200), primary_key=True)
+    version: Mapped[int] = mapped_column(nullable=False, default=0)
+    item_count: Mapped[int] = mapped_column(nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"ItemVersion(phone_number={self.phone_number}, version={self.version}, item_count={self.item_count})"
+
+
+class ItemNgram(Base):
+    __tablename__ = "user_item_ngram"
+    __table_args__ = (
+        Index("idx_user_item_ngram_phone_seq", "phone_number", "seq"),
+    )
+
+    phone_number: Mapped[str] = mapped_column(VARCHAR(200), primary_key=True)
+    # grams are compared by code point (utf8mb4_bin, ex. "ㄱ" and "가" are different)
+    gram: Mapped[str] = mapped_column(
+        VARCHAR(8).with_variant(VARCHAR(8, collation="utf8mb4_bin"), "mysql"), primary_key=True)
+    seq: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    field: Mapped[str] = mapped_column(VARCHAR(1), primary_key=True)
+
+    def __repr__(self) -> str:
+        return f"ItemNgram(gram={self.gram}, seq={self.seq}, field={self.field})"
+
+
+class ItemStat(Base):
+    __tablename__ = "user_item_stat"
+
+    phone_number: Mapped[str] = mapped_column(VARCHAR(200), primary_key=True)
+    category: Mapped[str] = mapped_column(VARCHAR(200), primary_key=True)
+    item_count: Mapped[int] = mapped_column(nullable=False, default=0)
+    selling_price_sum: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    cost_price_sum: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"ItemStat(phone_number={self.phone_number}, category={self.category}, item_count={self.item_count})"
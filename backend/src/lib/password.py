@@ -0,0 +1,148 @@
+"""Password hash library
+
+PasswordHasher:
+    - 유저 비밀번호를 scrypt로 해싱하는 Password Hasher 입니다.
+    - scrypt 연산은 CPU를 오래 사용하므로 프로세스당 하나의 ProcessPoolExecutor에서 실행하고,
+      API 핸들러는 await 하는 동안 이벤트 루프를 막지 않습니다.
+    - hashing 프로세스 수는 conf password_hash.max_workers, 없으면 CPU 수를 worker 수로 나눈 값입니다.
+      (worker마다 CPU 수만큼 만들면 서버 전체에서 CPU 수 x worker 수가 됨)
+    - 해시 형식: $scrypt$ln={cost},r={r},p={p}${salt}${hash}
+    Functions:
+        - hash_password: 유저의 비밀번호를 해싱합니다.
+        - verify_password: 유저의 비밀번호가 해시와 일치하는지 상수 시간으로 비교합니다.
+        - is_hashed: 저장된 비밀번호가 scrypt 해시인지 확인합니다. (아니면 기존 AES 암호문)
+        - needs_rehash: 저장된 비밀번호를 현재 cost factor로 다시 해싱해야 하는지 확인합니다.
+
+get_password_hasher:
+    - 프로세스당 하나의 PasswordHasher를 처음 사용할 때 만들어 조회합니다. (import 시 conf를 읽지 않음)
+
+Raises:
+    PasswordHasherError: PasswordHasher 클래스에서 발생한 오류
+
+"""
+import os
+import hmac
+import base64
+import asyncio
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from . import PASSWORD_HASH
+from .server import worker_count
+
+PREFIX = "$scrypt$"
+BLOCK_SIZE = 8
+PARALLELISM = 1
+
+# process-wide hashing pool, hasher (created lazily on first use)
+_executor = None
+_password_hasher = None
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """Get process-wide bounded hashing pool. (default: cpu count divided by worker count, at least 1)"""
+    global _executor
+    if _executor is None:
+        max_workers = PASSWORD_HASH.get("max_workers") or max(1, (os.cpu_count() or 1) // worker_count())
+        _executor = ProcessPoolExecutor(max_workers=max_workers)
+    return _executor
+
+
+def shutdown_executor() -> None:
+    """Shutdown process-wide hashing pool."""
+    global _executor
+    if _executor is not None:
+        # cancel_futures needs python 3.9 (image is 3.8). requests are drained before app shutdown
+        _executor.shutdown(wait=False)
+    _executor = None
+
+
+def _reset_executor_after_fork() -> None:
+    # hashing processes belong to the parent
+    global _executor
+    _executor = None
+
+
+os.register_at_fork(after_in_child=_reset_executor_after_fork)
+
+
+def _scrypt(password: str, salt: bytes, cost: int, r: int, p: int) -> bytes:
+    """Run scrypt in hashing pool process."""
+    n = 2 ** cost
+    return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p,
+                          maxmem=256 * n * r * p, dklen=32)
+
+
+class PasswordHasher:
+    def __init__(self, cost: int = None) -> None:
+        self.cost = cost or PASSWORD_HASH.get("cost", 14)
+
+    async def hash_password(self, origin_pw: str) -> str:
+        """Hash password.
+        Args:
+            origin_pw: user password
+
+        Return:
+            hash_pw
+
+        Raise:
+            Failed to hash password.
+        """
+        try:
+            salt = os.urandom(16)
+            digest = await asyncio.get_running_loop().run_in_executor(
+                get_executor(), _scrypt, origin_pw, salt, self.cost, BLOCK_SIZE, PARALLELISM)
+            return f"{PREFIX}ln={self.cost},r={BLOCK_SIZE},p={PARALLELISM}$" \
+                f"{base64.b64encode(salt).decode()}${base64.b64encode(digest).decode()}"
+        except Exception:
+            raise PasswordHasherError("Failed to hash password.")
+
+    async def verify_password(self, origin_pw: str, hash_pw: str) -> bool:
+        """Verify password.
+        Args:
+            origin_pw: user input password
+            hash_pw: user hash password
+
+        Return:
+            True if password matches
+
+        Raise:
+            Failed to verify password.
+        """
+        try:
+            cost, r, p, salt, digest = self._parse(hash_pw)
+            result = await asyncio.get_running_loop().run_in_executor(
+                get_executor(), _scrypt, origin_pw, salt, cost, r, p)
+            return hmac.compare_digest(result, digest)
+        except Exception:
+            raise PasswordHasherError("Failed to verify password.")
+
+    @staticmethod
+    def is_hashed(stored_pw: str) -> bool:
+        """Check stored password is scrypt hash. (not legacy AES password)"""
+        return isinstance(stored_pw, str) and stored_pw.startswith(PREFIX)
+
+    def needs_rehash(self, stored_pw: str) -> bool:
+        """Check stored password needs to be hashed again with current cost factor."""
+        if not self.is_hashed(stored_pw):
+            return True
+        cost, r, p, _, _ = self._parse(stored_pw)
+        return (cost, r, p) != (self.cost, BLOCK_SIZE, PARALLELISM)
+
+    @staticmethod
+    def _parse(hash_pw: str) -> tuple:
+        params, salt, digest = hash_pw[len(PREFIX):].split("$")
+        params = dict(param.split("=") for param in params.split(","))
+        return (int(params["ln"]), int(params["r"]), int(params["p"]),
+                base64.b64decode(salt), base64.b64decode(digest))
+
+
+def get_password_hasher() -> PasswordHasher:
+    """Get process-wide PasswordHasher."""
+    global _password_hasher
+    if _password_hasher is None:
+        _password_hasher = PasswordHasher()
+    return _password_hasher
+
+
+class PasswordHasherError(Exception):
+    """All PasswordHasher Error"""
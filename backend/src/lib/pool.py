@@ -0,0 +1,157 @@
+"""DB connection pool library
+
+pool_options:
+    - conf의 db_pool 설정(환경별)으로 engine의 connection pool 옵션을 만듭니다.
+    - pool_size, max_overflow가 없으면 server.worker_pool_size(db_connection_budget을 worker 수로 나눈 값)를 사용합니다.
+    - sync engine(migration, 스크립트)은 connection 1개(pool_size 1, max_overflow 0)만 사용하고 예산에서 제외합니다.
+      (API 요청은 async engine만 사용하므로 worker별 connection은 예산의 몫을 넘지 않음)
+    - pool_pre_ping(기본 true): connection을 pool에서 꺼낼 때 ping으로 확인하고,
+      MySQL이 끊은 idle connection은 요청에서 오류를 내지 않고 새 connection으로 바꿉니다. (checkout마다 왕복 1번)
+    - pool_recycle(기본 500초): MySQL wait_timeout보다 오래된 connection은 꺼낼 때 다시 연결합니다.
+
+PoolStats:
+    - SQLAlchemy pool event(connect, checkout, checkin, invalidate)로 connection pool 사용량을 집계합니다.
+    - StatsQueuePool, StatsAsyncQueuePool은 pool에서 connection을 얻기까지 기다린 시간(wait)과
+      pool_timeout 초과(timeouts)를 함께 기록합니다. (engine.dispose로 pool을 다시 만들어도 유지)
+    - 집계는 프로세스(worker)별입니다.
+    Functions:
+        - watch: engine의 pool event를 구독하고 pool에 PoolStats를 연결합니다.
+        - snapshot: 현재 checked_out, idle, overflow와 누적 wait, hold(connection 사용 시간) 통계를 조회합니다.
+"""
+import time
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.pool import Pool, QueuePool, AsyncAdaptedQueuePool
+from . import DB_POOL
+from .server import worker_pool_size
+
+DEFAULT_POOL_RECYCLE = 500
+DEFAULT_POOL_TIMEOUT = 30
+# sync engine pool, not counted in db_connection_budget
+SYNC_POOL_SIZE = 1
+SYNC_MAX_OVERFLOW = 0
+
+
+def pool_options(sync: bool = False) -> dict:
+    """Get connection pool options of engine from conf db_pool.
+    Args:
+        sync: options of sync engine (pool_size 1, max_overflow 0 regardless of conf)
+    """
+    if sync:
+        pool_size, max_overflow = SYNC_POOL_SIZE, SYNC_MAX_OVERFLOW
+    else:
+        pool_size, max_overflow = worker_pool_size()
+        pool_size = DB_POOL.get("pool_size", pool_size)
+        max_overflow = DB_POOL.get("max_overflow", max_overflow)
+    return {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_recycle": DB_POOL.get("pool_recycle", DEFAULT_POOL_RECYCLE),
+        "pool_timeout": DB_POOL.get("pool_timeout", DEFAULT_POOL_TIMEOUT),
+        "pool_pre_ping": DB_POOL.get("pool_pre_ping", True)
+    }
+
+
+class PoolStats:
+    def __init__(self) -> None:
+        self.connects = 0
+        self.checkouts = 0
+        self.invalidated = 0
+        self.timeouts = 0
+        # checkouts waiting for a connection now
+        self.waiting = 0
+        self.wait_count = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.hold_count = 0
+        self.hold_total = 0.0
+        self.hold_max = 0.0
+
+    def watch(self, engine: Engine) -> None:
+        """Listen pool events of engine. (sync engine, or sync_engine of async engine)"""
+        engine.pool.stats = self
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        event.listen(engine, "invalidate", self._on_invalidate)
+
+    def add_wait(self, seconds: float) -> None:
+        self.wait_count += 1
+        self.wait_total += seconds
+        self.wait_max = max(self.wait_max, seconds)
+
+    def snapshot(self, pool: Pool) -> dict:
+        """Get pool state and stats.
+        Return:
+            {
+                "size": pool_size, "max_overflow": max_overflow,
+                "checked_out": connections in use, "idle": connections in pool,
+                "overflow": connections opened over pool_size, "waiting": checkouts waiting for a connection,
+                "connects", "checkouts", "invalidated" (dead or stale connection), "timeouts" (pool_timeout),
+                "wait_avg_ms", "wait_max_ms": time to get a connection from pool (with connect),
+                "hold_avg_ms", "hold_max_ms": time from checkout to checkin
+            }
+        """
+        return {
+            "size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": max(0, pool.overflow()),
+            "waiting": self.waiting,
+            "connects": self.connects,
+            "checkouts": self.checkouts,
+            "invalidated": self.invalidated,
+            "timeouts": self.timeouts,
+            "wait_avg_ms": self.wait_total / self.wait_count * 1000 if self.wait_count else 0.0,
+            "wait_max_ms": self.wait_max * 1000,
+            "hold_avg_ms": self.hold_total / self.hold_count * 1000 if self.hold_count else 0.0,
+            "hold_max_ms": self.hold_max * 1000
+        }
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        self.checkouts += 1
+        connection_record.info["checkout_at"] = time.perf_counter()
+
+    def _on_checkin(self, dbapi_connection, connection_record) -> None:
+        checkout_at = connection_record.info.pop("checkout_at", None)
+        if checkout_at is not None:
+            hold = time.perf_counter() - checkout_at
+            self.hold_count += 1
+            self.hold_total += hold
+            self.hold_max = max(self.hold_max, hold)
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        self.invalidated += 1
+
+
+class StatsQueuePool(QueuePool):
+    """QueuePool recording wait time to get a connection."""
+    stats = None
+
+    def _do_get(self):
+        if self.stats is None:
+            return super()._do_get()
+        self.stats.waiting += 1
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except TimeoutError:
+            self.stats.timeouts += 1
+            raise
+        finally:
+            self.stats.waiting -= 1
+            self.stats.add_wait(time.perf_counter() - start)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+class StatsAsyncQueuePool(StatsQueuePool, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool recording wait time to get a connection."""
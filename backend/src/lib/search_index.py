@@ -0,0 +1,475 @@
+"""Search index library
+
+ItemTrie:
+    - 유저 한 명의 아이템 이름/초성 prefix 검색을 위한 trie 입니다.
+    - 각 노드는 그 prefix로 시작하는 아이템 seq 집합을 가지므로 검색은 prefix 길이만큼만 탐색합니다.
+    Functions:
+        - add: 아이템 이름과 초성을 trie에 추가합니다.
+        - remove: 아이템을 trie에서 삭제합니다.
+        - search: prefix로 시작하는 아이템 seq 집합을 조회합니다.
+
+FuzzyItemIndex:
+    - 유저 한 명의 아이템 이름 오타 검색을 위한 symmetric delete 인덱스입니다.
+    - 이름(공백 제거)과 이름의 각 단어를 자모로 분해한 key마다 앞/뒤 FUZZY_PREFIX_LENGTH 자모에서
+      FUZZY_MAX_DISTANCE개 이하를 지운 문자열을 저장합니다. (같은 key는 한 번만 저장)
+    - 검색어도 같은 방식으로 지운 문자열로 앞/뒤 모두 일치하는 key만 후보로 찾으므로 모든 아이템과
+      편집 거리를 계산하지 않고, 후보 key만 자모 단위 편집 거리(인접 자모 교환 포함)를 계산합니다.
+    Functions:
+        - add: 아이템 이름을 인덱스에 추가합니다.
+        - remove: 아이템을 인덱스에서 삭제합니다.
+        - search: 검색어와 편집 거리가 max_distance 이하인 아이템 seq와 거리를 조회합니다.
+
+SearchIndex:
+    - 유저(phone_number)별 ItemTrie를 프로세스 메모리에 저장하는 검색 인덱스입니다.
+    - 유저의 첫 검색 때 DB에서 이름/초성을 읽어 trie를 만들고(lazy load),
+      아이템 등록/수정/삭제 시 이미 로드된 trie를 바로 수정합니다.
+    - 메모리 사용량(추정치)이 max_bytes를 넘으면 가장 오래 검색하지 않은 유저부터 제거합니다.
+    - 프로세스별 인덱스이므로 다른 worker의 변경은 ttl(초)이 지나 다시 로드할 때 반영됩니다.
+    - 같은 유저의 동시 검색은 로드를 한 번만 하고, 로드 중에 아이템이 등록/수정/삭제되면(generation 증가)
+      로드한 trie는 그 요청에만 사용하고 저장하지 않습니다. (다음 검색 때 다시 로드)
+    Functions:
+        - search: 유저의 아이템 중 keyword로 시작하는 아이템 seq를 페이지 단위로 조회합니다.
+        - count: 유저의 아이템 중 keyword로 시작하는 아이템 수를 조회합니다.
+        - add: 로드된 유저 trie에 아이템을 추가합니다.
+        - remove: 로드된 유저 trie에서 아이템을 삭제합니다.
+        - invalidate: 유저 trie를 제거합니다. (다음 검색 때 다시 로드)
+        - stats: 인덱스 사용량과 hit/miss, 저장하지 않은 로드(discards) 카운트를 조회합니다.
+
+FuzzySearchIndex:
+    - SearchIndex와 같이 유저별 FuzzyItemIndex를 lazy load, 수정, 제거합니다.
+    - search는 편집 거리, seq 순서로 조회합니다. (cursor 미지원)
+
+get_search_index:
+    - conf의 search_index 설정으로 프로세스당 하나의 SearchIndex를 만듭니다. (비활성화 시 None)
+
+get_fuzzy_index:
+    - conf의 fuzzy_index 설정으로 프로세스당 하나의 FuzzySearchIndex를 만듭니다. (기본 활성화, 비활성화 시 None)
+
+fuzzy_distance:
+    - 검색어 자모 수에 따른 최대 편집 거리입니다. (4자모 미만 0, 8자모 미만 1, 이상 2)
+"""
+import os
+import time
+import heapq
+import asyncio
+from collections import OrderedDict
+from typing import Awaitable, Callable
+from . import SEARCH_INDEX, FUZZY_INDEX
+from .util import normalize_search_text, decompose_jamo
+
+# estimated memory per trie node(object, children dict, seq set) and per seq reference
+NODE_BYTES = 500
+REF_BYTES = 60
+# estimated memory per fuzzy index string(str, set, dict slot)
+DELETE_BYTES = 350
+
+# deletes of the first and last FUZZY_PREFIX_LENGTH jamo are indexed (candidates are checked with full edit distance)
+FUZZY_PREFIX_LENGTH = 6
+FUZZY_MAX_DISTANCE = 2
+
+_search_index = None
+_fuzzy_index = None
+
+
+def get_search_index():
+    """Get process-wide SearchIndex. Return None if search index is disabled."""
+    global _search_index
+    if _search_index is None and SEARCH_INDEX.get("enabled"):
+        _search_index = SearchIndex(
+            max_bytes=SEARCH_INDEX.get("max_bytes", 256 * 1024 * 1024),
+            ttl=SEARCH_INDEX.get("ttl", 60))
+    return _search_index
+
+
+def get_fuzzy_index():
+    """Get process-wide FuzzySearchIndex. Return None if fuzzy index is disabled."""
+    global _fuzzy_index
+    if _fuzzy_index is None and FUZZY_INDEX.get("enabled", True):
+        _fuzzy_index = FuzzySearchIndex(
+            max_bytes=FUZZY_INDEX.get("max_bytes", 256 * 1024 * 1024),
+            ttl=FUZZY_INDEX.get("ttl", 60))
+    return _fuzzy_index
+
+
+def _reset_index_after_fork() -> None:
+    # every worker loads its own index
+    global _search_index, _fuzzy_index
+    _search_index = _fuzzy_index = None
+
+
+os.register_at_fork(after_in_child=_reset_index_after_fork)
+
+
+def fuzzy_distance(keyword: str) -> int:
+    """Max edit distance of keyword. (one jamo typo per 4 jamo, up to FUZZY_MAX_DISTANCE)"""
+    return min(FUZZY_MAX_DISTANCE, len(decompose_jamo(normalize_search_text(keyword))) // 4)
+
+
+def _deletes(text: str, distance: int) -> set:
+    result = edge = {text}
+    for _ in range(distance):
+        edge = {word[:i] + word[i + 1:] for word in edge for i in range(len(word))}
+        result = result | edge
+    return result
+
+
+def _edit_distance(a: str, b: str, max_distance: int) -> int:
+    """Edit distance with adjacent transposition. Return max_distance + 1 if it is over max_distance."""
+    limit = max_distance + 1
+    if abs(len(a) - len(b)) > max_distance:
+        return limit
+    # common prefix and suffix don't change distance
+    prefix = 0
+    while prefix < min(len(a), len(b)) and a[prefix] == b[prefix]:
+        prefix += 1
+    a, b = a[prefix:], b[prefix:]
+    suffix = 0
+    while suffix < min(len(a), len(b)) and a[-1 - suffix] == b[-1 - suffix]:
+        suffix += 1
+    a, b = a[:len(a) - suffix], b[:len(b) - suffix]
+    if not a or not b:
+        return min(max(len(a), len(b)), limit)
+    # only cells within max_distance of the diagonal can be under limit
+    before, previous = None, [min(j, limit) for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        low, high = max(1, i - max_distance), min(len(b), i + max_distance)
+        current = [limit] * (len(b) + 1)
+        current[0] = min(i, limit)
+        for j in range(low, high + 1):
+            distance = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                distance = min(distance, before[j - 2] + 1)
+            current[j] = min(distance, limit)
+        if min(current[low - 1:high + 1]) >= limit:
+            return limit
+        before, previous = previous, current
+    return previous[-1]
+
+
+def _fuzzy_keys(name: str) -> set:
+    # whole name without whitespace and each word (ex. "바닐라 라떼" -> 바닐라라떼, 바닐라, 라떼)
+    words = name.split()
+    texts = [name] + words if len(words) > 1 else [name]
+    return {decompose_jamo(text) for text in map(normalize_search_text, texts) if text}
+
+
+class _Node:
+    __slots__ = ("children", "seqs")
+
+    def __init__(self) -> None:
+        self.children = {}
+        self.seqs = set()
+
+
+class ItemTrie:
+    def __init__(self) -> None:
+        self.root = _Node()
+        self.keys = {}
+        self.nodes = 1
+        self.refs = 0
+
+    @property
+    def nbytes(self) -> int:
+        return self.nodes * NODE_BYTES + self.refs * REF_BYTES
+
+    def add(self, seq: int, name: str, search_initial: str) -> None:
+        """Add item name and search_initial."""
+        self.remove(seq)
+        keys = {name.lower(), search_initial.lower()}
+        self.keys[seq] = keys
+        for key in keys:
+            node = self.root
+            for char in key:
+                child = node.children.get(char)
+                if child is None:
+                    child = node.children[char] = _Node()
+                    self.nodes += 1
+                node = child
+                # name and search_initial can share prefix nodes
+                if seq not in node.seqs:
+                    node.seqs.add(seq)
+                    self.refs += 1
+
+    def remove(self, seq: int) -> None:
+        """Remove item. Empty nodes are pruned."""
+        for key in self.keys.pop(seq, ()):
+            path = [self.root]
+            for char in key:
+                node = path[-1].children.get(char)
+                if node is None:
+                    break
+                path.append(node)
+            for depth in range(len(path) - 1, 0, -1):
+                node = path[depth]
+                if seq in node.seqs:
+                    node.seqs.discard(seq)
+                    self.refs -= 1
+                # child seqs are subset of parent seqs, so empty node has no child
+                if not node.seqs:
+                    del path[depth - 1].children[key[depth - 1]]
+                    self.nodes -= 1
+
+    def search(self, prefix: str) -> set:
+        """Search item seqs which name or search_initial starts with prefix."""
+        node = self.root
+        for char in prefix.lower():
+            node = node.children.get(char)
+            if node is None:
+                return set()
+        return node.seqs
+
+
+class FuzzyItemIndex:
+    def __init__(self) -> None:
+        # key prefix / suffix -> {key, ...}, delete string -> {prefix / suffix, ...}, key -> {seq, ...}
+        self.prefixes = {}
+        self.suffixes = {}
+        self.prefix_deletes = {}
+        self.suffix_deletes = {}
+        self.seqs = {}
+        self.keys = {}
+        self.refs = 0
+        # page and count of the same keyword search once
+        self.last_search = None
+
+    @property
+    def nbytes(self) -> int:
+        strings = len(self.prefixes) + len(self.suffixes) + len(self.prefix_deletes) + len(self.suffix_deletes)
+        return (strings + len(self.seqs)) * DELETE_BYTES + self.refs * REF_BYTES
+
+    def add(self, seq: int, name: str, search_initial: str = None) -> None:
+        """Add item name. (search_initial is not indexed, same signature as ItemTrie.add)"""
+        self.remove(seq)
+        self.last_search = None
+        keys = _fuzzy_keys(name)
+        self.keys[seq] = keys
+        for key in keys:
+            seqs = self.seqs.get(key)
+            if seqs is None:
+                seqs = self.seqs[key] = set()
+                for parts, deletes, part in self._key_parts(key):
+                    # deletes are stored once per distinct prefix / suffix (ex. names starting with the same word)
+                    if part not in parts:
+                        parts[part] = set()
+                        for text in _deletes(part, FUZZY_MAX_DISTANCE):
+                            deletes.setdefault(text, set()).add(part)
+                            self.refs += 1
+                    parts[part].add(key)
+                    self.refs += 1
+            seqs.add(seq)
+            self.refs += 1
+
+    def remove(self, seq: int) -> None:
+        self.last_search = None
+        for key in self.keys.pop(seq, ()):
+            seqs = self.seqs[key]
+            seqs.discard(seq)
+            self.refs -= 1
+            if seqs:
+                continue
+            del self.seqs[key]
+            for parts, deletes, part in self._key_parts(key):
+                parts[part].discard(key)
+                self.refs -= 1
+                if parts[part]:
+                    continue
+                del parts[part]
+                for text in _deletes(part, FUZZY_MAX_DISTANCE):
+                    deletes[text].discard(part)
+                    self.refs -= 1
+                    if not deletes[text]:
+                        del deletes[text]
+
+    def search(self, keyword: str, max_distance: int = None) -> dict:
+        """Search items within max_distance(default: fuzzy_distance) jamo edits from keyword.
+        Return:
+            {seq: edit distance, ...}
+        """
+        if max_distance is None:
+            max_distance = fuzzy_distance(keyword)
+        max_distance = min(max_distance, FUZZY_MAX_DISTANCE)
+        if self.last_search is not None and self.last_search[0] == (keyword, max_distance):
+            return self.last_search[1]
+        query = decompose_jamo(normalize_search_text(keyword))
+        if not query:
+            return {}
+        # a key within max_distance matches both prefix and suffix deletes of query
+        candidates = None
+        for parts, deletes, part in self._key_parts(query):
+            matched = set()
+            for text in _deletes(part, max_distance):
+                matched.update(deletes.get(text, ()))
+            keys = set().union(*(parts[part] for part in matched))
+            candidates = keys if candidates is None else candidates & keys
+        result = {}
+        for key in candidates:
+            distance = _edit_distance(query, key, max_distance)
+            if distance > max_distance:
+                continue
+            for seq in self.seqs[key]:
+                if result.get(seq, max_distance + 1) > distance:
+                    result[seq] = distance
+        self.last_search = ((keyword, max_distance), result)
+        return result
+
+    def _key_parts(self, key: str) -> tuple:
+        return ((self.prefixes, self.prefix_deletes, key[:FUZZY_PREFIX_LENGTH]),
+                (self.suffixes, self.suffix_deletes, key[-FUZZY_PREFIX_LENGTH:]))
+
+
+class SearchIndex:
+    # per user index (ItemTrie or FuzzyItemIndex)
+    index_class = ItemTrie
+
+    def __init__(self, max_bytes: int, ttl: float = None) -> None:
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.discards = 0
+        self._tries = OrderedDict()
+        # users being loaded: [lock, waiting or loading requests], write generation
+        self._locks = {}
+        self._generations = {}
+
+    async def search(self, phone_number: str, keyword: str, loader: Callable[[str], Awaitable[list]],
+                     page_number: int = 0, cursor: int = None, page_size: int = 10,
+                     lookahead: bool = False) -> list:
+        """Search user item seqs ordered by seq.
+        Args:
+            phone_number: user phone_number
+            keyword: user input keyword for searching
+            loader: async function returns [(seq, name, search_initial), ...] of user
+            page_number, cursor, page_size, lookahead: same as AsyncMySQLManager.get_search_item
+
+        Return:
+            [seq, ...]
+        """
+        trie = await self._get_trie(phone_number, loader)
+        seqs = trie.search(keyword)
+        limit = page_size + 1 if lookahead else page_size
+        if cursor is not None:
+            return heapq.nsmallest(limit, (seq for seq in seqs if seq > cursor))
+        offset = page_number * page_size
+        return heapq.nsmallest(offset + limit, seqs)[offset:]
+
+    async def count(self, phone_number: str, keyword: str, loader: Callable[[str], Awaitable[list]]) -> int:
+        """Count user items matched by keyword. (loader: same as search)"""
+        trie = await self._get_trie(phone_number, loader)
+        return len(trie.search(keyword))
+
+    def add(self, phone_number: str, seq: int, name: str, search_initial: str) -> None:
+        self._bump_generation(phone_number)
+        entry = self._tries.get(phone_number)
+        if entry is not None:
+            self._resize(entry[0], lambda trie: trie.add(seq, name, search_initial))
+
+    def remove(self, phone_number: str, seq: int) -> None:
+        self._bump_generation(phone_number)
+        entry = self._tries.get(phone_number)
+        if entry is not None:
+            self._resize(entry[0], lambda trie: trie.remove(seq))
+
+    def invalidate(self, phone_number: str) -> None:
+        self._bump_generation(phone_number)
+        self._drop(phone_number)
+
+    def stats(self) -> dict:
+        return {
+            "users": len(self._tries),
+            "bytes": self.nbytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "discards": self.discards
+        }
+
+    async def _get_trie(self, phone_number: str, loader) -> ItemTrie:
+        trie = self._get_loaded(phone_number)
+        if trie is not None:
+            return trie
+
+        # load once even if the same user searches concurrently.
+        # the lock is kept until the last waiting request, so a request arriving after a failed load
+        # waits for the retry of a waiting request instead of loading at the same time.
+        waiting = self._locks.setdefault(phone_number, [asyncio.Lock(), 0])
+        waiting[1] += 1
+        try:
+            async with waiting[0]:
+                trie = self._get_loaded(phone_number)
+                if trie is not None:
+                    return trie
+                self.misses += 1
+                generation = self._generations.setdefault(phone_number, 0)
+                trie = self.index_class()
+                for seq, name, search_initial in await loader(phone_number):
+                    trie.add(seq, name, search_initial)
+                # item written during the load may be missing from the snapshot
+                if self._generations[phone_number] != generation:
+                    self.discards += 1
+                    return trie
+                self._drop(phone_number)
+                self._tries[phone_number] = (trie, time.monotonic())
+                self.nbytes += trie.nbytes
+                self._evict()
+                return trie
+        finally:
+            waiting[1] -= 1
+            if not waiting[1]:
+                del self._locks[phone_number]
+                self._generations.pop(phone_number, None)
+
+    def _bump_generation(self, phone_number: str) -> None:
+        # only users being loaded are tracked
+        if phone_number in self._generations:
+            self._generations[phone_number] += 1
+
+    def _drop(self, phone_number: str) -> None:
+        entry = self._tries.pop(phone_number, None)
+        if entry is not None:
+            self.nbytes -= entry[0].nbytes
+
+    def _get_loaded(self, phone_number: str):
+        entry = self._tries.get(phone_number)
+        if entry is None or (self.ttl is not None and entry[1] + self.ttl <= time.monotonic()):
+            return None
+        self._tries.move_to_end(phone_number)
+        self.hits += 1
+        return entry[0]
+
+    def _resize(self, trie: ItemTrie, change) -> None:
+        before = trie.nbytes
+        change(trie)
+        self.nbytes += trie.nbytes - before
+        self._evict()
+
+    def _evict(self) -> None:
+        # evict cold users (least recently searched) over memory cap
+        while self.nbytes > self.max_bytes and len(self._tries) > 1:
+            _, (trie, _) = self._tries.popitem(last=False)
+            self.nbytes -= trie.nbytes
+            self.evictions += 1
+
+
+class FuzzySearchIndex(SearchIndex):
+    index_class = FuzzyItemIndex
+
+    async def search(self, phone_number: str, keyword: str, loader: Callable[[str], Awaitable[list]],
+                     page_number: int = 0, cursor: int = None, page_size: int = 10,
+                     lookahead: bool = False) -> list:
+        """Search user item seqs within fuzzy_distance(keyword) ordered by edit distance, seq.
+        Args:
+            same as SearchIndex.search (cursor is not supported)
+
+        Return:
+            [seq, ...]
+        """
+        if cursor is not None:
+            raise ValueError("Cursor is not supported in fuzzy search.")
+        index = await self._get_trie(phone_number, loader)
+        distances = index.search(keyword)
+        limit = page_size + 1 if lookahead else page_size
+        offset = page_number * page_size
+        return heapq.nsmallest(offset + limit, distances, key=lambda seq: (distances[seq], seq))[offset:]
@@ -0,0 +1,39 @@
+"""Server library
+
+멀티 프로세스 운영(gunicorn + uvicorn worker) 설정 라이브러리입니다. (conf server)
+    - worker는 master에서 fork 된 뒤 app을 import 하고, engine, 캐시, 검색 인덱스는 처음 사용할 때 worker마다 만듭니다.
+    - master에서 만든 객체를 물려받은 경우(preload_app)에도 fork 직후 각 모듈이 버리고 worker에서 다시 만듭니다.
+      (os.register_at_fork, 부모 프로세스의 연결은 닫지 않음)
+    Functions:
+        - worker_count: worker 프로세스 수를 조회합니다. (WEB_CONCURRENCY 환경 변수, conf workers, 기본 1)
+        - worker_pool_size: 전체 DB 연결 예산(db_connection_budget)을 worker 수로 나눈 worker별 pool_size, max_overflow를 계산합니다.
+"""
+import os
+from . import SERVER
+
+# pool of a worker without db_connection_budget
+DEFAULT_POOL_SIZE = 10
+DEFAULT_MAX_OVERFLOW = 10
+
+
+def worker_count() -> int:
+    """Get worker process count. WEB_CONCURRENCY (set by gunicorn.conf.py for workers) > conf workers > 1"""
+    return int(os.environ.get("WEB_CONCURRENCY") or SERVER.get("workers", 1))
+
+
+def worker_pool_size(workers: int = None) -> tuple:
+    """Get DB connection pool size of a worker.
+    Args:
+        workers: worker process count (default: worker_count)
+
+    Return:
+        (pool_size, max_overflow)
+        With db_connection_budget, pool_size + max_overflow of every worker is at most the budget
+        (at least one connection per worker). Half of them are kept open, the other half are opened on demand.
+    """
+    budget = SERVER.get("db_connection_budget")
+    if not budget:
+        return DEFAULT_POOL_SIZE, DEFAULT_MAX_OVERFLOW
+    per_worker = max(1, budget // (workers or worker_count()))
+    pool_size = (per_worker + 1) // 2
+    return pool_size, per_worker - pool_size
@@ -2,23 +2,144 @@
 
 Functions:
     - extract_korean_initial: 초성 검색을 위해 아이템 이름의 초성을 추출합니다.
+    - extract_korean_initial_many: 여러 아이템 이름의 초성을 한 번에 추출합니다. (bulk 등록용)
+    - normalize_search_text: 부분 검색을 위해 문자열을 정규화합니다. (NFC, 소문자, 공백 제거)
+    - extract_ngrams: 부분 검색 인덱스에 저장할 bigram을 추출합니다.
+    - split_search_terms: 부분 검색어를 정규화된 검색어 목록으로 나눕니다.
+    - decompose_jamo: 오타 검색을 위해 한글 음절을 자모로 분해합니다. (ex. "아메" -> "ㅇㅏㅁㅔ")
     - make_respose: 공통된 API 응답을 위해 response를 생성합니다.
+    - encode_cursor: 페이지네이션 cursor(마지막 아이템 seq)를 불투명한 문자열로 변환합니다.
+    - decode_cursor: 페이지네이션 cursor 문자열을 아이템 seq로 변환합니다.
+    - make_etag: 유저 아이템 버전과 요청 URL로 ETag를 생성합니다.
+    - make_content_etag: 응답 데이터로 ETag를 생성합니다. (아이템 상세 조회, 캐시 hit에서 DB 조회 없음)
+    - etag_matches: If-None-Match 헤더가 ETag와 일치하는지 확인합니다. (304 Not Modified)
+    - parse_date: 유통기한 문자열(YYYY-MM-DD)을 날짜로 변환합니다. (형식이 다르거나 없는 날짜면 None)
 """
+import re
+import zlib
+import base64
+import unicodedata
+from datetime import date, datetime
+from typing import Iterable
 from jamo import h2j, j2hcj
 
-def extract_korean_initial(text: str) -> str:
-    """Extract korean initial for searching."""
+# 한글 음절(U+AC00 ~ U+D7A3)은 초성 19 x 중성 21 x 종성 28 순서로 배치되어 있으므로
+# 코드 포인트로 바로 초성을 계산하고, 조합형 자모(U+1100 ~ U+11FF)는 jamo 변환 결과를 미리 저장합니다.
+_CHOSUNG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_INITIAL_TABLE = {0xAC00 + i: _CHOSUNG[i // 588] for i in range(11172)}
+_INITIAL_TABLE.update({cp: j2hcj(h2j(chr(cp)))[0] for cp in range(0x1100, 0x1200)})
+# jamo가 변환하지 못하는 확장 자모는 기존 방식으로 처리합니다. (InvalidJamoError)
+_EXTENDED_JAMO = re.compile("[\uA960-\uA97F\uD7B0-\uD7FF]")
+_SEPARATOR = "\n"
+_DATE_FORMAT = re.compile(r"\d{4}-\d{2}-\d{2}")
+# 음절 -> 호환 자모 변환 표 (decompose_jamo 첫 호출 때 생성)
+_JAMO_TABLE = None
+
+def _extract_korean_initial(text: str) -> str:
     result = ""
     for t in text:
         result += j2hcj(h2j(t))[0]
     return result
 
-def make_respose(result: any) -> dict:
-    """Make api response format."""
+def extract_korean_initial(text: str) -> str:
+    """Extract korean initial for searching."""
+    if _EXTENDED_JAMO.search(text):
+        return _extract_korean_initial(text)
+    return text.translate(_INITIAL_TABLE)
+
+def extract_korean_initial_many(names: Iterable[str]) -> list:
+    """Extract korean initial of many item names at once."""
+    names = list(names)
+    if not names:
+        return []
+    text = _SEPARATOR.join(names)
+    # 이름에 구분자가 포함된 경우 한 건씩 처리합니다.
+    if text.count(_SEPARATOR) != len(names) - 1 or _EXTENDED_JAMO.search(text):
+        return [extract_korean_initial(name) for name in names]
+    return text.translate(_INITIAL_TABLE).split(_SEPARATOR)
+
+def normalize_search_text(text: str) -> str:
+    """Normalize text for infix search. (NFC, lower case, without whitespace)"""
+    return "".join(unicodedata.normalize("NFC", text or "").lower().split())
+
+def extract_ngrams(text: str) -> set:
+    """Extract bigrams of normalized text for infix search index.
+    The last character is paired with a space, so a one character keyword is found by gram prefix.
+    ex) "바닐라 라떼" -> {"바닐", "닐라", "라라", "라떼", "떼 "}
+    """
+    text = normalize_search_text(text)
+    if not text:
+        return set()
+    text += " "
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+def split_search_terms(query: str) -> list:
+    """Split infix search query by whitespace to normalized terms. (duplicates removed, order kept)"""
+    terms = [normalize_search_text(term) for term in (query or "").split()]
+    return list(dict.fromkeys(term for term in terms if term))
+
+def decompose_jamo(text: str) -> str:
+    """Decompose korean syllables of text to compatibility jamo. Other characters are kept."""
+    global _JAMO_TABLE
+    if _JAMO_TABLE is None:
+        _JAMO_TABLE = {cp: j2hcj(h2j(chr(cp))) for cp in range(0xAC00, 0xD7A4)}
+    return text.translate(_JAMO_TABLE)
+
+def make_respose(result: any, meta: dict = None) -> dict:
+    """Make api response format.
+    Args:
+        result: response data
+        meta: additional meta info. (ex. next_cursor)
+    """
     return {
         "meta": {
             "code": 200,
-            "message": "ok"
+            "message": "ok",
+            **(meta or {})
         },
         "data": result
     }
+
+def encode_cursor(seq: int) -> str:
+    """Encode last item seq to opaque cursor."""
+    return base64.urlsafe_b64encode(str(seq).encode()).decode()
+
+def decode_cursor(cursor: str) -> int:
+    """Decode opaque cursor to last item seq. Raise ValueError if invalid."""
+    try:
+        return int(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except Exception:
+        raise ValueError("Invalid cursor.")
+
+
+def make_etag(version: int, key: str) -> str:
+    """Make ETag from user item version and request key(user, path, query).
+    The same version gives a different ETag for each page and search keyword.
+    """
+    return f'"{version}-{zlib.crc32(key.encode()):08x}"'
+
+
+def make_content_etag(content: bytes) -> str:
+    """Make ETag from response content. (changes only when the content changes)"""
+    return f'"c-{zlib.crc32(content):08x}-{len(content):x}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Check If-None-Match header. (weak comparison, "*" matches any)"""
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or (tag[2:] if tag.startswith("W/") else tag) == etag:
+            return True
+    return False
+
+
+def parse_date(text: str) -> date:
+    """Parse YYYY-MM-DD date. Return None if format is wrong or the date does not exist. (ex. 2023-02-30)"""
+    if not isinstance(text, str) or not _DATE_FORMAT.fullmatch(text):
+        return None
+    try:
+        return datetime.strptime(text, "%Y-%m-%d").date()
+    except ValueError:
+        return None
@@ -5,47 +5,79 @@ ApiValidator:
     Functions:
         - check_user_signup: 회원가입을 위해 유저가 입력한 값을 검사합니다.
         - check_user_login: 로그인을 위해 유저가 입력한 값을 검사합니다.
+                            기존 AES 비밀번호는 로그인 성공 시 scrypt 해시로 변경합니다.
         - check_user_valid_input: 아이템 등록을 위해 유저가 입력한 값을 검사합니다.
+        - check_page_input: 아이템 목록 조회를 위해 유저가 입력한 페이지 값을 검사합니다.
+        - check_fuzzy_input: 아이템 오타 검색을 위해 유저가 입력한 검색어와 페이지 값을 검사합니다.
+        - check_infix_input: 아이템 부분 검색을 위해 유저가 입력한 검색어와 페이지 값을 검사합니다.
+        - check_bulk_input: 아이템 일괄 등록을 위해 유저가 입력한 chunk 크기를 검사합니다.
+        - check_bulk_filter: 아이템 일괄 수정/삭제를 위해 유저가 입력한 조건을 검사합니다.
+        - check_bulk_change: 아이템 일괄 수정을 위해 유저가 입력한 변경 값을 검사합니다.
+        - check_export_input: 아이템 내보내기를 위해 유저가 입력한 형식을 검사합니다.
+        - check_barcode_input: 바코드 아이템 조회를 위해 유저가 입력한 바코드 목록을 검사합니다.
+        - check_expiring_input: 유통기한 임박 아이템 조회를 위해 유저가 입력한 기간과 페이지 값을 검사합니다.
         - check_current_user: 사용자의 토큰이 유효한지 확인합니다.
+                              검증한 토큰은 만료(exp) 전까지 TokenCache에 저장합니다.
+        - check_internal_token: 내부 운영 API(/internal) 호출 토큰을 확인합니다. (conf server.internal_token이 없으면 403)
+
+get_api_validator:
+    - 프로세스당 하나의 ApiValidator를 처음 사용할 때 만들어 조회합니다. (auth, item api가 TokenCache를 함께 사용)
 
 Raises:
     BadRequestError: 400
     UnAuthorizationError: 401
+    ForbiddenError: 403
 """
 import re
 import jwt
-from . import TOKEN_KEY
-from .db_connect import MySQLManager
+import hmac
+import hashlib
+from . import SERVER, get_key
+from .cache import TTLCache
+from .util import decode_cursor, parse_date
+from .db_connect import AsyncMySQLManager
 from .encrypt import EncryptManager
+from .password import PasswordHasher
+
+MAX_PAGE_SIZE = 100
+MAX_SEARCH_QUERY_LENGTH = 100
+MAX_SEARCH_TERMS = 5
+MAX_BULK_CHUNK_SIZE = 10000
+MAX_BARCODE_BATCH = 100
+MAX_BARCODE_LENGTH = 200
+MAX_EXPIRING_DAYS = 365
+PRICE_FIELDS = ["selling_price", "cost_price"]
+EXPORT_FORMATS = ["csv", "ndjson"]
+
+# process-wide validator (created lazily on first use)
+_api_validator = None
 
 
 class ApiValidator:
-    def __init__(self) -> None:
-        self.MySQLManager = MySQLManager()
+    def __init__(self, token_cache_size: int = 10000) -> None:
         self.EncryptManager = EncryptManager()
+        self.PasswordHasher = PasswordHasher()
+        # verified jwt claims cache (key: token sha256 digest, expire: token exp)
+        self.TokenCache = TTLCache(maxsize=token_cache_size, ttl=300)
         
     def check_user_signup(self, phone_number: str) -> None:
         """Check user valid signup input
+        Duplicate phone_number is checked by unique key when inserting user auth.
         Args:
             phone_number: user phone_number
 
         Raise:
             phone_number format error: The input does not fit the phone number format.
-            phon_number already existence error: 
-                This phone number already exists. Please log in with your existing account.
         """
         if not re.match(r"\d{3}-\d{4}-\d{4}", phone_number):
             raise BadRequestError("The input does not fit the phone number format.")
-        
-        all_user_phone_number = self.MySQLManager.get_user_all_auth_number()
-        if phone_number in all_user_phone_number:
-            raise BadRequestError("This phone number already exists. Please log in with your existing account.")
     
-    def check_user_login(self, phone_number: str, password: str) -> None:
+    async def check_user_login(self, phone_number: str, password: str, MySQLManager: AsyncMySQLManager) -> None:
         """Check user valid signup input
         Args:
             phone_number: user phone_number
             password: user password
+            MySQLManager: request scoped db manager
 
         Raise:
             phone_number format error: The input does not fit the phone number format.
@@ -55,14 +87,24 @@ class ApiValidator:
         if not re.match(r"\d{3}-\d{4}-\d{4}", phone_number):
             raise BadRequestError("The input does not fit the phone number format.")
         
-        all_user_phone_number = self.MySQLManager.get_user_all_auth_number()
-        if phone_number not in all_user_phone_number:
+        user_auth = await MySQLManager.get_user_auth(phone_number)
+        if user_auth is None:
             raise BadRequestError("Invalid phone number. Please check your phone number.")
         
-        encrypt_password = self.MySQLManager.get_user_auth(phone_number)["password"]
-        decrypt_password = self.EncryptManager.decrypt_password(encrypt_password)
-        if password != decrypt_password:
+        stored_password = user_auth["password"]
+        if self.PasswordHasher.is_hashed(stored_password):
+            is_valid = await self.PasswordHasher.verify_password(password, stored_password)
+        else:
+            # legacy AES encrypted password
+            decrypt_password = self.EncryptManager.decrypt_password(stored_password)
+            is_valid = hmac.compare_digest(password.encode(), decrypt_password.encode())
+        if not is_valid:
             raise UnAuthorizationError("Wrong password. Please check your password.")
+
+        # rehash legacy or old cost factor password with current hash format
+        if self.PasswordHasher.needs_rehash(stored_password):
+            new_password = await self.PasswordHasher.hash_password(password)
+            await MySQLManager.update_user_password(phone_number, new_password)
     
     def check_user_valid_input(self, expriation_date: str=None, size: str=None) -> None:
         """Check user valid input for insert item
@@ -74,11 +116,157 @@ class ApiValidator:
             expriation_date format error: The input does not fit the expriation date format.
             size format error: The input does not fit the size format. (small or large)
         """
-        if expriation_date and not re.match(r"\d{4}-\d{2}-\d{2}", expriation_date):
+        if expriation_date and parse_date(expriation_date) is None:
             raise BadRequestError("The input does not fit the expriation date format.")
         if size and size not in ["small", "large"]:
             raise BadRequestError("The input does not fit the size format. (small or large)")
     
+    def check_page_input(self, page_size: int, cursor: str = None) -> None:
+        """Check user valid page input for item list
+        Args:
+            page_size: item count per page
+            cursor: next_cursor of previous page
+
+        Raise:
+            page_size format error: The page size must be between 1 and MAX_PAGE_SIZE.
+            cursor format error: Invalid cursor.
+        """
+        if not 1 <= page_size <= MAX_PAGE_SIZE:
+            raise BadRequestError(f"The page size must be between 1 and {MAX_PAGE_SIZE}.")
+        if cursor is not None:
+            try:
+                decode_cursor(cursor)
+            except ValueError as e:
+                raise BadRequestError(str(e))
+
+    def check_fuzzy_input(self, keyword: str, cursor: str = None) -> None:
+        """Check user valid input for item fuzzy search
+        Args:
+            keyword: user input keyword for searching
+            cursor: next_cursor of previous page (not supported in fuzzy search)
+
+        Raise:
+            keyword format error: The keyword is required for fuzzy search.
+            cursor format error: Cursor is not supported in fuzzy search. Use page_number.
+        """
+        if not keyword or not keyword.strip():
+            raise BadRequestError("The keyword is required for fuzzy search.")
+        if len(keyword) > MAX_SEARCH_QUERY_LENGTH:
+            raise BadRequestError(f"The keyword must be at most {MAX_SEARCH_QUERY_LENGTH} characters.")
+        if cursor is not None:
+            raise BadRequestError("Cursor is not supported in fuzzy search. Use page_number.")
+
+    def check_infix_input(self, terms: list, page_size: int) -> None:
+        """Check user valid input for item infix search
+        Args:
+            terms: normalized search terms (util.split_search_terms)
+            page_size: item count per page
+
+        Raise:
+            terms format error: The search query must have 1 to MAX_SEARCH_TERMS terms and
+                                at most MAX_SEARCH_QUERY_LENGTH characters.
+            page_size format error: The page size must be between 1 and MAX_PAGE_SIZE.
+        """
+        if not 1 <= len(terms) <= MAX_SEARCH_TERMS or sum(map(len, terms)) > MAX_SEARCH_QUERY_LENGTH:
+            raise BadRequestError(f"The search query must have 1 to {MAX_SEARCH_TERMS} terms "
+                                  f"and at most {MAX_SEARCH_QUERY_LENGTH} characters.")
+        if not 1 <= page_size <= MAX_PAGE_SIZE:
+            raise BadRequestError(f"The page size must be between 1 and {MAX_PAGE_SIZE}.")
+
+    def check_bulk_input(self, chunk_size: int) -> None:
+        """Check user valid chunk size input for bulk insert item
+        Args:
+            chunk_size: item count per insert statement and commit
+
+        Raise:
+            chunk_size format error: The chunk size must be between 1 and MAX_BULK_CHUNK_SIZE.
+        """
+        if not 1 <= chunk_size <= MAX_BULK_CHUNK_SIZE:
+            raise BadRequestError(f"The chunk size must be between 1 and {MAX_BULK_CHUNK_SIZE}.")
+
+    def check_bulk_filter(self, filters: dict) -> None:
+        """Check user valid filter input for bulk update, delete item
+        Args:
+            filters: category, size, expiration_before, seqs
+
+        Raise:
+            empty filter error: At least one filter is required.
+            expiration_before, size format error: Same as check_user_valid_input
+            seqs error: The seqs must be at most MAX_BULK_CHUNK_SIZE items.
+        """
+        if all(value is None for value in filters.values()):
+            raise BadRequestError("At least one filter is required.")
+        self.check_user_valid_input(filters.get("expiration_before"), filters.get("size"))
+        if filters.get("seqs") is not None and len(filters["seqs"]) > MAX_BULK_CHUNK_SIZE:
+            raise BadRequestError(f"The seqs must be at most {MAX_BULK_CHUNK_SIZE} items.")
+
+    def check_bulk_change(self, params: dict, adjust: dict = None) -> None:
+        """Check user valid change input for bulk update item
+        Args:
+            params: values to set
+            adjust: field(selling_price, cost_price), amount or percent
+
+        Raise:
+            empty change error: At least one change is required.
+            expiration_date, size format error: Same as check_user_valid_input
+            adjust error: The adjust field must be selling_price or cost_price.
+                          Either amount or percent is required.
+                          The percent must be greater than -100.
+                          Cannot set and adjust the same field.
+        """
+        if not params and not adjust:
+            raise BadRequestError("At least one change is required.")
+        self.check_user_valid_input(params.get("expiration_date"), params.get("size"))
+        if adjust:
+            if adjust.get("field") not in PRICE_FIELDS:
+                raise BadRequestError("The adjust field must be selling_price or cost_price.")
+            if (adjust.get("amount") is None) == (adjust.get("percent") is None):
+                raise BadRequestError("Either amount or percent is required.")
+            if adjust.get("percent") is not None and adjust["percent"] <= -100:
+                raise BadRequestError("The percent must be greater than -100.")
+            if adjust["field"] in params:
+                raise BadRequestError("Cannot set and adjust the same field.")
+
+    def check_export_input(self, format: str) -> None:
+        """Check user valid format input for export item
+        Args:
+            format: export format
+
+        Raise:
+            format error: The format must be csv or ndjson.
+        """
+        if format not in EXPORT_FORMATS:
+            raise BadRequestError("The format must be csv or ndjson.")
+
+    def check_barcode_input(self, barcodes: list) -> None:
+        """Check user valid barcodes input for barcode item lookup
+        Args:
+            barcodes: [barcode, ...]
+
+        Raise:
+            barcodes count error: The barcodes must have 1 to MAX_BARCODE_BATCH barcodes.
+            barcode format error: The barcode must be 1 to MAX_BARCODE_LENGTH characters.
+        """
+        if not 1 <= len(barcodes) <= MAX_BARCODE_BATCH:
+            raise BadRequestError(f"The barcodes must have 1 to {MAX_BARCODE_BATCH} barcodes.")
+        if any(not 1 <= len(barcode) <= MAX_BARCODE_LENGTH for barcode in barcodes):
+            raise BadRequestError(f"The barcode must be 1 to {MAX_BARCODE_LENGTH} characters.")
+
+    def check_expiring_input(self, within_days: int, page_size: int) -> None:
+        """Check user valid input for expiring item list
+        Args:
+            within_days: days from today
+            page_size: item count per page
+
+        Raise:
+            within_days format error: The within days must be between 0 and MAX_EXPIRING_DAYS.
+            page_size format error: The page size must be between 1 and MAX_PAGE_SIZE.
+        """
+        if not 0 <= within_days <= MAX_EXPIRING_DAYS:
+            raise BadRequestError(f"The within days must be between 0 and {MAX_EXPIRING_DAYS}.")
+        if not 1 <= page_size <= MAX_PAGE_SIZE:
+            raise BadRequestError(f"The page size must be between 1 and {MAX_PAGE_SIZE}.")
+
     def check_current_user(self, user: str, token: str) -> None:
         """Check current valid user
         Args:
@@ -93,20 +281,51 @@ class ApiValidator:
         # check token existence
         if token is None:
             raise BadRequestError("Token does not exist.")
-        # check token expired period
-        try:
-            decode_token = jwt.decode(token, TOKEN_KEY, algorithms=["HS256"])
-            # check wrong used token
-            if decode_token["phone_number"] != user:
-                raise UnAuthorizationError("The wrong approach. Go back to the previous page")
-        except jwt.ExpiredSignatureError:
-            raise UnAuthorizationError("An expired token. Please log in again.")
+        # check token expired period (verified token is cached until exp)
+        digest = hashlib.sha256(token.encode()).digest()
+        decode_token = self.TokenCache.get(digest)
+        if decode_token is None:
+            try:
+                decode_token = jwt.decode(token, get_key("jwt_key"), algorithms=["HS256"])
+            except jwt.ExpiredSignatureError:
+                raise UnAuthorizationError("An expired token. Please log in again.")
+            self.TokenCache.set(digest, decode_token, expire_at=decode_token.get("exp"))
+        # check wrong used token
+        if decode_token["phone_number"] != user:
+            raise UnAuthorizationError("The wrong approach. Go back to the previous page")
+
+    def check_internal_token(self, token: str) -> None:
+        """Check internal api token
+        Internal api is disabled if conf server.internal_token is not set.
+        Args:
+            token: X-Internal-Token header value
+
+        Raise:
+            internal api disabled error: Internal api is disabled.
+            token not match error: Invalid internal token.
+        """
+        internal_token = SERVER.get("internal_token")
+        if not internal_token:
+            raise ForbiddenError("Internal api is disabled.")
+        if not hmac.compare_digest((token or "").encode(), internal_token.encode()):
+            raise UnAuthorizationError("Invalid internal token.")
+
+
+def get_api_validator() -> ApiValidator:
+    """Get process-wide ApiValidator."""
+    global _api_validator
+    if _api_validator is None:
+        _api_validator = ApiValidator()
+    return _api_validator
+
 
-        
-        
 class BadRequestError(Exception):
     """Bad Request Error : 400"""
     
 
 class UnAuthorizationError(Exception):
-    """UnAuthorization Error : 401"""
\ No newline at end of file
+    """UnAuthorization Error : 401"""
+
+
+class ForbiddenError(Exception):
+    """Forbidden Error : 403"""
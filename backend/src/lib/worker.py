@@ -0,0 +1,11 @@
+"""Gunicorn worker library
+
+UvicornWorker:
+    - gunicorn.conf.py의 worker_class 입니다. (gunicorn이 설치된 서버에서만 import)
+    - auto 대신 uvloop 이벤트 루프와 httptools http parser를 명시적으로 사용합니다. (설치되지 않았으면 worker 시작 실패)
+"""
+from uvicorn.workers import UvicornWorker as BaseUvicornWorker
+
+
+class UvicornWorker(BaseUvicornWorker):
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools"}
@@ -0,0 +1,97 @@
+"""DB migration package
+
+DB 스키마와 인덱스를 버전별로 적용하는 migration 패키지입니다.
+각 버전은 그 버전의 테이블/컬럼/인덱스를 직접 선언하며 lib/model.py가 바뀌어도 변하지 않습니다.
+
+Versions:
+    - versions/v0001_initial.py: user_auth, user_item 테이블 생성
+    - versions/v0002_indexes.py: 잘못된 인덱스 삭제 후 복합/prefix 인덱스 생성
+    - versions/v0003_item_version.py: 유저별 아이템 버전(ETag) user_item_version 테이블 생성
+    - versions/v0004_item_count.py: user_item_version에 유저별 아이템 수(item_count) 추가, 기존 아이템 수 계산
+    - versions/v0005_item_ngram.py: 부분 검색 인덱스 user_item_ngram 테이블 생성, 기존 아이템 gram 생성
+    - versions/v0006_barcode_index.py: 바코드 조회 인덱스 user_item (phone_number, barcode) 생성
+    - versions/v0007_expiration_date.py: user_item expiration_date를 DATE로 변경, 유통기한 조회 인덱스 생성
+    - versions/v0008_item_stat.py: 유저별 카테고리 통계 user_item_stat 테이블 생성, 기존 아이템 통계 계산
+
+Functions:
+    - current_version: DB에 적용된 마지막 migration 버전을 조회합니다.
+    - upgrade: 적용되지 않은 migration을 버전 순서대로 적용합니다.
+    - rebuild_item_stats: user_item에서 user_item_stat(카테고리 통계)을 다시 계산합니다.
+
+Usage:
+    cd src
+    python -m migration upgrade     # migration 적용
+    python -m migration version     # 현재 버전 조회
+    python -m migration explain     # 주요 쿼리 EXPLAIN 검사 (full table scan 이면 실패)
+    python -m migration rebuild-stats [--phone-number 010-0000-0000]   # 카테고리 통계 다시 계산
+
+Raises:
+    MigrationError: migration 적용 중 발생한 오류
+"""
+from datetime import datetime
+from sqlalchemy import Table, Column, Integer, VARCHAR, MetaData, select, insert
+from sqlalchemy.engine import Engine
+from migration.versions import v0001_initial, v0002_indexes, v0003_item_version, v0004_item_count, \
+    v0005_item_ngram, v0006_barcode_index, v0007_expiration_date, v0008_item_stat
+
+MIGRATIONS = [v0001_initial, v0002_indexes, v0003_item_version, v0004_item_count, v0005_item_ngram,
+              v0006_barcode_index, v0007_expiration_date, v0008_item_stat]
+
+schema_version = Table(
+    "schema_version", MetaData(),
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("description", VARCHAR(200), nullable=False),
+    Column("applied_at", VARCHAR(200), nullable=False),
+)
+
+
+def current_version(engine: Engine) -> int:
+    """Get last applied migration version. (0 if nothing applied)"""
+    with engine.begin() as conn:
+        schema_version.create(conn, checkfirst=True)
+        versions = conn.execute(select(schema_version.c.version)).scalars().all()
+    return max(versions, default=0)
+
+
+def upgrade(engine: Engine) -> list:
+    """Apply migrations not yet applied in version order.
+    Return:
+        [applied version, ...]
+
+    Raise:
+        Failed to apply migration {version}.
+    """
+    applied = []
+    version = current_version(engine)
+    for migration in MIGRATIONS:
+        if migration.VERSION <= version:
+            continue
+        try:
+            with engine.begin() as conn:
+                migration.upgrade(conn)
+                conn.execute(insert(schema_version).values(
+                    version=migration.VERSION,
+                    description=migration.DESCRIPTION,
+                    applied_at=str(datetime.utcnow())
+                ))
+        except Exception as e:
+            raise MigrationError(f"Failed to apply migration {migration.VERSION}. {e}")
+        applied.append(migration.VERSION)
+    return applied
+
+
+def rebuild_item_stats(engine: Engine, phone_number: str = None) -> None:
+    """Recompute user_item_stat of every user (or a user) from user_item in one transaction.
+
+    Raise:
+        Failed to rebuild item stats.
+    """
+    try:
+        with engine.begin() as conn:
+            v0008_item_stat.rebuild(conn, phone_number)
+    except Exception as e:
+        raise MigrationError(f"Failed to rebuild item stats. {e}")
+
+
+class MigrationError(Exception):
+    """All Migration Error"""
@@ -0,0 +1,41 @@
+import sys
+import argparse
+from lib.db_connect import get_engine
+from migration import upgrade, current_version, rebuild_item_stats
+from migration.explain import explain, check_query_plan, QueryPlanError
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m migration")
+    parser.add_argument("command", choices=["upgrade", "version", "explain", "rebuild-stats"])
+    parser.add_argument("--phone-number", default=None, help="rebuild-stats of a user (default: every user)")
+    args = parser.parse_args()
+    engine = get_engine()
+
+    if args.command == "upgrade":
+        applied = upgrade(engine)
+        print(f"applied: {applied}, current version: {current_version(engine)}")
+    elif args.command == "version":
+        print(current_version(engine))
+    elif args.command == "rebuild-stats":
+        rebuild_item_stats(engine, args.phone_number)
+        print(f"rebuilt item stats of {args.phone_number or 'every user'}")
+    elif args.command == "explain":
+        result = explain(engine)
+        for query in result:
+            status = "ERROR" if query["error"] else "FULL SCAN" if query["full_scan"] else "ok"
+            print(f"[{status}] {query['name']}")
+            for row in query["plan"]:
+                print(f"    {row}")
+            if query["error"]:
+                print(f"    {query['error']}")
+        try:
+            check_query_plan(engine, result)
+        except QueryPlanError as e:
+            print(e, file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""Query plan checker
+
+MySQLManager가 실행하는 주요 쿼리를 EXPLAIN 해서 full table scan 여부를 검사합니다.
+인덱스가 빠지거나 쿼리가 바뀌어 full table scan이 생기면 배포 전에 실패하도록 사용합니다.
+(대표 데이터가 있는 DB에서 실행해야 실제 실행 계획과 같습니다.)
+
+Functions:
+    - hot_queries: MySQLManager가 실행하는 주요 쿼리 목록을 만듭니다.
+    - explain: 쿼리별 실행 계획과 full table scan 여부를 조회합니다.
+    - check_query_plan: full table scan 쿼리나 실행할 수 없는 쿼리(ex. migration 전 테이블 없음)가 있으면
+                        QueryPlanError를 발생시킵니다.
+
+Raises:
+    QueryPlanError: full table scan 쿼리, 실행할 수 없는 쿼리가 있을 때 발생하는 오류
+"""
+import re
+from sqlalchemy.engine import Engine, Connection
+from lib import db_connect
+
+PHONE_NUMBER = "010-0000-0000"
+
+
+def hot_queries(phone_number: str = PHONE_NUMBER, seq: int = 1, keyword: str = "아메") -> list:
+    """Make statements issued by MySQLManager.
+    Return:
+        [(name, statement), ...]
+    """
+    return [
+        ("get_user_auth", db_connect._user_auth_sql(phone_number)),
+        ("delete_user_auth", db_connect._delete_user_sql(phone_number)),
+        ("update_user_password", db_connect._update_password_sql(phone_number, "password")),
+        ("get_item_info", db_connect._item_info_sql(phone_number, seq)),
+        ("update_item_info", db_connect._update_item_sql(phone_number, seq, {"size": "small"})),
+        ("delete_item_info", db_connect._delete_item_sql(phone_number, seq)),
+        ("get_all_item(page_number)", db_connect._all_item_sql(phone_number, page_number=1)),
+        ("get_all_item(cursor)", db_connect._all_item_sql(phone_number, cursor=seq)),
+        ("get_search_item(page_number)", db_connect._search_item_sql(phone_number, keyword, page_number=1)),
+        ("get_search_item(cursor)", db_connect._search_item_sql(phone_number, keyword, cursor=seq)),
+        ("get_search_item(search_index)", db_connect._items_by_seq_sql(phone_number, [seq, seq + 1])),
+        ("count_search_item", db_connect._count_search_item_sql(phone_number, keyword)),
+        ("get_infix_search_item(term)", db_connect._infix_rank_sql(phone_number, ["라떼", "ㅂ"]).limit(10)),
+        ("get_infix_search_item(count)", db_connect._count_infix_rank_sql(phone_number, ["라떼"])),
+        ("get_infix_search_item(long term)", db_connect._ngram_candidate_sql(phone_number, "바닐라라떼")),
+        ("get_infix_search_item(one character)", db_connect._ngram_candidate_sql(phone_number, "떼")),
+        ("get_infix_search_item(verify)", db_connect._item_text_sql(phone_number, [seq, seq + 1])),
+        ("insert_item_bulk(inserted rows)", db_connect._item_text_sql(phone_number, after_seq=seq)),
+        ("insert_item_bulk(last seq)", db_connect._max_item_seq_sql(phone_number)),
+        ("delete_item_ngram", db_connect._delete_ngram_sql(phone_number, [seq], ["n", "i"])),
+        ("get_item_names", db_connect._item_names_sql(phone_number)),
+        ("get_item_by_barcode", db_connect._barcode_item_sql(phone_number, ["8801234567890"])),
+        ("get_items_by_barcodes", db_connect._barcode_item_sql(phone_number, ["8801234567890", "8801234567891"])),
+        ("get_expiring_item", db_connect._expiring_item_sql(phone_number, "2023-08-20", "2023-08-23", page_number=1)),
+        ("get_expiring_item(count)", db_connect._count_expiring_item_sql(phone_number, "2023-08-20", "2023-08-23")),
+        ("get_expiry_items", db_connect._expiry_item_sql("2023-08-20", "2023-08-22")),
+        ("get_expiry_items(user)", db_connect._expiry_item_sql("2023-08-20", "2023-08-22", phone_number)),
+        ("get_expiry_items_by_seq", db_connect._expiry_item_by_seq_sql(phone_number, [seq, seq + 1])),
+        ("get_item_stats", db_connect._item_stat_sql(phone_number)),
+        ("rebuild_item_stats(user)", db_connect._rebuild_item_stat_sql(phone_number).select),
+        ("item stat(update/delete)", db_connect._item_stat_change_sql("mysql", phone_number, seq, -1).select),
+        ("item stat(bulk)", db_connect._item_stat_group_sql(phone_number, [seq, seq + 1])),
+        ("stream_all_item", db_connect._export_item_sql(phone_number)),
+        ("update_item_bulk(dry_run)", db_connect._count_item_sql(phone_number, {"category": "coffee"})),
+        ("update_item_bulk", db_connect._update_item_bulk_sql(
+            phone_number, {"expiration_before": "2023-08-20"}, {"size": "small"})),
+        ("delete_item_bulk", db_connect._delete_item_bulk_sql(phone_number, {"seqs": [seq, seq + 1]})),
+    ]
+
+
+def explain(engine: Engine) -> list:
+    """Explain hot queries.
+    Return:
+        [{"name": name, "sql": sql, "plan": [plan row, ...], "full_scan": bool, "error": error or None}, ...]
+    """
+    result = []
+    with engine.connect() as conn:
+        for name, statement in hot_queries():
+            sql = str(statement.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+            try:
+                plan, error = _explain(conn, sql), None
+            except Exception as e:
+                conn.rollback()
+                plan, error = [], str(e).splitlines()[0]
+            result.append({
+                "name": name,
+                "sql": sql,
+                "plan": plan,
+                "full_scan": any(_is_full_scan(conn, row) for row in plan),
+                "error": error
+            })
+    return result
+
+
+def check_query_plan(engine: Engine, result: list = None) -> list:
+    """Check hot queries do not use full table scan.
+    Args:
+        result: explain result already fetched (default: explain(engine))
+
+    Return:
+        explain result
+
+    Raise:
+        Full table scan query: {name}, ...
+        Failed query: {name}, ...
+    """
+    if result is None:
+        result = explain(engine)
+    full_scan = [query["name"] for query in result if query["full_scan"]]
+    if full_scan:
+        raise QueryPlanError(f"Full table scan query: {', '.join(full_scan)}")
+    failed = [query["name"] for query in result if query["error"]]
+    if failed:
+        raise QueryPlanError(f"Failed query: {', '.join(failed)}")
+    return result
+
+
+def _explain(conn: Connection, sql: str) -> list:
+    prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+    return [dict(row._mapping) for row in conn.exec_driver_sql(prefix + sql)]
+
+
+def _is_full_scan(conn: Connection, row: dict) -> bool:
+    # full table scan or full index scan (scan of subquery result is not counted)
+    if conn.dialect.name == "sqlite":
+        # ex) "SCAN user_item", "SCAN user_item USING INDEX ...", "SEARCH user_item USING INDEX ...", "SCAN anon_1"
+        match = re.match(r"SCAN (TABLE )?(\w+)", row["detail"])
+        return match is not None and not match.group(2).startswith("anon_")
+    # ex) table: user_item, <derived2>, <union2,3>
+    return row["type"] in ("ALL", "index") and not (row["table"] or "<").startswith("<")
+
+
+class QueryPlanError(Exception):
+    """Full table scan query Error"""
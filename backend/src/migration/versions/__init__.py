@@ -0,0 +1,15 @@
+"""Migration versions
+
+Each version declares its tables, columns and indexes literally (as of that version) and does not use lib/model.py,
+so an applied migration does not change when the model changes.
+"""
+
+
+def create_index_sql(name: str, table_name: str, columns: list, unique: bool = False) -> str:
+    return f"CREATE {'UNIQUE ' if unique else ''}INDEX {name} ON {table_name} ({', '.join(columns)})"
+
+
+def drop_index_sql(dialect_name: str, name: str, table_name: str) -> str:
+    if dialect_name == "mysql":
+        return f"DROP INDEX {name} ON {table_name}"
+    return f"DROP INDEX {name}"
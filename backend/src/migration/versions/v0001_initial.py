@@ -0,0 +1,36 @@
+"""Create user_auth, user_item tables. (src/README.md DDL, expiration_date is changed to DATE by v0007)"""
+from sqlalchemy import Table, Column, Integer, VARCHAR, MetaData
+from sqlalchemy.engine import Connection
+
+VERSION = 1
+DESCRIPTION = "create user_auth, user_item tables"
+
+metadata = MetaData()
+
+user_auth = Table(
+    "user_auth", metadata,
+    Column("seq", Integer, primary_key=True, autoincrement=True, nullable=False),
+    Column("phone_number", VARCHAR(200), nullable=False),
+    Column("password", VARCHAR(500), nullable=False),
+    Column("timestamp", VARCHAR(200), nullable=False),
+)
+
+user_item = Table(
+    "user_item", metadata,
+    Column("seq", Integer, primary_key=True, autoincrement=True, nullable=False),
+    Column("phone_number", VARCHAR(200), nullable=False),
+    Column("category", VARCHAR(200), nullable=False),
+    Column("selling_price", Integer, nullable=False),
+    Column("cost_price", Integer, nullable=False),
+    Column("name", VARCHAR(200), nullable=False),
+    Column("description", VARCHAR(1000), nullable=True),
+    Column("barcode", VARCHAR(200), nullable=False),
+    Column("expiration_date", VARCHAR(200), nullable=False),
+    Column("size", VARCHAR(100), nullable=False),
+    Column("search_initial", VARCHAR(200), nullable=False),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    # tables created before migration (src/README.md DDL) are kept
+    metadata.create_all(conn, checkfirst=True)
@@ -0,0 +1,50 @@
+"""Replace wrong order indexes with composite/prefix indexes.
+
+- idx_user_item (seq, phone_number): every query filters phone_number first, so it was never used.
+- idx_user_item_name (name, search_initial): can not serve search filtered by phone_number.
+- idx_user_auth (phone_number): changed to unique index.
+Indexes are declared as of this version (later indexes are created by their own migration).
+"""
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection
+from migration.versions import create_index_sql, drop_index_sql
+
+VERSION = 2
+DESCRIPTION = "create user_item composite/prefix indexes, unique user_auth phone_number"
+
+OLD_INDEXES = {
+    "user_item": ["idx_user_item", "idx_user_item_name"],
+    "user_auth": ["idx_user_auth"],
+}
+
+# table: {name: (columns, unique)}
+INDEXES = {
+    "user_auth": {
+        "idx_user_auth": (["phone_number"], True),
+    },
+    "user_item": {
+        "idx_user_item_phone_seq": (["phone_number", "seq"], False),
+        "idx_user_item_phone_name": (["phone_number", "name"], False),
+        "idx_user_item_phone_initial": (["phone_number", "search_initial"], False),
+    },
+}
+
+
+def upgrade(conn: Connection) -> None:
+    inspector = inspect(conn)
+    for table_name, indexes in INDEXES.items():
+        existing = {index["name"]: index for index in inspector.get_indexes(table_name)}
+        for name in OLD_INDEXES[table_name]:
+            if name in existing and not _same_index(indexes.get(name), existing[name]):
+                conn.exec_driver_sql(drop_index_sql(conn.dialect.name, name, table_name))
+                del existing[name]
+        for name, (columns, unique) in indexes.items():
+            if name not in existing:
+                conn.exec_driver_sql(create_index_sql(name, table_name, columns, unique))
+
+
+def _same_index(index, reflected: dict) -> bool:
+    if index is None:
+        return False
+    columns, unique = index
+    return columns == reflected["column_names"] and unique == bool(reflected["unique"])
@@ -0,0 +1,20 @@
+"""Create user_item_version table.
+
+Per-user item version counter. Bumped in the same transaction as every item write and
+used as ETag of item read apis.
+"""
+from sqlalchemy import Table, Column, Integer, VARCHAR, MetaData
+from sqlalchemy.engine import Connection
+
+VERSION = 3
+DESCRIPTION = "create user_item_version table"
+
+user_item_version = Table(
+    "user_item_version", MetaData(),
+    Column("phone_number", VARCHAR(200), primary_key=True),
+    Column("version", Integer, nullable=False),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    user_item_version.create(conn, checkfirst=True)
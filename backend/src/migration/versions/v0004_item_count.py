@@ -0,0 +1,32 @@
+"""Add item_count to user_item_version table.
+
+Per-user item count maintained by item insert/delete (total of item listing api).
+Count of items created before this migration is filled from user_item.
+"""
+from sqlalchemy import inspect, select, insert, update, func, literal, table, column
+from sqlalchemy.engine import Connection
+
+VERSION = 4
+DESCRIPTION = "add user_item_version item_count"
+
+# columns as of this version
+user_item = table("user_item", column("phone_number"))
+user_item_version = table("user_item_version", column("phone_number"), column("version"), column("item_count"))
+
+
+def upgrade(conn: Connection) -> None:
+    columns = [info["name"] for info in inspect(conn).get_columns("user_item_version")]
+    if "item_count" not in columns:
+        conn.exec_driver_sql(
+            "ALTER TABLE user_item_version ADD COLUMN item_count BIGINT NOT NULL DEFAULT 0")
+
+    # users with version row
+    item_count = select(func.count()).where(
+        user_item.c.phone_number == user_item_version.c.phone_number).scalar_subquery()
+    conn.execute(update(user_item_version).values(item_count=item_count))
+
+    # users without version row (no item write since v0003)
+    missing = select(user_item.c.phone_number, literal(0), func.count()).where(
+        user_item.c.phone_number.not_in(select(user_item_version.c.phone_number))
+    ).group_by(user_item.c.phone_number)
+    conn.execute(insert(user_item_version).from_select(["phone_number", "version", "item_count"], missing))
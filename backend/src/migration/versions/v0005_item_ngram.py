@@ -0,0 +1,51 @@
+"""Create user_item_ngram table (infix search inverted index).
+
+Grams of items created before this migration are built in seq order, BATCH_SIZE items per statement.
+"""
+from sqlalchemy import Table, Column, Index, Integer, VARCHAR, MetaData, select, table, column
+from sqlalchemy.engine import Connection
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from lib.db_connect import _item_ngram_rows
+
+VERSION = 5
+DESCRIPTION = "create user_item_ngram table"
+BATCH_SIZE = 1000
+
+user_item_ngram = Table(
+    "user_item_ngram", MetaData(),
+    Column("phone_number", VARCHAR(200), primary_key=True),
+    # grams are compared by code point (utf8mb4_bin)
+    Column("gram", VARCHAR(8).with_variant(VARCHAR(8, collation="utf8mb4_bin"), "mysql"), primary_key=True),
+    Column("seq", Integer, primary_key=True, autoincrement=False),
+    Column("field", VARCHAR(1), primary_key=True),
+    Index("idx_user_item_ngram_phone_seq", "phone_number", "seq"),
+)
+
+# columns as of this version
+user_item = table("user_item", column("seq"), column("phone_number"), column("name"), column("description"),
+                  column("search_initial"))
+
+
+def upgrade(conn: Connection) -> None:
+    user_item_ngram.create(conn, checkfirst=True)
+    last_seq = 0
+    while True:
+        rows = conn.execute(
+            select(user_item.c.seq, user_item.c.phone_number, user_item.c.name, user_item.c.description,
+                   user_item.c.search_initial)
+            .filter(user_item.c.seq > last_seq).order_by(user_item.c.seq).limit(BATCH_SIZE)).all()
+        if not rows:
+            break
+        ngrams = [ngram for row in rows for ngram in _item_ngram_rows(
+            row.phone_number, row.seq, row.name, row.description, row.search_initial)]
+        if ngrams:
+            conn.execute(_insert_ngram_sql(conn.dialect.name), ngrams)
+        last_seq = rows[-1].seq
+
+
+def _insert_ngram_sql(dialect_name: str):
+    # grams written by the running api during migration are ignored
+    if dialect_name == "mysql":
+        return mysql_insert(user_item_ngram).prefix_with("IGNORE")
+    return sqlite_insert(user_item_ngram).on_conflict_do_nothing()
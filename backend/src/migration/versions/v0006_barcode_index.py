@@ -0,0 +1,18 @@
+"""Create user_item (phone_number, barcode) index (barcode lookup).
+
+Not unique: items registered before this migration may share a barcode. Lookup returns the first seq.
+"""
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection
+from migration.versions import create_index_sql
+
+VERSION = 6
+DESCRIPTION = "create user_item phone_number, barcode index"
+INDEX_NAME = "idx_user_item_phone_barcode"
+INDEX_COLUMNS = ["phone_number", "barcode"]
+
+
+def upgrade(conn: Connection) -> None:
+    existing = {index["name"] for index in inspect(conn).get_indexes("user_item")}
+    if INDEX_NAME not in existing:
+        conn.exec_driver_sql(create_index_sql(INDEX_NAME, "user_item", INDEX_COLUMNS))
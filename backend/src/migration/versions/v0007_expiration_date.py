@@ -0,0 +1,49 @@
+"""Change user_item expiration_date from VARCHAR to DATE and create expiration indexes.
+
+- idx_user_item_phone_expiration (phone_number, expiration_date): expiring item api
+- idx_user_item_expiration (expiration_date): expiry scheduler (items of every user)
+Every value is checked before the column is changed; a value that is not a YYYY-MM-DD date fails the migration
+without changing the table. (sqlite keeps the text value, which is the same format DATE is stored in)
+"""
+from sqlalchemy import inspect, select, table, column
+from sqlalchemy.engine import Connection
+from lib.util import parse_date
+from migration.versions import create_index_sql
+
+VERSION = 7
+DESCRIPTION = "change user_item expiration_date to DATE, create expiration indexes"
+# {name: columns}
+INDEXES = {
+    "idx_user_item_phone_expiration": ["phone_number", "expiration_date"],
+    "idx_user_item_expiration": ["expiration_date"],
+}
+BATCH_SIZE = 1000
+
+# raw column (no DATE conversion) to read values before migration
+raw_item = table("user_item", column("seq"), column("expiration_date"))
+
+
+def upgrade(conn: Connection) -> None:
+    invalid = _invalid_seqs(conn)
+    if invalid:
+        raise ValueError(f"Invalid expiration_date of item seq: {', '.join(map(str, invalid[:10]))}"
+                         + (f" and {len(invalid) - 10} more" if len(invalid) > 10 else ""))
+    if conn.dialect.name == "mysql":
+        conn.exec_driver_sql("ALTER TABLE user_item MODIFY expiration_date DATE NOT NULL")
+    existing = {index["name"] for index in inspect(conn).get_indexes("user_item")}
+    for name, columns in INDEXES.items():
+        if name not in existing:
+            conn.exec_driver_sql(create_index_sql(name, "user_item", columns))
+
+
+def _invalid_seqs(conn: Connection) -> list:
+    invalid, last_seq = [], 0
+    while True:
+        rows = conn.execute(select(raw_item.c.seq, raw_item.c.expiration_date)
+                            .filter(raw_item.c.seq > last_seq).order_by(raw_item.c.seq).limit(BATCH_SIZE)).all()
+        if not rows:
+            return invalid
+        # MySQL DATE column (migration applied again after failure) returns date
+        invalid += [row.seq for row in rows if isinstance(row.expiration_date, str)
+                    and parse_date(row.expiration_date) is None]
+        last_seq = rows[-1].seq
@@ -0,0 +1,31 @@
+"""Create user_item_stat table (per-user category aggregates).
+
+Item count and price sums per (phone_number, category), changed by delta in the same transaction as every item write.
+Aggregates of items created before this migration are computed from user_item. (Same as rebuild)
+"""
+from sqlalchemy import Table, Column, Integer, BigInteger, VARCHAR, MetaData
+from sqlalchemy.engine import Connection
+from lib.db_connect import _delete_item_stat_sql, _rebuild_item_stat_sql
+
+VERSION = 8
+DESCRIPTION = "create user_item_stat table"
+
+user_item_stat = Table(
+    "user_item_stat", MetaData(),
+    Column("phone_number", VARCHAR(200), primary_key=True),
+    Column("category", VARCHAR(200), primary_key=True),
+    Column("item_count", Integer, nullable=False),
+    Column("selling_price_sum", BigInteger, nullable=False),
+    Column("cost_price_sum", BigInteger, nullable=False),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    user_item_stat.create(conn, checkfirst=True)
+    rebuild(conn)
+
+
+def rebuild(conn: Connection, phone_number: str = None) -> None:
+    """Recompute user_item_stat of every user (or a user) from user_item."""
+    conn.execute(_delete_item_stat_sql(phone_number))
+    conn.execute(_rebuild_item_stat_sql(phone_number))
@@ -0,0 +1,13 @@
+import pytest_asyncio
+from lib.db_connect import dispose_engine
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def dispose_engine_after_test():
+    """Dispose process-wide engines after each test.
+
+    Pooled connections are bound to the event loop of the test (a new loop per test function),
+    and AsyncClient(app=app) does not run the app lifespan that disposes them.
+    """
+    yield
+    await dispose_engine()
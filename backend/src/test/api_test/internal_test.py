@@ -0,0 +1,108 @@
+import os
+import tempfile
+import pytest
+from unittest.mock import patch
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from api import create_app
+from lib import SERVER, db_connect, cache
+from lib.pool import PoolStats, StatsAsyncQueuePool
+
+app = create_app()
+
+
+@pytest.fixture
+def async_engine():
+    """Replace process-wide MySQL engine with sqlite engine counted by PoolStats."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(), 'pool.db')}",
+                                 poolclass=StatsAsyncQueuePool, pool_size=2, max_overflow=3)
+    PoolStats().watch(engine.sync_engine)
+    with patch.object(db_connect, "_async_engine", engine):
+        yield engine
+
+
+@pytest.mark.asyncio
+async def test_get_pool(async_engine):
+    for _ in range(3):
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    # Success: 이 worker의 connection pool 상태 조회
+    with patch.dict(SERVER, {"internal_token": "secret"}):
+        async with AsyncClient(app=app, base_url="http://localhost:8000") as ac:
+            resp = await ac.get("/internal/pool", headers={"X-Internal-Token": "secret"})
+    assert resp.status_code == 200
+    data = resp.json()["data"]
+    assert data["pid"] == os.getpid()
+    assert data["async"]["size"] == 2
+    assert data["async"]["max_overflow"] == 3
+    assert data["async"]["checked_out"] == 0
+    assert data["async"]["idle"] == 1
+    assert data["async"]["checkouts"] == 3
+    assert data["async"]["connects"] == 1
+    await async_engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_get_pool_token(async_engine):
+    with patch.dict(SERVER, {"internal_token": "secret"}):
+        async with AsyncClient(app=app, base_url="http://localhost:8000") as ac:
+            # Error: internal token 없음, 불일치
+            resp = await ac.get("/internal/pool")
+            assert resp.status_code == 401
+            assert resp.json()["meta"]["error"] == "Invalid internal token."
+            resp = await ac.get("/internal/pool", headers={"X-Internal-Token": "wrong"})
+            assert resp.status_code == 401
+
+            # Success
+            resp = await ac.get("/internal/pool", headers={"X-Internal-Token": "secret"})
+            assert resp.status_code == 200
+            assert resp.json()["data"]["async"]["checkouts"] == 0
+    await async_engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_get_pool_disabled(async_engine):
+    # Error: internal_token 설정이 없으면 토큰과 관계없이 비활성화
+    with patch.dict(SERVER, {}, clear=True):
+        async with AsyncClient(app=app, base_url="http://localhost:8000") as ac:
+            for headers in [{}, {"X-Internal-Token": ""}, {"X-Internal-Token": "secret"}]:
+                resp = await ac.get("/internal/pool", headers=headers)
+                assert resp.status_code == 403
+                assert resp.json()["meta"]["error"] == "Internal api is disabled."
+    await async_engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_get_cache():
+    item_cache = cache.ItemCache(cache.MemoryBackend(maxsize=2))
+
+    async def loader() -> dict:
+        return {"seq": 1}
+
+    for seq in (1, 1, 2, 3):
+        await item_cache.get_or_load("010-0000-0000", seq, loader)
+
+    # Success: 이 worker의 캐시 크기, hit/miss 통계 조회
+    with patch.object(cache, "_item_cache", item_cache), patch.dict(SERVER, {"internal_token": "secret"}):
+        async with AsyncClient(app=app, base_url="http://localhost:8000") as ac:
+            resp = await ac.get("/internal/cache", headers={"X-Internal-Token": "secret"})
+            assert resp.status_code == 200
+            data = resp.json()["data"]
+            assert data["pid"] == os.getpid()
+            # memory backend is bounded by maxsize (LRU)
+            assert data["item"] == {"backend": "MemoryBackend", "size": 2, "hits": 1, "misses": 3, "errors": 0,
+                                    "hit_rate": 0.25}
+            assert set(data["token"]) == {"size", "hits", "misses", "hit_rate"}
+            assert set(data["barcode"]) == {"size", "hits", "misses", "hit_rate"}
+
+            # Error: internal token 불일치
+            resp = await ac.get("/internal/cache", headers={"X-Internal-Token": "wrong"})
+            assert resp.status_code == 401
+
+    # Error: internal_token 설정이 없으면 비활성화
+    with patch.dict(SERVER, {}, clear=True):
+        async with AsyncClient(app=app, base_url="http://localhost:8000") as ac:
+            resp = await ac.get("/internal/cache", headers={"X-Internal-Token": "secret"})
+            assert resp.status_code == 403
@@ -0,0 +1,186 @@
+import jwt
+import json
+import asyncio
+import pytest
+from httpx import AsyncClient
+from datetime import datetime, timedelta
+from api import create_app
+from lib import TOKEN_KEY
+from lib.db_connect import get_session
+from test.async_sqlite import create_sqlite_sessionmaker
+
+app = create_app()
+PHONE_NUMBER = "010-0000-0000"
+params = {
+    "category": "coffee",
+    "selling_price": 5000,
+    "cost_price": 3500,
+    "name": "아메리카노",
+    "description": "맛있는 아메리카노",
+    "barcode": "010100000110224",
+    "expiration_date": "2023-08-20",
+    "size": "small"
+}
+
+
+def make_headers(phone_number: str, content_type: str = "application/json") -> dict:
+    token = jwt.encode({
+        "phone_number": phone_number,
+        "exp": datetime.utcnow() + timedelta(hours=2)
+    }, TOKEN_KEY, algorithm="HS256")
+    return {"user": phone_number, "Authorization": token, "Content-Type": content_type}
+
+
+@pytest.fixture(scope="module", autouse=True)
+def sqlite_session():
+    """Replace MySQL session dependency with sqlite session."""
+    Session = asyncio.run(create_sqlite_sessionmaker())
+
+    async def override_get_session():
+        async with Session() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+    yield
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+async def test_insert_item_bulk():
+    # Success: JSON array, 잘못된 행은 errors로 반환
+    items = [dict(params, name=f"아메리카노{i}") for i in range(25)]
+    items[3]["size"] = "medium"
+    items[7]["expiration_date"] = "20230820"
+    del items[9]["barcode"]
+    async with AsyncClient(app=app, base_url="http://localhost:8000", follow_redirects=True) as ac:
+        resp = await ac.post("/item/bulk?chunk_size=10", headers=make_headers(PHONE_NUMBER),
+                             content=json.dumps(items))
+    assert resp.status_code == 200
+    data = resp.json()["data"]
+    assert data["inserted"] == 22
+    assert data["failed"] == 3
+    assert [error["row"] for error in data["errors"]] == [3, 7, 9]
+    assert data["errors"][0]["error"] == "The input does not fit the size format. (small or large)"
+    assert data["errors"][2]["error"].startswith("barcode")
+
+    # Success: CSV stream
+    header = ",".join(params)
+    lines = [header] + [",".join(str(value) for value in dict(params, name=f"카페라떼{i}").values())
+                        for i in range(30)]
+    lines.append("카페모카,small")
+
+    async def csv_stream():
+        for line in lines:
+            yield (line + "\r\n").encode()
+
+    async with AsyncClient(app=app, base_url="http://localhost:8000", follow_redirects=True) as ac:
+        resp = await ac.post("/item/bulk", headers=make_headers(PHONE_NUMBER, "text/csv"),
+                             content=csv_stream())
+        assert resp.status_code == 200
+        assert resp.json()["data"]["inserted"] == 30
+        assert resp.json()["data"]["errors"] == [{"row": 30, "error": "Expected 8 columns, got 2."}]
+
+        # 등록한 아이템은 초성 검색 가능
+        resp = await ac.get("/item?keyword=ㅋㅍㄹㄸ&page_size=100", headers=make_headers(PHONE_NUMBER))
+        assert len(resp.json()["data"]) == 30
+
+    # Success: NDJSON
+    body = "\n".join(json.dumps(dict(params, name=f"아이스티{i}")) for i in range(5))
+    async with AsyncClient(app=app, base_url="http://localhost:8000", follow_redirects=True) as ac:
+        resp = await ac.post("/item/bulk", headers=make_headers(PHONE_NUMBER, "application/x-ndjson"),
+                             content=body)
+    assert resp.status_code == 200
+    assert resp.json()["data"]["inserted"] == 5
+
+    # Error: JSON array가 아닌 body, 잘못된 chunk_size
+    for query, body in [("", json.dumps(params)), ("?chunk_size=0", "[]"), ("?chunk_size=10001", "[]")]:
+        async with AsyncClient(app=app, base_url="http://localhost:8000", follow_redirects=True) as ac:
+            resp = await ac.post(f"/item/bulk{query}", headers=make_headers(PHONE_NUMBER), content=body)
+        assert resp.status_code == 400
+
+    # Error: 다른 유저의 토큰으로 API 요청
+    headers = dict(make_headers("010-1111-1234"), user=PHONE_NUMBER)
+    async with AsyncClient(app=app, base_url="http://localhost:8000", follow_redirects=True) as ac:
+        resp = await ac.post("/item/bulk", headers=headers, content="[]")
+    assert resp.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_update_delete_item_bulk():
+    phone_number = "010-2222-0000"
+    items = [dict(params, name=f"아메리카노{i}", category="tea" if i % 2 else "coffee") for i in range(10)]
+    async with AsyncClient(app=app, base_url="http://localhost:8000", follow_redirects=True) as ac:
+        resp = await ac.post("/item/bulk", headers=make_headers(phone_number), content=json.dumps(items))
+        assert resp.json()["data"]["inserted"] == 10
+
+        # Success: dry_run은 변경하지 않고 개수만 조회
+        body = {"filter": {"category": "tea"}, "adjust": {"field": "selling_price", "percent": 10}, "dry_run": True}
+        resp = await ac.post("/item/bulk-update", headers=make_headers(phone_number), json=body)
+        assert resp.status_code == 200
+        assert resp.json()["data"] == {"phone_number": phone_number, "dry_run": True, "affected": 5}
+
+        # Success: 조건에 맞는 아이템 가격, 값 일괄 변경
+        body.update(dry_run=False, change={"size": "large"})
+        resp = await ac.post("/item/bulk-update", headers=make_headers(phone_number), json=body)
+        assert resp.json()["data"]["affected"] == 5
+        resp = await ac.get("/item?page_size=100", headers=make_headers(phone_number))
+        changed = [item for item in resp.json()["data"] if item["category"] == "tea"]
+        assert all(item["selling_price"] == 5500 and item["size"] == "large" for item in changed)
+        assert all(item["selling_price"] == 5000 for item in resp.json()["data"] if item["category"] == "coffee")
+
+        # Success: 일괄 삭제
+        resp = await ac.post("/item/bulk-delete", headers=make_headers(phone_number),
+                             json={"filter": {"category": "coffee"}})
+        assert resp.json()["data"]["affected"] == 5
+        resp = await ac.get("/item?page_size=100", headers=make_headers(phone_number))
+        assert len(resp.json()["data"]) == 5
+
+        # Error: 잘못된 filter, change
+        error_case = [
+            ("/item/bulk-delete", {"filter": {}}, "At least one filter is required."),
+            ("/item/bulk-update", {"filter": {"category": "tea"}}, "At least one change is required."),
+            ("/item/bulk-update", {"filter": {"size": "medium"}, "change": {"size": "small"}},
+             "The input does not fit the size format. (small or large)"),
+            ("/item/bulk-update", {"filter": {"category": "tea"}, "adjust": {"field": "name", "amount": 1}},
+             "The adjust field must be selling_price or cost_price."),
+            ("/item/bulk-update", {"filter": {"category": "tea"}, "adjust": {"field": "cost_price"}},
+             "Either amount or percent is required."),
+        ]
+        for url, body, error in error_case:
+            resp = await ac.post(url, headers=make_headers(phone_number), json=body)
+            assert resp.status_code == 400
+            assert resp.json()["meta"]["error"] == error
+
+
+@pytest.mark.asyncio
+async def test_export_item():
+    phone_number = "010-3333-0000"
+    items = [dict(params, name=f"아메리카노, {i}") for i in range(2500)]
+    async with AsyncClient(app=app, base_url="http://localhost:8000", follow_redirects=True) as ac:
+        resp = await ac.post("/item/bulk", headers=make_headers(phone_number), content=json.dumps(items))
+        assert resp.json()["data"]["inserted"] == 2500
+
+        # Success: CSV 내보내기, 다시 등록할 수 있는 형식
+        resp = await ac.get("/item/export?format=csv", headers=make_headers(phone_number))
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/csv")
+        lines = resp.text.splitlines()
+        assert len(lines) == 2501
+        assert lines[0] == "seq,phone_number,category,selling_price,cost_price,name,description,barcode,expiration_date,size"
+        assert '"아메리카노, 0"' in lines[1]
+
+        resp = await ac.post("/item/bulk", headers=make_headers("010-3333-0001", "text/csv"), content=resp.content)
+        assert resp.json()["data"]["inserted"] == 2500
+
+        # Success: NDJSON 내보내기 (seq 순서)
+        resp = await ac.get("/item/export?format=ndjson", headers=make_headers(phone_number))
+        assert resp.status_code == 200
+        rows = [json.loads(line) for line in resp.text.splitlines()]
+        assert len(rows) == 2500
+        assert rows[-1]["name"] == "아메리카노, 2499"
+        assert [row["seq"] for row in rows] == sorted(row["seq"] for row in rows)
+
+        # Error: 지원하지 않는 형식
+        resp = await ac.get("/item/export?format=xlsx", headers=make_headers(phone_number))
+        assert resp.status_code == 400
+        assert resp.json()["meta"]["error"] == "The format must be csv or ndjson."
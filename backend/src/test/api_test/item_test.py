@@ -3,11 +3,13 @@ import pytest
 from enum import Enum
 from httpx import AsyncClient
 from sqlalchemy import select
-from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+from datetime import date, datetime, timedelta
 from api import create_app
 from lib import TOKEN_KEY
 from lib.model import Item
-from lib.db_connect import MySQLManager, MySQLManagerError
+from lib.db_connect import MySQLManager, get_engine, MySQLManagerError
+from lib.util import encode_cursor
 
 
 class Mock(Enum):
@@ -28,12 +30,9 @@ app = create_app()
 
 
 class MySQLManager(MySQLManager):
-    def __init__(self) -> None:
-        super().__init__()
-
     def get_item_seq(self, phone_number: str, name: str) -> str:
         try:
-            with self.session as session:
+            with Session(get_engine()) as session:
                 sql = select(Item).filter(Item.phone_number ==
                                           phone_number, Item.name == name)
                 obj = session.execute(sql).scalar_one()
@@ -187,10 +186,29 @@ async def test_get_item():
     assert resp.json()["data"]["category"] == Mock.CATEGORY.value
     assert resp.json()["data"]["expiration_date"] == Mock.EXPIRATION_DATE.value
 
+    # Error: 존재하지 않는 아이템, 다른 유저의 아이템
+    async with AsyncClient(app=app, base_url="http://localhost:8000", follow_redirects=True) as ac:
+        resp = await ac.get(f"/item/{seq + 1000}", headers={
+            "user": Mock.PHONE_NUMBER.value,
+            "Authorization": authorization
+        })
+    assert resp.status_code == 404
+    assert resp.json()["meta"]["error"] == "This item does not exist."
+
 
 @pytest.mark.order(5)
 @pytest.mark.asyncio
 async def test_update_item():
+    headers = {
+        "user": Mock.PHONE_NUMBER.value,
+        "Authorization": authorization
+    }
+    # Success: 바코드 아이템 조회 (같은 바코드 아이템 중 첫 번째 아이템)
+    async with AsyncClient(app=app, base_url="http://localhost:8000", follow_redirects=True) as ac:
+        resp = await ac.get(f"/item/barcode/{Mock.BARCODE.value}", headers=headers)
+    assert resp.status_code == 200
+    assert resp.json()["data"]["seq"] == seq
+
     # Success: 아이템 정보 수정
     change_value = {
         "description": "Change value",
@@ -213,7 +231,39 @@ async def test_update_item():
     assert resp.status_code == 200
     assert resp.json()["data"]["description"] == change_value["description"]
     assert resp.json()["data"]["barcode"] == change_value["barcode"]
-    
+
+    # Success: 수정한 바코드 조회, 기존 바코드는 다음 아이템 (아이템 버전이 바뀌어 캐시되지 않음)
+    async with AsyncClient(app=app, base_url="http://localhost:8000", follow_redirects=True) as ac:
+        resp = await ac.get(f"/item/barcode/{change_value['barcode']}", headers=headers)
+        assert resp.status_code == 200
+        assert resp.json()["data"]["seq"] == seq
+        etag = resp.headers["etag"]
+        resp = await ac.get(f"/item/barcode/{change_value['barcode']}", headers=dict(headers, **{
+            "If-None-Match": etag}))
+        assert resp.status_code == 304
+        resp = await ac.get(f"/item/barcode/{Mock.BARCODE.value}", headers=headers)
+        assert resp.status_code == 200
+        assert resp.json()["data"]["seq"] > seq
+        assert resp.json()["data"]["barcode"] == Mock.BARCODE.value
+
+        # Success: 여러 바코드 한 번에 조회 (없는 바코드는 null)
+        resp = await ac.post("/item/barcode", headers=headers, json={
+            "barcodes": [change_value["barcode"], Mock.BARCODE.value, "0000"]})
+        assert resp.status_code == 200
+        data = resp.json()["data"]
+        assert list(data) == [change_value["barcode"], Mock.BARCODE.value, "0000"]
+        assert data[change_value["barcode"]]["seq"] == seq
+        assert data[Mock.BARCODE.value]["barcode"] == Mock.BARCODE.value
+        assert data["0000"] is None
+
+        # Error: 없는 바코드, 잘못된 바코드 목록
+        resp = await ac.get("/item/barcode/0000", headers=headers)
+        assert resp.status_code == 404
+        assert resp.json()["meta"]["error"] == "This barcode item does not exist."
+        for barcodes in [[], ["1"] * 101, [""]]:
+            resp = await ac.post("/item/barcode", headers=headers, json={"barcodes": barcodes})
+            assert resp.status_code == 400
+
     # Error: 잘못된 expiration_date case
     error_case = ["2024-5-12", "23-066-02", "20230522", "2023-01-9"]
     for case in error_case:
@@ -253,6 +303,8 @@ async def test_get_all_item():
         })
     assert resp.status_code == 200
     assert len(resp.json()["data"]) == 10
+    assert resp.json()["meta"]["total"] == 12
+    assert resp.json()["meta"]["has_more"] is True
     async with AsyncClient(app=app, base_url="http://localhost:8000", follow_redirects=True) as ac:
         resp = await ac.get("/item?page_number=1", headers={
             "user": Mock.PHONE_NUMBER.value,
@@ -260,6 +312,7 @@ async def test_get_all_item():
         })
     assert resp.status_code == 200
     assert (len(resp.json()["data"]) > 0)
+    assert resp.json()["meta"]["has_more"] is False
     async with AsyncClient(app=app, base_url="http://localhost:8000", follow_redirects=True) as ac:
         resp = await ac.get("/item?page_number=5", headers={
             "user": Mock.PHONE_NUMBER.value,
@@ -268,6 +321,45 @@ async def test_get_all_item():
     assert resp.status_code == 200
     assert (len(resp.json()["data"]) == 0)
 
+    # Success: cursor 기반 전체 아이템 조회
+    async with AsyncClient(app=app, base_url="http://localhost:8000", follow_redirects=True) as ac:
+        resp = await ac.get("/item?page_size=5", headers={
+            "user": Mock.PHONE_NUMBER.value,
+            "Authorization": authorization
+        })
+        first_page = resp.json()["data"]
+        assert resp.status_code == 200
+        assert len(first_page) == 5
+        next_cursor = resp.json()["meta"]["next_cursor"]
+        resp = await ac.get(f"/item?page_size=10&cursor={next_cursor}", headers={
+            "user": Mock.PHONE_NUMBER.value,
+            "Authorization": authorization
+        })
+        second_page = resp.json()["data"]
+        assert resp.status_code == 200
+        assert len(second_page) == 7
+        assert resp.json()["meta"]["next_cursor"] is None
+        assert resp.json()["meta"]["has_more"] is False
+
+        # Success: 마지막 페이지가 page_size와 같으면 빈 페이지 요청 없이 종료
+        resp = await ac.get(f"/item?page_size=7&cursor={next_cursor}", headers={
+            "user": Mock.PHONE_NUMBER.value,
+            "Authorization": authorization
+        })
+        assert len(resp.json()["data"]) == 7
+        assert resp.json()["meta"]["next_cursor"] is None
+        assert resp.json()["meta"]["has_more"] is False
+        assert second_page[0]["seq"] > first_page[-1]["seq"]
+
+    # Error: 잘못된 page_size, cursor
+    for query in ["page_size=0", "page_size=101", "cursor=wrong"]:
+        async with AsyncClient(app=app, base_url="http://localhost:8000", follow_redirects=True) as ac:
+            resp = await ac.get(f"/item?{query}", headers={
+                "user": Mock.PHONE_NUMBER.value,
+                "Authorization": authorization
+            })
+        assert resp.status_code == 400
+
 
 @pytest.mark.order(7)
 @pytest.mark.asyncio
@@ -282,6 +374,8 @@ async def test_get_search_item():
             })
         assert resp.status_code == 200
         assert len(resp.json()["data"]) == 10
+        assert resp.json()["meta"]["total"] == 12
+        assert resp.json()["meta"]["has_more"] is True
 
         async with AsyncClient(app=app, base_url="http://localhost:8000", follow_redirects=True) as ac:
             resp = await ac.get(f"/item?page_number=1&keyword={keyword}", headers={
@@ -300,10 +394,173 @@ async def test_get_search_item():
             })
     assert resp.status_code == 200
     assert len(resp.json()["data"]) == 0
+    assert resp.json()["meta"]["total"] == 0
+    assert resp.json()["meta"]["has_more"] is False
+
+    # Success: 오타 검색 (편집 거리 순서)
+    async with AsyncClient(app=app, base_url="http://localhost:8000", follow_redirects=True) as ac:
+        resp = await ac.get("/item?keyword=아매리카노&fuzzy=1&page_size=5", headers={
+            "user": Mock.PHONE_NUMBER.value,
+            "Authorization": authorization
+        })
+        assert resp.status_code == 200
+        assert [item["name"] for item in resp.json()["data"]] == [Mock.NAME.value] + [
+            Mock.NAME.value + str(i) for i in range(4)]
+        assert resp.json()["meta"]["total"] == 11
+        assert resp.json()["meta"]["has_more"] is True
+        assert resp.json()["meta"]["next_cursor"] is None
+
+        # Error: 검색어 없음, cursor 사용
+        for url in ["/item?fuzzy=1", f"/item?keyword=아매리카노&fuzzy=1&cursor={encode_cursor(1)}"]:
+            resp = await ac.get(url, headers={
+                "user": Mock.PHONE_NUMBER.value,
+                "Authorization": authorization
+            })
+            assert resp.status_code == 400
 
 
 @pytest.mark.order(8)
 @pytest.mark.asyncio
+async def test_infix_search_item():
+    headers = {"user": Mock.PHONE_NUMBER.value, "Authorization": authorization}
+    async with AsyncClient(app=app, base_url="http://localhost:8000", follow_redirects=True) as ac:
+        # Success: 부분 검색 (이름에 포함된 검색어)
+        resp = await ac.get("/item/search?q=리카노1", headers=headers)
+        assert resp.status_code == 200
+        assert [item["name"] for item in resp.json()["data"]] == ["아메리카노1", "아메리카노10"]
+        assert resp.json()["meta"]["total"] == 2
+        assert resp.json()["meta"]["has_more"] is False
+
+        # Success: 이름과 설명 모두 포함된 아이템이 먼저 조회
+        resp = await ac.get("/item/search?q=카노&page_size=5", headers=headers)
+        assert resp.status_code == 200
+        assert len(resp.json()["data"]) == 5
+        assert seq not in [item["seq"] for item in resp.json()["data"]]
+        assert resp.json()["meta"]["total"] == 12
+        assert resp.json()["meta"]["has_more"] is True
+        etag = resp.headers["etag"]
+        resp = await ac.get("/item/search?q=카노&page_size=5", headers={**headers, "If-None-Match": etag})
+        assert resp.status_code == 304
+
+        # Success: 여러 검색어는 모두 포함된 아이템만 조회
+        resp = await ac.get("/item/search?q=Change 카노", headers=headers)
+        assert [item["seq"] for item in resp.json()["data"]] == [seq]
+        resp = await ac.get("/item/search?q=파이썬", headers=headers)
+        assert resp.json()["data"] == []
+        assert resp.json()["meta"]["total"] == 0
+
+        # Error: 검색어 없음, 잘못된 page_size
+        for url in ["/item/search", "/item/search?q=%20", "/item/search?q=카노&page_size=0"]:
+            resp = await ac.get(url, headers=headers)
+            assert resp.status_code == 400
+
+
+@pytest.mark.order(9)
+@pytest.mark.asyncio
+async def test_expiring_item():
+    headers = {"user": Mock.PHONE_NUMBER.value, "Authorization": authorization}
+    today = date.today()
+    async with AsyncClient(app=app, base_url="http://localhost:8000", follow_redirects=True) as ac:
+        for i, days in [(3, 2), (2, 0)]:
+            resp = await ac.post(f"/item/{seq + i}", headers=headers,
+                                 json={"expiration_date": (today + timedelta(days=days)).isoformat()})
+            assert resp.status_code == 200
+
+        # Success: 오늘 만료 아이템, within_days 안 만료 아이템 (유통기한 순서)
+        resp = await ac.get("/item/expiring?within_days=0", headers=headers)
+        assert resp.status_code == 200
+        assert [item["seq"] for item in resp.json()["data"]] == [seq + 2]
+        resp = await ac.get("/item/expiring?page_size=1", headers=headers)
+        assert [item["seq"] for item in resp.json()["data"]] == [seq + 2]
+        assert resp.json()["data"][0]["expiration_date"] == today.isoformat()
+        assert resp.json()["meta"]["total"] == 2
+        assert resp.json()["meta"]["has_more"] is True
+        resp = await ac.get("/item/expiring?page_size=1&page_number=1", headers=headers)
+        assert [item["seq"] for item in resp.json()["data"]] == [seq + 3]
+        assert resp.json()["meta"]["has_more"] is False
+
+        # Error: 잘못된 within_days, page_size
+        for url in ["/item/expiring?within_days=-1", "/item/expiring?within_days=366",
+                    "/item/expiring?page_size=0"]:
+            resp = await ac.get(url, headers=headers)
+            assert resp.status_code == 400
+
+
+@pytest.mark.order(10)
+@pytest.mark.asyncio
+async def test_item_stats():
+    headers = {"user": Mock.PHONE_NUMBER.value, "Authorization": authorization}
+    async with AsyncClient(app=app, base_url="http://localhost:8000", follow_redirects=True) as ac:
+        resp = await ac.post(f"/item/{seq + 4}", headers=headers, json={"category": "cake", "selling_price": 7000})
+        assert resp.status_code == 200
+        resp = await ac.post(f"/item/{seq + 5}", headers=headers, json={"selling_price": 6100, "cost_price": 3000})
+        assert resp.status_code == 200
+
+        # Success: 아이템 목록으로 계산한 카테고리 통계와 같은 결과
+        resp = await ac.get("/item/stats", headers=headers)
+        assert resp.status_code == 200
+        stats = resp.json()["data"]
+        items = (await ac.get("/item?page_size=100", headers=headers)).json()["data"]
+        assert [stat["category"] for stat in stats["categories"]] == sorted({item["category"] for item in items})
+        for stat in stats["categories"]:
+            category_items = [item for item in items if item["category"] == stat["category"]]
+            assert stat["item_count"] == len(category_items)
+            assert stat["avg_selling_price"] == round(
+                sum(item["selling_price"] for item in category_items) / len(category_items), 2)
+        cake = stats["categories"][0]
+        assert cake["category"] == "cake"
+        assert cake["margin"] == cake["avg_selling_price"] - cake["avg_cost_price"]
+        assert stats["total"]["item_count"] == len(items)
+
+        # Success: 같은 ETag로 요청 시 304
+        etag = resp.headers["etag"]
+        resp = await ac.get("/item/stats", headers={**headers, "If-None-Match": etag})
+        assert resp.status_code == 304
+
+        # Error: 본인의 토큰으로 다른사람의 통계 요청
+        resp = await ac.get("/item/stats", headers={**headers, "user": "010-1111-1234"})
+        assert resp.status_code == 401
+
+
+@pytest.mark.order(11)
+@pytest.mark.asyncio
+async def test_item_etag():
+    headers = {"user": Mock.PHONE_NUMBER.value, "Authorization": authorization}
+    async with AsyncClient(app=app, base_url="http://localhost:8000", follow_redirects=True) as ac:
+        # Success: ETag 응답, 같은 ETag로 요청 시 304 (body 없음)
+        resp = await ac.get(f"/item/{seq}", headers=headers)
+        assert resp.status_code == 200
+        etag = resp.headers["etag"]
+        resp = await ac.get(f"/item/{seq}", headers={**headers, "If-None-Match": etag})
+        assert resp.status_code == 304
+        assert resp.content == b""
+        assert resp.headers["etag"] == etag
+
+        resp = await ac.get("/item?page_size=5", headers=headers)
+        assert resp.status_code == 200
+        list_etag = resp.headers["etag"]
+        assert list_etag != etag
+        resp = await ac.get("/item?page_size=5", headers={**headers, "If-None-Match": f'W/{list_etag}'})
+        assert resp.status_code == 304
+
+        # Success: 다른 아이템 수정은 아이템 ETag를 바꾸지 않고, 아이템 수정 후 새 ETag로 응답
+        resp = await ac.post(f"/item/{seq + 1}", headers=headers, json={"description": "Change etag"})
+        assert resp.status_code == 200
+        resp = await ac.get(f"/item/{seq}", headers={**headers, "If-None-Match": etag})
+        assert resp.status_code == 304
+        resp = await ac.post(f"/item/{seq}", headers=headers, json={"description": "Change item etag"})
+        assert resp.status_code == 200
+        resp = await ac.get(f"/item/{seq}", headers={**headers, "If-None-Match": etag})
+        assert resp.status_code == 200
+        assert resp.headers["etag"] != etag
+        assert resp.json()["data"]["description"] == "Change item etag"
+        resp = await ac.get("/item?page_size=5", headers={**headers, "If-None-Match": list_etag})
+        assert resp.status_code == 200
+        assert resp.json()["data"][1]["description"] == "Change etag"
+
+
+@pytest.mark.order(12)
+@pytest.mark.asyncio
 async def test_delete_item():
     # single case test clean
     async with AsyncClient(app=app, base_url="http://localhost:8000", follow_redirects=True) as ac:
@@ -314,6 +571,27 @@ async def test_delete_item():
     assert resp.status_code == 200
     assert resp.json()["data"] == "success"
 
+    # Error: 이미 삭제한 아이템 수정, 삭제
+    async with AsyncClient(app=app, base_url="http://localhost:8000", follow_redirects=True) as ac:
+        resp = await ac.post(f"/item/{seq}", headers={
+            "user": Mock.PHONE_NUMBER.value,
+            "Authorization": authorization
+        }, json={"description": "Change value"})
+        assert resp.status_code == 404
+        resp = await ac.delete(f"/item/{seq}", headers={
+            "user": Mock.PHONE_NUMBER.value,
+            "Authorization": authorization
+        })
+        assert resp.status_code == 404
+        assert resp.json()["meta"]["error"] == "This item does not exist."
+
+        # Success: 삭제한 아이템은 통계에서 빠지고, 없는 아이템 삭제는 통계를 바꾸지 않음
+        headers = {"user": Mock.PHONE_NUMBER.value, "Authorization": authorization}
+        stats = (await ac.get("/item/stats", headers=headers)).json()["data"]
+        items = (await ac.get("/item?page_size=100", headers=headers)).json()["data"]
+        assert stats["total"]["item_count"] == len(items) == 11
+        assert stats["total"]["avg_selling_price"] == round(sum(item["selling_price"] for item in items) / 11, 2)
+
     # multi case test clean
     for i in range(1, 12):
         async with AsyncClient(app=app, base_url="http://localhost:8000", follow_redirects=True) as ac:
@@ -0,0 +1,83 @@
+import jwt
+import asyncio
+import pytest
+from httpx import AsyncClient
+from datetime import datetime, timedelta
+from api import create_app
+from lib import TOKEN_KEY
+from lib.db_connect import get_session
+from test.async_sqlite import create_sqlite_sessionmaker
+
+app = create_app()
+opened_sessions = []
+params = {
+    "category": "coffee",
+    "selling_price": 5000,
+    "cost_price": 3500,
+    "name": "아메리카노",
+    "description": "맛있는 아메리카노",
+    "barcode": "010100000110224",
+    "expiration_date": "2023-08-20",
+    "size": "small"
+}
+
+
+def make_token(phone_number: str) -> str:
+    return jwt.encode({
+        "phone_number": phone_number,
+        "exp": datetime.utcnow() + timedelta(hours=2)
+    }, TOKEN_KEY, algorithm="HS256")
+
+
+@pytest.fixture(scope="module", autouse=True)
+def sqlite_session():
+    """Replace MySQL session dependency with sqlite session."""
+    Session = asyncio.run(create_sqlite_sessionmaker())
+
+    async def override_get_session():
+        async with Session() as session:
+            opened_sessions.append(session)
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+    yield
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_request_session():
+    users = [f"010-0000-{i:04d}" for i in range(10)]
+
+    async def insert_items(phone_number: str, count: int):
+        async with AsyncClient(app=app, base_url="http://localhost:8000", follow_redirects=True) as ac:
+            for i in range(count):
+                resp = await ac.post("/item", headers={
+                    "user": phone_number,
+                    "Authorization": make_token(phone_number)
+                }, json=dict(params, name=params["name"] + str(i)))
+                assert resp.status_code == 200
+
+    async def get_items(phone_number: str):
+        async with AsyncClient(app=app, base_url="http://localhost:8000", follow_redirects=True) as ac:
+            resp = await ac.get("/item?page_number=0", headers={
+                "user": phone_number,
+                "Authorization": make_token(phone_number)
+            })
+        assert resp.status_code == 200
+        return resp.json()["data"]
+
+    # Success: 여러 유저의 동시 요청
+    await asyncio.gather(*[insert_items(user, i + 1) for i, user in enumerate(users)])
+    results = await asyncio.gather(*[get_items(user) for user in users])
+
+    # 다른 유저의 아이템이 조회되지 않음
+    for i, (user, items) in enumerate(zip(users, results)):
+        assert len(items) == min(i + 1, 10)
+        assert all(item["phone_number"] == user for item in items)
+
+    # 요청마다 새 session을 열고 요청이 끝나면 닫힘
+    assert len(opened_sessions) == sum(range(1, 11)) + len(users)
+    assert len(set(map(id, opened_sessions))) == len(opened_sessions)
+    for session in opened_sessions:
+        assert not session.in_transaction()
+        assert len(session.identity_map) == 0
@@ -0,0 +1,18 @@
+"""SQLite async stand-in for MySQL
+
+AsyncMySQLManager를 MySQL 없이 테스트하기 위해 sqlite+aiosqlite engine을 사용합니다.
+"""
+import os
+import tempfile
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from lib.model import Base
+
+
+async def create_sqlite_sessionmaker(path: str = None) -> async_sessionmaker:
+    """Create async sessionmaker on sqlite file with all tables."""
+    if path is None:
+        path = os.path.join(tempfile.mkdtemp(), "cafe.db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return async_sessionmaker(engine, expire_on_commit=False)
@@ -0,0 +1,122 @@
+"""Async DB benchmark
+
+핸들러가 동기 MySQLManager를 호출할 때(before)와 AsyncMySQLManager를 await 할 때(after)의
+처리량과 p99 지연시간을 동시 클라이언트 수에 따라 비교합니다.
+
+Usage:
+    cd src
+    python -m test.benchmark.async_db_bench --clients 50 --requests 20
+    python -m test.benchmark.async_db_bench --sqlite --slow-query 0.01
+
+    --slow-query: 요청마다 SELECT SLEEP(n)을 함께 실행해 느린 쿼리를 흉내냅니다.
+    --sqlite: MySQL 없이 sqlite로 실행합니다. sqlite는 네트워크 대기가 없으므로
+              --slow-query 없이 측정한 값은 실제 MySQL 환경을 대표하지 않습니다.
+"""
+import time
+import asyncio
+import argparse
+import tempfile
+from sqlalchemy import create_engine, delete, event, text
+from sqlalchemy.orm import Session
+from lib.model import Item
+from lib import db_connect
+from lib.db_connect import MySQLManager, AsyncMySQLManager, get_engine, get_async_sessionmaker
+from test.async_sqlite import create_sqlite_sessionmaker
+
+PHONE_NUMBER = "010-9999-0000"
+PARAMS = {
+    "category": "coffee",
+    "selling_price": 5000,
+    "cost_price": 3500,
+    "name": "아메리카노",
+    "description": "benchmark",
+    "barcode": "0000",
+    "expiration_date": "2023-08-20",
+    "size": "small"
+}
+
+
+async def run_clients(call, clients: int, requests: int) -> dict:
+    """Run concurrent clients and collect latency."""
+    latency = []
+
+    async def client():
+        for _ in range(requests):
+            start = time.perf_counter()
+            # receive request from socket (other clients can run here)
+            await asyncio.sleep(0)
+            await call()
+            latency.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[client() for _ in range(clients)])
+    elapsed = time.perf_counter() - start
+    latency.sort()
+    return {
+        "throughput": len(latency) / elapsed,
+        "p50_ms": latency[len(latency) // 2] * 1000,
+        "p99_ms": latency[int(len(latency) * 0.99) - 1] * 1000
+    }
+
+
+def add_sleep_function(engine) -> None:
+    """Register mysql like SLEEP function on sqlite connection."""
+    @event.listens_for(engine, "connect")
+    def connect(dbapi_connection, connection_record):
+        dbapi_connection.create_function("sleep", 1, time.sleep)
+
+
+async def main(args) -> None:
+    if args.sqlite:
+        path = tempfile.mktemp(suffix=".db")
+        AsyncSession = await create_sqlite_sessionmaker(path)
+        # process-wide sync engine used by MySQLManager
+        db_connect._engine = create_engine(f"sqlite:///{path}")
+        add_sleep_function(db_connect._engine)
+        add_sleep_function(AsyncSession.kw["bind"].sync_engine)
+    else:
+        AsyncSession = get_async_sessionmaker()
+    sync_manager = MySQLManager()
+
+    # insert benchmark data
+    async with AsyncSession() as session:
+        for _ in range(args.items):
+            await AsyncMySQLManager(session).insert_item_info(PHONE_NUMBER, PARAMS)
+
+    slow_sql = text("SELECT SLEEP(:n)").bindparams(n=args.slow_query)
+
+    # before: sync call inside async handler blocks the event loop
+    async def sync_call():
+        if args.slow_query:
+            with Session(get_engine()) as session:
+                session.execute(slow_sql)
+        sync_manager.get_all_item(PHONE_NUMBER, 0)
+
+    # after: awaiting async manager yields the event loop while waiting DB
+    async def async_call():
+        async with AsyncSession() as session:
+            if args.slow_query:
+                await session.execute(slow_sql)
+            await AsyncMySQLManager(session).get_all_item(PHONE_NUMBER, 0)
+
+    for name, call in [("sync(before)", sync_call), ("async(after)", async_call)]:
+        result = await run_clients(call, args.clients, args.requests)
+        print(f"{name:14} clients={args.clients} "
+              f"throughput={result['throughput']:.1f} req/s "
+              f"p50={result['p50_ms']:.2f}ms p99={result['p99_ms']:.2f}ms")
+
+    # clean benchmark data
+    with Session(get_engine()) as session:
+        session.execute(delete(Item).where(Item.phone_number == PHONE_NUMBER))
+        session.commit()
+    await AsyncSession.kw["bind"].dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--items", type=int, default=10)
+    parser.add_argument("--slow-query", type=float, default=0)
+    parser.add_argument("--sqlite", action="store_true")
+    asyncio.run(main(parser.parse_args()))
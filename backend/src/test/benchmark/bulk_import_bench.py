@@ -0,0 +1,81 @@
+"""Bulk import benchmark
+
+아이템 N건을 POST /item 으로 한 건씩 등록하는 경우와 POST /item/bulk(CSV stream)로 등록하는 경우의 시간을 비교합니다.
+DB는 sqlite(aiosqlite) 파일을 사용합니다. 단건 등록은 --single 건만 측정해 N건 시간으로 환산합니다.
+
+Usage:
+    cd src
+    python -m test.benchmark.bulk_import_bench --rows 100000 --chunk-size 1000
+"""
+import os
+import jwt
+import time
+import asyncio
+import argparse
+import tempfile
+from httpx import AsyncClient
+from datetime import datetime, timedelta
+from api import create_app
+from lib import TOKEN_KEY
+from lib.db_connect import get_session
+from test.async_sqlite import create_sqlite_sessionmaker
+
+PHONE_NUMBER = "010-9999-0000"
+params = {
+    "category": "coffee",
+    "selling_price": 5000,
+    "cost_price": 3500,
+    "name": "아메리카노",
+    "description": "benchmark",
+    "barcode": "010100000110224",
+    "expiration_date": "2023-08-20",
+    "size": "small"
+}
+
+
+async def csv_stream(rows: int):
+    yield (",".join(params) + "\n").encode()
+    for start in range(0, rows, 1000):
+        yield "".join(
+            ",".join(str(value) for value in dict(params, name=f"아메리카노{i}").values()) + "\n"
+            for i in range(start, min(start + 1000, rows))).encode()
+
+
+async def main(args) -> None:
+    app = create_app()
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    Session = await create_sqlite_sessionmaker(path)
+
+    async def override_get_session():
+        async with Session() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+    token = jwt.encode({"phone_number": PHONE_NUMBER, "exp": datetime.utcnow() + timedelta(hours=2)},
+                       TOKEN_KEY, algorithm="HS256")
+    headers = {"user": PHONE_NUMBER, "Authorization": token}
+
+    async with AsyncClient(app=app, base_url="http://localhost:8000", follow_redirects=True, timeout=None) as ac:
+        start = time.perf_counter()
+        for i in range(args.single):
+            resp = await ac.post("/item", headers=headers, json=dict(params, name=f"카페라떼{i}"))
+            assert resp.status_code == 200
+        single_s = (time.perf_counter() - start) / args.single * args.rows
+
+        start = time.perf_counter()
+        resp = await ac.post(f"/item/bulk?chunk_size={args.chunk_size}",
+                             headers=dict(headers, **{"Content-Type": "text/csv"}), content=csv_stream(args.rows))
+        bulk_s = time.perf_counter() - start
+        assert resp.status_code == 200 and resp.json()["data"]["inserted"] == args.rows, resp.text
+
+    print(f"rows={args.rows} single(estimated)={single_s:.1f}s bulk={bulk_s:.2f}s "
+          f"({args.rows / bulk_s:.0f} rows/s, {single_s / bulk_s:.0f}x)")
+    await Session.kw["bind"].dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--single", type=int, default=500)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,131 @@
+"""ETag polling benchmark
+
+POS 태블릿이 몇 초마다 메뉴(GET /item, GET /item/{seq})를 다시 조회하는 polling 부하를 재현해서
+If-None-Match(ETag)를 보내지 않는 경우와 보내는 경우의 응답 bytes, 실행된 SQL 수, 처리 시간을 비교합니다.
+    - version: 목록 요청마다 실행하는 user_item_version 조회 (primary key)
+    - item: user_item 조회 (목록은 304 응답이면 실행하지 않음, GET /item/{seq}는 item cache hit이면 SQL 없이 응답)
+    - plain: 매번 전체 body를 받습니다. (기존 클라이언트)
+    - etag: 이전 응답의 ETag를 If-None-Match로 보내고, 변경이 없으면 304(body 없음)를 받습니다.
+write_every polling마다 한 번 아이템을 수정해서 ETag가 바뀌는 경우도 포함합니다.
+
+Usage:
+    cd src
+    python -m test.benchmark.etag_polling_bench --tablets 5 --polls 200 --write-every 20
+"""
+import jwt
+import time
+import asyncio
+import argparse
+from datetime import datetime, timedelta
+from httpx import AsyncClient
+from sqlalchemy import event, insert
+from api import create_app
+from lib import TOKEN_KEY
+from lib.model import Item
+from lib.cache import close_item_cache
+from lib.db_connect import get_session
+from test.async_sqlite import create_sqlite_sessionmaker
+
+PHONE_NUMBER = "010-9999-0000"
+
+
+def make_headers() -> dict:
+    token = jwt.encode({
+        "phone_number": PHONE_NUMBER,
+        "exp": datetime.utcnow() + timedelta(hours=2)
+    }, TOKEN_KEY, algorithm="HS256")
+    return {"user": PHONE_NUMBER, "Authorization": token}
+
+
+def response_bytes(resp) -> int:
+    # status line is not counted
+    return len(resp.content) + sum(len(k) + len(v) + 4 for k, v in resp.headers.items())
+
+
+async def replay(app, use_etag: bool, args) -> dict:
+    headers = make_headers()
+    urls = [f"/item/?page_size={args.page_size}", "/item/1"]
+    etags = [{} for _ in range(args.tablets)]
+    result = {"requests": 0, "not_modified": 0, "bytes": 0}
+    async with AsyncClient(app=app, base_url="http://localhost:8000") as ac:
+        for poll in range(args.polls):
+            if args.write_every and poll and poll % args.write_every == 0:
+                resp = await ac.post("/item/1", headers=headers, json={"selling_price": 5000 + poll})
+                assert resp.status_code == 200
+            for tablet in range(args.tablets):
+                for url in urls:
+                    request_headers = dict(headers)
+                    if use_etag and url in etags[tablet]:
+                        request_headers["If-None-Match"] = etags[tablet][url]
+                    resp = await ac.get(url, headers=request_headers)
+                    assert resp.status_code in (200, 304)
+                    etags[tablet][url] = resp.headers["etag"]
+                    result["requests"] += 1
+                    result["not_modified"] += resp.status_code == 304
+                    result["bytes"] += response_bytes(resp)
+    return result
+
+
+async def run(use_etag: bool, args) -> dict:
+    app = create_app()
+    Session = await create_sqlite_sessionmaker()
+    async with Session() as session:
+        await session.execute(insert(Item), [{
+            "phone_number": PHONE_NUMBER,
+            "category": "coffee",
+            "selling_price": 5000,
+            "cost_price": 3500,
+            "name": f"아메리카노{i}",
+            "description": "맛있는 아메리카노",
+            "barcode": str(i),
+            "expiration_date": "2023-08-20",
+            "size": "small",
+            "search_initial": "ㅇㅁㄹㅋㄴ"
+        } for i in range(args.page_size)])
+        await session.commit()
+
+    async def override_get_session():
+        async with Session() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+    queries = {"version": 0, "item": 0, "write": 0}
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        if not statement.lstrip().upper().startswith("SELECT"):
+            queries["write"] += 1
+        elif "user_item_version" in statement:
+            queries["version"] += 1
+        else:
+            queries["item"] += 1
+
+    engine = Session.kw["bind"].sync_engine
+    event.listen(engine, "before_cursor_execute", count)
+    start = time.perf_counter()
+    result = await replay(app, use_etag, args)
+    result["seconds"] = time.perf_counter() - start
+    result.update(queries)
+    event.remove(engine, "before_cursor_execute", count)
+    await close_item_cache()
+    await Session.kw["bind"].dispose()
+    return result
+
+
+async def main(args) -> None:
+    results = {name: await run(name == "etag", args) for name in ["plain", "etag"]}
+    for name, result in results.items():
+        print(f"{name:<6} requests={result['requests']} 304={result['not_modified']} "
+              f"bytes={result['bytes'] / 1024:.1f}KB select(version={result['version']} item={result['item']}) "
+              f"time={result['seconds']:.2f}s")
+    plain, etag = results["plain"], results["etag"]
+    print(f"saved  bytes={1 - etag['bytes'] / plain['bytes']:.1%} "
+          f"item select={1 - etag['item'] / plain['item']:.1%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tablets", type=int, default=5)
+    parser.add_argument("--polls", type=int, default=200)
+    parser.add_argument("--write-every", type=int, default=20)
+    parser.add_argument("--page-size", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
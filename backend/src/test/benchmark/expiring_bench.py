@@ -0,0 +1,101 @@
+"""Expiring item benchmark
+
+매일 아침 매장별로 실행하는 "within_days 안에 유통기한이 끝나는 아이템" 조회를 비교합니다.
+    - python: 유저의 모든 아이템을 읽고 expiration_date 문자열을 Python에서 날짜로 바꿔 비교 (인덱스 없음)
+    - index: AsyncMySQLManager.get_expiring_item (phone_number, expiration_date 인덱스, 첫 페이지 + 전체 개수)
+    - scheduler: ExpiryScheduler.reload (모든 유저의 horizon_days 안 만료 아이템, expiration_date 인덱스)
+유저 stores명에게 아이템을 items개씩 만들고, 유통기한은 오늘부터 365일 안에 고르게 분포시킵니다.
+
+Usage:
+    cd src
+    python -m test.benchmark.expiring_bench --stores 20 --items 5000 --within-days 3
+"""
+import time
+import asyncio
+import argparse
+from datetime import date, timedelta
+from sqlalchemy import insert, select
+from lib.model import Item
+from lib.db_connect import AsyncMySQLManager
+from lib.expiry import ExpiryScheduler
+from lib.util import parse_date
+from test.async_sqlite import create_sqlite_sessionmaker
+
+BATCH_SIZE = 10000
+
+
+def make_item(phone_number: str, i: int, today: date) -> dict:
+    return {
+        "phone_number": phone_number,
+        "category": "coffee",
+        "selling_price": 5000,
+        "cost_price": 3500,
+        "name": f"아메리카노{i}",
+        "description": "맛있는 아메리카노",
+        "barcode": str(i),
+        "expiration_date": (today + timedelta(days=i * 7 % 365)).isoformat(),
+        "size": "small",
+        "search_initial": "ㅇㅁㄹㅋㄴ"
+    }
+
+
+async def measure(call, repeat: int) -> tuple:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = await call()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+async def main(args) -> None:
+    today = date.today()
+    end = today + timedelta(days=args.within_days)
+    phone_numbers = [f"010-9999-{store:04d}" for store in range(args.stores)]
+    Session = await create_sqlite_sessionmaker()
+    async with Session() as session:
+        rows = [make_item(phone_number, i, today) for phone_number in phone_numbers for i in range(args.items)]
+        for offset in range(0, len(rows), BATCH_SIZE):
+            await session.execute(insert(Item), rows[offset:offset + BATCH_SIZE])
+        await session.commit()
+
+        async def python():
+            # 모든 유저 아이템을 읽고 문자열을 날짜로 변환
+            expiring = []
+            for phone_number in phone_numbers:
+                items = (await session.execute(
+                    select(Item.seq, Item.expiration_date).filter(Item.phone_number == phone_number))).all()
+                expiring += [item.seq for item in items if today <= parse_date(item.expiration_date) <= end]
+            return len(expiring)
+
+        async def index():
+            total = 0
+            for phone_number in phone_numbers:
+                _, count = await AsyncMySQLManager(session).get_expiring_item(
+                    phone_number, today.isoformat(), end.isoformat(), page_size=args.page_size)
+                total += count
+            return total
+
+        scheduler = ExpiryScheduler(Session, [], horizon_days=args.within_days)
+
+        async def reload():
+            await scheduler.reload()
+            return scheduler.stats()["scheduled"]
+
+        python_ms, python_total = await measure(python, args.repeat)
+        index_ms, index_total = await measure(index, args.repeat)
+        reload_ms, scheduled = await measure(reload, args.repeat)
+        assert python_total == index_total, (python_total, index_total)
+        print(f"stores={args.stores} items={args.stores * args.items} within_days={args.within_days} "
+              f"expiring={index_total}")
+        print(f"python={python_ms:.1f}ms index={index_ms:.1f}ms ({python_ms / index_ms:.1f}x) "
+              f"scheduler reload={reload_ms:.1f}ms scheduled={scheduled}")
+    await Session.kw["bind"].dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stores", type=int, default=20)
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--within-days", type=int, default=3)
+    parser.add_argument("--page-size", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,121 @@
+"""Fuzzy search benchmark
+
+유저 한 명의 아이템 items개에서 한 글자 오타가 있는 검색어로 오타 검색 시간을 측정합니다.
+    - brute: 모든 아이템 이름과 자모 편집 거리를 계산 (인덱스 없음)
+    - index: FuzzySearchIndex (symmetric delete, 메모리에 로드된 상태)
+    - api: AsyncMySQLManager.get_fuzzy_search_item (index 검색 + 페이지 아이템 DB 조회)
+인덱스 첫 로드 시간(DB 조회 포함)과 메모리(tracemalloc 실제 사용량, nbytes 추정치)를 함께 출력합니다.
+
+Usage:
+    cd src
+    python -m test.benchmark.fuzzy_search_bench --items 50000 --queries 1000
+"""
+import time
+import random
+import asyncio
+import argparse
+import tracemalloc
+from sqlalchemy import insert
+from lib.model import Item
+from lib.db_connect import AsyncMySQLManager
+from lib.search_index import FuzzySearchIndex, fuzzy_distance, _fuzzy_keys, _edit_distance
+from lib.util import extract_korean_initial
+from test.async_sqlite import create_sqlite_sessionmaker
+
+PHONE_NUMBER = "010-9999-0000"
+WORDS = ["아메리카노", "카페라떼", "카페모카", "바닐라", "라떼", "아이스티", "자몽", "에이드", "콜드브루", "녹차",
+         "딸기", "스무디", "초코", "프라푸치노", "케이크", "치즈", "마카롱", "쿠키", "샌드위치", "베이글"]
+SYLLABLES = "가나다라마바사아자차카타파하매메래레새세개게배베"
+
+
+def make_names(count: int, rng: random.Random) -> list:
+    # 메뉴 단어 1~2개 + 임의 음절 1~3개 (ex. "바닐라 라떼가마")
+    return [" ".join(rng.sample(WORDS, rng.randint(1, 2))) +
+            "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 3))) for _ in range(count)]
+
+
+def make_typo(name: str, rng: random.Random) -> str:
+    chars = list(name)
+    positions = [i for i, char in enumerate(chars) if "가" <= char <= "힣"]
+    chars[rng.choice(positions)] = rng.choice(SYLLABLES)
+    return "".join(chars)
+
+
+def percentile(times: list, p: float) -> float:
+    times = sorted(times)
+    return times[min(len(times) - 1, int(len(times) * p))] * 1000
+
+
+async def measure(call, queries: list) -> list:
+    times = []
+    for query in queries:
+        start = time.perf_counter()
+        await call(query)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+async def main(args) -> None:
+    rng = random.Random(0)
+    names = make_names(args.items, rng)
+    queries = [make_typo(rng.choice(names), rng) for _ in range(args.queries)]
+
+    Session = await create_sqlite_sessionmaker()
+    async with Session() as session:
+        await session.execute(insert(Item), [{
+            "phone_number": PHONE_NUMBER,
+            "category": "coffee",
+            "selling_price": 5000,
+            "cost_price": 3500,
+            "name": name,
+            "description": "benchmark",
+            "barcode": str(i),
+            "expiration_date": "2023-08-20",
+            "size": "small",
+            "search_initial": extract_korean_initial(name)
+        } for i, name in enumerate(names)])
+        await session.commit()
+
+        index = FuzzySearchIndex(max_bytes=10 ** 10)
+        MySQLManager = AsyncMySQLManager(session, fuzzy_index=index)
+        start = time.perf_counter()
+        await index.count(PHONE_NUMBER, "아메리카노", MySQLManager.get_item_names)
+        load = time.perf_counter() - start
+        # load again to trace memory (tracemalloc slows down load)
+        index.invalidate(PHONE_NUMBER)
+        tracemalloc.start()
+        await index.count(PHONE_NUMBER, "아메리카노", MySQLManager.get_item_names)
+        traced, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"items={args.items} load={load:.2f}s traced={traced / 1024 / 1024:.1f}MB "
+              f"estimated={index.stats()['bytes'] / 1024 / 1024:.1f}MB")
+
+        keys = [_fuzzy_keys(name) for name in names]
+
+        async def brute(query):
+            distance = fuzzy_distance(query)
+            query_keys = _fuzzy_keys(query)
+            return [seq for seq, item_keys in enumerate(keys)
+                    if min(_edit_distance(q, key, distance) for q in query_keys for key in item_keys) <= distance]
+
+        results = {
+            "brute": await measure(brute, queries[:args.brute_queries]),
+            "index": await measure(lambda query: index.search(PHONE_NUMBER, query, MySQLManager.get_item_names),
+                                   queries),
+            "api": await measure(lambda query: MySQLManager.get_fuzzy_search_item(PHONE_NUMBER, query), queries),
+        }
+        matched = [await index.count(PHONE_NUMBER, query, MySQLManager.get_item_names) for query in queries]
+        print(f"queries={len(queries)} matched avg={sum(matched) / len(matched):.1f} "
+              f"not found={sum(count == 0 for count in matched)}")
+        for name, times in results.items():
+            print(f"{name:<6} p50={percentile(times, 0.5):.2f}ms p99={percentile(times, 0.99):.2f}ms "
+                  f"max={max(times) * 1000:.2f}ms")
+    await Session.kw["bind"].dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--brute-queries", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
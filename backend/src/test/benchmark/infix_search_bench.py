@@ -0,0 +1,105 @@
+"""Infix search benchmark
+
+아이템 이름, 초성, 설명의 부분 검색을 SQL LIKE '%keyword%'(full scan)와 user_item_ngram(bigram 인덱스)로 비교합니다.
+두 방식 모두 첫 페이지와 전체 검색 개수를 조회하며, ngram은 검색 결과 캐시(version) 없이 측정합니다.
+index 크기는 아이템당 gram row 수로 출력합니다.
+--db 로 sqlite 파일을 지정하면 이미 생성된 아이템을 다시 사용합니다. (1M 아이템 생성에 수 분 소요)
+
+Usage:
+    cd src
+    python -m test.benchmark.infix_search_bench --items 1000000 --db /tmp/infix.db --keywords 라떼 에티오피아 카노12345
+"""
+import time
+import asyncio
+import argparse
+from sqlalchemy import insert, select, func, or_
+from lib.model import Item, ItemNgram
+from lib.db_connect import AsyncMySQLManager, _item_ngram_rows, _insert_ngram_sql
+from lib.util import extract_korean_initial, split_search_terms
+from test.async_sqlite import create_sqlite_sessionmaker
+
+PHONE_NUMBER = "010-9999-0000"
+NAMES = ["아메리카노", "카페라떼", "카페모카", "바닐라 라떼", "아이스티", "자몽에이드"]
+ORIGINS = ["에티오피아", "콜롬비아", "브라질", "과테말라", "케냐", "인도네시아", "코스타리카"]
+TASTES = ["산미가 좋은", "고소한", "달콤한", "진한", "부드러운"]
+BATCH_SIZE = 10000
+
+
+def make_item(i: int) -> dict:
+    name = f"{NAMES[i % len(NAMES)]}{i}"
+    return {
+        "phone_number": PHONE_NUMBER,
+        "category": "coffee",
+        "selling_price": 5000,
+        "cost_price": 3500,
+        "name": name,
+        "description": f"{TASTES[i % len(TASTES)]} {ORIGINS[i % len(ORIGINS)]} 원두",
+        "barcode": str(i),
+        "expiration_date": "2023-08-20",
+        "size": "small",
+        "search_initial": extract_korean_initial(name)
+    }
+
+
+def like_search_sql(terms: list, page_size: int):
+    # 기존 prefix 검색을 '%keyword%'로 바꾼 경우 (모든 검색어 포함, seq 순서)
+    conditions = [or_(Item.name.contains(term, autoescape=True),
+                      Item.search_initial.contains(term, autoescape=True),
+                      Item.description.contains(term, autoescape=True)) for term in terms]
+    page = select(Item).filter(Item.phone_number == PHONE_NUMBER, *conditions).order_by(Item.seq).limit(page_size)
+    total = select(func.count()).select_from(Item).filter(Item.phone_number == PHONE_NUMBER, *conditions)
+    return page, total
+
+
+async def measure(call, repeat: int) -> tuple:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = await call()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+async def main(args) -> None:
+    Session = await create_sqlite_sessionmaker(args.db)
+    async with Session() as session:
+        start = time.perf_counter()
+        grams = (await session.execute(select(func.count()).select_from(ItemNgram))).scalar_one()
+        loaded = (await session.execute(select(func.count()).select_from(Item))).scalar_one()
+        for offset in range(loaded, args.items, BATCH_SIZE):
+            rows = [make_item(i) for i in range(offset, min(offset + BATCH_SIZE, args.items))]
+            await session.execute(insert(Item), rows)
+            ngrams = [ngram for seq, row in enumerate(rows, offset + 1) for ngram in _item_ngram_rows(
+                PHONE_NUMBER, seq, row["name"], row["description"], row["search_initial"])]
+            await session.execute(_insert_ngram_sql("sqlite"), ngrams)
+            grams += len(ngrams)
+        await session.commit()
+        args.items = max(args.items, loaded)
+        print(f"items={args.items} grams={grams} ({grams / args.items:.1f}/item) "
+              f"load={time.perf_counter() - start:.1f}s")
+
+        MySQLManager = AsyncMySQLManager(session)
+        for keyword in args.keywords:
+            terms = split_search_terms(keyword)
+            page_sql, total_sql = like_search_sql(terms, args.page_size)
+
+            async def like():
+                page = (await session.execute(page_sql)).all()
+                return page, (await session.execute(total_sql)).scalar_one()
+
+            like_ms, (_, like_total) = await measure(like, args.repeat)
+            ngram_ms, (_, ngram_total) = await measure(
+                lambda: MySQLManager.get_infix_search_item(PHONE_NUMBER, terms, page_size=args.page_size),
+                args.repeat)
+            assert like_total == ngram_total, (keyword, like_total, ngram_total)
+            print(f"keyword={keyword:<10} total={ngram_total:<7} like={like_ms:.1f}ms ngram={ngram_ms:.1f}ms "
+                  f"({like_ms / ngram_ms:.1f}x)")
+    await Session.kw["bind"].dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=100000)
+    parser.add_argument("--db", default=None, help="sqlite file path (reuse loaded items)")
+    parser.add_argument("--keywords", nargs="+", default=["라떼", "에티오피아", "바닐라 라떼", "카노12345", "ㅁㅋ"])
+    parser.add_argument("--page-size", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    asyncio.run(main(parser.parse_args()))
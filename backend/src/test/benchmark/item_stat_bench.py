@@ -0,0 +1,94 @@
+"""Item stat benchmark
+
+유저 한 명의 카테고리 통계(아이템 수, 평균 판매가/원가, 마진)를 세 가지 방법으로 조회합니다.
+    - export: 모든 아이템을 읽어 Python에서 계산 (기존 클라이언트가 GET /item 으로 받아 계산하는 방법)
+    - group_by: user_item을 SQL GROUP BY로 계산 (아이템 수에 비례)
+    - stat: AsyncMySQLManager.get_item_stats (user_item_stat, 카테고리 수에 비례)
+아이템 등록/수정/삭제 시 user_item_stat 변경분을 더하는 비용도 함께 출력합니다.
+
+Usage:
+    cd src
+    python -m test.benchmark.item_stat_bench --items 100000 --categories 20
+"""
+import time
+import asyncio
+import argparse
+from sqlalchemy import insert, select, func
+from lib.model import Item
+from lib.db_connect import AsyncMySQLManager
+from test.async_sqlite import create_sqlite_sessionmaker
+
+PHONE_NUMBER = "010-9999-0000"
+BATCH_SIZE = 10000
+
+
+def make_item(i: int, categories: int) -> dict:
+    return {
+        "phone_number": PHONE_NUMBER,
+        "category": f"category{i % categories}",
+        "selling_price": 3000 + i % 50 * 100,
+        "cost_price": 1000 + i % 30 * 100,
+        "name": f"아메리카노{i}",
+        "description": "맛있는 아메리카노",
+        "barcode": str(i),
+        "expiration_date": "2023-08-20",
+        "size": "small",
+    }
+
+
+async def measure(call, repeat: int) -> tuple:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = await call()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+async def main(args) -> None:
+    Session = await create_sqlite_sessionmaker()
+    async with Session() as session:
+        MySQLManager = AsyncMySQLManager(session)
+        rows = [make_item(i, args.categories) for i in range(args.items)]
+        start = time.perf_counter()
+        for offset in range(0, len(rows), BATCH_SIZE):
+            await MySQLManager.insert_item_bulk(PHONE_NUMBER, rows[offset:offset + BATCH_SIZE])
+        print(f"items={args.items} categories={args.categories} load={time.perf_counter() - start:.1f}s")
+
+        async def export():
+            stats = {}
+            result = await session.execute(select(Item.category, Item.selling_price, Item.cost_price).filter(
+                Item.phone_number == PHONE_NUMBER))
+            for category, selling_price, cost_price in result:
+                stat = stats.setdefault(category, [0, 0, 0])
+                stat[0] += 1
+                stat[1] += selling_price
+                stat[2] += cost_price
+            return len(stats)
+
+        async def group_by():
+            result = await session.execute(select(
+                Item.category, func.count(), func.sum(Item.selling_price), func.sum(Item.cost_price)).filter(
+                Item.phone_number == PHONE_NUMBER).group_by(Item.category))
+            return len(result.all())
+
+        async def stat():
+            return len((await MySQLManager.get_item_stats(PHONE_NUMBER))["categories"])
+
+        for name, call in [("export", export), ("group_by", group_by), ("stat", stat)]:
+            ms, categories = await measure(call, args.repeat)
+            print(f"{name:<9} {ms:.2f}ms categories={categories}")
+
+        # write path (stat delta in the same transaction)
+        params = dict(make_item(0, args.categories), category="category0")
+        write_ms, _ = await measure(lambda: MySQLManager.insert_item_info(PHONE_NUMBER, params), args.repeat)
+        update_ms, _ = await measure(
+            lambda: MySQLManager.update_item_info(PHONE_NUMBER, 1, {"selling_price": 4000}), args.repeat)
+        print(f"insert_item_info={write_ms:.2f}ms update_item_info(price)={update_ms:.2f}ms")
+    await Session.kw["bind"].dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=100000)
+    parser.add_argument("--categories", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
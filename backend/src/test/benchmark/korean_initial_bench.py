@@ -0,0 +1,54 @@
+"""Korean initial benchmark
+
+jamo로 한 글자씩 분해하는 기존 초성 추출과 lookup table 기반 초성 추출(단건, batch)의 속도를 비교합니다.
+
+Usage:
+    cd src
+    python -m test.benchmark.korean_initial_bench --names 1000000
+"""
+import time
+import random
+import argparse
+from jamo import h2j, j2hcj
+from lib.util import extract_korean_initial, extract_korean_initial_many
+
+
+def jamo_korean_initial(text: str) -> str:
+    result = ""
+    for t in text:
+        result += j2hcj(h2j(t))[0]
+    return result
+
+
+def make_names(count: int) -> list:
+    random.seed(0)
+    syllables = [chr(cp) for cp in range(0xAC00, 0xD7A4)]
+    names = []
+    for i in range(count):
+        name = "".join(random.choices(syllables, k=random.randint(2, 8)))
+        names.append(f"{name} {i}" if i % 4 == 0 else name)
+    return names
+
+
+def measure(label: str, call, count: int) -> float:
+    start = time.perf_counter()
+    result = call()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<8} total={elapsed:.3f}s per_name={elapsed / count * 1e9:.0f}ns")
+    return elapsed, result
+
+
+def main(args) -> None:
+    names = make_names(args.names)
+    jamo_s, expected = measure("jamo", lambda: [jamo_korean_initial(name) for name in names], args.names)
+    table_s, result = measure("table", lambda: [extract_korean_initial(name) for name in names], args.names)
+    assert result == expected
+    batch_s, result = measure("batch", lambda: extract_korean_initial_many(names), args.names)
+    assert result == expected
+    print(f"speedup table={jamo_s / table_s:.1f}x batch={jamo_s / batch_s:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--names", type=int, default=1000000)
+    main(parser.parse_args())
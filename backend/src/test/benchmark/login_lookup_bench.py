@@ -0,0 +1,81 @@
+"""Login lookup benchmark
+
+로그인 시 전화번호 조회 지연시간을 유저 수(1k ~ 1M)에 따라 비교합니다.
+    - full scan(before): get_user_all_auth_number로 전체 전화번호를 가져온 뒤 in 으로 검사
+    - indexed(after): unique index로 get_user_auth 한 번만 조회
+
+Usage:
+    cd src
+    python -m test.benchmark.login_lookup_bench --users 1000 10000 100000 1000000
+"""
+import os
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+from sqlalchemy import insert
+from lib.model import User
+from lib.db_connect import AsyncMySQLManager
+from test.async_sqlite import create_sqlite_sessionmaker
+
+
+def phone_number(i: int) -> str:
+    return f"010-{i // 10000:04d}-{i % 10000:04d}"
+
+
+async def measure(call, lookups: int) -> dict:
+    latency = []
+    for _ in range(lookups):
+        start = time.perf_counter()
+        await call()
+        latency.append(time.perf_counter() - start)
+    latency.sort()
+    return {
+        "mean_ms": sum(latency) / len(latency) * 1000,
+        "p99_ms": latency[int(len(latency) * 0.99) - 1] * 1000
+    }
+
+
+async def bench(users: int, lookups: int, full_scan_limit: int) -> None:
+    Session = await create_sqlite_sessionmaker(os.path.join(tempfile.mkdtemp(), "cafe.db"))
+    async with Session() as session:
+        for start in range(0, users, 10000):
+            await session.execute(insert(User), [{
+                "phone_number": phone_number(i),
+                "password": "password",
+                "timestamp": "2023-07-23 00:00:00"
+            } for i in range(start, min(start + 10000, users))])
+        await session.commit()
+
+        MySQLManager = AsyncMySQLManager(session)
+
+        async def indexed():
+            await MySQLManager.get_user_auth(phone_number(random.randrange(users)))
+
+        async def full_scan():
+            number = phone_number(random.randrange(users))
+            if number in await MySQLManager.get_user_all_auth_number():
+                await MySQLManager.get_user_auth(number)
+
+        result = await measure(indexed, lookups)
+        print(f"users={users:>8} indexed(after)    "
+              f"mean={result['mean_ms']:.3f}ms p99={result['p99_ms']:.3f}ms")
+        if users <= full_scan_limit:
+            result = await measure(full_scan, max(lookups // 100, 10))
+            print(f"users={users:>8} full scan(before) "
+                  f"mean={result['mean_ms']:.3f}ms p99={result['p99_ms']:.3f}ms")
+    await Session.kw["bind"].dispose()
+
+
+async def main(args) -> None:
+    for users in args.users:
+        await bench(users, args.lookups, args.full_scan_limit)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, nargs="+", default=[1000, 10000, 100000, 1000000])
+    parser.add_argument("--lookups", type=int, default=1000)
+    parser.add_argument("--full-scan-limit", type=int, default=100000)
+    asyncio.run(main(parser.parse_args()))
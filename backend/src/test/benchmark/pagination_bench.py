@@ -0,0 +1,64 @@
+"""Pagination benchmark
+
+offset(page_number) 페이지네이션과 cursor(keyset) 페이지네이션의 페이지별 조회 시간을 비교합니다.
+cursor 페이지네이션은 첫 페이지와 마지막 페이지(page 5000)의 조회 시간이 같아야 합니다.
+
+Usage:
+    cd src
+    python -m test.benchmark.pagination_bench --items 50010 --pages 1 5000
+"""
+import time
+import asyncio
+import argparse
+from sqlalchemy import insert
+from lib.model import Item
+from lib.db_connect import AsyncMySQLManager
+from test.async_sqlite import create_sqlite_sessionmaker
+
+PHONE_NUMBER = "010-9999-0000"
+
+
+async def measure(call, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        await call()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+async def main(args) -> None:
+    Session = await create_sqlite_sessionmaker()
+    async with Session() as session:
+        for start in range(0, args.items, 10000):
+            await session.execute(insert(Item), [{
+                "phone_number": PHONE_NUMBER,
+                "category": "coffee",
+                "selling_price": 5000,
+                "cost_price": 3500,
+                "name": f"아메리카노{i}",
+                "description": "benchmark",
+                "barcode": str(i),
+                "expiration_date": "2023-08-20",
+                "size": "small",
+                "search_initial": "ㅇㅁㄹㅋㄴ"
+            } for i in range(start, min(start + 10000, args.items))])
+        await session.commit()
+
+        MySQLManager = AsyncMySQLManager(session)
+        for page in args.pages:
+            # cursor of page N is the last seq of page N-1
+            cursor = (page - 1) * args.page_size
+            offset_ms = await measure(
+                lambda: MySQLManager.get_all_item(PHONE_NUMBER, page - 1, None, args.page_size), args.repeat)
+            cursor_ms = await measure(
+                lambda: MySQLManager.get_all_item(PHONE_NUMBER, 0, cursor, args.page_size), args.repeat)
+            print(f"page={page:>5} offset={offset_ms:.3f}ms cursor={cursor_ms:.3f}ms")
+    await Session.kw["bind"].dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=50010)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 100, 1000, 5000])
+    parser.add_argument("--page-size", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
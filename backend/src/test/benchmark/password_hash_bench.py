@@ -0,0 +1,58 @@
+"""Password hash benchmark
+
+scrypt cost factor별 로그인(verify_password) 처리량과 p99 지연시간을 측정합니다.
+CPU 예산에 맞는 cost factor를 고르기 위해 hashing 프로세스(core)당 처리량도 함께 출력합니다.
+
+Usage:
+    cd src
+    python -m test.benchmark.password_hash_bench --costs 12 13 14 15 --workers 2 --logins 200
+"""
+import os
+import time
+import asyncio
+import argparse
+import lib.password as password
+from lib.password import PasswordHasher
+
+PASSWORD = "123adfabv22"
+
+
+async def bench(cost: int, logins: int, concurrency: int, workers: int) -> None:
+    hasher = PasswordHasher(cost=cost)
+    hash_password = await hasher.hash_password(PASSWORD)
+    latency = []
+    queue = list(range(logins))
+
+    async def client():
+        while queue:
+            queue.pop()
+            start = time.perf_counter()
+            assert await hasher.verify_password(PASSWORD, hash_password)
+            latency.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[client() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - start
+    latency.sort()
+    throughput = logins / elapsed
+    print(f"cost={cost:>2} (N=2^{cost}) workers={workers} "
+          f"logins/sec={throughput:.1f} logins/sec/core={throughput / workers:.1f} "
+          f"p99={latency[int(len(latency) * 0.99) - 1] * 1000:.1f}ms")
+
+
+async def main(args) -> None:
+    password.PASSWORD_HASH["max_workers"] = args.workers
+    # warm up hashing pool processes
+    await PasswordHasher(cost=4).hash_password(PASSWORD)
+    for cost in args.costs:
+        await bench(cost, args.logins, args.concurrency, args.workers)
+    password.shutdown_executor()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--costs", type=int, nargs="+", default=[12, 13, 14, 15])
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,94 @@
+"""Read path benchmark
+
+100개 아이템 페이지 한 번을 조회하고 응답 body를 만드는 데 드는 CPU 시간과 메모리 할당량을 비교합니다.
+    - orm: Item ORM 객체 조회 -> dict 복사 -> FastAPI jsonable_encoder -> JSONResponse (기존 방식)
+    - core: 필요한 컬럼만 Core row로 조회 -> dict -> ORJSONResponse (jsonable_encoder 생략)
+
+Usage:
+    cd src
+    python -m test.benchmark.read_path_bench --page-size 100 --repeat 500
+"""
+import time
+import asyncio
+import argparse
+import tracemalloc
+from sqlalchemy import insert, select
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from lib.model import Item
+from lib.util import make_respose
+from lib.db_connect import AsyncMySQLManager
+from test.async_sqlite import create_sqlite_sessionmaker
+
+PHONE_NUMBER = "010-9999-0000"
+
+
+async def orm_page(session, page_size: int) -> bytes:
+    sql = select(Item).filter(Item.phone_number == PHONE_NUMBER).order_by(Item.seq).limit(page_size)
+    result = [{
+        "seq": obj.seq,
+        "phone_number": obj.phone_number,
+        "category": obj.category,
+        "selling_price": obj.selling_price,
+        "cost_price": obj.cost_price,
+        "name": obj.name,
+        "description": obj.description,
+        "barcode": obj.barcode,
+        "expiration_date": obj.expiration_date,
+        "size": obj.size
+    } for obj in (await session.execute(sql)).scalars()]
+    return JSONResponse(jsonable_encoder(make_respose(result))).body
+
+
+async def core_page(session, page_size: int) -> bytes:
+    result = await AsyncMySQLManager(session).get_all_item(PHONE_NUMBER, page_size=page_size)
+    return ORJSONResponse(make_respose(result)).body
+
+
+async def measure(Session, page, args) -> tuple:
+    """Return (cpu ms per request, peak allocated bytes per request)."""
+    async with Session() as session:
+        await page(session, args.page_size)
+        start = time.process_time()
+        for _ in range(args.repeat):
+            await page(session, args.page_size)
+        cpu_ms = (time.process_time() - start) / args.repeat * 1000
+
+        tracemalloc.start()
+        await page(session, args.page_size)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return cpu_ms, peak
+
+
+async def main(args) -> None:
+    Session = await create_sqlite_sessionmaker()
+    async with Session() as session:
+        await session.execute(insert(Item), [{
+            "phone_number": PHONE_NUMBER,
+            "category": "coffee",
+            "selling_price": 5000,
+            "cost_price": 3500,
+            "name": f"아메리카노{i}",
+            "description": "맛있는 아메리카노",
+            "barcode": str(i),
+            "expiration_date": "2023-08-20",
+            "size": "small",
+            "search_initial": "ㅇㅁㄹㅋㄴ"
+        } for i in range(args.page_size)])
+        await session.commit()
+
+        # same response body
+        assert await orm_page(session, args.page_size) == await core_page(session, args.page_size)
+
+    for name, page in [("orm", orm_page), ("core", core_page)]:
+        cpu_ms, peak = await measure(Session, page, args)
+        print(f"{name:<5} cpu={cpu_ms:.3f}ms/request peak_alloc={peak / 1024:.1f}KB/request")
+    await Session.kw["bind"].dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=500)
+    asyncio.run(main(parser.parse_args()))
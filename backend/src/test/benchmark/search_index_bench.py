@@ -0,0 +1,79 @@
+"""Search index benchmark
+
+SQL LIKE prefix 검색과 in-process trie 검색 인덱스의 검색 시간, 인덱스 메모리 사용량을 비교합니다.
+메모리는 tracemalloc으로 측정한 실제 사용량과 SearchIndex의 추정치(max_bytes 기준)를 함께 출력합니다.
+
+Usage:
+    cd src
+    python -m test.benchmark.search_index_bench --items 10000 --keywords 아메 ㅇㅁㄹ 카페라떼1
+"""
+import time
+import asyncio
+import argparse
+import tracemalloc
+from sqlalchemy import insert
+from lib.model import Item
+from lib.db_connect import AsyncMySQLManager
+from lib.search_index import SearchIndex
+from lib.util import extract_korean_initial
+from test.async_sqlite import create_sqlite_sessionmaker
+
+PHONE_NUMBER = "010-9999-0000"
+NAMES = ["아메리카노", "카페라떼", "카페모카", "바닐라라떼", "아이스티", "자몽에이드"]
+
+
+async def measure(call, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        await call()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+async def main(args) -> None:
+    Session = await create_sqlite_sessionmaker()
+    async with Session() as session:
+        rows = []
+        for i in range(args.items):
+            name = f"{NAMES[i % len(NAMES)]}{i}"
+            rows.append({
+                "phone_number": PHONE_NUMBER,
+                "category": "coffee",
+                "selling_price": 5000,
+                "cost_price": 3500,
+                "name": name,
+                "description": "benchmark",
+                "barcode": str(i),
+                "expiration_date": "2023-08-20",
+                "size": "small",
+                "search_initial": extract_korean_initial(name)
+            })
+        await session.execute(insert(Item), rows)
+        await session.commit()
+
+        index = SearchIndex(max_bytes=10 ** 10)
+        MySQLManager = AsyncMySQLManager(session)
+        IndexMySQLManager = AsyncMySQLManager(session, index)
+
+        tracemalloc.start()
+        await IndexMySQLManager.get_search_item(PHONE_NUMBER, NAMES[0])
+        traced, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        per_10k = 10000 / args.items / 1024 / 1024
+        print(f"items={args.items} traced={traced * per_10k:.2f}MB/10k "
+              f"estimated={index.stats()['bytes'] * per_10k:.2f}MB/10k")
+
+        for keyword in args.keywords:
+            sql_ms = await measure(
+                lambda: MySQLManager.get_search_item(PHONE_NUMBER, keyword), args.repeat)
+            index_ms = await measure(
+                lambda: IndexMySQLManager.get_search_item(PHONE_NUMBER, keyword), args.repeat)
+            print(f"keyword={keyword:<8} sql={sql_ms:.3f}ms index={index_ms:.3f}ms")
+    await Session.kw["bind"].dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=10000)
+    parser.add_argument("--keywords", nargs="+", default=["아메", "ㅇㅁㄹ", "ㅋㅍ", "카페라떼1"])
+    parser.add_argument("--repeat", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
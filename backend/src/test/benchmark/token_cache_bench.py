@@ -0,0 +1,38 @@
+"""Token cache benchmark
+
+ApiValidator.check_current_user의 요청당 인증 비용을 TokenCache 사용/미사용으로 비교합니다.
+
+Usage:
+    cd src
+    python -m test.benchmark.token_cache_bench --requests 100000 --tokens 10
+"""
+import jwt
+import time
+import argparse
+from datetime import datetime, timedelta
+from lib import TOKEN_KEY
+from lib.validator import ApiValidator
+
+
+def main(args) -> None:
+    users = [f"010-0000-{i:04d}" for i in range(args.tokens)]
+    tokens = [jwt.encode({
+        "phone_number": user,
+        "exp": datetime.utcnow() + timedelta(hours=2)
+    }, TOKEN_KEY, algorithm="HS256") for user in users]
+
+    for name, cache_size in [("cache off", 0), ("cache on", 10000)]:
+        validator = ApiValidator(token_cache_size=cache_size)
+        start = time.perf_counter()
+        for i in range(args.requests):
+            validator.check_current_user(users[i % args.tokens], tokens[i % args.tokens])
+        elapsed = time.perf_counter() - start
+        print(f"{name:9} {elapsed / args.requests * 1e6:.2f}us/request "
+              f"{validator.TokenCache.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=100000)
+    parser.add_argument("--tokens", type=int, default=10)
+    main(parser.parse_args())
@@ -0,0 +1,139 @@
+"""Worker scaling benchmark
+
+gunicorn.conf.py로 worker 수(--workers)를 바꿔 서버를 띄우고, 여러 client 프로세스가 duration초 동안
+같은 GET 요청을 보내서 worker 수에 따른 처리량(req/s)과 p50/p99 지연시간을 비교합니다.
+    - speedup: worker 1개 대비 처리량
+    - efficiency: speedup / worker 수 (1에 가까울수록 worker 추가만큼 처리량이 늘어남)
+서버와 client가 같은 머신의 CPU를 나눠 쓰므로 CPU 수가 worker 수 + client 수보다 적으면 efficiency가 낮게 측정됩니다.
+기본 요청은 GET /item (DB 조회, conf.json의 DB 필요) 이고, --path /openapi.json 으로 DB 없이 측정할 수 있습니다.
+
+Usage:
+    cd src
+    python -m test.benchmark.worker_scaling_bench --workers 1 2 4 --clients 4 --duration 10
+    python -m test.benchmark.worker_scaling_bench --workers 1 2 --path /openapi.json --anonymous
+"""
+import os
+import jwt
+import sys
+import time
+import signal
+import asyncio
+import argparse
+import subprocess
+import multiprocessing
+import httpx
+from datetime import datetime, timedelta
+from lib import TOKEN_KEY
+
+PHONE_NUMBER = "010-9999-0000"
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+
+def make_headers() -> dict:
+    token = jwt.encode({
+        "phone_number": PHONE_NUMBER,
+        "exp": datetime.utcnow() + timedelta(hours=2)
+    }, TOKEN_KEY, algorithm="HS256")
+    return {"user": PHONE_NUMBER, "Authorization": token}
+
+
+def percentile(times: list, p: float) -> float:
+    times = sorted(times)
+    return times[min(len(times) - 1, int(len(times) * p))] * 1000
+
+
+def start_server(workers: int, port: int) -> subprocess.Popen:
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "app:app", "-c", "gunicorn.conf.py",
+         "-w", str(workers), "-b", f"127.0.0.1:{port}"],
+        cwd=BACKEND_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/openapi.json").status_code == 200:
+                return server
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("server did not start")
+
+
+def stop_server(server: subprocess.Popen) -> None:
+    server.send_signal(signal.SIGTERM)
+    try:
+        server.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        server.kill()
+
+
+async def drive(url: str, headers: dict, concurrency: int, duration: float) -> tuple:
+    latency, errors = [], 0
+    deadline = time.perf_counter() + duration
+
+    async def connection(client):
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                resp = await client.get(url, headers=headers)
+                if resp.status_code == 200:
+                    latency.append(time.perf_counter() - start)
+                else:
+                    errors += 1
+            except httpx.TransportError:
+                errors += 1
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        await asyncio.gather(*(connection(client) for _ in range(concurrency)))
+    return latency, errors
+
+
+def client_process(args: tuple) -> tuple:
+    return asyncio.run(drive(*args))
+
+
+def run(workers: int, args) -> dict:
+    server = start_server(workers, args.port)
+    try:
+        url = f"http://127.0.0.1:{args.port}{args.path}"
+        headers = {} if args.anonymous else make_headers()
+        # warm up engines, caches of every worker
+        client_process((url, headers, args.concurrency, 1.0))
+        with multiprocessing.Pool(args.clients) as pool:
+            results = pool.map(client_process, [(url, headers, args.concurrency, args.duration)] * args.clients)
+    finally:
+        stop_server(server)
+    latency = [t for times, _ in results for t in times]
+    return {
+        "rps": len(latency) / args.duration,
+        "errors": sum(errors for _, errors in results),
+        "p50": percentile(latency, 0.5) if latency else 0,
+        "p99": percentile(latency, 0.99) if latency else 0
+    }
+
+
+def main(args) -> None:
+    print(f"cpus={os.cpu_count()} clients={args.clients}x{args.concurrency} duration={args.duration}s "
+          f"path={args.path}")
+    base = None
+    for workers in args.workers:
+        result = run(workers, args)
+        base = base or result["rps"]
+        speedup = result["rps"] / base if base else 0
+        print(f"workers={workers:<3} rps={result['rps']:.0f} errors={result['errors']} "
+              f"p50={result['p50']:.1f}ms p99={result['p99']:.1f}ms "
+              f"speedup={speedup:.2f}x efficiency={speedup / workers:.0%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--clients", type=int, default=4, help="load generator processes")
+    parser.add_argument("--concurrency", type=int, default=16, help="connections per client")
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--path", default="/item/?page_size=10")
+    parser.add_argument("--anonymous", action="store_true", help="send no auth headers")
+    parser.add_argument("--port", type=int, default=8765)
+    main(parser.parse_args())
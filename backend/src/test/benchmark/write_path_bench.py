@@ -0,0 +1,109 @@
+"""Write path benchmark
+
+아이템 수정/삭제 한 건의 latency와 DB로 보내는 statement 수를 비교합니다.
+    - before: SELECT로 ORM 객체를 읽고 값을 바꾼 뒤(session.delete) commit (기존 방식)
+    - after: UPDATE/DELETE ... WHERE phone_number=? AND seq=? 한 번과 commit
+      (같은 transaction에서 user_item_ngram 수정, user_item_version 증가, user_item_stat upsert statement가 더해집니다.
+       user_item_stat은 이전 값을 따로 읽지 않고 INSERT ... SELECT upsert 한 번으로 더합니다.)
+
+Usage:
+    cd src
+    python -m test.benchmark.write_path_bench --items 2000 --rtt 0.5
+
+    --rtt: statement마다 n ms를 기다려 MySQL까지의 network round trip을 흉내냅니다.
+           sqlite는 같은 프로세스에서 동작하므로 --rtt 없이 측정한 값은 CPU 비용만 나타냅니다.
+"""
+import time
+import asyncio
+import argparse
+from sqlalchemy import event, insert, select
+from lib.model import Item
+from lib.util import extract_korean_initial
+from lib.db_connect import AsyncMySQLManager
+from test.async_sqlite import create_sqlite_sessionmaker
+
+PHONE_NUMBER = "010-9999-0000"
+statements = 0
+
+
+async def update_before(session, seq: int, params: dict) -> None:
+    sql = select(Item).filter(Item.phone_number == PHONE_NUMBER, Item.seq == seq)
+    item_obj = (await session.execute(sql)).scalar_one()
+    for key, value in params.items():
+        setattr(item_obj, key, value if type(value) is str else int(value))
+        if key == "name":
+            item_obj.search_initial = extract_korean_initial(value)
+    await session.commit()
+
+
+async def delete_before(session, seq: int) -> None:
+    sql = select(Item).filter(Item.phone_number == PHONE_NUMBER, Item.seq == seq)
+    item_obj = (await session.execute(sql)).scalar_one()
+    await session.delete(item_obj)
+    await session.commit()
+
+
+async def update_after(session, seq: int, params: dict) -> None:
+    await AsyncMySQLManager(session).update_item_info(PHONE_NUMBER, seq, params)
+
+
+async def delete_after(session, seq: int) -> None:
+    await AsyncMySQLManager(session).delete_item_info(PHONE_NUMBER, seq)
+
+
+async def measure(Session, call, seqs: list) -> tuple:
+    global statements
+    statements = 0
+    async with Session() as session:
+        start = time.perf_counter()
+        for seq in seqs:
+            await call(session, seq)
+        elapsed = time.perf_counter() - start
+    return elapsed / len(seqs) * 1000, statements / len(seqs)
+
+
+async def main(args) -> None:
+    Session = await create_sqlite_sessionmaker()
+    engine = Session.kw["bind"].sync_engine
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def round_trip(*_):
+        global statements
+        statements += 1
+        if args.rtt:
+            time.sleep(args.rtt / 1000)
+
+    async with Session() as session:
+        await session.execute(insert(Item), [{
+            "phone_number": PHONE_NUMBER,
+            "category": "coffee",
+            "selling_price": 5000,
+            "cost_price": 3500,
+            "name": f"아메리카노{i}",
+            "description": "benchmark",
+            "barcode": str(i),
+            "expiration_date": "2023-08-20",
+            "size": "small",
+            "search_initial": "ㅇㅁㄹㅋㄴ"
+        } for i in range(args.items * 2)])
+        await session.commit()
+
+    params = {"name": "카페라떼", "selling_price": 5500}
+    half = list(range(1, args.items + 1)), list(range(args.items + 1, args.items * 2 + 1))
+    cases = [
+        ("update", "before", lambda session, seq: update_before(session, seq, params), half[0]),
+        ("update", "after", lambda session, seq: update_after(session, seq, params), half[1]),
+        ("delete", "before", delete_before, half[0]),
+        ("delete", "after", delete_after, half[1]),
+    ]
+    for name, version, call, seqs in cases:
+        latency, count = await measure(Session, call, seqs)
+        print(f"{name} {version:<6} latency={latency:.3f}ms statements={count:.1f} (commit excluded)")
+    await Session.kw["bind"].dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=2000)
+    parser.add_argument("--rtt", type=float, default=0)
+    asyncio.run(main(parser.parse_args()))
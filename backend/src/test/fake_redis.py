@@ -0,0 +1,69 @@
+"""In-process Redis stand-in
+
+RedisBackend를 Redis 서버 없이 테스트하기 위해 asyncio로 RESP protocol의 일부 명령(GET, MGET, SET PX, DEL, INCR)만 처리합니다.
+"""
+import time
+import asyncio
+
+
+class FakeRedisServer:
+    def __init__(self) -> None:
+        self.data = {}
+        self.commands = []
+        self.server = None
+
+    async def start(self) -> int:
+        """Start server on random port and return the port."""
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    def _get(self, key: bytes):
+        value, expire_at = self.data.get(key, (None, None))
+        if expire_at is not None and expire_at <= time.time():
+            self.data.pop(key)
+            return None
+        return value
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                args = []
+                for _ in range(int(line[1:-2])):
+                    length = int((await reader.readline())[1:-2])
+                    args.append((await reader.readexactly(length + 2))[:-2])
+                self.commands.append(args[0].upper().decode())
+                writer.write(self._execute(args))
+                await writer.drain()
+        finally:
+            writer.close()
+
+    def _execute(self, args: list) -> bytes:
+        command, keys = args[0].upper(), args[1:]
+        if command == b"MGET":
+            return b"*%d\r\n" % len(keys) + b"".join(self._bulk(self._get(key)) for key in keys)
+        if command == b"GET":
+            return self._bulk(self._get(keys[0]))
+        if command == b"SET":
+            expire_at = time.time() + int(args[4]) / 1000 if len(args) > 4 else None
+            self.data[args[1]] = (args[2], expire_at)
+            return b"+OK\r\n"
+        if command == b"DEL":
+            return b":%d\r\n" % sum(self.data.pop(key, None) is not None for key in keys)
+        if command == b"INCR":
+            value = int(self._get(keys[0]) or 0) + 1
+            self.data[keys[0]] = (str(value).encode(), None)
+            return b":%d\r\n" % value
+        return b"-ERR unknown command\r\n"
+
+    @staticmethod
+    def _bulk(value: bytes) -> bytes:
+        if value is None:
+            return b"$-1\r\n"
+        return b"$%d\r\n%s\r\n" % (len(value), value)
@@ -0,0 +1,40 @@
+"""In-process webhook stand-in
+
+WebhookHandler를 외부 서버 없이 테스트하기 위해 asyncio로 HTTP POST 요청을 받아 body(JSON)를 저장합니다.
+status를 바꾸면 다음 요청부터 해당 status code로 응답합니다.
+"""
+import json
+import asyncio
+
+
+class FakeWebhookServer:
+    def __init__(self) -> None:
+        self.requests = []
+        self.status = 200
+        self.server = None
+
+    async def start(self) -> str:
+        """Start server on random port and return the url."""
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return f"http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}/expired"
+
+    async def stop(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            headers = {}
+            method, path, _ = (await reader.readline()).decode().split(" ", 2)
+            while True:
+                line = (await reader.readline()).decode().strip()
+                if not line:
+                    break
+                key, value = line.split(":", 1)
+                headers[key.lower()] = value.strip()
+            body = await reader.readexactly(int(headers.get("content-length", 0)))
+            self.requests.append({"method": method, "path": path, "json": json.loads(body or b"null")})
+            writer.write(b"HTTP/1.1 %d OK\r\nContent-Length: 0\r\nConnection: close\r\n\r\n" % self.status)
+            await writer.drain()
+        finally:
+            writer.close()
@@ -0,0 +1,452 @@
+import random
+import asyncio
+from unittest import IsolatedAsyncioTestCase
+from enum import Enum
+from lib.db_connect import AsyncMySQLManager, DuplicateKeyError, MySQLManagerError, NotFoundError
+from test.async_sqlite import create_sqlite_sessionmaker
+
+
+class Mock(Enum):
+    """Mock data for testing"""
+    PHONE_NUMBER = "010-0000-0000"
+    PASSWORD = "12312312"
+    CATEGORY = "coffee"
+    SELLING_PRICE = 5000
+    COST_PRICE = 3500
+    NAME = "아메리카노"
+    DESCRIPTION = "맛있는 아메리카노"
+    BARCODE = "010100000110224"
+    EXPIRATION_DATE = "2023-08-20"
+    SIZE = "small"
+
+
+params = {
+    "category": Mock.CATEGORY.value,
+    "selling_price": Mock.SELLING_PRICE.value,
+    "cost_price": Mock.COST_PRICE.value,
+    "name": Mock.NAME.value,
+    "description": Mock.DESCRIPTION.value,
+    "barcode": Mock.BARCODE.value,
+    "expiration_date": Mock.EXPIRATION_DATE.value,
+    "size": Mock.SIZE.value
+}
+
+
+class AsyncMySQLManagerAuthTestCase(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.Session = await create_sqlite_sessionmaker()
+        self.session = self.Session()
+        self.MySQLManager = AsyncMySQLManager(self.session)
+        await self.MySQLManager.insert_user_auth(Mock.PHONE_NUMBER.value, Mock.PASSWORD.value)
+
+    async def asyncTearDown(self) -> None:
+        await self.session.close()
+        await self.Session.kw["bind"].dispose()
+
+    async def test_get_user_auth(self):
+        result = await self.MySQLManager.get_user_auth(Mock.PHONE_NUMBER.value)
+        self.assertEqual(result["phone_number"], Mock.PHONE_NUMBER.value)
+        self.assertEqual(result["password"], Mock.PASSWORD.value)
+
+    async def test_get_user_auth_not_exist(self):
+        result = await self.MySQLManager.get_user_auth("010-1555-1555")
+        self.assertIsNone(result)
+
+    async def test_insert_duplicate_user_auth(self):
+        with self.assertRaises(DuplicateKeyError):
+            await self.MySQLManager.insert_user_auth(Mock.PHONE_NUMBER.value, Mock.PASSWORD.value)
+
+    async def test_get_user_all_auth_number(self):
+        result = await self.MySQLManager.get_user_all_auth_number()
+        self.assertIn(Mock.PHONE_NUMBER.value, result)
+
+    async def test_delete_user_auth(self):
+        result = await self.MySQLManager.delete_user_auth(Mock.PHONE_NUMBER.value)
+        self.assertEqual(result, "success")
+        result = await self.MySQLManager.get_user_all_auth_number()
+        self.assertNotIn(Mock.PHONE_NUMBER.value, result)
+
+
+class AsyncMySQLManagerItemTestCase(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.Session = await create_sqlite_sessionmaker()
+        self.session = self.Session()
+        self.MySQLManager = AsyncMySQLManager(self.session)
+        # single case test
+        await self.MySQLManager.insert_item_info(Mock.PHONE_NUMBER.value, dict(params))
+
+        # multi case test
+        for i in range(11):
+            await self.MySQLManager.insert_item_info(
+                Mock.PHONE_NUMBER.value, dict(params, name=Mock.NAME.value + str(i)))
+
+    async def asyncTearDown(self) -> None:
+        await self.session.close()
+        await self.Session.kw["bind"].dispose()
+
+    async def test_get_item_info(self):
+        result = await self.MySQLManager.get_item_info(Mock.PHONE_NUMBER.value, 1)
+        self.assertEqual(result["selling_price"], Mock.SELLING_PRICE.value)
+        self.assertEqual(result["description"], Mock.DESCRIPTION.value)
+        self.assertEqual(result["expiration_date"], Mock.EXPIRATION_DATE.value)
+
+    async def test_update_item_info(self):
+        change_params = {
+            "category": "ice",
+            "cost_price": 6000
+        }
+        result = await self.MySQLManager.update_item_info(Mock.PHONE_NUMBER.value, 1, change_params)
+        self.assertIn("category", result)
+        self.assertIn("cost_price", result)
+
+        result = await self.MySQLManager.get_item_info(Mock.PHONE_NUMBER.value, 1)
+        self.assertEqual(result["category"], change_params["category"])
+        self.assertEqual(result["cost_price"], change_params["cost_price"])
+
+        # 허용되지 않은 컬럼은 변경되지 않음
+        result = await self.MySQLManager.update_item_info(
+            Mock.PHONE_NUMBER.value, 1, {"phone_number": "010-1111-1234", "size": "large"})
+        self.assertEqual(result, ["size"])
+        result = await self.MySQLManager.get_item_info(Mock.PHONE_NUMBER.value, 1)
+        self.assertEqual(result["phone_number"], Mock.PHONE_NUMBER.value)
+
+    async def test_item_not_found(self):
+        with self.assertRaises(NotFoundError):
+            await self.MySQLManager.update_item_info(Mock.PHONE_NUMBER.value, 100, {"category": "ice"})
+        with self.assertRaises(NotFoundError):
+            await self.MySQLManager.update_item_info("010-1111-1234", 1, {})
+        with self.assertRaises(NotFoundError):
+            await self.MySQLManager.delete_item_info("010-1111-1234", 1)
+        with self.assertRaises(NotFoundError):
+            await self.MySQLManager.get_item_info(Mock.PHONE_NUMBER.value, 100)
+        result = await self.MySQLManager.update_item_info(Mock.PHONE_NUMBER.value, 1, {})
+        self.assertEqual(result, [])
+
+    async def test_get_all_item(self):
+        result = await self.MySQLManager.get_all_item(Mock.PHONE_NUMBER.value, page_number=0)
+        self.assertEqual(len(result), 10)
+        result = await self.MySQLManager.get_all_item(Mock.PHONE_NUMBER.value, page_number=1)
+        self.assertEqual(len(result), 2)
+
+    async def test_get_all_item_cursor(self):
+        first_page = await self.MySQLManager.get_all_item(Mock.PHONE_NUMBER.value, page_size=5)
+        self.assertEqual([item["seq"] for item in first_page], [1, 2, 3, 4, 5])
+        second_page = await self.MySQLManager.get_all_item(
+            Mock.PHONE_NUMBER.value, cursor=first_page[-1]["seq"], page_size=10)
+        self.assertEqual([item["seq"] for item in second_page], list(range(6, 13)))
+        result = await self.MySQLManager.get_search_item(
+            Mock.PHONE_NUMBER.value, "ㅇㅁㄹ", cursor=10, page_size=10)
+        self.assertEqual([item["seq"] for item in result], [11, 12])
+
+    async def test_get_search_item(self):
+        search_keyword = ["아메", "ㅇㅁㄹ", "아메리카", "ㅇㅁㄹㅋㄴ"]
+        for keyword in search_keyword:
+            result = await self.MySQLManager.get_search_item(Mock.PHONE_NUMBER.value, keyword, page_number=1)
+            self.assertTrue(result)
+
+        result = await self.MySQLManager.update_item_info(Mock.PHONE_NUMBER.value, 1, {"name": "카페라떼"})
+        self.assertIn("search_initial", result)
+        search_keyword = ["카페라떼", "ㅋㅍ", "ㅋㅍㄹㄸ", "카페라"]
+        for keyword in search_keyword:
+            result = await self.MySQLManager.get_search_item(Mock.PHONE_NUMBER.value, keyword, page_number=0)
+            self.assertTrue(result)
+
+    async def test_delete_item_info(self):
+        result = await self.MySQLManager.delete_item_info(Mock.PHONE_NUMBER.value, 1)
+        self.assertEqual(result, "success")
+        result = await self.MySQLManager.get_all_item(Mock.PHONE_NUMBER.value, page_number=1)
+        self.assertEqual(len(result), 1)
+
+    async def test_insert_item_bulk(self):
+        items = [dict(params, name=f"카페라떼{i}") for i in range(25)]
+        result = await self.MySQLManager.insert_item_bulk(Mock.PHONE_NUMBER.value, items)
+        self.assertEqual(result, 25)
+        result = await self.MySQLManager.get_search_item(Mock.PHONE_NUMBER.value, "ㅋㅍㄹㄸ", page_size=100)
+        self.assertEqual(len(result), 25)
+        self.assertEqual(result[0]["name"], "카페라떼0")
+
+        # Error: 한 chunk 실패 시 chunk 전체 rollback
+        items = [dict(params, name="카페모카"), dict(params, barcode=None)]
+        with self.assertRaises(MySQLManagerError):
+            await self.MySQLManager.insert_item_bulk(Mock.PHONE_NUMBER.value, items)
+        result = await self.MySQLManager.get_search_item(Mock.PHONE_NUMBER.value, "카페모카")
+        self.assertEqual(result, [])
+
+    async def test_update_item_bulk(self):
+        await self.MySQLManager.insert_item_info(
+            Mock.PHONE_NUMBER.value, dict(params, name="카페라떼", category="latte", expiration_date="2023-07-01"))
+        await self.MySQLManager.insert_item_info("010-1111-1234", dict(params, category="latte"))
+
+        # dry_run: 개수만 조회
+        filters = {"category": "latte"}
+        result = await self.MySQLManager.update_item_bulk(
+            Mock.PHONE_NUMBER.value, filters, {"size": "large"}, dry_run=True)
+        self.assertEqual(result, 1)
+        result = await self.MySQLManager.get_item_info(Mock.PHONE_NUMBER.value, 13)
+        self.assertEqual(result["size"], Mock.SIZE.value)
+
+        # 다른 유저의 아이템은 변경되지 않음
+        result = await self.MySQLManager.update_item_bulk(
+            Mock.PHONE_NUMBER.value, filters, {"size": "large", "name": "바닐라라떼"})
+        self.assertEqual(result, 1)
+        result = await self.MySQLManager.get_item_info(Mock.PHONE_NUMBER.value, 13)
+        self.assertEqual((result["size"], result["name"]), ("large", "바닐라라떼"))
+        result = await self.MySQLManager.get_search_item(Mock.PHONE_NUMBER.value, "ㅂㄴㄹ")
+        self.assertEqual(len(result), 1)
+        result = await self.MySQLManager.get_item_info("010-1111-1234", 14)
+        self.assertEqual(result["size"], Mock.SIZE.value)
+
+        # 가격 변경: 금액, 퍼센트(반올림, 0 미만 불가)
+        filters = {"expiration_before": "2023-08-01"}
+        await self.MySQLManager.update_item_bulk(
+            Mock.PHONE_NUMBER.value, filters, adjust={"field": "selling_price", "amount": 550})
+        await self.MySQLManager.update_item_bulk(
+            Mock.PHONE_NUMBER.value, filters, adjust={"field": "selling_price", "percent": 10})
+        result = await self.MySQLManager.get_item_info(Mock.PHONE_NUMBER.value, 13)
+        self.assertEqual(result["selling_price"], 6105)
+        await self.MySQLManager.update_item_bulk(
+            Mock.PHONE_NUMBER.value, {"seqs": [1, 2]}, adjust={"field": "cost_price", "amount": -5000})
+        result = await self.MySQLManager.get_item_info(Mock.PHONE_NUMBER.value, 1)
+        self.assertEqual(result["cost_price"], 0)
+        result = await self.MySQLManager.get_item_info(Mock.PHONE_NUMBER.value, 3)
+        self.assertEqual(result["cost_price"], Mock.COST_PRICE.value)
+
+    async def test_delete_item_bulk(self):
+        filters = {"seqs": [1, 2, 3, 100]}
+        result = await self.MySQLManager.delete_item_bulk(Mock.PHONE_NUMBER.value, filters, dry_run=True)
+        self.assertEqual(result, 3)
+        result = await self.MySQLManager.delete_item_bulk("010-1111-1234", filters)
+        self.assertEqual(result, 0)
+        result = await self.MySQLManager.delete_item_bulk(Mock.PHONE_NUMBER.value, filters)
+        self.assertEqual(result, 3)
+        result = await self.MySQLManager.delete_item_bulk(Mock.PHONE_NUMBER.value, {"size": "small"})
+        self.assertEqual(result, 9)
+        result = await self.MySQLManager.get_all_item(Mock.PHONE_NUMBER.value)
+        self.assertEqual(result, [])
+
+    async def test_item_version(self):
+        # setUp: 12 item inserts
+        version = await self.MySQLManager.get_item_version(Mock.PHONE_NUMBER.value)
+        self.assertEqual(version, 12)
+        self.assertEqual(await self.MySQLManager.get_item_version("010-1111-1234"), 0)
+
+        await self.MySQLManager.update_item_info(Mock.PHONE_NUMBER.value, 1, {"category": "ice"})
+        await self.MySQLManager.delete_item_info(Mock.PHONE_NUMBER.value, 2)
+        await self.MySQLManager.insert_item_bulk(Mock.PHONE_NUMBER.value, [dict(params)])
+        await self.MySQLManager.update_item_bulk(Mock.PHONE_NUMBER.value, {"seqs": [1]}, {"size": "large"})
+        await self.MySQLManager.delete_item_bulk(Mock.PHONE_NUMBER.value, {"seqs": [3]})
+        self.assertEqual(await self.MySQLManager.get_item_version(Mock.PHONE_NUMBER.value), version + 5)
+
+        # no change: version is not increased
+        with self.assertRaises(NotFoundError):
+            await self.MySQLManager.update_item_info(Mock.PHONE_NUMBER.value, 100, {"category": "ice"})
+        with self.assertRaises(NotFoundError):
+            await self.MySQLManager.delete_item_info(Mock.PHONE_NUMBER.value, 100)
+        await self.MySQLManager.update_item_bulk(Mock.PHONE_NUMBER.value, {"seqs": [100]}, {"size": "large"})
+        await self.MySQLManager.delete_item_bulk(Mock.PHONE_NUMBER.value, {"seqs": [3]})
+        await self.MySQLManager.update_item_bulk(Mock.PHONE_NUMBER.value, {"seqs": [1]}, {"size": "large"},
+                                                 dry_run=True)
+        self.assertEqual(await self.MySQLManager.get_item_version(Mock.PHONE_NUMBER.value), version + 5)
+        self.assertEqual(await self.MySQLManager.get_item_version("010-1111-1234"), 0)
+
+    async def test_item_count(self):
+        counter = await self.MySQLManager.get_item_counter(Mock.PHONE_NUMBER.value)
+        self.assertEqual(counter["item_count"], 12)
+        await self.MySQLManager.delete_item_info(Mock.PHONE_NUMBER.value, 1)
+        await self.MySQLManager.insert_item_bulk(Mock.PHONE_NUMBER.value, [dict(params)] * 3)
+        await self.MySQLManager.delete_item_bulk(Mock.PHONE_NUMBER.value, {"seqs": [2, 3, 100]})
+        await self.MySQLManager.update_item_bulk(Mock.PHONE_NUMBER.value, {"seqs": [4]}, {"size": "large"})
+        counter = await self.MySQLManager.get_item_counter(Mock.PHONE_NUMBER.value)
+        self.assertEqual(counter["item_count"], 12 - 1 + 3 - 2)
+
+        # search count is cached per item version
+        count = await self.MySQLManager.count_search_item(Mock.PHONE_NUMBER.value, "ㅇㅁ", counter["version"])
+        self.assertEqual(count, 12)
+        await self.MySQLManager.delete_item_info(Mock.PHONE_NUMBER.value, 4)
+        counter = await self.MySQLManager.get_item_counter(Mock.PHONE_NUMBER.value)
+        count = await self.MySQLManager.count_search_item(Mock.PHONE_NUMBER.value, "ㅇㅁ", counter["version"])
+        self.assertEqual(count, 11)
+
+    async def test_item_count_concurrent_write(self):
+        async def write(i: int) -> None:
+            async with self.Session() as session:
+                MySQLManager = AsyncMySQLManager(session)
+                if i % 3 == 0:
+                    await MySQLManager.insert_item_bulk(Mock.PHONE_NUMBER.value, [dict(params)] * 2)
+                elif i % 3 == 1:
+                    await MySQLManager.insert_item_info(Mock.PHONE_NUMBER.value, dict(params))
+                else:
+                    # the same item is deleted by several tasks, only one of them succeeds
+                    # (not the last seq 12: sqlite reuses the max rowid for the next insert)
+                    try:
+                        await MySQLManager.delete_item_info(Mock.PHONE_NUMBER.value, i % 9 + 1)
+                    except NotFoundError:
+                        pass
+
+        await asyncio.gather(*[write(i) for i in range(60)])
+        counter = await self.MySQLManager.get_item_counter(Mock.PHONE_NUMBER.value)
+        result = await self.MySQLManager.get_all_item(Mock.PHONE_NUMBER.value, page_size=1000)
+        # 12 + 20 x 2 (bulk) + 20 (single) - 3 (seq 3, 6, 9)
+        self.assertEqual(len(result), 69)
+        self.assertEqual(counter["item_count"], len(result))
+        self.assertEqual(counter["version"], 12 + 20 + 20 + 3)
+
+    async def test_get_infix_search_item(self):
+        phone_number = Mock.PHONE_NUMBER.value
+        await self.MySQLManager.insert_item_info(phone_number, dict(params, name="바닐라 라떼", description="달콤한 라떼"))
+        await self.MySQLManager.insert_item_bulk(phone_number, [
+            dict(params, name="카페 라떼", description="우유"),
+            dict(params, name="라떼아트 원두", description="에티오피아")])
+
+        # 부분 검색: 이름(3) > 초성(2) > 설명(1) 순서, 같으면 seq 순서
+        result, total = await self.MySQLManager.get_infix_search_item(phone_number, ["라떼"])
+        self.assertEqual([item["seq"] for item in result], [13, 14, 15])
+        self.assertEqual(total, 3)
+        result, total = await self.MySQLManager.get_infix_search_item(phone_number, ["리카"], page_number=1)
+        self.assertEqual([item["seq"] for item in result], [11, 12])
+        self.assertEqual(total, 12)
+        result, _ = await self.MySQLManager.get_infix_search_item(phone_number, ["ㄹㄸ"])
+        self.assertEqual([item["seq"] for item in result], [13, 14, 15])
+        result, _ = await self.MySQLManager.get_infix_search_item(phone_number, ["피아"])
+        self.assertEqual([item["seq"] for item in result], [15])
+        result, _ = await self.MySQLManager.get_infix_search_item(phone_number, ["떼"])
+        self.assertEqual([item["seq"] for item in result], [13, 14, 15])
+        result, _ = await self.MySQLManager.get_infix_search_item(phone_number, ["바닐라", "라떼"])
+        self.assertEqual([item["seq"] for item in result], [13])
+        result, _ = await self.MySQLManager.get_infix_search_item(phone_number, ["아메리카노0"])
+        self.assertEqual([item["seq"] for item in result], [2])
+        result, _ = await self.MySQLManager.get_infix_search_item("010-1111-1234", ["라떼"])
+        self.assertEqual(result, [])
+
+        # 모든 bigram이 있어도 연속된 문자열이 아니면 제외
+        await self.MySQLManager.update_item_info(phone_number, 14, {"name": "떼아 라떼"})
+        result, _ = await self.MySQLManager.get_infix_search_item(phone_number, ["라떼아"])
+        self.assertEqual([item["seq"] for item in result], [15])
+
+        # 수정, 삭제 시 인덱스 갱신
+        await self.MySQLManager.delete_item_info(phone_number, 13)
+        result, _ = await self.MySQLManager.get_infix_search_item(phone_number, ["바닐라"])
+        self.assertEqual(result, [])
+        await self.MySQLManager.update_item_bulk(phone_number, {"seqs": [15]}, {"name": "콜드브루"})
+        result, _ = await self.MySQLManager.get_infix_search_item(phone_number, ["라떼"])
+        self.assertEqual([item["seq"] for item in result], [14])
+        result, _ = await self.MySQLManager.get_infix_search_item(phone_number, ["브루"])
+        self.assertEqual([item["seq"] for item in result], [15])
+        await self.MySQLManager.delete_item_bulk(phone_number, {"seqs": [14]})
+        result, total = await self.MySQLManager.get_infix_search_item(phone_number, ["라떼"])
+        self.assertEqual((result, total), ([], 0))
+
+    async def test_get_infix_search_item_cache(self):
+        phone_number = Mock.PHONE_NUMBER.value
+        version = await self.MySQLManager.get_item_version(phone_number)
+        _, total = await self.MySQLManager.get_infix_search_item(phone_number, ["리카"], version=version)
+        self.assertEqual(total, 12)
+        _, total = await self.MySQLManager.get_infix_search_item(phone_number, ["아메리카"], version=version)
+        self.assertEqual(total, 12)
+
+        await self.MySQLManager.delete_item_info(phone_number, 1)
+        # 같은 version은 저장된 검색 개수(2글자 이하), 순위(3글자 이상)를 사용하고, 삭제된 아이템은 결과에서 빠짐
+        result, total = await self.MySQLManager.get_infix_search_item(phone_number, ["리카"], version=version)
+        self.assertEqual((len(result), total), (10, 12))
+        result, total = await self.MySQLManager.get_infix_search_item(phone_number, ["아메리카"], version=version)
+        self.assertEqual((len(result), total), (9, 12))
+        version = await self.MySQLManager.get_item_version(phone_number)
+        _, total = await self.MySQLManager.get_infix_search_item(phone_number, ["리카"], version=version)
+        self.assertEqual(total, 11)
+        _, total = await self.MySQLManager.get_infix_search_item(phone_number, ["아메리카"], version=version)
+        self.assertEqual(total, 11)
+
+    async def test_get_item_by_barcode(self):
+        phone_number = Mock.PHONE_NUMBER.value
+        version = await self.MySQLManager.get_item_version(phone_number)
+        # 같은 바코드 아이템 중 첫 번째 아이템
+        item = await self.MySQLManager.get_item_by_barcode(phone_number, Mock.BARCODE.value, version)
+        self.assertEqual(item["seq"], 1)
+
+        await self.MySQLManager.update_item_info(phone_number, 1, {"barcode": "8801234567890"})
+        # 같은 version은 캐시된 아이템, 바뀐 version은 다시 조회
+        item = await self.MySQLManager.get_item_by_barcode(phone_number, Mock.BARCODE.value, version)
+        self.assertEqual(item["seq"], 1)
+        version = await self.MySQLManager.get_item_version(phone_number)
+        item = await self.MySQLManager.get_item_by_barcode(phone_number, Mock.BARCODE.value, version)
+        self.assertEqual(item["seq"], 2)
+
+        result = await self.MySQLManager.get_items_by_barcodes(
+            phone_number, ["8801234567890", Mock.BARCODE.value, "0000"], version)
+        self.assertEqual({barcode: item and item["seq"] for barcode, item in result.items()},
+                         {"8801234567890": 1, Mock.BARCODE.value: 2, "0000": None})
+        with self.assertRaises(NotFoundError):
+            await self.MySQLManager.get_item_by_barcode(phone_number, "0000", version)
+
+    async def test_get_expiring_item(self):
+        phone_number = Mock.PHONE_NUMBER.value
+        for seq, expiration_date in [(3, "2023-08-18"), (5, "2023-08-25"), (7, "2023-08-19")]:
+            await self.MySQLManager.update_item_info(phone_number, seq, {"expiration_date": expiration_date})
+        await self.MySQLManager.insert_item_info("010-1111-1234", dict(params, expiration_date="2023-08-19"))
+
+        # 유통기한 순서, 같은 날짜는 seq 순서 (다른 유저 아이템 제외)
+        result, total = await self.MySQLManager.get_expiring_item(phone_number, "2023-08-18", "2023-08-20",
+                                                                  page_size=3)
+        self.assertEqual([item["seq"] for item in result], [3, 7, 1])
+        self.assertEqual(result[0]["expiration_date"], "2023-08-18")
+        self.assertEqual(total, 11)
+        result, _ = await self.MySQLManager.get_expiring_item(phone_number, "2023-08-18", "2023-08-19")
+        self.assertEqual([item["seq"] for item in result], [3, 7])
+
+        # 모든 유저의 만료 예정 아이템, seq로 다시 조회 (삭제된 아이템 제외)
+        result = await self.MySQLManager.get_expiry_items("2023-08-19", "2023-08-19")
+        self.assertEqual({(item["phone_number"], item["seq"]) for item in result},
+                         {(phone_number, 7), ("010-1111-1234", 13)})
+        await self.MySQLManager.delete_item_info(phone_number, 7)
+        result = await self.MySQLManager.get_expiry_items_by_seq(phone_number, [3, 5, 7])
+        self.assertEqual([(item["seq"], item["expiration_date"]) for item in result],
+                         [(3, "2023-08-18"), (5, "2023-08-25")])
+
+    async def test_item_stats(self):
+        phone_number = Mock.PHONE_NUMBER.value
+        result = await self.MySQLManager.get_item_stats(phone_number)
+        self.assertEqual(result["categories"], [dict(
+            category="coffee", item_count=12, avg_selling_price=5000.0, avg_cost_price=3500.0, margin=1500.0,
+            margin_rate=30.0)])
+        self.assertEqual(result["total"]["item_count"], 12)
+
+        # 아이템 등록/수정/삭제(일괄 포함) 후 변경분으로 계산한 통계와 user_item에서 다시 계산한 통계 비교
+        rng = random.Random(0)
+        categories = ["coffee", "latte", "tea"]
+        for _ in range(60):
+            seqs = [item["seq"] for item in await self.MySQLManager.get_all_item(phone_number, page_size=1000)]
+            action = rng.choice(["insert", "update", "delete", "insert_bulk", "update_bulk", "delete_bulk"])
+            if action == "insert":
+                await self.MySQLManager.insert_item_info(phone_number, dict(
+                    params, category=rng.choice(categories), selling_price=rng.randint(1, 9) * 1000))
+            elif action == "update" and seqs:
+                await self.MySQLManager.update_item_info(phone_number, rng.choice(seqs), rng.choice([
+                    {"category": rng.choice(categories)}, {"cost_price": rng.randint(1, 5) * 500},
+                    {"selling_price": rng.randint(1, 9) * 1000, "category": rng.choice(categories)},
+                    {"size": "large"}]))
+            elif action == "delete" and seqs:
+                await self.MySQLManager.delete_item_info(phone_number, rng.choice(seqs))
+            elif action == "insert_bulk":
+                await self.MySQLManager.insert_item_bulk(phone_number, [dict(
+                    params, category=rng.choice(categories), cost_price=rng.randint(1, 5) * 500) for _ in range(3)])
+            elif action == "update_bulk":
+                await self.MySQLManager.update_item_bulk(
+                    phone_number, {"category": rng.choice(categories)},
+                    *rng.choice([({"category": rng.choice(categories)}, None),
+                                 (None, {"field": "selling_price", "percent": 10})]))
+            elif action == "delete_bulk" and seqs:
+                await self.MySQLManager.delete_item_bulk(phone_number, {"seqs": rng.sample(seqs, min(2, len(seqs)))})
+
+            if _ % 10 == 9:
+                incremental = await self.MySQLManager.get_item_stats(phone_number)
+                await self.MySQLManager.rebuild_item_stats(phone_number)
+                self.assertEqual(incremental, await self.MySQLManager.get_item_stats(phone_number))
+
+        items = await self.MySQLManager.get_all_item(phone_number, page_size=1000)
+        result = await self.MySQLManager.get_item_stats(phone_number)
+        self.assertEqual(result["total"]["item_count"], len(items))
+        self.assertEqual({stat["category"]: stat["item_count"] for stat in result["categories"]},
+                         {category: sum(item["category"] == category for item in items)
+                          for category in {item["category"] for item in items}})
+        self.assertEqual(result["total"]["avg_selling_price"],
+                         round(sum(item["selling_price"] for item in items) / len(items), 2))
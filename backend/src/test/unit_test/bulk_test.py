@@ -0,0 +1,103 @@
+import tracemalloc
+from unittest import IsolatedAsyncioTestCase
+from sqlalchemy import insert
+from lib.model import Item
+from lib.bulk import parse_bulk_rows, export_rows, BulkParseError
+from lib.db_connect import AsyncMySQLManager
+from test.async_sqlite import create_sqlite_sessionmaker
+
+
+async def stream(body: bytes, size: int = 7):
+    # 작은 chunk로 나누어 줄/멀티바이트 문자가 chunk 경계에서 잘리는 경우를 확인합니다.
+    for i in range(0, len(body), size):
+        yield body[i:i + size]
+
+
+async def parse(content_type: str, body: bytes) -> list:
+    return [row async for row in parse_bulk_rows(content_type, stream(body))]
+
+
+class BulkParseTestCase(IsolatedAsyncioTestCase):
+    async def test_parse_csv(self):
+        body = ("﻿name,size,description\r\n"
+                "아메리카노,small,\"맛있는, 아메리카노\"\r\n"
+                "\r\n"
+                "카페라떼,large,\"두 줄\n설명\"\r\n"
+                "바닐라라떼,small\r\n"
+                "아이스티,large,\"\"\"따옴표\"\"\"").encode()
+        result = await parse("text/csv; charset=utf-8", body)
+        self.assertEqual(result[0], ({"name": "아메리카노", "size": "small", "description": "맛있는, 아메리카노"}, None))
+        self.assertEqual(result[1][0]["description"], "두 줄\n설명")
+        self.assertEqual(result[2], (None, "Expected 3 columns, got 2."))
+        self.assertEqual(result[3][0]["description"], '"따옴표"')
+        self.assertEqual(len(result), 4)
+
+        result = await parse("text/csv", 'name\n"닫히지 않은'.encode())
+        self.assertEqual(result, [(None, "Unterminated quoted field.")])
+
+    async def test_parse_ndjson(self):
+        body = '{"name": "아메리카노"}\n\n[1]\n{"name": \n{"name": "카페라떼"}'.encode()
+        result = await parse("application/x-ndjson", body)
+        self.assertEqual(result, [
+            ({"name": "아메리카노"}, None),
+            (None, "Row must be a JSON object."),
+            (None, "Invalid JSON line."),
+            ({"name": "카페라떼"}, None)
+        ])
+
+    async def test_parse_json(self):
+        result = await parse("application/json", '[{"name": "아메리카노"}, "wrong"]'.encode())
+        self.assertEqual(result, [({"name": "아메리카노"}, None), (None, "Row must be a JSON object.")])
+
+        # Error: JSON array가 아닌 body
+        for body in [b'{"name": 1}', b"[{"]:
+            with self.assertRaises(BulkParseError):
+                await parse(None, body)
+
+
+class ExportTestCase(IsolatedAsyncioTestCase):
+    PHONE_NUMBER = "010-0000-0000"
+
+    async def asyncSetUp(self) -> None:
+        self.Session = await create_sqlite_sessionmaker()
+        self.session = self.Session()
+        self.MySQLManager = AsyncMySQLManager(self.session)
+
+    async def asyncTearDown(self) -> None:
+        await self.session.close()
+        await self.Session.kw["bind"].dispose()
+
+    async def insert_items(self, count: int) -> None:
+        for start in range(0, count, 10000):
+            await self.session.execute(insert(Item), [{
+                "phone_number": self.PHONE_NUMBER,
+                "category": "coffee",
+                "selling_price": 5000,
+                "cost_price": 3500,
+                "name": f"아메리카노{i}",
+                "description": "맛있는 아메리카노" * 5,
+                "barcode": str(i),
+                "expiration_date": "2023-08-20",
+                "size": "small",
+                "search_initial": "ㅇㅁㄹㅋㄴ"
+            } for i in range(start, min(start + 10000, count))])
+        await self.session.commit()
+
+    async def export_peak_memory(self, format: str) -> tuple:
+        size = 0
+        tracemalloc.start()
+        async for text in export_rows(format, self.MySQLManager.stream_all_item(self.PHONE_NUMBER)):
+            size += len(text.encode())
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return size, peak
+
+    async def test_export_memory_bounded(self):
+        # 아이템 수가 10배가 되어도 내보내기 중 최대 메모리는 거의 같습니다. (chunk 단위 server-side cursor)
+        await self.insert_items(2000)
+        small_size, small_peak = await self.export_peak_memory("csv")
+        await self.insert_items(18000)
+        for format in ["csv", "ndjson"]:
+            size, peak = await self.export_peak_memory(format)
+            self.assertGreater(size, 9 * small_size)
+            self.assertLess(peak, 2 * small_peak)
@@ -0,0 +1,265 @@
+import jwt
+import time
+from unittest import TestCase, IsolatedAsyncioTestCase
+from enum import Enum
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from lib import TOKEN_KEY
+from lib.cache import TTLCache, ItemCache, MemoryBackend, RedisBackend
+from lib.db_connect import AsyncMySQLManager, NotFoundError
+from lib.validator import ApiValidator, UnAuthorizationError
+from test.async_sqlite import create_sqlite_sessionmaker
+from test.fake_redis import FakeRedisServer
+
+
+class Mock(Enum):
+    PHONE_NUMBER = "010-0000-0000"
+    OTHER_PHONE_NUMBER = "010-1111-1234"
+
+
+class TTLCacheTestCase(TestCase):
+    def test_get_set(self):
+        cache = TTLCache(maxsize=10)
+        self.assertIsNone(cache.get("key"))
+        cache.set("key", "value")
+        self.assertEqual(cache.get("key"), "value")
+        cache.delete("key")
+        self.assertIsNone(cache.get("key"))
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 2)
+
+    def test_lru_eviction(self):
+        cache = TTLCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
+
+    def test_expire(self):
+        cache = TTLCache(maxsize=10, ttl=0.05)
+        cache.set("ttl", 1)
+        cache.set("expire_at", 2, expire_at=time.time() - 1)
+        self.assertEqual(cache.get("ttl"), 1)
+        self.assertIsNone(cache.get("expire_at"))
+        time.sleep(0.06)
+        self.assertIsNone(cache.get("ttl"))
+        self.assertEqual(len(cache), 0)
+
+
+class TokenCacheTestCase(TestCase):
+    def setUp(self) -> None:
+        self.ApiValidator = ApiValidator()
+
+    def make_token(self, phone_number: str, exp: timedelta) -> str:
+        return jwt.encode({
+            "phone_number": phone_number,
+            "exp": datetime.utcnow() + exp
+        }, TOKEN_KEY, algorithm="HS256")
+
+    def test_token_cache_hit(self):
+        token = self.make_token(Mock.PHONE_NUMBER.value, timedelta(hours=2))
+        for _ in range(3):
+            self.ApiValidator.check_current_user(Mock.PHONE_NUMBER.value, token)
+        self.assertEqual(self.ApiValidator.TokenCache.stats()["misses"], 1)
+        self.assertEqual(self.ApiValidator.TokenCache.stats()["hits"], 2)
+
+        # cached token is still checked with user header
+        with self.assertRaises(UnAuthorizationError):
+            self.ApiValidator.check_current_user(Mock.OTHER_PHONE_NUMBER.value, token)
+
+    def test_token_cache_expired(self):
+        token = self.make_token(Mock.PHONE_NUMBER.value, timedelta(seconds=1))
+        self.ApiValidator.check_current_user(Mock.PHONE_NUMBER.value, token)
+        time.sleep(1.1)
+        with self.assertRaises(UnAuthorizationError) as e:
+            self.ApiValidator.check_current_user(Mock.PHONE_NUMBER.value, token)
+        self.assertEqual(str(e.exception), "An expired token. Please log in again.")
+
+
+ITEM = {"seq": 1, "name": "아메리카노", "selling_price": 5000}
+
+
+class MemoryItemCacheTestCase(IsolatedAsyncioTestCase):
+    async def make_backend(self):
+        return MemoryBackend(maxsize=10)
+
+    async def asyncSetUp(self) -> None:
+        self.backend = await self.make_backend()
+        self.cache = ItemCache(self.backend, ttl=60)
+        self.loads = 0
+
+    async def asyncTearDown(self) -> None:
+        await self.backend.close()
+
+    async def loader(self):
+        self.loads += 1
+        return ITEM
+
+    async def test_read_through(self):
+        for _ in range(3):
+            result = await self.cache.get_or_load(Mock.PHONE_NUMBER.value, 1, self.loader)
+            self.assertEqual(result, ITEM)
+        self.assertEqual(self.loads, 1)
+        self.assertEqual(self.cache.stats()["hits"], 2)
+        self.assertEqual(self.cache.stats()["misses"], 1)
+
+    async def test_invalidate(self):
+        await self.cache.get_or_load(Mock.PHONE_NUMBER.value, 1, self.loader)
+        await self.cache.get_or_load(Mock.PHONE_NUMBER.value, 2, self.loader)
+        await self.cache.get_or_load(Mock.OTHER_PHONE_NUMBER.value, 1, self.loader)
+        self.assertEqual(self.loads, 3)
+
+        # only the written item is loaded again
+        await self.cache.invalidate(Mock.PHONE_NUMBER.value, [1])
+        await self.cache.get_or_load(Mock.PHONE_NUMBER.value, 1, self.loader)
+        await self.cache.get_or_load(Mock.PHONE_NUMBER.value, 2, self.loader)
+        self.assertEqual(self.loads, 4)
+
+        # every item of the user (bulk write), other users are kept
+        await self.cache.invalidate_user(Mock.PHONE_NUMBER.value)
+        await self.cache.get_or_load(Mock.PHONE_NUMBER.value, 1, self.loader)
+        await self.cache.get_or_load(Mock.PHONE_NUMBER.value, 2, self.loader)
+        await self.cache.get_or_load(Mock.OTHER_PHONE_NUMBER.value, 1, self.loader)
+        self.assertEqual(self.loads, 6)
+
+    async def test_invalidate_during_load(self):
+        # a write committed while the row is loaded: the loaded value is not returned later
+        async def loader():
+            await self.cache.invalidate(Mock.PHONE_NUMBER.value, [1])
+            return await self.loader()
+
+        await self.cache.get_or_load(Mock.PHONE_NUMBER.value, 1, loader)
+        await self.cache.get_or_load(Mock.PHONE_NUMBER.value, 1, self.loader)
+        self.assertEqual(self.loads, 2)
+        self.assertEqual(self.cache.stats()["hits"], 0)
+
+    async def test_loader_error_not_cached(self):
+        async def not_found():
+            raise NotFoundError("This item does not exist.")
+
+        for _ in range(2):
+            with self.assertRaises(NotFoundError):
+                await self.cache.get_or_load(Mock.PHONE_NUMBER.value, 1, not_found)
+        self.assertEqual(self.cache.stats()["misses"], 2)
+
+
+class RedisItemCacheTestCase(MemoryItemCacheTestCase):
+    async def make_backend(self):
+        self.server = FakeRedisServer()
+        port = await self.server.start()
+        return RedisBackend(port=port)
+
+    async def asyncTearDown(self) -> None:
+        await self.backend.close()
+        await self.server.stop()
+
+    async def test_one_round_trip_on_hit(self):
+        await self.cache.get_or_load(Mock.PHONE_NUMBER.value, 1, self.loader)
+        self.server.commands.clear()
+        await self.cache.get_or_load(Mock.PHONE_NUMBER.value, 1, self.loader)
+        self.assertEqual(self.server.commands, ["MGET"])
+
+    async def test_server_down(self):
+        await self.cache.get_or_load(Mock.PHONE_NUMBER.value, 1, self.loader)
+        await self.backend.close()
+        await self.server.stop()
+        self.backend.port = 1
+
+        # falls back to loader and counts errors
+        result = await self.cache.get_or_load(Mock.PHONE_NUMBER.value, 1, self.loader)
+        self.assertEqual(result, ITEM)
+        self.assertEqual(self.loads, 2)
+        self.assertEqual(self.cache.stats()["errors"], 1)
+        self.server = FakeRedisServer()
+        await self.server.start()
+
+
+class ItemCacheManagerTestCase(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.Session = await create_sqlite_sessionmaker()
+        self.session = self.Session()
+        self.cache = ItemCache(MemoryBackend(maxsize=10))
+        self.MySQLManager = AsyncMySQLManager(self.session, item_cache=self.cache)
+        self.seq = 1
+        await self.MySQLManager.insert_item_info(Mock.PHONE_NUMBER.value, {
+            "category": "coffee", "selling_price": 5000, "cost_price": 3500, "name": "아메리카노",
+            "description": "", "barcode": "1", "expiration_date": "2023-08-20", "size": "small"
+        })
+
+    async def asyncTearDown(self) -> None:
+        await self.session.close()
+        await self.Session.kw["bind"].dispose()
+
+    async def test_update_invalidate(self):
+        result = await self.MySQLManager.get_item_info(Mock.PHONE_NUMBER.value, self.seq)
+        self.assertEqual(await self.MySQLManager.get_item_info(Mock.PHONE_NUMBER.value, self.seq), result)
+        await self.MySQLManager.update_item_info(Mock.PHONE_NUMBER.value, self.seq, {"selling_price": 5500})
+        result = await self.MySQLManager.get_item_info(Mock.PHONE_NUMBER.value, self.seq)
+        self.assertEqual(result["selling_price"], 5500)
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+    async def test_bulk_update_invalidate(self):
+        await self.MySQLManager.get_item_info(Mock.PHONE_NUMBER.value, self.seq)
+        await self.MySQLManager.update_item_bulk(Mock.PHONE_NUMBER.value, {"category": "coffee"},
+                                                 adjust={"field": "selling_price", "amount": 100})
+        result = await self.MySQLManager.get_item_info(Mock.PHONE_NUMBER.value, self.seq)
+        self.assertEqual(result["selling_price"], 5100)
+
+    async def test_cache_hit_without_sql(self):
+        statements = []
+        event.listen(self.Session.kw["bind"].sync_engine, "before_cursor_execute",
+                     lambda *args: statements.append(args[2]))
+        result = await self.MySQLManager.get_item_info(Mock.PHONE_NUMBER.value, self.seq)
+        self.assertEqual(len(statements), 1)
+        self.assertEqual(await self.MySQLManager.get_item_info(Mock.PHONE_NUMBER.value, self.seq), result)
+        self.assertEqual(len(statements), 1)
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+    async def test_write_keeps_other_items(self):
+        await self.MySQLManager.insert_item_info(Mock.PHONE_NUMBER.value, {
+            "category": "coffee", "selling_price": 4000, "cost_price": 2000, "name": "에스프레소",
+            "description": "", "barcode": "2", "expiration_date": "2023-08-20", "size": "small"
+        })
+        await self.MySQLManager.get_item_info(Mock.PHONE_NUMBER.value, self.seq)
+        await self.MySQLManager.get_item_info(Mock.PHONE_NUMBER.value, self.seq + 1)
+        await self.MySQLManager.update_item_info(Mock.PHONE_NUMBER.value, self.seq + 1, {"selling_price": 4500})
+        await self.MySQLManager.get_item_info(Mock.PHONE_NUMBER.value, self.seq)
+        result = await self.MySQLManager.get_item_info(Mock.PHONE_NUMBER.value, self.seq + 1)
+        self.assertEqual(result["selling_price"], 4500)
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+    async def test_other_worker_cache(self):
+        # worker A and B share the cache backend (redis): A's write invalidates B's entry
+        other_session = self.Session()
+        other = AsyncMySQLManager(other_session, item_cache=ItemCache(self.cache.backend))
+        result = await other.get_item_info(Mock.PHONE_NUMBER.value, self.seq)
+        await other_session.commit()
+        self.assertEqual(result["selling_price"], 5000)
+        await self.MySQLManager.update_item_info(Mock.PHONE_NUMBER.value, self.seq, {"selling_price": 5500})
+
+        result = await other.get_item_info(Mock.PHONE_NUMBER.value, self.seq)
+        self.assertEqual(result["selling_price"], 5500)
+        self.assertEqual(other.item_cache.stats()["hits"], 0)
+        await other_session.close()
+
+    async def test_stale_set_after_write(self):
+        # a slow read stores the row loaded before a concurrent write is committed
+        stale = await self.MySQLManager._load_item_info(Mock.PHONE_NUMBER.value, self.seq)
+
+        async def slow_loader():
+            await self.MySQLManager.update_item_info(Mock.PHONE_NUMBER.value, self.seq, {"selling_price": 5500})
+            return stale
+
+        self.assertEqual(await self.cache.get_or_load(Mock.PHONE_NUMBER.value, self.seq, slow_loader), stale)
+        result = await self.MySQLManager.get_item_info(Mock.PHONE_NUMBER.value, self.seq)
+        self.assertEqual(result["selling_price"], 5500)
+
+    async def test_delete_invalidate(self):
+        await self.MySQLManager.get_item_info(Mock.PHONE_NUMBER.value, self.seq)
+        await self.MySQLManager.delete_item_info(Mock.PHONE_NUMBER.value, self.seq)
+        with self.assertRaises(NotFoundError):
+            await self.MySQLManager.get_item_info(Mock.PHONE_NUMBER.value, self.seq)
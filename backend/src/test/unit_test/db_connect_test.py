@@ -1,17 +1,15 @@
 from unittest import TestCase
 from enum import Enum
-from lib.db_connect import MySQLManager, MySQLManagerError
+from lib.db_connect import MySQLManager, get_engine, MySQLManagerError, NotFoundError
 from sqlalchemy import select
+from sqlalchemy.orm import Session
 from lib.model import Item
 
 
 class MySQLManager(MySQLManager):
-    def __init__(self) -> None:
-        super().__init__()
-
     def get_item_seq(self, phone_number: str, name: str) -> str:
         try:
-            with self.session as session:
+            with Session(get_engine()) as session:
                 sql = select(Item).filter(Item.phone_number == phone_number, Item.name == name)
                 obj = session.execute(sql).scalar_one()
             return obj.seq
@@ -104,6 +102,27 @@ class MySQLManagerItemTestCase(TestCase):
         result = MySQLManager.get_item_info(Mock.PHONE_NUMBER.value, seq)
         self.assertEqual(result["category"], change_params["category"])
         self.assertEqual(result["cost_price"], change_params["cost_price"])
+
+        # 허용되지 않은 컬럼, 따옴표가 포함된 값
+        change_params = {
+            "phone_number": "010-1111-1234",
+            "description": "it's \"fresh\"'); DROP TABLE user_item; --"
+        }
+        result = MySQLManager.update_item_info(Mock.PHONE_NUMBER.value, seq, change_params)
+        self.assertEqual(result, ["description"])
+        result = MySQLManager.get_item_info(Mock.PHONE_NUMBER.value, seq)
+        self.assertEqual(result["phone_number"], Mock.PHONE_NUMBER.value)
+        self.assertEqual(result["description"], change_params["description"])
+
+    def test_item_not_found(self):
+        with self.assertRaises(NotFoundError):
+            MySQLManager.update_item_info(Mock.PHONE_NUMBER.value, 10 ** 9, {"category": "ice"})
+        with self.assertRaises(NotFoundError):
+            MySQLManager.update_item_info("010-1111-1234", self.get_seq_num(), {"category": "ice"})
+        with self.assertRaises(NotFoundError):
+            MySQLManager.delete_item_info(Mock.PHONE_NUMBER.value, 10 ** 9)
+        with self.assertRaises(NotFoundError):
+            MySQLManager.get_item_info(Mock.PHONE_NUMBER.value, 10 ** 9)
         
     def test_get_all_item(self):
         result = MySQLManager.get_all_item(Mock.PHONE_NUMBER.value, page_number=1)
@@ -0,0 +1,163 @@
+import asyncio
+from unittest import TestCase, IsolatedAsyncioTestCase
+from datetime import datetime
+from lib.db_connect import AsyncMySQLManager
+from lib.expiry import ExpiryScheduler, WebhookHandler, expire_time
+from test.async_sqlite import create_sqlite_sessionmaker
+from test.fake_webhook import FakeWebhookServer
+
+PHONE_NUMBER = "010-0000-0000"
+params = {
+    "category": "coffee",
+    "selling_price": 5000,
+    "cost_price": 3500,
+    "name": "아메리카노",
+    "description": "맛있는 아메리카노",
+    "barcode": "010100000110224",
+    "size": "small"
+}
+
+
+class ExpireTimeTestCase(TestCase):
+    def test_expire_time(self):
+        # 유통기한 다음 날 0시 (local time)
+        self.assertEqual(datetime.fromtimestamp(expire_time("2023-08-20")), datetime(2023, 8, 21))
+
+
+class ExpirySchedulerTestCase(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.Session = await create_sqlite_sessionmaker()
+        self.session = self.Session()
+        self.events = []
+        # 2023-08-20 23:59:00 (local time)
+        self.now = expire_time("2023-08-20") - 60
+        self.scheduler = ExpiryScheduler(self.Session, [self.handler], clock=lambda: self.now)
+        self.MySQLManager = AsyncMySQLManager(self.session, expiry_scheduler=self.scheduler)
+
+    async def asyncTearDown(self) -> None:
+        await self.scheduler.stop()
+        await self.session.close()
+        await self.Session.kw["bind"].dispose()
+
+    async def handler(self, events: list) -> None:
+        self.events += events
+
+    async def insert_item(self, expiration_date: str, phone_number: str = PHONE_NUMBER, MySQLManager=None) -> int:
+        MySQLManager = MySQLManager or self.MySQLManager
+        await MySQLManager.insert_item_info(phone_number, dict(params, expiration_date=expiration_date))
+        items = await MySQLManager.get_all_item(phone_number, page_size=100)
+        return items[-1]["seq"]
+
+    async def test_run_pending(self):
+        first = await self.insert_item("2023-08-20")
+        second = await self.insert_item("2023-08-21")
+        # 이미 만료된 아이템, horizon 이후 만료 아이템은 예약하지 않음
+        await self.insert_item("2023-08-19")
+        await self.insert_item("2023-08-30")
+        self.assertEqual(self.scheduler.stats()["scheduled"], 2)
+
+        self.assertEqual(await self.scheduler.run_pending(), 0)
+        self.now += 60
+        self.assertEqual(await self.scheduler.run_pending(), 1)
+        self.assertEqual(self.events, [{
+            "seq": first, "phone_number": PHONE_NUMBER, "name": "아메리카노", "expiration_date": "2023-08-20"}])
+
+        # 수정된 유통기한으로 다시 예약, 이전 예약은 보내지 않음
+        await self.MySQLManager.update_item_info(PHONE_NUMBER, second, {"expiration_date": "2023-08-22"})
+        self.now = expire_time("2023-08-21")
+        self.assertEqual(await self.scheduler.run_pending(), 0)
+        self.now = expire_time("2023-08-22")
+        self.assertEqual(await self.scheduler.run_pending(), 1)
+        self.assertEqual(self.events[-1]["expiration_date"], "2023-08-22")
+        self.assertEqual(self.scheduler.stats()["sent"], 2)
+
+    async def test_drop_changed_item(self):
+        # 다른 worker(scheduler 없는 manager)에서 삭제, 수정한 아이템은 보내기 전 확인해서 버림
+        deleted = await self.insert_item("2023-08-21")
+        changed = await self.insert_item("2023-08-21")
+        kept = await self.insert_item("2023-08-21")
+        async with self.Session() as session:
+            other = AsyncMySQLManager(session)
+            await other.delete_item_info(PHONE_NUMBER, deleted)
+            await other.update_item_info(PHONE_NUMBER, changed, {"expiration_date": "2023-09-01"})
+
+        self.now = expire_time("2023-08-21")
+        self.assertEqual(await self.scheduler.run_pending(), 1)
+        self.assertEqual([event["seq"] for event in self.events], [kept])
+        self.assertEqual(self.scheduler.stats()["dropped"], 2)
+
+    async def test_reload(self):
+        async with self.Session() as session:
+            other = AsyncMySQLManager(session)
+            await self.insert_item("2023-08-21", MySQLManager=other)
+            await self.insert_item("2023-08-21", phone_number="010-1111-1234", MySQLManager=other)
+            await self.insert_item("2023-08-30", MySQLManager=other)
+        self.assertEqual(self.scheduler.stats()["scheduled"], 0)
+
+        # 모든 유저의 horizon 안 만료 아이템 예약
+        await self.scheduler.reload()
+        self.assertEqual(self.scheduler.stats()["scheduled"], 2)
+        self.now = expire_time("2023-08-21")
+        self.assertEqual(await self.scheduler.run_pending(), 2)
+        self.assertEqual({event["phone_number"] for event in self.events}, {PHONE_NUMBER, "010-1111-1234"})
+
+    async def test_start(self):
+        await self.scheduler.start()
+        # 실행 중인 scheduler task는 새로 예약된 이벤트가 지나면 바로 보냄
+        await self.insert_item("2023-08-20")
+        self.now += 60
+        self.scheduler._wakeup.set()
+        await asyncio.sleep(0.1)
+        self.assertEqual(len(self.events), 1)
+
+        # 일괄 등록은 유저 아이템을 다시 읽어 예약
+        await self.MySQLManager.insert_item_bulk(
+            PHONE_NUMBER, [dict(params, expiration_date="2023-08-21") for _ in range(3)])
+        await asyncio.sleep(0.1)
+        self.assertEqual(self.scheduler.stats()["scheduled"], 3)
+
+        await self.scheduler.stop()
+        self.assertIsNone(self.scheduler._task)
+
+    async def test_start_db_error(self):
+        async with self.Session() as session:
+            await self.insert_item("2023-08-21", MySQLManager=AsyncMySQLManager(session))
+
+        def broken_sessionmaker():
+            raise ConnectionRefusedError("mysql is down")
+
+        # Success: DB 오류에도 시작하고, 로드는 60초 뒤 다시 시도
+        self.scheduler.sessionmaker = broken_sessionmaker
+        await self.scheduler.start()
+        await asyncio.sleep(0.1)
+        self.assertIsNotNone(self.scheduler._task)
+        self.assertEqual(self.scheduler.stats()["errors"], 1)
+        self.assertEqual(self.scheduler.stats()["scheduled"], 0)
+
+        self.scheduler.sessionmaker = self.Session
+        self.now += 60
+        self.scheduler._wakeup.set()
+        await asyncio.sleep(0.1)
+        self.assertEqual(self.scheduler.stats()["scheduled"], 1)
+
+    async def test_webhook_handler(self):
+        server = FakeWebhookServer()
+        url = await server.start()
+        self.scheduler.handlers = [WebhookHandler(url)]
+        try:
+            seq = await self.insert_item("2023-08-20")
+            self.now += 60
+            self.assertEqual(await self.scheduler.run_pending(), 1)
+            self.assertEqual(server.requests[0]["method"], "POST")
+            self.assertEqual([event["seq"] for event in server.requests[0]["json"]["events"]], [seq])
+
+            # Error: webhook 오류는 다른 handler를 멈추지 않고 errors로 집계
+            server.status = 500
+            self.scheduler.handlers.append(self.handler)
+            await self.insert_item("2023-08-21")
+            self.now = expire_time("2023-08-21")
+            self.assertEqual(await self.scheduler.run_pending(), 1)
+            self.assertEqual(len(self.events), 1)
+            self.assertEqual(self.scheduler.stats()["errors"], 1)
+        finally:
+            await server.stop()
@@ -0,0 +1,276 @@
+import io
+import os
+import sys
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+from sqlalchemy import create_engine, inspect, select
+import migration
+from migration import upgrade, current_version, rebuild_item_stats, MIGRATIONS, MigrationError
+from migration.explain import check_query_plan, QueryPlanError
+from migration import __main__ as migration_main
+from lib.model import Base, Item, ItemVersion, ItemNgram, ItemStat
+from migration.versions import v0005_item_ngram
+
+# user_auth, user_item DDL before migration (src/README.md)
+OLD_DDL = [
+    """CREATE TABLE user_auth (
+    seq INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,
+    phone_number VARCHAR(200) NOT NULL,
+    password VARCHAR(500) NOT NULL,
+    timestamp VARCHAR(200) NOT NULL)""",
+    "CREATE INDEX idx_user_auth ON user_auth (phone_number)",
+    """CREATE TABLE user_item (
+    seq INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,
+    phone_number VARCHAR(200) NOT NULL,
+    category VARCHAR(200) NOT NULL,
+    selling_price BIGINT NOT NULL,
+    cost_price BIGINT NOT NULL,
+    name VARCHAR(200) NOT NULL,
+    description VARCHAR(1000),
+    barcode VARCHAR(200) NOT NULL,
+    expiration_date VARCHAR(200) NOT NULL,
+    size VARCHAR(100) NOT NULL,
+    search_initial VARCHAR(200) NOT NULL)""",
+    "CREATE INDEX idx_user_item ON user_item (seq, phone_number)",
+    "CREATE INDEX idx_user_item_name ON user_item (name, search_initial)",
+]
+
+ITEM_COLUMNS = ["seq", "phone_number", "category", "selling_price", "cost_price", "name", "description", "barcode",
+                "expiration_date", "size", "search_initial"]
+
+# schema after each version: {table: (columns, {index: (columns, unique)})}
+VERSION_SCHEMAS = {
+    1: {
+        "user_auth": (["seq", "phone_number", "password", "timestamp"], {}),
+        "user_item": (ITEM_COLUMNS, {}),
+    },
+    2: {
+        "user_auth": (["seq", "phone_number", "password", "timestamp"], {
+            "idx_user_auth": (["phone_number"], True),
+        }),
+        "user_item": (ITEM_COLUMNS, {
+            "idx_user_item_phone_seq": (["phone_number", "seq"], False),
+            "idx_user_item_phone_name": (["phone_number", "name"], False),
+            "idx_user_item_phone_initial": (["phone_number", "search_initial"], False),
+        }),
+    },
+    3: {"user_item_version": (["phone_number", "version"], {})},
+    4: {"user_item_version": (["phone_number", "version", "item_count"], {})},
+    5: {"user_item_ngram": (["phone_number", "gram", "seq", "field"], {
+        "idx_user_item_ngram_phone_seq": (["phone_number", "seq"], False),
+    })},
+    6: {"user_item": (ITEM_COLUMNS, {
+        "idx_user_item_phone_barcode": (["phone_number", "barcode"], False),
+    })},
+    7: {"user_item": (ITEM_COLUMNS, {
+        "idx_user_item_phone_expiration": (["phone_number", "expiration_date"], False),
+        "idx_user_item_expiration": (["expiration_date"], False),
+    })},
+    8: {"user_item_stat": (["phone_number", "category", "item_count", "selling_price_sum", "cost_price_sum"], {})},
+}
+
+
+def create_sqlite_engine():
+    return create_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'cafe.db')}")
+
+
+def get_schema(engine) -> dict:
+    inspector = inspect(engine)
+    return {table: ([column["name"] for column in inspector.get_columns(table)],
+                    {index["name"]: (index["column_names"], bool(index["unique"]))
+                     for index in inspector.get_indexes(table)})
+            for table in inspector.get_table_names() if table != "schema_version"}
+
+
+def expected_schema(version: int) -> dict:
+    # indexes of later versions are added to the tables of earlier versions
+    schema = {}
+    for schema_version in range(1, version + 1):
+        for table, (columns, indexes) in VERSION_SCHEMAS[schema_version].items():
+            schema[table] = (columns, {**schema.get(table, (None, {}))[1], **indexes})
+    return schema
+
+
+class MigrationTestCase(TestCase):
+    def test_upgrade_empty_db(self):
+        engine = create_sqlite_engine()
+        self.assertEqual(current_version(engine), 0)
+        self.assertEqual(upgrade(engine), [migration.VERSION for migration in MIGRATIONS])
+        self.assertEqual(current_version(engine), MIGRATIONS[-1].VERSION)
+
+        # already applied migration is skipped
+        self.assertEqual(upgrade(engine), [])
+        check_query_plan(engine)
+
+    def test_upgrade_each_version(self):
+        engine = create_sqlite_engine()
+        for i, step in enumerate(MIGRATIONS):
+            # only migrations up to this version
+            with patch.object(migration, "MIGRATIONS", MIGRATIONS[:i + 1]):
+                self.assertEqual(upgrade(engine), [step.VERSION])
+            self.assertEqual(get_schema(engine), expected_schema(step.VERSION))
+
+        # schema of every migration is the same as the model
+        model_engine = create_sqlite_engine()
+        Base.metadata.create_all(model_engine)
+        self.assertEqual(get_schema(engine), get_schema(model_engine))
+
+    def test_upgrade_old_db(self):
+        engine = create_sqlite_engine()
+        with engine.begin() as conn:
+            for ddl in OLD_DDL:
+                conn.exec_driver_sql(ddl)
+
+        # Error: old index can not serve queries filtered by phone_number
+        with self.assertRaises(QueryPlanError):
+            check_query_plan(engine)
+
+        upgrade(engine)
+        inspector = inspect(engine)
+        item_indexes = {index["name"]: index["column_names"] for index in inspector.get_indexes("user_item")}
+        self.assertEqual(item_indexes, {
+            "idx_user_item_phone_seq": ["phone_number", "seq"],
+            "idx_user_item_phone_name": ["phone_number", "name"],
+            "idx_user_item_phone_initial": ["phone_number", "search_initial"],
+            "idx_user_item_phone_barcode": ["phone_number", "barcode"],
+            "idx_user_item_phone_expiration": ["phone_number", "expiration_date"],
+            "idx_user_item_expiration": ["expiration_date"],
+        })
+        auth_indexes = inspector.get_indexes("user_auth")
+        self.assertEqual(auth_indexes[0]["name"], "idx_user_auth")
+        self.assertTrue(auth_indexes[0]["unique"])
+        check_query_plan(engine)
+
+    def test_upgrade_item_count(self):
+        engine = create_sqlite_engine()
+        with engine.begin() as conn:
+            for ddl in OLD_DDL:
+                conn.exec_driver_sql(ddl)
+            for phone_number in ["010-0000-0000"] * 3 + ["010-1111-1234"]:
+                conn.exec_driver_sql(
+                    "INSERT INTO user_item (phone_number, category, selling_price, cost_price, name, barcode, "
+                    "expiration_date, size, search_initial) VALUES "
+                    f"('{phone_number}', 'coffee', 5000, 3500, '아메리카노', '1', '2023-08-20', 'small', 'ㅇㅁㄹㅋㄴ')")
+
+        # item count of items created before migration
+        upgrade(engine)
+        with engine.begin() as conn:
+            rows = conn.execute(select(ItemVersion.phone_number, ItemVersion.item_count)
+                                .order_by(ItemVersion.phone_number)).all()
+        self.assertEqual([tuple(row) for row in rows], [("010-0000-0000", 3), ("010-1111-1234", 1)])
+
+    def test_upgrade_item_ngram(self):
+        engine = create_sqlite_engine()
+        with engine.begin() as conn:
+            for ddl in OLD_DDL:
+                conn.exec_driver_sql(ddl)
+            for name, description in [("바닐라 라떼", "NULL"), ("아메리카노", "'진한 라떼'"), ("카페모카", "NULL")]:
+                conn.exec_driver_sql(
+                    "INSERT INTO user_item (phone_number, category, selling_price, cost_price, name, description, "
+                    "barcode, expiration_date, size, search_initial) VALUES "
+                    f"('010-0000-0000', 'coffee', 5000, 3500, '{name}', {description}, '1', '2023-08-20', "
+                    "'small', 'ㅇㅁㄹㅋㄴ')")
+
+        # grams of items created before migration (2 items per batch)
+        with patch.object(v0005_item_ngram, "BATCH_SIZE", 2):
+            upgrade(engine)
+        with engine.begin() as conn:
+            rows = conn.execute(select(ItemNgram.seq, ItemNgram.field)
+                                .filter(ItemNgram.gram == "라떼").order_by(ItemNgram.seq)).all()
+            self.assertEqual([tuple(row) for row in rows], [(1, "n"), (2, "d")])
+            rows = conn.execute(select(ItemNgram.seq).filter(ItemNgram.gram == "모카")).all()
+            self.assertEqual([tuple(row) for row in rows], [(3,)])
+
+    def test_upgrade_barcode_index(self):
+        engine = create_sqlite_engine()
+        upgrade(engine)
+        # DB migrated before the barcode index
+        with engine.begin() as conn:
+            conn.exec_driver_sql("DROP INDEX idx_user_item_phone_barcode")
+            conn.exec_driver_sql("DELETE FROM schema_version WHERE version >= 6")
+
+        self.assertEqual(upgrade(engine), [6, 7, 8])
+        item_indexes = {index["name"] for index in inspect(engine).get_indexes("user_item")}
+        self.assertIn("idx_user_item_phone_barcode", item_indexes)
+        check_query_plan(engine)
+
+    def test_upgrade_expiration_date(self):
+        engine = create_sqlite_engine()
+        with engine.begin() as conn:
+            for ddl in OLD_DDL:
+                conn.exec_driver_sql(ddl)
+            for expiration_date in ["2023-08-20", "2023-8-1"]:
+                conn.exec_driver_sql(
+                    "INSERT INTO user_item (phone_number, category, selling_price, cost_price, name, barcode, "
+                    "expiration_date, size, search_initial) VALUES "
+                    f"('010-0000-0000', 'coffee', 5000, 3500, '아메리카노', '1', '{expiration_date}', 'small', "
+                    "'ㅇㅁㄹㅋㄴ')")
+
+        # Error: invalid expiration_date fails migration (later migrations are not applied)
+        with self.assertRaisesRegex(MigrationError, "seq: 2"):
+            upgrade(engine)
+        self.assertEqual(current_version(engine), 6)
+
+        with engine.begin() as conn:
+            conn.exec_driver_sql("UPDATE user_item SET expiration_date = '2023-08-01' WHERE seq = 2")
+        self.assertEqual(upgrade(engine), [7, 8])
+        with engine.begin() as conn:
+            rows = conn.execute(select(Item.expiration_date).order_by(Item.seq)).all()
+        self.assertEqual([row.expiration_date for row in rows], ["2023-08-20", "2023-08-01"])
+        check_query_plan(engine)
+
+    def test_upgrade_item_stat(self):
+        engine = create_sqlite_engine()
+        with engine.begin() as conn:
+            for ddl in OLD_DDL:
+                conn.exec_driver_sql(ddl)
+            for phone_number, category, selling_price, cost_price in [
+                    ("010-0000-0000", "coffee", 5000, 3500), ("010-0000-0000", "coffee", 4000, 2500),
+                    ("010-0000-0000", "cake", 7000, 5000), ("010-1111-1234", "coffee", 3000, 1000)]:
+                conn.exec_driver_sql(
+                    "INSERT INTO user_item (phone_number, category, selling_price, cost_price, name, barcode, "
+                    f"expiration_date, size, search_initial) VALUES ('{phone_number}', '{category}', "
+                    f"{selling_price}, {cost_price}, '아메리카노', '1', '2023-08-20', 'small', 'ㅇㅁㄹㅋㄴ')")
+
+        # category stat of items created before migration
+        upgrade(engine)
+        columns = (ItemStat.phone_number, ItemStat.category, ItemStat.item_count, ItemStat.selling_price_sum,
+                   ItemStat.cost_price_sum)
+        with engine.begin() as conn:
+            rows = conn.execute(select(*columns).order_by(ItemStat.phone_number, ItemStat.category)).all()
+        expected = [("010-0000-0000", "cake", 1, 7000, 5000), ("010-0000-0000", "coffee", 2, 9000, 6000),
+                    ("010-1111-1234", "coffee", 1, 3000, 1000)]
+        self.assertEqual([tuple(row) for row in rows], expected)
+
+        # rebuild of a user keeps other users
+        with engine.begin() as conn:
+            conn.exec_driver_sql("UPDATE user_item_stat SET item_count = 100")
+        rebuild_item_stats(engine, "010-0000-0000")
+        with engine.begin() as conn:
+            rows = conn.execute(select(*columns).order_by(ItemStat.phone_number, ItemStat.category)).all()
+        self.assertEqual([tuple(row) for row in rows], expected[:2] + [("010-1111-1234", "coffee", 100, 3000, 1000)])
+        rebuild_item_stats(engine)
+        with engine.begin() as conn:
+            rows = conn.execute(select(*columns).order_by(ItemStat.phone_number, ItemStat.category)).all()
+        self.assertEqual([tuple(row) for row in rows], expected)
+
+    def test_explain_command(self):
+        engine = create_sqlite_engine()
+        with engine.begin() as conn:
+            for ddl in OLD_DDL:
+                conn.exec_driver_sql(ddl)
+
+        # Error: full table scan query fails the command (same check as check_query_plan)
+        with patch.object(migration_main, "get_engine", return_value=engine), \
+                patch.object(sys, "argv", ["migration", "explain"]), \
+                patch.object(sys, "stdout", io.StringIO()), patch.object(sys, "stderr", io.StringIO()) as stderr:
+            self.assertEqual(migration_main.main(), 1)
+        self.assertTrue(stderr.getvalue().startswith("Full table scan query: "))
+
+        upgrade(engine)
+        with patch.object(migration_main, "get_engine", return_value=engine), \
+                patch.object(sys, "argv", ["migration", "explain"]), \
+                patch.object(sys, "stdout", io.StringIO()) as stdout:
+            self.assertEqual(migration_main.main(), 0)
+        self.assertIn("[ok] get_user_auth", stdout.getvalue())
@@ -0,0 +1,82 @@
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch
+from enum import Enum
+from lib import password
+from lib.db_connect import AsyncMySQLManager
+from lib.encrypt import EncryptManager
+from lib.password import PasswordHasher, get_executor, shutdown_executor
+from lib.validator import ApiValidator, UnAuthorizationError
+from test.async_sqlite import create_sqlite_sessionmaker
+
+EncryptManager = EncryptManager()
+OldPasswordHasher = PasswordHasher(cost=5)
+PasswordHasher = PasswordHasher(cost=4)
+
+
+class Mock(Enum):
+    PHONE_NUMBER = "010-0000-0000"
+    PASSWORD = "123adfabv22"
+
+
+class PasswordHasherTestCase(IsolatedAsyncioTestCase):
+    async def test_hash_verify_password(self):
+        hash_password = await PasswordHasher.hash_password(Mock.PASSWORD.value)
+        self.assertTrue(PasswordHasher.is_hashed(hash_password))
+        self.assertFalse(PasswordHasher.needs_rehash(hash_password))
+
+        self.assertTrue(await PasswordHasher.verify_password(Mock.PASSWORD.value, hash_password))
+        self.assertFalse(await PasswordHasher.verify_password("wrong password", hash_password))
+
+        # salt is different every time
+        self.assertNotEqual(hash_password, await PasswordHasher.hash_password(Mock.PASSWORD.value))
+
+    async def test_needs_rehash(self):
+        legacy_password = EncryptManager.encrypt_password(Mock.PASSWORD.value).decode()
+        self.assertFalse(PasswordHasher.is_hashed(legacy_password))
+        self.assertTrue(PasswordHasher.needs_rehash(legacy_password))
+
+        old_cost_password = await OldPasswordHasher.hash_password(Mock.PASSWORD.value)
+        self.assertTrue(PasswordHasher.needs_rehash(old_cost_password))
+        self.assertTrue(await PasswordHasher.verify_password(Mock.PASSWORD.value, old_cost_password))
+
+    async def test_executor_size(self):
+        # hashing processes of every worker are at most cpu count (at least one per worker)
+        shutdown_executor()
+        with patch.dict(password.PASSWORD_HASH, {}, clear=True), patch.object(password.os, "cpu_count", return_value=8):
+            for workers, max_workers in [(1, 8), (4, 2), (16, 1)]:
+                with patch.object(password, "worker_count", return_value=workers):
+                    self.assertEqual(get_executor()._max_workers, max_workers)
+                shutdown_executor()
+            with patch.dict(password.PASSWORD_HASH, {"max_workers": 3}):
+                self.assertEqual(get_executor()._max_workers, 3)
+            shutdown_executor()
+
+
+class LoginRehashTestCase(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.Session = await create_sqlite_sessionmaker()
+        self.session = self.Session()
+        self.MySQLManager = AsyncMySQLManager(self.session)
+        self.ApiValidator = ApiValidator()
+        self.ApiValidator.PasswordHasher = PasswordHasher
+        legacy_password = EncryptManager.encrypt_password(Mock.PASSWORD.value).decode()
+        await self.MySQLManager.insert_user_auth(Mock.PHONE_NUMBER.value, legacy_password)
+
+    async def asyncTearDown(self) -> None:
+        await self.session.close()
+        await self.Session.kw["bind"].dispose()
+
+    async def test_login_rehash_legacy_password(self):
+        with self.assertRaises(UnAuthorizationError):
+            await self.ApiValidator.check_user_login(Mock.PHONE_NUMBER.value, "wrong password", self.MySQLManager)
+        user_auth = await self.MySQLManager.get_user_auth(Mock.PHONE_NUMBER.value)
+        self.assertFalse(PasswordHasher.is_hashed(user_auth["password"]))
+
+        # legacy AES password is changed to scrypt hash after login
+        await self.ApiValidator.check_user_login(Mock.PHONE_NUMBER.value, Mock.PASSWORD.value, self.MySQLManager)
+        user_auth = await self.MySQLManager.get_user_auth(Mock.PHONE_NUMBER.value)
+        self.assertTrue(PasswordHasher.is_hashed(user_auth["password"]))
+
+        await self.ApiValidator.check_user_login(Mock.PHONE_NUMBER.value, Mock.PASSWORD.value, self.MySQLManager)
+        with self.assertRaises(UnAuthorizationError):
+            await self.ApiValidator.check_user_login(Mock.PHONE_NUMBER.value, "wrong password", self.MySQLManager)
@@ -0,0 +1,129 @@
+import os
+import tempfile
+from unittest import TestCase, IsolatedAsyncioTestCase
+from unittest.mock import patch
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError, ProgrammingError, TimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+from lib import pool
+from lib.pool import PoolStats, StatsQueuePool, StatsAsyncQueuePool, pool_options
+
+
+def sqlite_path() -> str:
+    return os.path.join(tempfile.mkdtemp(), "pool.db")
+
+
+def close_idle_connection(engine) -> None:
+    # connection dropped by server (wait_timeout) while idle in pool
+    engine.pool._pool.queue[0].dbapi_connection.close()
+
+
+class PoolOptionsTestCase(TestCase):
+    def test_default(self):
+        with patch.dict(pool.DB_POOL, {}, clear=True), patch.object(pool, "worker_pool_size", return_value=(5, 5)):
+            self.assertEqual(pool_options(), {
+                "pool_size": 5,
+                "max_overflow": 5,
+                "pool_recycle": 500,
+                "pool_timeout": 30,
+                "pool_pre_ping": True
+            })
+
+    def test_conf(self):
+        conf = {"pool_size": 3, "max_overflow": 0, "pool_recycle": 60, "pool_pre_ping": False}
+        with patch.dict(pool.DB_POOL, conf, clear=True), patch.object(pool, "worker_pool_size", return_value=(5, 5)):
+            options = pool_options()
+        self.assertEqual(options["pool_size"], 3)
+        self.assertEqual(options["max_overflow"], 0)
+        self.assertEqual(options["pool_recycle"], 60)
+        self.assertFalse(options["pool_pre_ping"])
+
+    def test_sync(self):
+        # sync engine is not counted in the budget: one connection regardless of conf
+        conf = {"pool_size": 3, "max_overflow": 2, "pool_recycle": 60}
+        with patch.dict(pool.DB_POOL, conf, clear=True), patch.object(pool, "worker_pool_size", return_value=(5, 5)):
+            options = pool_options(sync=True)
+        self.assertEqual(options["pool_size"], 1)
+        self.assertEqual(options["max_overflow"], 0)
+        self.assertEqual(options["pool_recycle"], 60)
+
+
+class PoolStatsTestCase(TestCase):
+    def setUp(self):
+        self.engine = create_engine(f"sqlite:///{sqlite_path()}", poolclass=StatsQueuePool,
+                                    pool_size=1, max_overflow=0, pool_timeout=0.1, pool_pre_ping=True)
+        self.stats = PoolStats()
+        self.stats.watch(self.engine)
+
+    def tearDown(self):
+        self.engine.dispose()
+
+    def snapshot(self) -> dict:
+        return self.stats.snapshot(self.engine.pool)
+
+    def test_checkout_checkin(self):
+        with self.engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            snapshot = self.snapshot()
+            self.assertEqual(snapshot["checked_out"], 1)
+            self.assertEqual(snapshot["idle"], 0)
+            # pool is full
+            with self.assertRaises(TimeoutError):
+                self.engine.connect()
+        snapshot = self.snapshot()
+        self.assertEqual(snapshot["checked_out"], 0)
+        self.assertEqual(snapshot["idle"], 1)
+        self.assertEqual(snapshot["connects"], 1)
+        self.assertEqual(snapshot["checkouts"], 1)
+        self.assertEqual(snapshot["timeouts"], 1)
+        self.assertEqual(snapshot["waiting"], 0)
+        self.assertGreaterEqual(snapshot["wait_max_ms"], 100)
+        self.assertGreater(snapshot["hold_avg_ms"], 0)
+
+    def test_pre_ping(self):
+        with self.engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        close_idle_connection(self.engine)
+        # stale connection is replaced without error
+        with self.engine.connect() as conn:
+            self.assertEqual(conn.execute(text("SELECT 1")).scalar(), 1)
+        snapshot = self.snapshot()
+        self.assertEqual(snapshot["invalidated"], 1)
+        self.assertEqual(snapshot["connects"], 2)
+
+    def test_without_pre_ping(self):
+        engine = create_engine(f"sqlite:///{sqlite_path()}", poolclass=StatsQueuePool, pool_size=1)
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        close_idle_connection(engine)
+        with self.assertRaises((OperationalError, ProgrammingError)):
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+        engine.dispose()
+
+    def test_recreate(self):
+        with self.engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        self.engine.dispose()
+        with self.engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        self.assertIs(self.engine.pool.stats, self.stats)
+        self.assertEqual(self.snapshot()["checkouts"], 2)
+
+
+class AsyncPoolStatsTestCase(IsolatedAsyncioTestCase):
+    async def test_async_pool(self):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{sqlite_path()}", poolclass=StatsAsyncQueuePool,
+                                     pool_size=2, max_overflow=1)
+        stats = PoolStats()
+        stats.watch(engine.sync_engine)
+        async with engine.connect() as first, engine.connect() as second, engine.connect() as third:
+            for conn in (first, second, third):
+                await conn.execute(text("SELECT 1"))
+            snapshot = stats.snapshot(engine.sync_engine.pool)
+            self.assertEqual(snapshot["checked_out"], 3)
+            self.assertEqual(snapshot["overflow"], 1)
+        snapshot = stats.snapshot(engine.sync_engine.pool)
+        self.assertEqual(snapshot["checkouts"], 3)
+        self.assertEqual(snapshot["idle"], 2)
+        await engine.dispose()
@@ -0,0 +1,315 @@
+import asyncio
+import random
+from unittest import TestCase, IsolatedAsyncioTestCase
+from enum import Enum
+from lib.db_connect import AsyncMySQLManager, MySQLManagerError
+from lib.search_index import ItemTrie, SearchIndex, FuzzyItemIndex, FuzzySearchIndex, fuzzy_distance, \
+    _edit_distance, _fuzzy_keys
+from test.async_sqlite import create_sqlite_sessionmaker
+
+
+class Mock(Enum):
+    PHONE_NUMBER = "010-0000-0000"
+    OTHER_PHONE_NUMBER = "010-1111-1234"
+    NAME = "아메리카노"
+
+
+params = {
+    "category": "coffee",
+    "selling_price": 5000,
+    "cost_price": 3500,
+    "name": Mock.NAME.value,
+    "description": "맛있는 아메리카노",
+    "barcode": "010100000110224",
+    "expiration_date": "2023-08-20",
+    "size": "small"
+}
+
+
+class ItemTrieTestCase(TestCase):
+    def test_add_search_remove(self):
+        trie = ItemTrie()
+        trie.add(1, "아메리카노", "ㅇㅁㄹㅋㄴ")
+        trie.add(2, "아이스티", "ㅇㅇㅅㅌ")
+        trie.add(3, "Latte", "Latte")
+        self.assertEqual(trie.search("아메"), {1})
+        self.assertEqual(trie.search("ㅇ"), {1, 2})
+        self.assertEqual(trie.search("lat"), {3})
+        self.assertEqual(trie.search("카페"), set())
+
+        # rename
+        trie.add(1, "카페라떼", "ㅋㅍㄹㄸ")
+        self.assertEqual(trie.search("아메"), set())
+        self.assertEqual(trie.search("ㅋㅍ"), {1})
+
+        # empty nodes are pruned
+        for seq in [1, 2, 3]:
+            trie.remove(seq)
+        self.assertEqual(trie.nodes, 1)
+        self.assertEqual(trie.refs, 0)
+
+
+class FuzzyItemIndexTestCase(TestCase):
+    def test_add_search_remove(self):
+        index = FuzzyItemIndex()
+        index.add(1, "아메리카노")
+        index.add(2, "바닐라 라떼")
+        index.add(3, "카페라떼")
+        index.add(4, "Latte")
+        self.assertEqual(index.search("아매리카노"), {1: 1})
+        self.assertEqual(index.search("아메리카노"), {1: 0})
+        self.assertEqual(index.search("아매리카누"), {1: 2})
+        self.assertEqual(index.search("아메카리노"), {})
+        # 이름의 단어, 공백 무시
+        self.assertEqual(index.search("라때"), {2: 1})
+        self.assertEqual(index.search("바닐라라때"), {2: 1})
+        self.assertEqual(index.search("카페 라때"), {3: 1})
+        self.assertEqual(index.search("LATE"), {4: 1})
+        # 4자모 미만은 정확히 일치하는 경우만
+        self.assertEqual(index.search("라"), {})
+
+        # rename
+        index.add(1, "카페모카")
+        self.assertEqual(index.search("아매리카노"), {})
+        self.assertEqual(index.search("카페모까"), {1: 1})
+
+        for seq in [1, 2, 3, 4]:
+            index.remove(seq)
+        self.assertEqual((index.prefixes, index.suffixes, index.prefix_deletes, index.suffix_deletes), ({}, {}, {}, {}))
+        self.assertEqual((index.seqs, index.keys, index.refs), ({}, {}, 0))
+
+    def test_fuzzy_distance(self):
+        self.assertEqual(fuzzy_distance("라"), 0)
+        self.assertEqual(fuzzy_distance("라떼"), 1)
+        self.assertEqual(fuzzy_distance("아메리카노"), 2)
+        self.assertEqual(_edit_distance("abcd", "abdc", 2), 1)
+        self.assertEqual(_edit_distance("abcd", "dcba", 2), 3)
+
+    def test_search_same_as_brute_force(self):
+        # 모든 이름과 편집 거리를 계산한 결과와 같아야 함 (앞 FUZZY_PREFIX_LENGTH 자모만 인덱스)
+        rng = random.Random(0)
+        syllables = "아메리카노라떼바닐모카페자몽에이드티매래까"
+        names = ["".join(rng.choice(syllables) for _ in range(rng.randint(1, 7))) for _ in range(500)]
+        index = FuzzyItemIndex()
+        for seq, name in enumerate(names):
+            index.add(seq, name)
+        for _ in range(200):
+            keyword = list(rng.choice(names))
+            keyword[rng.randrange(len(keyword))] = rng.choice(syllables)
+            keyword = "".join(keyword)
+            distance = fuzzy_distance(keyword)
+            expected = {}
+            for seq, name in enumerate(names):
+                found = min(_edit_distance(_query, key, distance)
+                            for _query in _fuzzy_keys(keyword) for key in _fuzzy_keys(name))
+                if found <= distance:
+                    expected[seq] = found
+            self.assertEqual(index.search(keyword), expected, keyword)
+
+
+class SearchIndexTestCase(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.load_count = 0
+
+    async def loader(self, phone_number: str) -> list:
+        self.load_count += 1
+        return [(seq, f"아메리카노{seq}", "ㅇㅁㄹㅋㄴ") for seq in range(1, 13)]
+
+    async def test_search_page(self):
+        index = SearchIndex(max_bytes=10 ** 8)
+        result = await index.search(Mock.PHONE_NUMBER.value, "아메", self.loader)
+        self.assertEqual(result, list(range(1, 11)))
+        result = await index.search(Mock.PHONE_NUMBER.value, "ㅇㅁㄹ", self.loader, page_number=1)
+        self.assertEqual(result, [11, 12])
+        result = await index.search(Mock.PHONE_NUMBER.value, "ㅇㅁㄹ", self.loader, cursor=5, page_size=3)
+        self.assertEqual(result, [6, 7, 8])
+
+        # lookahead: one more seq if the next page exists
+        result = await index.search(Mock.PHONE_NUMBER.value, "ㅇㅁㄹ", self.loader, cursor=5, page_size=3,
+                                    lookahead=True)
+        self.assertEqual(result, [6, 7, 8, 9])
+        result = await index.search(Mock.PHONE_NUMBER.value, "ㅇㅁㄹ", self.loader, page_number=1, lookahead=True)
+        self.assertEqual(result, [11, 12])
+        self.assertEqual(await index.count(Mock.PHONE_NUMBER.value, "아메리카노1", self.loader), 4)
+
+        # user index is loaded once
+        self.assertEqual(self.load_count, 1)
+        self.assertEqual(index.stats()["misses"], 1)
+        self.assertEqual(index.stats()["hits"], 5)
+
+    async def test_update_loaded_user(self):
+        index = SearchIndex(max_bytes=10 ** 8)
+        # not loaded user is not changed
+        index.add(Mock.PHONE_NUMBER.value, 100, "카페라떼", "ㅋㅍㄹㄸ")
+        self.assertEqual(index.stats()["users"], 0)
+
+        await index.search(Mock.PHONE_NUMBER.value, "아메", self.loader)
+        index.add(Mock.PHONE_NUMBER.value, 100, "카페라떼", "ㅋㅍㄹㄸ")
+        index.remove(Mock.PHONE_NUMBER.value, 1)
+        self.assertEqual(await index.search(Mock.PHONE_NUMBER.value, "ㅋㅍ", self.loader), [100])
+        self.assertEqual(await index.search(Mock.PHONE_NUMBER.value, "아메리카노1", self.loader), [10, 11, 12])
+
+        index.invalidate(Mock.PHONE_NUMBER.value)
+        self.assertEqual(index.stats()["bytes"], 0)
+        self.assertEqual(await index.search(Mock.PHONE_NUMBER.value, "ㅋㅍ", self.loader), [])
+
+    async def test_concurrent_load(self):
+        index = SearchIndex(max_bytes=10 ** 8)
+        release = asyncio.Event()
+        loading = []
+
+        async def loader(phone_number: str) -> list:
+            loading.append(phone_number)
+            self.assertEqual(len(loading), 1)
+            await release.wait()
+            await asyncio.sleep(0.01)
+            loading.pop()
+            self.load_count += 1
+            if self.load_count == 1:
+                raise ConnectionError("mysql is down")
+            return await self.loader(phone_number)
+
+        # first load fails. waiting and later requests load one at a time, not at the same time
+        first = asyncio.ensure_future(index.count(Mock.PHONE_NUMBER.value, "아메", loader))
+        second = asyncio.ensure_future(index.count(Mock.PHONE_NUMBER.value, "아메", loader))
+        await asyncio.sleep(0)
+        release.set()
+        with self.assertRaises(ConnectionError):
+            await first
+        third = asyncio.ensure_future(index.count(Mock.PHONE_NUMBER.value, "아메", loader))
+        self.assertEqual(await second, 12)
+        self.assertEqual(await third, 12)
+        self.assertEqual(index.stats()["misses"], 2)
+
+    async def test_write_during_load(self):
+        index = SearchIndex(max_bytes=10 ** 8)
+        loaded = asyncio.Event()
+        release = asyncio.Event()
+
+        async def loader(phone_number: str) -> list:
+            rows = await self.loader(phone_number)
+            loaded.set()
+            await release.wait()
+            return rows
+
+        # item added after the snapshot was read: the snapshot is not stored
+        search = asyncio.ensure_future(index.search(Mock.PHONE_NUMBER.value, "ㅋㅍ", loader))
+        await loaded.wait()
+        index.add(Mock.PHONE_NUMBER.value, 100, "카페라떼", "ㅋㅍㄹㄸ")
+        release.set()
+        self.assertEqual(await search, [])
+        self.assertEqual(index.stats()["users"], 0)
+        self.assertEqual(index.stats()["discards"], 1)
+
+        # next search loads again
+        self.assertEqual(await index.search(Mock.PHONE_NUMBER.value, "아메", self.loader), list(range(1, 11)))
+        self.assertEqual(index.stats()["users"], 1)
+        self.assertEqual(index.stats()["misses"], 2)
+
+    async def test_evict_cold_user(self):
+        index = SearchIndex(max_bytes=10 ** 8)
+        await index.search(Mock.PHONE_NUMBER.value, "아메", self.loader)
+        index.max_bytes = index.stats()["bytes"] * 2 - 1
+
+        await index.search(Mock.OTHER_PHONE_NUMBER.value, "아메", self.loader)
+        self.assertEqual(index.stats()["users"], 1)
+        self.assertEqual(index.stats()["evictions"], 1)
+        self.assertLessEqual(index.stats()["bytes"], index.max_bytes)
+
+
+class AsyncMySQLManagerSearchIndexTestCase(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.Session = await create_sqlite_sessionmaker()
+        self.session = self.Session()
+        self.MySQLManager = AsyncMySQLManager(self.session)
+        self.IndexMySQLManager = AsyncMySQLManager(self.session, SearchIndex(max_bytes=10 ** 8))
+        for i in range(12):
+            await self.MySQLManager.insert_item_info(
+                Mock.PHONE_NUMBER.value, dict(params, name=Mock.NAME.value + str(i)))
+        await self.MySQLManager.insert_item_info(Mock.OTHER_PHONE_NUMBER.value, params)
+
+    async def asyncTearDown(self) -> None:
+        await self.session.close()
+        await self.Session.kw["bind"].dispose()
+
+    async def assert_same_search(self, keyword: str, **page) -> None:
+        expected = await self.MySQLManager.get_search_item(Mock.PHONE_NUMBER.value, keyword, **page)
+        result = await self.IndexMySQLManager.get_search_item(Mock.PHONE_NUMBER.value, keyword, **page)
+        self.assertEqual(result, expected)
+
+    async def test_search_same_as_sql(self):
+        for keyword in ["아메", "ㅇㅁㄹ", "아메리카노1", "ㅇㅁㄹㅋㄴ", "파이썬"]:
+            await self.assert_same_search(keyword)
+            await self.assert_same_search(keyword, page_number=1)
+            await self.assert_same_search(keyword, cursor=3, page_size=5)
+
+    async def test_search_after_write(self):
+        await self.assert_same_search("아메")
+        await self.IndexMySQLManager.insert_item_info(Mock.PHONE_NUMBER.value, dict(params, name="카페라떼"))
+        await self.IndexMySQLManager.update_item_info(Mock.PHONE_NUMBER.value, 1, {"name": "카페모카"})
+        await self.IndexMySQLManager.delete_item_info(Mock.PHONE_NUMBER.value, 2)
+        for keyword in ["아메", "카페", "ㅋㅍ", "ㅋㅍㅁ"]:
+            await self.assert_same_search(keyword)
+
+
+class FuzzySearchIndexTestCase(IsolatedAsyncioTestCase):
+    async def loader(self, phone_number: str) -> list:
+        return [(1, "아메리카노", "ㅇㅁㄹㅋㄴ"), (2, "아메리카노", "ㅇㅁㄹㅋㄴ"), (3, "아매리카노", "ㅇㅁㄹㅋㄴ"),
+                (4, "카페라떼", "ㅋㅍㄹㄸ")]
+
+    async def test_search_order(self):
+        index = FuzzySearchIndex(max_bytes=10 ** 8)
+        result = await index.search(Mock.PHONE_NUMBER.value, "아매리카노", self.loader)
+        self.assertEqual(result, [3, 1, 2])
+        result = await index.search(Mock.PHONE_NUMBER.value, "아메리카노", self.loader, page_number=1, page_size=2)
+        self.assertEqual(result, [3])
+        result = await index.search(Mock.PHONE_NUMBER.value, "아메리카노", self.loader, page_size=2, lookahead=True)
+        self.assertEqual(result, [1, 2, 3])
+        self.assertEqual(await index.count(Mock.PHONE_NUMBER.value, "카페라때", self.loader), 1)
+        with self.assertRaises(ValueError):
+            await index.search(Mock.PHONE_NUMBER.value, "아메리카노", self.loader, cursor=1)
+
+
+class AsyncMySQLManagerFuzzySearchTestCase(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.Session = await create_sqlite_sessionmaker()
+        self.session = self.Session()
+        self.MySQLManager = AsyncMySQLManager(self.session, fuzzy_index=FuzzySearchIndex(max_bytes=10 ** 8))
+        for name in ["아메리카노", "카페라떼", "바닐라 라떼"]:
+            await self.MySQLManager.insert_item_info(Mock.PHONE_NUMBER.value, dict(params, name=name))
+        await self.MySQLManager.insert_item_info(Mock.OTHER_PHONE_NUMBER.value, params)
+
+    async def asyncTearDown(self) -> None:
+        await self.session.close()
+        await self.Session.kw["bind"].dispose()
+
+    async def search(self, keyword: str) -> list:
+        result, _ = await self.MySQLManager.get_fuzzy_search_item(Mock.PHONE_NUMBER.value, keyword)
+        return [item["name"] for item in result]
+
+    async def test_fuzzy_search(self):
+        result, total = await self.MySQLManager.get_fuzzy_search_item(Mock.PHONE_NUMBER.value, "아매리카노")
+        self.assertEqual([item["seq"] for item in result], [1])
+        self.assertEqual(total, 1)
+        self.assertEqual(await self.search("카페라때"), ["카페라떼"])
+        self.assertEqual(await self.search("라때"), ["바닐라 라떼"])
+        self.assertEqual(await self.search("파이썬"), [])
+
+        with self.assertRaises(MySQLManagerError):
+            await AsyncMySQLManager(self.session).get_fuzzy_search_item(Mock.PHONE_NUMBER.value, "아매리카노")
+
+    async def test_fuzzy_search_after_write(self):
+        self.assertEqual(await self.search("아매리카노"), ["아메리카노"])
+        await self.MySQLManager.insert_item_info(Mock.PHONE_NUMBER.value, dict(params, name="아메리카노"))
+        await self.MySQLManager.update_item_info(Mock.PHONE_NUMBER.value, 2, {"name": "아메리카노"})
+        await self.MySQLManager.delete_item_info(Mock.PHONE_NUMBER.value, 1)
+        result, _ = await self.MySQLManager.get_fuzzy_search_item(Mock.PHONE_NUMBER.value, "아매리카노")
+        self.assertEqual([item["seq"] for item in result], [2, 5])
+
+        # bulk write reloads the index
+        await self.MySQLManager.insert_item_bulk(Mock.PHONE_NUMBER.value, [dict(params, name="카페모카")])
+        await self.MySQLManager.update_item_bulk(Mock.PHONE_NUMBER.value, {"seqs": [3]}, {"name": "자몽에이드"})
+        self.assertEqual(await self.search("카페모까"), ["카페모카"])
+        self.assertEqual(await self.search("자몽에이도"), ["자몽에이드"])
+        await self.MySQLManager.delete_item_bulk(Mock.PHONE_NUMBER.value, {"seqs": [6]})
+        self.assertEqual(await self.search("카페모까"), [])
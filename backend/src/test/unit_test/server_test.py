@@ -0,0 +1,89 @@
+import os
+import multiprocessing
+from unittest import TestCase
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine
+from lib import server, expiry, db_connect, cache, search_index
+from lib.server import worker_count, worker_pool_size, DEFAULT_POOL_SIZE, DEFAULT_MAX_OVERFLOW
+
+
+def child_state(queue) -> None:
+    queue.put({
+        "engine": db_connect._engine is None,
+        "async_engine": db_connect._async_engine is None,
+        "item_cache": cache._item_cache is None,
+        "search_index": search_index._search_index is None,
+        "barcode_cache": len(db_connect._barcode_cache) == 0
+    })
+
+
+def child_lock(queue) -> None:
+    queue.put(expiry._acquire_lock())
+
+
+def run_child(target) -> object:
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+    process = context.Process(target=target, args=(queue,))
+    process.start()
+    result = queue.get(timeout=10)
+    process.join()
+    return result
+
+
+class WorkerPoolSizeTestCase(TestCase):
+    def test_default(self):
+        with patch.dict(server.SERVER, {}, clear=True):
+            self.assertEqual(worker_pool_size(4), (DEFAULT_POOL_SIZE, DEFAULT_MAX_OVERFLOW))
+
+    def test_budget(self):
+        with patch.dict(server.SERVER, {"db_connection_budget": 40}, clear=True):
+            self.assertEqual(worker_pool_size(1), (20, 20))
+            self.assertEqual(worker_pool_size(4), (5, 5))
+            self.assertEqual(worker_pool_size(3), (7, 6))
+            # at least one connection per worker
+            self.assertEqual(worker_pool_size(100), (1, 0))
+            for workers in range(1, 41):
+                self.assertLessEqual(sum(worker_pool_size(workers)) * workers, 40)
+
+    def test_worker_count(self):
+        with patch.dict(server.SERVER, {"workers": 3}, clear=True), patch.dict(os.environ):
+            os.environ.pop("WEB_CONCURRENCY", None)
+            self.assertEqual(worker_count(), 3)
+            os.environ["WEB_CONCURRENCY"] = "8"
+            self.assertEqual(worker_count(), 8)
+            with patch.dict(server.SERVER, {"db_connection_budget": 32}, clear=True):
+                self.assertEqual(worker_pool_size(), (2, 2))
+
+
+class ForkTestCase(TestCase):
+    def test_reset_after_fork(self):
+        engine = create_engine("sqlite://")
+        async_engine = create_async_engine("sqlite+aiosqlite://")
+        with patch.object(db_connect, "_engine", engine), patch.object(db_connect, "_async_engine", async_engine), \
+                patch.object(cache, "_item_cache", object()), patch.object(search_index, "_search_index", object()):
+            db_connect._barcode_cache.set("key", "value")
+            self.assertEqual(run_child(child_state), {
+                "engine": True,
+                "async_engine": True,
+                "item_cache": True,
+                "search_index": True,
+                "barcode_cache": True
+            })
+            # the parent keeps its engine
+            self.assertIs(db_connect._engine, engine)
+            self.assertEqual(db_connect._barcode_cache.get("key"), "value")
+            db_connect._barcode_cache.delete("key")
+        engine.dispose()
+
+    def test_expiry_lock(self):
+        with patch.dict(expiry.EXPIRY_SCHEDULER, {"lock_file": f"/tmp/expiry_lock_test_{os.getpid()}.lock"}):
+            self.assertTrue(expiry._acquire_lock())
+            try:
+                # another worker can not run the scheduler
+                self.assertFalse(run_child(child_lock))
+            finally:
+                expiry._release_lock()
+            self.assertTrue(run_child(child_lock))
+            os.remove(expiry.EXPIRY_SCHEDULER["lock_file"])
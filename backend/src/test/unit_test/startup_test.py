@@ -0,0 +1,65 @@
+import os
+import sys
+import json
+import subprocess
+from unittest import TestCase
+
+SRC_PATH = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# import + create_app() wall time, including fastapi, sqlalchemy, pydantic
+CREATE_APP_BUDGET_MS = float(os.environ.get("CREATE_APP_BUDGET_MS", 2500))
+# self import time of api, lib modules (python -X importtime)
+OWN_IMPORT_BUDGET_MS = float(os.environ.get("OWN_IMPORT_BUDGET_MS", 200))
+# modules which must not be imported until used (webhook, dev server, DB driver, redis)
+LAZY_MODULES = ["httpx", "uvicorn", "gunicorn", "aiomysql", "pymysql", "redis"]
+
+CREATE_APP = f"""
+import sys, json, time
+start = time.perf_counter()
+from api import create_app
+create_app()
+elapsed = (time.perf_counter() - start) * 1000
+from lib import db_connect
+print(json.dumps({{
+    "elapsed": elapsed,
+    "imported": [name for name in {LAZY_MODULES!r} if name in sys.modules],
+    "engine": db_connect._engine is not None or db_connect._async_engine is not None
+}}))
+"""
+
+
+def parse_importtime(stderr: str) -> dict:
+    """Self import time(ms) of each module."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(self_us) / 1000
+    return modules
+
+
+class StartupTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # no conf.json: importing and creating the app must not read conf
+        env = dict(os.environ, CONF_FILE=os.path.join(SRC_PATH, "no_conf.json"))
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", CREATE_APP],
+                              cwd=SRC_PATH, env=env, capture_output=True, text=True)
+        if proc.returncode != 0:
+            raise AssertionError(proc.stderr[-2000:])
+        cls.result = json.loads(proc.stdout.strip().splitlines()[-1])
+        cls.modules = parse_importtime(proc.stderr)
+
+    def test_create_app_budget(self):
+        self.assertLess(self.result["elapsed"], CREATE_APP_BUDGET_MS)
+
+    def test_own_import_budget(self):
+        own = {name: ms for name, ms in self.modules.items() if name.split(".")[0] in ("api", "lib")}
+        self.assertLess(sum(own.values()), OWN_IMPORT_BUDGET_MS, sorted(own.items(), key=lambda x: -x[1])[:5])
+
+    def test_lazy(self):
+        self.assertEqual(self.result["imported"], [])
+        self.assertFalse(self.result["engine"])
+        # lib modules are imported once as lib.* (no sys.path of lib)
+        self.assertNotIn("model", self.modules)
+        self.assertNotIn("util", self.modules)
@@ -1,12 +1,80 @@
 from unittest import TestCase
 from enum import Enum
-from lib.util import extract_korean_initial
+from jamo import h2j, j2hcj, InvalidJamoError
+import unicodedata
+from lib.util import extract_korean_initial, extract_korean_initial_many, make_etag, etag_matches, \
+    normalize_search_text, extract_ngrams, split_search_terms, decompose_jamo, parse_date
+from datetime import date
 
 class Mock(Enum):
     TEXT = "아메리카노"
     
 
+def reference_korean_initial(text: str) -> str:
+    result = ""
+    for t in text:
+        result += j2hcj(h2j(t))[0]
+    return result
+
+
 class UtilsTestCase(TestCase):
     def test_extract_korean_initial(self):
         result = extract_korean_initial(Mock.TEXT.value)
-        self.assertEqual('ㅇㅁㄹㅋㄴ', result)
\ No newline at end of file
+        self.assertEqual('ㅇㅁㄹㅋㄴ', result)
+
+    def test_extract_korean_initial_all_hangul(self):
+        # 한글 음절, 조합형/호환 자모, 영문/숫자/기호 전체
+        chars = [chr(cp) for cp in range(0xAC00, 0xD7A4)]
+        chars += [chr(cp) for cp in range(0x1100, 0x1200)]
+        chars += [chr(cp) for cp in range(0x3130, 0x3190)]
+        chars += [chr(cp) for cp in range(0x20, 0x7F)]
+        for char in chars:
+            self.assertEqual(reference_korean_initial(char), extract_korean_initial(char), hex(ord(char)))
+        self.assertEqual(reference_korean_initial("".join(chars)), extract_korean_initial("".join(chars)))
+
+    def test_extract_korean_initial_extended_jamo(self):
+        # jamo가 변환하지 못하는 확장 자모는 기존과 같이 에러가 발생합니다.
+        with self.assertRaises(InvalidJamoError):
+            extract_korean_initial("아메" + chr(0xA960))
+
+    def test_extract_korean_initial_many(self):
+        names = ["아메리카노", "Café 라떼 2", "", "줄\n바꿈", "ㄱ나다"]
+        self.assertEqual([reference_korean_initial(name) for name in names],
+                         extract_korean_initial_many(names))
+        self.assertEqual(["ㅇㅁㄹㅋㄴ"], extract_korean_initial_many(iter(["아메리카노"])))
+        self.assertEqual([], extract_korean_initial_many([]))
+
+    def test_etag(self):
+        etag = make_etag(1, "010-0000-0000:/item?page_size=5")
+        self.assertEqual(etag, make_etag(1, "010-0000-0000:/item?page_size=5"))
+        self.assertNotEqual(etag, make_etag(2, "010-0000-0000:/item?page_size=5"))
+        self.assertNotEqual(etag, make_etag(1, "010-0000-0000:/item?page_size=10"))
+
+        self.assertTrue(etag_matches(etag, etag))
+        self.assertTrue(etag_matches(f'"other", W/{etag}', etag))
+        self.assertTrue(etag_matches("*", etag))
+        self.assertFalse(etag_matches(None, etag))
+        self.assertFalse(etag_matches('"other"', etag))
+
+    def test_extract_ngrams(self):
+        self.assertEqual(normalize_search_text(" Café\tLATTE "), "cafélatte")
+        self.assertEqual(extract_ngrams("바닐라 라떼"), {"바닐", "닐라", "라라", "라떼", "떼 "})
+        self.assertEqual(extract_ngrams("라"), {"라 "})
+        self.assertEqual(extract_ngrams(" "), set())
+        # NFD 입력도 같은 bigram
+        self.assertEqual(extract_ngrams(unicodedata.normalize("NFD", "라떼")), {"라떼", "떼 "})
+
+    def test_split_search_terms(self):
+        self.assertEqual(split_search_terms(" 바닐라  라떼 바닐라 "), ["바닐라", "라떼"])
+        self.assertEqual(split_search_terms("LATTE"), ["latte"])
+        self.assertEqual(split_search_terms(None), [])
+
+    def test_decompose_jamo(self):
+        self.assertEqual(decompose_jamo("아메"), "ㅇㅏㅁㅔ")
+        self.assertEqual(decompose_jamo("왜 닭"), "ㅇㅙ ㄷㅏㄺ")
+        self.assertEqual(decompose_jamo("Latte 2ㄱ"), "Latte 2ㄱ")
+
+    def test_parse_date(self):
+        self.assertEqual(parse_date("2023-08-20"), date(2023, 8, 20))
+        for text in ["2023-8-20", "2023-02-30", "20230820", " 2023-08-20", None]:
+            self.assertIsNone(parse_date(text))
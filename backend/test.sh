@@ -4,12 +4,28 @@ cd ./src
 
 # unit test
 python -m unittest test/unit_test/db_connect_test.py
+python -m unittest test/unit_test/async_db_connect_test.py
+python -m unittest test/unit_test/bulk_test.py
 python -m unittest test/unit_test/encrypt_test.py
+python -m unittest test/unit_test/migration_test.py
+python -m unittest test/unit_test/password_test.py
 python -m unittest test/unit_test/util_test.py
+python -m unittest test/unit_test/cache_test.py
+python -m unittest test/unit_test/search_index_test.py
+python -m unittest test/unit_test/server_test.py
+python -m unittest test/unit_test/startup_test.py
+python -m unittest test/unit_test/pool_test.py
+python -m unittest test/unit_test/expiry_test.py
+
+# query plan check (full table scan)
+python -m migration explain
 
 # api test
 python -m pytest test/api_test/auth_test.py
 python -m pytest test/api_test/item_test.py
+python -m pytest test/api_test/item_bulk_test.py
+python -m pytest test/api_test/session_test.py
+python -m pytest test/api_test/internal_test.py
 
 # 테스트가 성공적으로 완료되었는지 확인
 if [ $? -eq 0 ]; then